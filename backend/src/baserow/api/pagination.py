@@ -1,8 +1,33 @@
+import binascii
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+from functools import partial
+from typing import Any, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator as DjangoPaginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Expression, F, OrderBy, Q, QuerySet
 from rest_framework.exceptions import NotFound, APIException
-from rest_framework.status import HTTP_400_BAD_REQUEST
 from rest_framework.pagination import (
+    LimitOffsetPagination as RestFrameworkLimitOffsetPagination,
     PageNumberPagination as RestFrameworkPageNumberPagination,
 )
+from rest_framework.response import Response
+from rest_framework.status import HTTP_400_BAD_REQUEST
+from rest_framework.utils.urls import replace_query_param
+
+
+class CountedPaginator(DjangoPaginator):
+    """
+    A Django paginator that uses the provided count instead of counting the objects.
+    """
+
+    def __init__(self, *args, count=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if count is not None:
+            self.count = count
 
 
 class PageNumberPagination(RestFrameworkPageNumberPagination):
@@ -11,8 +36,16 @@ class PageNumberPagination(RestFrameworkPageNumberPagination):
     page_size = 100
     page_size_query_param = "size"
 
-    def __init__(self, limit_page_size=None, *args, **kwargs):
+    def __init__(self, limit_page_size=None, count=None, *args, **kwargs):
+        """
+        :param limit_page_size: The maximum page size that can be requested.
+        :param count: If provided, this count is used instead of counting the objects
+            of the queryset.
+        """
+
         self.limit_page_size = limit_page_size
+        if count is not None:
+            self.django_paginator_class = partial(CountedPaginator, count=count)
         super().__init__(*args, **kwargs)
 
     def get_page_size(self, request):
@@ -39,3 +72,264 @@ class PageNumberPagination(RestFrameworkPageNumberPagination):
             exception = APIException({"error": "ERROR_INVALID_PAGE", "detail": str(e)})
             exception.status_code = HTTP_400_BAD_REQUEST
             raise exception
+
+
+class LimitOffsetPagination(RestFrameworkLimitOffsetPagination):
+    def __init__(self, count=None):
+        """
+        :param count: If provided, this count is used instead of counting the objects
+            of the queryset.
+        """
+
+        self.provided_count = count
+
+    def get_count(self, queryset):
+        if self.provided_count is not None:
+            return self.provided_count
+        return super().get_count(queryset)
+
+
+class KeysetPagination:
+    """
+    Paginates a queryset by filtering on the ordering values of the last row of the
+    previous page instead of using an offset. The ordering values, which always end
+    with the unique id, are encoded in an opaque cursor that is added to the URL of
+    the next page. Because the database can start reading at the position of the
+    cursor, every page is fetched in the same time no matter how deep it is. The
+    total amount of rows is only counted if explicitly requested.
+
+    The pagination is used if the `cursor` GET parameter is provided, it can be
+    empty to fetch the first page.
+    """
+
+    page_size = 100
+    page_size_query_param = "size"
+    cursor_query_param = "cursor"
+    count_query_param = "include_count"
+    annotation_prefix = "keyset_"
+
+    def __init__(self, limit_page_size=None):
+        self.limit_page_size = limit_page_size
+        self.request = None
+        self.count = None
+        self.next_cursor = None
+
+    @classmethod
+    def is_requested(cls, request) -> bool:
+        return cls.cursor_query_param in request.GET
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.GET.get(self.page_size_query_param, self.page_size))
+        except ValueError:
+            page_size = self.page_size
+
+        if self.limit_page_size and page_size > self.limit_page_size:
+            exception = APIException(
+                {
+                    "error": "ERROR_PAGE_SIZE_LIMIT",
+                    "detail": f"The page size is limited to {self.limit_page_size}.",
+                }
+            )
+            exception.status_code = HTTP_400_BAD_REQUEST
+            raise exception
+
+        return max(page_size, 1)
+
+    def get_ordering(self, queryset: QuerySet) -> List[Tuple[Expression, bool, bool]]:
+        """
+        Returns the expressions the queryset is ordered by, whether they are ordered
+        descending and whether null values come first. The id is added as last
+        expression if the ordering doesn't end with it, so that every row has a
+        unique position.
+        """
+
+        query = queryset.query
+        order_by = list(query.order_by or queryset.model._meta.ordering)
+        if order_by[-1:] not in (["id"], ["pk"]):
+            order_by.append("id")
+
+        ordering = []
+        for order in order_by:
+            nulls_first = None
+            if isinstance(order, str):
+                descending = order.startswith("-")
+                expression = F(order.lstrip("-"))
+            elif isinstance(order, OrderBy):
+                descending = order.descending
+                expression = order.expression
+                if order.nulls_first:
+                    nulls_first = True
+                elif order.nulls_last:
+                    nulls_first = False
+            else:
+                descending = False
+                expression = order
+
+            # PostgreSQL places null values last when ordering ascending and first
+            # when ordering descending, unless specified otherwise.
+            if nulls_first is None:
+                nulls_first = descending
+            ordering.append((expression, descending, nulls_first))
+
+        return ordering
+
+    def encode_cursor(self, values: List[Any]) -> str:
+        data = json.dumps(values, cls=DjangoJSONEncoder).encode()
+        return urlsafe_b64encode(data).decode().rstrip("=")
+
+    def decode_cursor(self, cursor: str, output_fields: List[Any]) -> List[Any]:
+        try:
+            data = urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            values = json.loads(data)
+            if not isinstance(values, list) or len(values) != len(output_fields):
+                raise ValueError("The cursor doesn't match the ordering.")
+            return [
+                None if value is None else output_field.to_python(value)
+                for value, output_field in zip(values, output_fields)
+            ]
+        except (binascii.Error, ValueError, TypeError, ValidationError):
+            exception = APIException(
+                {"error": "ERROR_INVALID_CURSOR", "detail": "Invalid cursor."}
+            )
+            exception.status_code = HTTP_400_BAD_REQUEST
+            raise exception
+
+    def get_after_filter(
+        self, name: str, value: Any, descending: bool, nulls_first: bool
+    ) -> Q:
+        """
+        Returns the filter matching the rows whose value is positioned after the
+        provided value for one of the ordering expressions.
+        """
+
+        if value is None:
+            # Only the non null values come after a null value if null values are
+            # placed first. Otherwise no value comes after it.
+            return Q(**{f"{name}__isnull": False}) if nulls_first else Q(pk__in=[])
+
+        lookup = "lt" if descending else "gt"
+        after = Q(**{f"{name}__{lookup}": value})
+        if not nulls_first:
+            after |= Q(**{f"{name}__isnull": True})
+        return after
+
+    def get_equal_filter(self, name: str, value: Any) -> Q:
+        if value is None:
+            return Q(**{f"{name}__isnull": True})
+        return Q(**{name: value})
+
+    def annotate_ordering(self, queryset: QuerySet) -> Tuple[QuerySet, List[str]]:
+        """
+        Annotates the values of the ordering expressions to the queryset, so that
+        the values of the last row of a page can be used to find the next page.
+
+        :return: The annotated queryset and the names of the annotations.
+        """
+
+        ordering = self.get_ordering(queryset)
+        names = [f"{self.annotation_prefix}{index}" for index in range(len(ordering))]
+        queryset = queryset.annotate(
+            **{name: expression for name, (expression, _, _) in zip(names, ordering)}
+        )
+        return queryset, names
+
+    def filter_after(
+        self, queryset: QuerySet, names: List[str], values: List[Any]
+    ) -> QuerySet:
+        """
+        Filters the annotated queryset on the rows coming after the provided values
+        of the ordering expressions.
+        """
+
+        ordering = self.get_ordering(queryset)
+
+        # A row comes after the values if its values are equal to the provided
+        # values up to an ordering expression and come after the value of that
+        # expression. The first expression must always be at or after the first
+        # value, which allows the database to start reading at the position of the
+        # values in the index.
+        after_values = Q(pk__in=[])
+        equal = Q()
+        for name, value, (_, descending, nulls_first) in zip(names, values, ordering):
+            after_values |= equal & self.get_after_filter(
+                name, value, descending, nulls_first
+            )
+            equal &= self.get_equal_filter(name, value)
+
+        first_name, first_value = names[0], values[0]
+        first_descending, first_nulls_first = ordering[0][1:]
+        return queryset.filter(
+            self.get_equal_filter(first_name, first_value)
+            | self.get_after_filter(
+                first_name, first_value, first_descending, first_nulls_first
+            )
+        ).filter(after_values)
+
+    def get_page(
+        self,
+        queryset: QuerySet,
+        page_size: int,
+        after: Optional[List[Any]] = None,
+    ) -> Tuple[List[Any], Optional[List[Any]]]:
+        """
+        Fetches the rows of the page coming after the provided values of the
+        ordering expressions.
+
+        :param queryset: The queryset to paginate.
+        :param page_size: The maximum amount of rows in the page.
+        :param after: The ordering values of the last row of the previous page, or
+            None for the first page.
+        :return: The rows of the page and the ordering values of its last row, which
+            are None if there is no next page.
+        """
+
+        queryset, names = self.annotate_ordering(queryset)
+        if after is not None:
+            queryset = self.filter_after(queryset, names, after)
+
+        # One row more than the page size is fetched to know if there is a next page.
+        rows = list(queryset[: page_size + 1])
+        if len(rows) <= page_size:
+            return rows, None
+
+        rows = rows[:page_size]
+        return rows, [getattr(rows[-1], name) for name in names]
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        if self.count_query_param in request.GET:
+            self.count = queryset.count()
+
+        after = None
+        cursor = request.GET.get(self.cursor_query_param)
+        if cursor:
+            annotated_queryset, names = self.annotate_ordering(queryset)
+            output_fields = [
+                annotated_queryset.query.annotations[name].output_field
+                for name in names
+            ]
+            after = self.decode_cursor(cursor, output_fields)
+
+        rows, last_values = self.get_page(queryset, page_size, after)
+        if last_values is not None:
+            self.next_cursor = self.encode_cursor(last_values)
+
+        return rows
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        response_data = OrderedDict()
+        if self.count is not None:
+            response_data["count"] = self.count
+        response_data["next"] = self.get_next_link()
+        response_data["previous"] = None
+        response_data["results"] = data
+        return Response(response_data)
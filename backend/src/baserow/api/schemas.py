@@ -40,3 +40,35 @@ CLIENT_SESSION_ID_SCHEMA_PARAMETER = OpenApiParameter(
     f"endpoints with the same {settings.CLIENT_SESSION_ID_HEADER} header this action "
     "can be undone/redone.",
 )
+
+KEYSET_PAGINATION_SCHEMA_PARAMETERS = [
+    OpenApiParameter(
+        name="cursor",
+        location=OpenApiParameter.QUERY,
+        type=OpenApiTypes.STR,
+        description="If provided the rows are paginated using a cursor instead of "
+        "a page number or offset, which makes fetching deep pages as fast as the "
+        "first one. Provide an empty value to fetch the first page and follow the "
+        "`next` URL of the response to fetch the next page. The `size` parameter "
+        "defines how many rows are returned. The `count` is only included in the "
+        "response if the `include_count` parameter is provided.",
+    ),
+    OpenApiParameter(
+        name="include_count",
+        location=OpenApiParameter.QUERY,
+        type=OpenApiTypes.BOOL,
+        description="Can only be used in combination with the `cursor` parameter and "
+        "adds the total amount of rows to the response.",
+    ),
+]
+
+APPROXIMATE_COUNT_SCHEMA_PARAMETER = OpenApiParameter(
+    name="approximate_count",
+    location=OpenApiParameter.QUERY,
+    type=OpenApiTypes.BOOL,
+    description="If provided, the count of the filtered or searched rows is estimated "
+    "by the database instead of counting all the rows, if the table has more than "
+    f"{settings.APPROXIMATE_ROW_COUNT_THRESHOLD} rows. The "
+    f"`{settings.ROW_COUNT_MODE_HEADER}` response header indicates whether the count "
+    "is `exact`, `cached` or `approximate`.",
+)
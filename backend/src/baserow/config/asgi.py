@@ -2,13 +2,13 @@ import django
 
 from channels.routing import ProtocolTypeRouter
 
+from baserow.core.asgi import BaserowASGIHandler
 from baserow.ws.routers import websocket_router
-from django.core.asgi import get_asgi_application
 
 
 django.setup()
 
-django_asgi_app = get_asgi_application()
+django_asgi_app = BaserowASGIHandler()
 
 application = ProtocolTypeRouter(
     {"http": django_asgi_app, "websocket": websocket_router}
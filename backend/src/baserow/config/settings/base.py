@@ -58,6 +58,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "baserow.contrib.database.middleware.SharedFieldCacheMiddleware",
 ]
 
 ROOT_URLCONF = "baserow.config.urls"
@@ -171,6 +172,17 @@ CACHES = {
         "VERSION": None,
     },
 }
+# The maximum amount of fully generated table models that every process keeps in
+# memory. Setting this to 0 disables the in memory model cache.
+GENERATED_MODEL_LOCAL_CACHE_SIZE = int(
+    os.getenv("BASEROW_GENERATED_MODEL_LOCAL_CACHE_SIZE", 64)
+)
+# The amount of most recently used tables whose generated model cache is warmed up in
+# the background after it has been cleared by running the migrations. Setting this to
+# 0 disables warming the cache after migrating.
+WARM_MODEL_CACHE_AFTER_MIGRATION_LIMIT = int(
+    os.getenv("BASEROW_WARM_MODEL_CACHE_AFTER_MIGRATION_LIMIT", 0)
+)
 
 
 # Should contain the database connection name of the database where the user tables
@@ -235,6 +247,9 @@ REST_FRAMEWORK = {
 }
 
 PUBLIC_VIEW_AUTHORIZATION_HEADER = "Baserow-View-Authorization"
+# Indicates whether the row count in the response has been computed, comes from the
+# cache or is approximated.
+ROW_COUNT_MODE_HEADER = "Baserow-Row-Count-Mode"
 
 CORS_ORIGIN_ALLOW_ALL = True
 CLIENT_SESSION_ID_HEADER = "ClientSessionId"
@@ -245,6 +260,7 @@ CORS_ALLOW_HEADERS = list(default_headers) + [
     PUBLIC_VIEW_AUTHORIZATION_HEADER,
     CLIENT_SESSION_ID_HEADER,
 ]
+CORS_EXPOSE_HEADERS = [ROW_COUNT_MODE_HEADER]
 
 
 JWT_AUTH = {
@@ -436,6 +452,14 @@ BATCH_ROWS_SIZE_LIMIT = int(
     os.getenv("BATCH_ROWS_SIZE_LIMIT", 200)
 )  # How many rows can be modified at once.
 
+# The count of filtered rows can optionally be approximated if the table has more rows.
+APPROXIMATE_ROW_COUNT_THRESHOLD = int(
+    os.getenv("BASEROW_APPROXIMATE_ROW_COUNT_THRESHOLD", 100000)
+)
+# The ordered ids of the rows of sorted or filtered grid views with at most this many
+# rows are cached, so that their pages don't have to be sorted again. 0 disables it.
+VIEW_ROW_IDS_CACHE_MAX_ROWS = int(os.getenv("BASEROW_VIEW_ROW_IDS_CACHE_MAX_ROWS", 0))
+
 TRASH_PAGE_SIZE_LIMIT = 200  # How many trash entries can be requested at once.
 ROW_COMMENT_PAGE_SIZE_LIMIT = 200  # How many row comments can be requested at once.
 # How many unique row values can be requested at once.
@@ -507,10 +531,40 @@ FILE_UPLOAD_PERMISSIONS = None
 
 
 MAX_FORMULA_STRING_LENGTH = 10000
+# The maximum number of parsed formulas every process keeps in memory, set to 0 to
+# disable.
+FORMULA_PARSE_CACHE_SIZE = int(os.getenv("BASEROW_FORMULA_PARSE_CACHE_SIZE", 1000))
 MAX_FIELD_REFERENCE_DEPTH = 1000
 DONT_UPDATE_FORMULAS_AFTER_MIGRATION = bool(
     os.getenv("DONT_UPDATE_FORMULAS_AFTER_MIGRATION", "")
 )
+# The number of databases of which the outdated formulas are recalculated concurrently
+# after a migration or when running the `update_formulas` management command.
+FORMULA_RECALCULATION_WORKERS = int(
+    os.getenv("BASEROW_FORMULA_RECALCULATION_WORKERS", 1)
+)
+# The amount of seconds the deferred updates of the dependant fields of a table wait
+# before they are applied, so that the row changes made in the meantime are updated
+# in the same batch. Only used by tables with `defer_dependant_updates` enabled.
+DEFERRED_DEPENDANT_UPDATES_DELAY = float(
+    os.getenv("BASEROW_DEFERRED_DEPENDANT_UPDATES_DELAY", 1)
+)
+DEFERRED_DEPENDANT_UPDATES_BATCH_SIZE = int(
+    os.getenv("BASEROW_DEFERRED_DEPENDANT_UPDATES_BATCH_SIZE", 1000)
+)
+# The amount of rows written to the search index of a table at once when the index
+# is rebuilt. Only used by tables with `search_index_enabled`.
+SEARCH_INDEX_REBUILD_BATCH_SIZE = int(
+    os.getenv("BASEROW_SEARCH_INDEX_REBUILD_BATCH_SIZE", 1000)
+)
+# Prevents creating trigram indexes on the columns of the fields which are used by
+# `contains` view filters, for example if the pg_trgm extension isn't available.
+DISABLE_TRIGRAM_INDEXES = bool(os.getenv("BASEROW_DISABLE_TRIGRAM_INDEXES", ""))
+# Tables need at least this many rows before the index advisor recommends indexing
+# the fields used by the sorts and filters of their views.
+FIELD_INDEX_MIN_ROW_COUNT = int(os.getenv("BASEROW_FIELD_INDEX_MIN_ROW_COUNT", 10000))
+# Automatically maintains an index on the fields recommended by the index advisor.
+AUTO_CREATE_FIELD_INDEXES = bool(os.getenv("BASEROW_AUTO_CREATE_FIELD_INDEXES", ""))
 
 WEBHOOKS_MAX_CONSECUTIVE_TRIGGER_FAILURES = 8
 WEBHOOKS_MAX_RETRIES_PER_CALL = 8
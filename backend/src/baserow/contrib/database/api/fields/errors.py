@@ -106,3 +106,13 @@ ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_UNIQUE_VALUES = (
     HTTP_400_BAD_REQUEST,
     "The requested field type is not compatible with generating unique values.",
 )
+ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_UPSERT = (
+    "ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_UPSERT",
+    HTTP_400_BAD_REQUEST,
+    "The values of the requested field type can't be used to match rows.",
+)
+ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_INDEX = (
+    "ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_INDEX",
+    HTTP_400_BAD_REQUEST,
+    "The requested field type can't be indexed.",
+)
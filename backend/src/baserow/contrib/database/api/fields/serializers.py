@@ -200,3 +200,32 @@ class UniqueRowValueParamsSerializer(serializers.Serializer):
 
 class UniqueRowValuesSerializer(serializers.Serializer):
     values = serializers.ListSerializer(child=serializers.CharField())
+
+
+class FieldIndexSerializer(serializers.Serializer):
+    field_id = serializers.IntegerField(help_text="The id of the field.")
+    db_index = serializers.BooleanField(
+        help_text="Indicates whether an index is maintained on the column of the "
+        "field."
+    )
+    index_exists = serializers.BooleanField(
+        help_text="Indicates whether the index has been created and can be used. "
+        "The index is created in the background, so this can be `false` for a "
+        "while after the field has been indexed."
+    )
+
+
+class FieldIndexRecommendationSerializer(serializers.Serializer):
+    field_id = serializers.IntegerField(
+        source="field.id", help_text="The id of the recommended field."
+    )
+    field_name = serializers.CharField(
+        source="field.name", help_text="The name of the recommended field."
+    )
+    sort_count = serializers.IntegerField(
+        help_text="The amount of views sorting by the field."
+    )
+    filter_count = serializers.IntegerField(
+        help_text="The amount of views filtering by the field in a way that can use "
+        "an index."
+    )
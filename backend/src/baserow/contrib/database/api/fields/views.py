@@ -28,6 +28,7 @@ from baserow.contrib.database.api.fields.errors import (
     ERROR_FIELD_SELF_REFERENCE,
     ERROR_FIELD_CIRCULAR_REFERENCE,
     ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_UNIQUE_VALUES,
+    ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_INDEX,
 )
 from baserow.contrib.database.api.tables.errors import ERROR_TABLE_DOES_NOT_EXIST
 from baserow.contrib.database.api.tokens.authentications import TokenAuthentication
@@ -41,8 +42,13 @@ from baserow.contrib.database.fields.exceptions import (
     FieldWithSameNameAlreadyExists,
     InvalidBaserowFieldName,
     IncompatibleFieldTypeForUniqueValues,
+    IncompatibleFieldTypeForIndex,
 )
 from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.fields.indexes import (
+    field_index_exists,
+    get_field_index_recommendations,
+)
 from baserow.contrib.database.fields.models import Field
 from baserow.contrib.database.fields.registries import field_type_registry
 from baserow.contrib.database.table.exceptions import TableDoesNotExist
@@ -60,6 +66,8 @@ from .serializers import (
     RelatedFieldsSerializer,
     UniqueRowValueParamsSerializer,
     UniqueRowValuesSerializer,
+    FieldIndexSerializer,
+    FieldIndexRecommendationSerializer,
 )
 from baserow.contrib.database.fields.dependencies.exceptions import (
     SelfReferenceFieldDependencyError,
@@ -470,3 +478,178 @@ class UniqueRowValueFieldView(APIView):
         )
 
         return Response(UniqueRowValuesSerializer({"values": values}).data)
+
+
+class FieldIndexView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    @staticmethod
+    def get_field_index_data(field):
+        return FieldIndexSerializer(
+            {
+                "field_id": field.id,
+                "db_index": field.db_index,
+                "index_exists": field_index_exists(field),
+            }
+        ).data
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="field_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Returns the index of the field related to the provided "
+                "value.",
+            )
+        ],
+        tags=["Database table fields"],
+        operation_id="get_database_table_field_index",
+        description=(
+            "Returns whether an index is maintained on the column of the field and "
+            "whether it has already been created."
+        ),
+        responses={
+            200: FieldIndexSerializer,
+            400: get_error_schema(["ERROR_USER_NOT_IN_GROUP"]),
+            404: get_error_schema(["ERROR_FIELD_DOES_NOT_EXIST"]),
+        },
+    )
+    @map_exceptions(
+        {
+            FieldDoesNotExist: ERROR_FIELD_DOES_NOT_EXIST,
+            UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+        }
+    )
+    def get(self, request, field_id):
+        """Responds with the state of the index of the field."""
+
+        field = FieldHandler().get_field(field_id)
+        field.table.database.group.has_user(request.user, raise_error=True)
+        return Response(self.get_field_index_data(field))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="field_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Indexes the field related to the provided value.",
+            ),
+            CLIENT_SESSION_ID_SCHEMA_PARAMETER,
+        ],
+        tags=["Database table fields"],
+        operation_id="create_database_table_field_index",
+        description=(
+            "Maintains an index on the column of the field, which speeds up sorting "
+            "and filtering the rows of large tables by the field, but slows down "
+            "creating and updating rows. The index is created in the background "
+            "without locking the table."
+        ),
+        request=None,
+        responses={
+            200: FieldIndexSerializer,
+            400: get_error_schema(
+                [
+                    "ERROR_USER_NOT_IN_GROUP",
+                    "ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_INDEX",
+                ]
+            ),
+            404: get_error_schema(["ERROR_FIELD_DOES_NOT_EXIST"]),
+        },
+    )
+    @transaction.atomic
+    @map_exceptions(
+        {
+            FieldDoesNotExist: ERROR_FIELD_DOES_NOT_EXIST,
+            UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+            IncompatibleFieldTypeForIndex: ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_INDEX,
+        }
+    )
+    def post(self, request, field_id):
+        """Indexes the field if the user belongs to the group."""
+
+        field = FieldHandler().get_field(field_id)
+        field = FieldHandler().update_field_index(request.user, field, True)
+        return Response(self.get_field_index_data(field))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="field_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Drops the index of the field related to the provided "
+                "value.",
+            ),
+            CLIENT_SESSION_ID_SCHEMA_PARAMETER,
+        ],
+        tags=["Database table fields"],
+        operation_id="delete_database_table_field_index",
+        description=(
+            "Stops maintaining an index on the column of the field. The index is "
+            "dropped in the background, unless it's still created automatically "
+            "because the field is recommended for indexing."
+        ),
+        responses={
+            204: None,
+            400: get_error_schema(["ERROR_USER_NOT_IN_GROUP"]),
+            404: get_error_schema(["ERROR_FIELD_DOES_NOT_EXIST"]),
+        },
+    )
+    @transaction.atomic
+    @map_exceptions(
+        {
+            FieldDoesNotExist: ERROR_FIELD_DOES_NOT_EXIST,
+            UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+        }
+    )
+    def delete(self, request, field_id):
+        """Drops the index of the field if the user belongs to the group."""
+
+        field = FieldHandler().get_field(field_id)
+        FieldHandler().update_field_index(request.user, field, False)
+        return Response(status=204)
+
+
+class FieldIndexRecommendationsView(APIView):
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="table_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Returns the recommendations for the table related to "
+                "the provided value.",
+            )
+        ],
+        tags=["Database table fields"],
+        operation_id="list_database_table_field_index_recommendations",
+        description=(
+            "Lists the fields of the table which are recommended to be indexed, "
+            "because they're used by the sorts or filters of its views and the table "
+            "has many rows. The fields used by the most views are listed first."
+        ),
+        responses={
+            200: FieldIndexRecommendationSerializer(many=True),
+            400: get_error_schema(["ERROR_USER_NOT_IN_GROUP"]),
+            404: get_error_schema(["ERROR_TABLE_DOES_NOT_EXIST"]),
+        },
+    )
+    @map_exceptions(
+        {
+            TableDoesNotExist: ERROR_TABLE_DOES_NOT_EXIST,
+            UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+        }
+    )
+    def get(self, request, table_id):
+        """Responds with the fields that are recommended to be indexed."""
+
+        table = TableHandler().get_table(table_id)
+        table.database.group.has_user(request.user, raise_error=True)
+        recommendations = get_field_index_recommendations(table)
+        return Response(
+            FieldIndexRecommendationSerializer(recommendations, many=True).data
+        )
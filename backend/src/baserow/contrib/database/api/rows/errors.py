@@ -11,3 +11,15 @@ ERROR_ROW_IDS_NOT_UNIQUE = (
     HTTP_400_BAD_REQUEST,
     "The provided row ids {e.ids} are not unique.",
 )
+
+ERROR_UPSERT_MATCH_VALUES_NOT_UNIQUE = (
+    "ERROR_UPSERT_MATCH_VALUES_NOT_UNIQUE",
+    HTTP_400_BAD_REQUEST,
+    "The provided values {e.values} of the match field are not unique.",
+)
+
+ERROR_UPSERT_MATCH_VALUES_MATCH_MULTIPLE_ROWS = (
+    "ERROR_UPSERT_MATCH_VALUES_MATCH_MULTIPLE_ROWS",
+    HTTP_400_BAD_REQUEST,
+    "The provided values {e.values} of the match field match multiple rows.",
+)
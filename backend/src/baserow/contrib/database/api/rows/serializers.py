@@ -325,6 +325,21 @@ class BatchCreateRowsQueryParamsSerializer(serializers.Serializer):
     before = serializers.IntegerField(required=False)
 
 
+class BatchUpsertRowsQueryParamsSerializer(serializers.Serializer):
+    match_field_id = serializers.IntegerField()
+
+
+class BatchUpsertRowsResponseSerializer(serializers.Serializer):
+    created_row_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="The ids of the rows that have been created.",
+    )
+    updated_row_ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        help_text="The ids of the existing rows that have been updated.",
+    )
+
+
 class ListRowsQueryParamsSerializer(serializers.Serializer):
     user_field_names = serializers.BooleanField(required=False, default=False)
     search = serializers.CharField(required=False)
@@ -334,6 +349,10 @@ class ListRowsQueryParamsSerializer(serializers.Serializer):
     filter_type = serializers.CharField(required=False, default="")
 
 
+class StreamRowsQueryParamsSerializer(ListRowsQueryParamsSerializer):
+    view_id = serializers.IntegerField(required=False)
+
+
 class BatchUpdateRowsSerializer(serializers.Serializer):
     items = serializers.ListField(
         child=RowSerializer(),
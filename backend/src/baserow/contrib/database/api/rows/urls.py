@@ -4,9 +4,11 @@ from django.urls import re_path
 from .views import (
     RowsView,
     RowView,
+    StreamRowsView,
     RowMoveView,
     RowNamesView,
     BatchRowsView,
+    BatchUpsertRowsView,
     BatchDeleteRowsView,
 )
 
@@ -20,11 +22,21 @@ urlpatterns = [
         RowView.as_view(),
         name="item",
     ),
+    re_path(
+        r"table/(?P<table_id>[0-9]+)/stream/$",
+        StreamRowsView.as_view(),
+        name="stream",
+    ),
     re_path(
         r"table/(?P<table_id>[0-9]+)/batch/$",
         BatchRowsView.as_view(),
         name="batch",
     ),
+    re_path(
+        r"table/(?P<table_id>[0-9]+)/batch-upsert/$",
+        BatchUpsertRowsView.as_view(),
+        name="batch-upsert",
+    ),
     re_path(
         r"table/(?P<table_id>[0-9]+)/batch-delete/$",
         BatchDeleteRowsView.as_view(),
@@ -1,13 +1,16 @@
+import json
 from typing import Dict, Any
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
+from asgiref.sync import sync_to_async
 from django.db import transaction
 from drf_spectacular.openapi import OpenApiParameter, OpenApiTypes
 from drf_spectacular.utils import extend_schema
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
 from rest_framework.views import APIView
 
 from baserow.api.decorators import (
@@ -20,8 +23,13 @@ from baserow.api.exceptions import (
     RequestBodyValidationException,
     QueryParameterValidationException,
 )
-from baserow.api.pagination import PageNumberPagination
-from baserow.api.schemas import get_error_schema, CLIENT_SESSION_ID_SCHEMA_PARAMETER
+from baserow.api.pagination import KeysetPagination, PageNumberPagination
+from baserow.api.schemas import (
+    get_error_schema,
+    APPROXIMATE_COUNT_SCHEMA_PARAMETER,
+    CLIENT_SESSION_ID_SCHEMA_PARAMETER,
+    KEYSET_PAGINATION_SCHEMA_PARAMETERS,
+)
 from baserow.api.trash.errors import ERROR_CANNOT_DELETE_ALREADY_DELETED_ITEM
 from baserow.api.user_files.errors import ERROR_USER_FILE_DOES_NOT_EXIST
 from baserow.api.utils import validate_data
@@ -32,10 +40,13 @@ from baserow.contrib.database.api.fields.errors import (
     ERROR_FILTER_FIELD_NOT_FOUND,
     ERROR_FIELD_DOES_NOT_EXIST,
     ERROR_INVALID_SELECT_OPTION_VALUES,
+    ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_UPSERT,
 )
 from baserow.contrib.database.api.rows.errors import (
     ERROR_ROW_DOES_NOT_EXIST,
     ERROR_ROW_IDS_NOT_UNIQUE,
+    ERROR_UPSERT_MATCH_VALUES_NOT_UNIQUE,
+    ERROR_UPSERT_MATCH_VALUES_MATCH_MULTIPLE_ROWS,
 )
 from baserow.contrib.database.api.rows.serializers import (
     example_pagination_row_serializer_class,
@@ -44,6 +55,7 @@ from baserow.contrib.database.api.tables.errors import ERROR_TABLE_DOES_NOT_EXIS
 from baserow.contrib.database.api.tokens.authentications import TokenAuthentication
 from baserow.contrib.database.api.tokens.errors import ERROR_NO_PERMISSION_TO_TABLE
 from baserow.contrib.database.api.views.errors import (
+    ERROR_VIEW_DOES_NOT_EXIST,
     ERROR_VIEW_FILTER_TYPE_DOES_NOT_EXIST,
     ERROR_VIEW_FILTER_TYPE_UNSUPPORTED_FIELD,
 )
@@ -53,6 +65,7 @@ from baserow.contrib.database.fields.exceptions import (
     FilterFieldNotFound,
     FieldDoesNotExist,
     AllProvidedMultipleSelectValuesMustBeSelectOption,
+    IncompatibleFieldTypeForUpsert,
 )
 from baserow.contrib.database.rows.actions import (
     CreateRowActionType,
@@ -62,30 +75,44 @@ from baserow.contrib.database.rows.actions import (
     MoveRowActionType,
     UpdateRowActionType,
     UpdateRowsActionType,
+    UpsertRowsActionType,
 )
 from baserow.core.action.registries import action_type_registry
-from baserow.contrib.database.rows.exceptions import RowDoesNotExist, RowIdsNotUnique
+from baserow.contrib.database.rows.exceptions import (
+    RowDoesNotExist,
+    RowIdsNotUnique,
+    UpsertMatchValuesMatchMultipleRows,
+    UpsertMatchValuesNotUnique,
+)
+from baserow.contrib.database.rows.counts import count_rows
 from baserow.contrib.database.rows.handler import RowHandler
 from baserow.contrib.database.table.exceptions import TableDoesNotExist
 from baserow.contrib.database.table.handler import TableHandler
-from baserow.contrib.database.table.models import Table
+from baserow.contrib.database.table.models import Table, deconstruct_filter_key_regex
 from baserow.contrib.database.tokens.exceptions import NoPermissionToTable
 from baserow.contrib.database.tokens.handler import TokenHandler
 from baserow.contrib.database.views.exceptions import (
+    ViewDoesNotExist,
     ViewFilterTypeNotAllowedForField,
     ViewFilterTypeDoesNotExist,
 )
+from baserow.contrib.database.views.handler import ViewHandler
+from baserow.contrib.database.views.models import View
 from baserow.contrib.database.views.registries import view_filter_type_registry
+from baserow.core.asgi import AsyncStreamingHttpResponse
 from baserow.core.exceptions import UserNotInGroup
 from baserow.core.trash.exceptions import CannotDeleteAlreadyDeletedItem
 from baserow.core.user_files.exceptions import UserFileDoesNotExist
 from .serializers import (
     ListRowsQueryParamsSerializer,
+    StreamRowsQueryParamsSerializer,
     MoveRowQueryParamsSerializer,
     CreateRowQueryParamsSerializer,
     RowSerializer,
     BatchCreateRowsQueryParamsSerializer,
     BatchDeleteRowsSerializer,
+    BatchUpsertRowsQueryParamsSerializer,
+    BatchUpsertRowsResponseSerializer,
     get_batch_row_serializer_class,
     get_example_row_serializer_class,
     get_row_serializer_class,
@@ -123,6 +150,8 @@ class RowsView(APIView):
                 type=OpenApiTypes.INT,
                 description="Defines how many rows should be returned per page.",
             ),
+            *KEYSET_PAGINATION_SCHEMA_PARAMETERS,
+            APPROXIMATE_COUNT_SCHEMA_PARAMETER,
             OpenApiParameter(
                 name="search",
                 location=OpenApiParameter.QUERY,
@@ -228,7 +257,8 @@ class RowsView(APIView):
         description=(
             "Lists all the rows of the table related to the provided parameter if the "
             "user has access to the related database's group. The response is "
-            "paginated by a page/size style. It is also possible to provide an "
+            "paginated by a page/size or a cursor/size style. It is also possible to "
+            "provide an "
             "optional search query, only rows where the data matches the search query "
             "are going to be returned then. The properties of the returned rows "
             "depends on which fields the table has. For a complete overview of fields "
@@ -292,11 +322,14 @@ class RowsView(APIView):
         fields = get_include_exclude_fields(
             table, include, exclude, user_field_names=user_field_names
         )
-
-        model = table.get_model(
-            fields=fields,
-            field_ids=[] if fields else None,
+        field_ids = (
+            None if fields is None else list(fields.values_list("id", flat=True))
         )
+
+        # If only some of the fields are requested, then a model containing only
+        # those fields is generated, so that only the related columns are selected and
+        # enhanced.
+        model = table.get_model(field_ids=field_ids or None)
         queryset = model.objects.all().enhance_by_fields()
 
         if search:
@@ -314,14 +347,32 @@ class RowsView(APIView):
         filter_object = {key: request.GET.getlist(key) for key in request.GET.keys()}
         queryset = queryset.filter_by_fields_object(filter_object, filter_type)
 
-        paginator = PageNumberPagination(limit_page_size=settings.ROW_PAGE_SIZE_LIMIT)
+        row_count = None
+        if KeysetPagination.is_requested(request):
+            paginator = KeysetPagination(limit_page_size=settings.ROW_PAGE_SIZE_LIMIT)
+        else:
+            filtered = bool(search) or any(
+                deconstruct_filter_key_regex.match(key) for key in filter_object
+            )
+            row_count = count_rows(
+                queryset,
+                filtered=filtered,
+                approximate="approximate_count" in request.GET,
+            )
+            paginator = PageNumberPagination(
+                limit_page_size=settings.ROW_PAGE_SIZE_LIMIT, count=row_count.count
+            )
         page = paginator.paginate_queryset(queryset, request, self)
         serializer_class = get_row_serializer_class(
             model, RowSerializer, is_response=True, user_field_names=user_field_names
         )
         serializer = serializer_class(page, many=True)
+        response = paginator.get_paginated_response(serializer.data)
 
-        return paginator.get_paginated_response(serializer.data)
+        if row_count:
+            response[settings.ROW_COUNT_MODE_HEADER] = row_count.mode
+
+        return response
 
     @extend_schema(
         parameters=[
@@ -444,6 +495,240 @@ class RowsView(APIView):
         return Response(serializer.data)
 
 
+class StreamRowsView(APIView):
+    authentication_classes = APIView.authentication_classes + [TokenAuthentication]
+    permission_classes = (IsAuthenticated,)
+    # The amount of rows that are fetched from the database, serialized and sent at
+    # once.
+    chunk_size = 1000
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="table_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Streams the rows of the table related to the provided "
+                "value.",
+            ),
+            OpenApiParameter(
+                name="view_id",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.INT,
+                description="If provided, the rows are filtered and sorted like the "
+                "view with the provided id, which must belong to the table. The "
+                "`order_by` and `filter__{field}__{filter}` parameters are applied in "
+                "addition.",
+            ),
+            OpenApiParameter(
+                name="search",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                description="If provided only rows with data that matches the search "
+                "query are going to be returned.",
+            ),
+            OpenApiParameter(
+                name="order_by",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                description="Optionally the rows can be ordered by provided field ids "
+                "separated by comma. Works the same as the `order_by` parameter of "
+                "the **list_database_table_rows** endpoint.",
+            ),
+            OpenApiParameter(
+                name="filter__{field}__{filter}",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                description=(
+                    "The rows can optionally be filtered by the same view filters "
+                    "available for the views. Works the same as the filter parameters "
+                    "of the **list_database_table_rows** endpoint."
+                ),
+            ),
+            OpenApiParameter(
+                name="filter_type",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                description=(
+                    "`AND`: Indicates that the rows must match all the provided "
+                    "filters.\n"
+                    "`OR`: Indicates that the rows only have to match one of the "
+                    "filters.\n\n"
+                    "This works only if two or more filters are provided."
+                ),
+            ),
+            OpenApiParameter(
+                name="include",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                description=(
+                    "Only the provided comma separated fields are included in the "
+                    "rows. Works the same as the `include` parameter of the "
+                    "**list_database_table_rows** endpoint."
+                ),
+            ),
+            OpenApiParameter(
+                name="exclude",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.STR,
+                description=(
+                    "The provided comma separated fields are excluded from the rows. "
+                    "Works the same as the `exclude` parameter of the "
+                    "**list_database_table_rows** endpoint."
+                ),
+            ),
+            OpenApiParameter(
+                name="user_field_names",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.BOOL,
+                description=(
+                    "A flag query parameter which if provided the returned json "
+                    "will use the user specified field names instead of internal "
+                    "Baserow field names (field_123 etc). "
+                ),
+            ),
+        ],
+        tags=["Database table rows"],
+        operation_id="stream_database_table_rows",
+        description=(
+            "Streams all the rows of the table related to the provided parameter if "
+            "the user has access to the related database's group. Contrary to the "
+            "**list_database_table_rows** endpoint the response isn't paginated. "
+            "Every row is written as a separate JSON object followed by a newline "
+            "(newline delimited JSON). The rows are read from the database and sent "
+            "in chunks while the response is streamed, so that tables of any size "
+            "can be fetched in one request. "
+            "The rows can be searched, filtered, ordered and the fields can be "
+            "selected in the same way as the **list_database_table_rows** endpoint."
+        ),
+        responses={
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+            400: get_error_schema(
+                [
+                    "ERROR_USER_NOT_IN_GROUP",
+                    "ERROR_QUERY_PARAMETER_VALIDATION",
+                    "ERROR_ORDER_BY_FIELD_NOT_FOUND",
+                    "ERROR_ORDER_BY_FIELD_NOT_POSSIBLE",
+                    "ERROR_FILTER_FIELD_NOT_FOUND",
+                    "ERROR_VIEW_FILTER_TYPE_DOES_NOT_EXIST",
+                    "ERROR_VIEW_FILTER_TYPE_UNSUPPORTED_FIELD",
+                ]
+            ),
+            401: get_error_schema(["ERROR_NO_PERMISSION_TO_TABLE"]),
+            404: get_error_schema(
+                [
+                    "ERROR_TABLE_DOES_NOT_EXIST",
+                    "ERROR_FIELD_DOES_NOT_EXIST",
+                    "ERROR_VIEW_DOES_NOT_EXIST",
+                ]
+            ),
+        },
+    )
+    @map_exceptions(
+        {
+            UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+            TableDoesNotExist: ERROR_TABLE_DOES_NOT_EXIST,
+            ViewDoesNotExist: ERROR_VIEW_DOES_NOT_EXIST,
+            NoPermissionToTable: ERROR_NO_PERMISSION_TO_TABLE,
+            OrderByFieldNotFound: ERROR_ORDER_BY_FIELD_NOT_FOUND,
+            OrderByFieldNotPossible: ERROR_ORDER_BY_FIELD_NOT_POSSIBLE,
+            FilterFieldNotFound: ERROR_FILTER_FIELD_NOT_FOUND,
+            FieldDoesNotExist: ERROR_FIELD_DOES_NOT_EXIST,
+            ViewFilterTypeDoesNotExist: ERROR_VIEW_FILTER_TYPE_DOES_NOT_EXIST,
+            ViewFilterTypeNotAllowedForField: ERROR_VIEW_FILTER_TYPE_UNSUPPORTED_FIELD,
+        }
+    )
+    @validate_query_parameters(StreamRowsQueryParamsSerializer)
+    def get(self, request, table_id, query_params):
+        """
+        Streams all the rows of the given table id as newline delimited JSON. The
+        rows are fetched page by page using keyset pagination while the response is
+        sent, so the memory usage doesn't depend on the amount of rows.
+        """
+
+        table = TableHandler().get_table(table_id)
+        table.database.group.has_user(request.user, raise_error=True)
+
+        TokenHandler().check_table_permissions(request, "read", table, False)
+        view_id = query_params.get("view_id")
+        search = query_params.get("search")
+        order_by = query_params.get("order_by")
+        include = query_params.get("include")
+        exclude = query_params.get("exclude")
+        user_field_names = query_params.get("user_field_names")
+        fields = get_include_exclude_fields(
+            table, include, exclude, user_field_names=user_field_names
+        )
+        field_ids = (
+            None if fields is None else list(fields.values_list("id", flat=True))
+        )
+
+        if view_id is not None:
+            view_handler = ViewHandler()
+            view = view_handler.get_view(
+                view_id, base_queryset=View.objects.filter(table=table)
+            )
+            # The filters and sortings of the view can reference fields that are not
+            # requested, so the model must contain all the fields of the table.
+            model = table.get_model()
+            queryset = view_handler.get_queryset(view, search or None, model)
+        else:
+            model = table.get_model(field_ids=field_ids or None)
+            queryset = model.objects.all().enhance_by_fields()
+            if search:
+                queryset = queryset.search_all_fields(search)
+
+        if order_by:
+            queryset = queryset.order_by_fields_string(order_by, user_field_names)
+
+        filter_type_query_param = query_params.get("filter_type")
+        filter_type = (
+            FILTER_TYPE_OR
+            if filter_type_query_param.upper() == "OR"
+            else FILTER_TYPE_AND
+        )
+        filter_object = {key: request.GET.getlist(key) for key in request.GET.keys()}
+        queryset = queryset.filter_by_fields_object(filter_object, filter_type)
+
+        serializer_class = get_row_serializer_class(
+            model,
+            RowSerializer,
+            is_response=True,
+            field_ids=field_ids,
+            user_field_names=user_field_names,
+        )
+
+        paginator = KeysetPagination()
+
+        def get_rows_chunk(after):
+            rows, after = paginator.get_page(queryset, self.chunk_size, after)
+            serializer = serializer_class(rows, many=True)
+            content = "".join(
+                json.dumps(row, cls=JSONEncoder) + "\n" for row in serializer.data
+            ).encode()
+            return content, after
+
+        def stream_rows():
+            content, after = get_rows_chunk(None)
+            yield content
+            while after is not None:
+                content, after = get_rows_chunk(after)
+                yield content
+
+        # Under ASGI the response is sent in the event loop, where the database
+        # can't be used, so every chunk is fetched in a thread.
+        async def stream_rows_async():
+            content, after = await sync_to_async(get_rows_chunk)(None)
+            yield content
+            while after is not None:
+                content, after = await sync_to_async(get_rows_chunk)(after)
+                yield content
+
+        return AsyncStreamingHttpResponse(
+            stream_rows(), stream_rows_async(), content_type="application/x-ndjson"
+        )
+
+
 class RowNamesView(APIView):
     authentication_classes = APIView.authentication_classes + [TokenAuthentication]
     permission_classes = (IsAuthenticated,)
@@ -1150,6 +1435,135 @@ class BatchRowsView(APIView):
         return Response(response_serializer.data)
 
 
+class BatchUpsertRowsView(APIView):
+    authentication_classes = APIView.authentication_classes + [TokenAuthentication]
+    permission_classes = (IsAuthenticated,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="table_id",
+                location=OpenApiParameter.PATH,
+                type=OpenApiTypes.INT,
+                description="Upserts the rows in the table.",
+            ),
+            OpenApiParameter(
+                name="match_field_id",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.INT,
+                required=True,
+                description="The id of the field whose values are used to find the "
+                "existing rows that must be updated.",
+            ),
+            OpenApiParameter(
+                name="user_field_names",
+                location=OpenApiParameter.QUERY,
+                type=OpenApiTypes.BOOL,
+                description=(
+                    "A flag query parameter which if provided this endpoint will "
+                    "expect the user specified field names instead of internal "
+                    "Baserow field names (field_123 etc)."
+                ),
+            ),
+            CLIENT_SESSION_ID_SCHEMA_PARAMETER,
+        ],
+        tags=["Database table rows"],
+        operation_id="batch_upsert_database_table_rows",
+        description=(
+            "Updates the existing rows having the same value for the field provided "
+            "by the `match_field_id` GET parameter as the provided rows and creates "
+            "new rows for the other provided rows, if the user has access to the "
+            "related table's group. All the existing rows are looked up at once, so "
+            "external data can be synchronized without first listing or searching "
+            "the rows. Provided rows without a value for the match field are always "
+            "created. Only text, long text, url, email, phone number and number "
+            "fields can be used to match rows. The accepted body fields are the same "
+            "as the ones of the **batch_create_database_table_rows** endpoint."
+            "\n\n **WARNING:** This endpoint doesn't yet work with row created and "
+            "row updated webhooks."
+        ),
+        request=get_example_batch_rows_serializer_class(
+            example_type="post", user_field_names=True
+        ),
+        responses={
+            200: BatchUpsertRowsResponseSerializer,
+            400: get_error_schema(
+                [
+                    "ERROR_USER_NOT_IN_GROUP",
+                    "ERROR_REQUEST_BODY_VALIDATION",
+                    "ERROR_QUERY_PARAMETER_VALIDATION",
+                    "ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_UPSERT",
+                    "ERROR_UPSERT_MATCH_VALUES_NOT_UNIQUE",
+                    "ERROR_UPSERT_MATCH_VALUES_MATCH_MULTIPLE_ROWS",
+                    "ERROR_INVALID_SELECT_OPTION_VALUES",
+                ]
+            ),
+            401: get_error_schema(["ERROR_NO_PERMISSION_TO_TABLE"]),
+            404: get_error_schema(
+                ["ERROR_TABLE_DOES_NOT_EXIST", "ERROR_FIELD_DOES_NOT_EXIST"]
+            ),
+        },
+    )
+    @transaction.atomic
+    @map_exceptions(
+        {
+            UserNotInGroup: ERROR_USER_NOT_IN_GROUP,
+            TableDoesNotExist: ERROR_TABLE_DOES_NOT_EXIST,
+            FieldDoesNotExist: ERROR_FIELD_DOES_NOT_EXIST,
+            IncompatibleFieldTypeForUpsert: ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_UPSERT,
+            UpsertMatchValuesNotUnique: ERROR_UPSERT_MATCH_VALUES_NOT_UNIQUE,
+            UpsertMatchValuesMatchMultipleRows: ERROR_UPSERT_MATCH_VALUES_MATCH_MULTIPLE_ROWS,
+            AllProvidedMultipleSelectValuesMustBeSelectOption: ERROR_INVALID_SELECT_OPTION_VALUES,
+            NoPermissionToTable: ERROR_NO_PERMISSION_TO_TABLE,
+            UserFileDoesNotExist: ERROR_USER_FILE_DOES_NOT_EXIST,
+        }
+    )
+    @validate_query_parameters(BatchUpsertRowsQueryParamsSerializer)
+    def post(self, request: Request, table_id: int, query_params) -> Response:
+        """
+        Updates the rows matching the provided rows and creates the other rows for
+        the given table_id.
+        """
+
+        table = TableHandler().get_table(table_id)
+        TokenHandler().check_table_permissions(request, "create", table, False)
+        TokenHandler().check_table_permissions(request, "update", table, False)
+        model = table.get_model()
+
+        user_field_names = "user_field_names" in request.GET
+
+        row_validation_serializer = get_row_serializer_class(
+            model, user_field_names=user_field_names
+        )
+        validation_serializer = get_batch_row_serializer_class(
+            row_validation_serializer
+        )
+        data = validate_data(
+            validation_serializer, request.data, partial=True, return_validated=True
+        )
+
+        try:
+            created_rows, updated_rows = action_type_registry.get_by_type(
+                UpsertRowsActionType
+            ).do(
+                request.user,
+                table,
+                data["items"],
+                query_params["match_field_id"],
+                model,
+            )
+        except ValidationError as exc:
+            raise RequestBodyValidationException(detail=exc.message)
+
+        response_serializer = BatchUpsertRowsResponseSerializer(
+            {
+                "created_row_ids": [row.id for row in created_rows],
+                "updated_row_ids": [row.id for row in updated_rows],
+            }
+        )
+        return Response(response_serializer.data)
+
+
 class BatchDeleteRowsView(APIView):
     authentication_classes = APIView.authentication_classes + [TokenAuthentication]
     permission_classes = (IsAuthenticated,)
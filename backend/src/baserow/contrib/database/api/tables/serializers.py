@@ -11,11 +11,17 @@ class TableSerializer(serializers.ModelSerializer):
             "name",
             "order",
             "database_id",
+            "defer_dependant_updates",
+            "search_index_enabled",
+            "search_index_ready",
         )
         extra_kwargs = {
             "id": {"read_only": True},
             "database_id": {"read_only": True},
             "order": {"help_text": "Lowest first."},
+            "defer_dependant_updates": {"read_only": True},
+            "search_index_enabled": {"read_only": True},
+            "search_index_ready": {"read_only": True},
         }
 
 
@@ -51,7 +57,11 @@ class TableCreateSerializer(serializers.ModelSerializer):
 class TableUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Table
-        fields = ("name",)
+        fields = ("name", "defer_dependant_updates", "search_index_enabled")
+        extra_kwargs = {
+            "defer_dependant_updates": {"required": False},
+            "search_index_enabled": {"required": False},
+        }
 
 
 class OrderTablesSerializer(serializers.Serializer):
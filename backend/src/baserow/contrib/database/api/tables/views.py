@@ -241,6 +241,8 @@ class TableView(APIView):
             request.user,
             TableHandler().get_table_for_update(table_id),
             name=data["name"],
+            defer_dependant_updates=data.get("defer_dependant_updates"),
+            search_index_enabled=data.get("search_index_enabled"),
         )
 
         serializer = TableSerializer(table)
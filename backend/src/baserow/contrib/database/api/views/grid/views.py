@@ -1,7 +1,7 @@
+from django.conf import settings
 from django.db import transaction
 from drf_spectacular.openapi import OpenApiParameter, OpenApiTypes
 from drf_spectacular.utils import extend_schema
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.request import Request
 from rest_framework.response import Response
@@ -9,8 +9,16 @@ from rest_framework.views import APIView
 
 from baserow.api.decorators import map_exceptions, allowed_includes, validate_body
 from baserow.api.errors import ERROR_USER_NOT_IN_GROUP
-from baserow.api.pagination import PageNumberPagination
-from baserow.api.schemas import get_error_schema
+from baserow.api.pagination import (
+    KeysetPagination,
+    LimitOffsetPagination,
+    PageNumberPagination,
+)
+from baserow.api.schemas import (
+    get_error_schema,
+    APPROXIMATE_COUNT_SCHEMA_PARAMETER,
+    KEYSET_PAGINATION_SCHEMA_PARAMETERS,
+)
 from baserow.api.serializers import get_example_pagination_serializer_class
 from baserow.contrib.database.api.rows.serializers import (
     get_example_row_serializer_class,
@@ -44,6 +52,7 @@ from baserow.contrib.database.api.fields.errors import (
 )
 from baserow.contrib.database.api.views.utils import get_public_view_authorization_token
 from baserow.contrib.database.rows.registries import row_metadata_registry
+from baserow.contrib.database.table.models import deconstruct_filter_key_regex
 from baserow.contrib.database.views.exceptions import (
     NoAuthorizationToPubliclySharedView,
     ViewDoesNotExist,
@@ -109,6 +118,7 @@ class GridViewView(APIView):
                 type=OpenApiTypes.BOOL,
                 description="If provided only the count will be returned.",
             ),
+            APPROXIMATE_COUNT_SCHEMA_PARAMETER,
             OpenApiParameter(
                 name="include",
                 location=OpenApiParameter.QUERY,
@@ -150,6 +160,7 @@ class GridViewView(APIView):
                 description="Can only be used in combination with the `page` parameter "
                 "and defines how many rows should be returned.",
             ),
+            *KEYSET_PAGINATION_SCHEMA_PARAMETERS,
             OpenApiParameter(
                 name="search",
                 location=OpenApiParameter.QUERY,
@@ -189,10 +200,11 @@ class GridViewView(APIView):
         description=(
             "Lists the requested rows of the view's table related to the provided "
             "`view_id` if the authorized user has access to the database's group. "
-            "The response is paginated either by a limit/offset or page/size style. "
-            "The style depends on the provided GET parameters. The properties of the "
-            "returned rows depends on which fields the table has. For a complete "
-            "overview of fields use the **list_database_table_fields** endpoint to "
+            "The response is paginated either by a limit/offset, page/size or "
+            "cursor/size style. The style depends on the provided GET parameters. "
+            "The properties of the returned rows depends on which fields the table "
+            "has. For a complete overview of fields use the "
+            "**list_database_table_fields** endpoint to "
             "list them all. In the example all field types are listed, but normally "
             "the number in field_{id} key is going to be the id of the field. "
             "The value is what the user has provided and the format of it depends on "
@@ -232,9 +244,10 @@ class GridViewView(APIView):
     @allowed_includes("field_options", "row_metadata")
     def get(self, request, view_id, field_options, row_metadata):
         """
-        Lists all the rows of a grid view, paginated either by a page or offset/limit.
-        If the limit get parameter is provided the limit/offset pagination will be used
-        else the page number pagination.
+        Lists all the rows of a grid view, paginated either by a cursor, page or
+        offset/limit. If the cursor get parameter is provided the keyset pagination
+        will be used, if the limit get parameter is provided the limit/offset
+        pagination will be used else the page number pagination.
 
         Optionally the field options can also be included in the response if the
         `field_options` are provided in the include GET parameter.
@@ -257,14 +270,34 @@ class GridViewView(APIView):
 
         model = view.table.get_model()
         queryset = view_handler.get_queryset(view, search, model)
+        approximate_count = "approximate_count" in request.GET
 
         if "count" in request.GET:
-            return Response({"count": queryset.count()})
+            row_count = view_handler.get_view_row_count(
+                view, queryset, search=search, approximate=approximate_count
+            )
+            response = Response({"count": row_count.count})
+            response[settings.ROW_COUNT_MODE_HEADER] = row_count.mode
+            return response
 
-        if LimitOffsetPagination.limit_query_param in request.GET:
-            paginator = LimitOffsetPagination()
+        row_count = None
+        if KeysetPagination.is_requested(request):
+            paginator = KeysetPagination()
         else:
-            paginator = PageNumberPagination()
+            cached_rows = (
+                None if search else view_handler.get_cached_view_rows(view, queryset)
+            )
+            if cached_rows is not None:
+                queryset = cached_rows
+                row_count = cached_rows.row_count
+            else:
+                row_count = view_handler.get_view_row_count(
+                    view, queryset, search=search, approximate=approximate_count
+                )
+            if LimitOffsetPagination.limit_query_param in request.GET:
+                paginator = LimitOffsetPagination(count=row_count.count)
+            else:
+                paginator = PageNumberPagination(count=row_count.count)
 
         page = paginator.paginate_queryset(queryset, request, self)
         serializer_class = get_row_serializer_class(
@@ -277,6 +310,9 @@ class GridViewView(APIView):
 
         response = paginator.get_paginated_response(serializer.data)
 
+        if row_count:
+            response[settings.ROW_COUNT_MODE_HEADER] = row_count.mode
+
         if field_options:
             context = {"fields": [o["field"] for o in model._field_objects.values()]}
             serializer_class = view_type.get_field_options_serializer_class(
@@ -389,6 +425,7 @@ class GridViewFieldAggregationsView(APIView):
                     "returned with the result."
                 ),
             ),
+            APPROXIMATE_COUNT_SCHEMA_PARAMETER,
         ],
         tags=["Database table grid view"],
         operation_id="get_database_table_grid_view_field_aggregations",
@@ -439,11 +476,23 @@ class GridViewFieldAggregationsView(APIView):
         # Compute aggregation
         # Note: we can't optimize model by giving a model with just
         # the aggregated field because we may need other fields for filtering
+        model = view.table.get_model()
         result = view_handler.get_view_field_aggregations(
-            view, with_total=total, search=search
+            view, model=model, search=search
         )
+        response = Response(result)
 
-        return Response(result)
+        if total:
+            row_count = view_handler.get_view_row_count(
+                view,
+                model=model,
+                search=search,
+                approximate="approximate_count" in request.GET,
+            )
+            result["total"] = row_count.count
+            response[settings.ROW_COUNT_MODE_HEADER] = row_count.mode
+
+        return response
 
 
 class GridViewFieldAggregationView(APIView):
@@ -487,6 +536,7 @@ class GridViewFieldAggregationView(APIView):
                     "returned with the result."
                 ),
             ),
+            APPROXIMATE_COUNT_SCHEMA_PARAMETER,
         ],
         tags=["Database table grid view"],
         operation_id="get_database_table_grid_view_field_aggregation",
@@ -546,18 +596,24 @@ class GridViewFieldAggregationView(APIView):
         # Compute aggregation
         # Note: we can't optimize model by giving a model with just
         # the aggregated field because we may need other fields for filtering
+        model = view.table.get_model()
         aggregations = view_handler.get_field_aggregations(
-            view, [(field_instance, aggregation_type)], with_total=total
+            view, [(field_instance, aggregation_type)], model
         )
 
         result = {
             "value": aggregations[field_instance.db_column],
         }
+        response = Response(result)
 
         if total:
-            result["total"] = aggregations["total"]
+            row_count = view_handler.get_view_row_count(
+                view, model=model, approximate="approximate_count" in request.GET
+            )
+            result["total"] = row_count.count
+            response[settings.ROW_COUNT_MODE_HEADER] = row_count.mode
 
-        return Response(result)
+        return response
 
 
 class PublicGridViewRowsView(APIView):
@@ -577,6 +633,7 @@ class PublicGridViewRowsView(APIView):
                 type=OpenApiTypes.BOOL,
                 description="If provided only the count will be returned.",
             ),
+            APPROXIMATE_COUNT_SCHEMA_PARAMETER,
             OpenApiParameter(
                 name="include",
                 location=OpenApiParameter.QUERY,
@@ -618,6 +675,7 @@ class PublicGridViewRowsView(APIView):
                 description="Can only be used in combination with the `page` parameter "
                 "and defines how many rows should be returned.",
             ),
+            *KEYSET_PAGINATION_SCHEMA_PARAMETERS,
             OpenApiParameter(
                 name="search",
                 location=OpenApiParameter.QUERY,
@@ -695,10 +753,11 @@ class PublicGridViewRowsView(APIView):
         description=(
             "Lists the requested rows of the view's table related to the provided "
             "`slug` if the grid view is public."
-            "The response is paginated either by a limit/offset or page/size style. "
-            "The style depends on the provided GET parameters. The properties of the "
-            "returned rows depends on which fields the table has. For a complete "
-            "overview of fields use the **list_database_table_fields** endpoint to "
+            "The response is paginated either by a limit/offset, page/size or "
+            "cursor/size style. The style depends on the provided GET parameters. "
+            "The properties of the returned rows depends on which fields the table "
+            "has. For a complete overview of fields use the "
+            "**list_database_table_fields** endpoint to "
             "list them all. In the example all field types are listed, but normally "
             "the number in field_{id} key is going to be the id of the field. "
             "The value is what the user has provided and the format of it depends on "
@@ -740,9 +799,10 @@ class PublicGridViewRowsView(APIView):
     @allowed_includes("field_options")
     def get(self, request: Request, slug: str, field_options: bool) -> Response:
         """
-        Lists all the rows of a grid view, paginated either by a page or offset/limit.
-        If the limit get parameter is provided the limit/offset pagination will be used
-        else the page number pagination.
+        Lists all the rows of a grid view, paginated either by a cursor, page or
+        offset/limit. If the cursor get parameter is provided the keyset pagination
+        will be used, if the limit get parameter is provided the limit/offset
+        pagination will be used else the page number pagination.
 
         Optionally the field options can also be included in the response if the the
         `field_options` are provided in the include GET parameter.
@@ -798,13 +858,40 @@ class PublicGridViewRowsView(APIView):
         if search:
             queryset = queryset.search_all_fields(search, publicly_visible_field_ids)
 
+        approximate_count = "approximate_count" in request.GET
+        # The count of the view can't be cached if the rows are filtered by the
+        # filters provided as GET parameters.
+        no_count_cache = any(
+            deconstruct_filter_key_regex.match(key) for key in filter_object
+        )
+
         if "count" in request.GET:
-            return Response({"count": queryset.count()})
+            row_count = view_handler.get_view_row_count(
+                view,
+                queryset,
+                search=search,
+                approximate=approximate_count,
+                no_cache=no_count_cache,
+            )
+            response = Response({"count": row_count.count})
+            response[settings.ROW_COUNT_MODE_HEADER] = row_count.mode
+            return response
 
-        if LimitOffsetPagination.limit_query_param in request.GET:
-            paginator = LimitOffsetPagination()
+        row_count = None
+        if KeysetPagination.is_requested(request):
+            paginator = KeysetPagination()
         else:
-            paginator = PageNumberPagination()
+            row_count = view_handler.get_view_row_count(
+                view,
+                queryset,
+                search=search,
+                approximate=approximate_count,
+                no_cache=no_count_cache,
+            )
+            if LimitOffsetPagination.limit_query_param in request.GET:
+                paginator = LimitOffsetPagination(count=row_count.count)
+            else:
+                paginator = PageNumberPagination(count=row_count.count)
 
         field_ids = (
             list(set(field_ids) & set(publicly_visible_field_ids))
@@ -819,6 +906,9 @@ class PublicGridViewRowsView(APIView):
         serializer = serializer_class(page, many=True)
         response = paginator.get_paginated_response(serializer.data)
 
+        if row_count:
+            response[settings.ROW_COUNT_MODE_HEADER] = row_count.mode
+
         if field_options:
             context = {"field_options": publicly_visible_field_options}
             serializer_class = view_type.get_field_options_serializer_class(
@@ -5,8 +5,10 @@ from django.db import connection
 from django.urls import path, include
 from django.utils import timezone
 
+from baserow.core.db import get_specific_instances
 from baserow.core.utils import ChildProgressBuilder
 from baserow.contrib.database.api.serializers import DatabaseSerializer
+from baserow.contrib.database.db.bulk_copy import copy_rows
 from baserow.contrib.database.db.schema import safe_django_schema_editor
 from baserow.contrib.database.fields.dependencies.update_collector import (
     CachingFieldUpdateCollector,
@@ -19,7 +21,11 @@ from baserow.core.registries import ApplicationType
 from baserow.core.trash.handler import TrashHandler
 from baserow.core.utils import grouper
 
-from .constants import IMPORT_SERIALIZED_IMPORTING, IMPORT_SERIALIZED_IMPORTING_TABLE
+from .constants import (
+    IMPORT_SERIALIZED_COPY_CHUNK_SIZE,
+    IMPORT_SERIALIZED_IMPORTING,
+    IMPORT_SERIALIZED_IMPORTING_TABLE,
+)
 from .export_serialized import DatabaseExportSerializedStructure
 
 
@@ -64,16 +70,14 @@ class DatabaseApplicationType(ApplicationType):
         )
         serialized_tables = []
         for table in tables:
-            fields = table.field_set.all()
+            fields = get_specific_instances(table.field_set.all())
             serialized_fields = []
-            for f in fields:
-                field = f.specific
+            for field in fields:
                 field_type = field_type_registry.get_by_model(field)
                 serialized_fields.append(field_type.export_serialized(field))
 
             serialized_views = []
-            for v in table.view_set.all():
-                view = v.specific
+            for view in get_specific_instances(table.view_set.all()):
                 view_type = view_type_registry.get_by_model(view)
                 serialized_views.append(
                     view_type.export_serialized(view, files_zip, storage)
@@ -239,7 +243,7 @@ class DatabaseApplicationType(ApplicationType):
             progress.increment(state=IMPORT_SERIALIZED_IMPORTING)
 
         # Now that everything is in place we can start filling the table with the rows
-        # in an efficient matter by using the bulk_create functionality.
+        # in an efficient matter by copying them into the table.
         for table in tables:
             model = table["_model"]
             field_ids = [field_object.id for field_object in table["_field_objects"]]
@@ -292,11 +296,13 @@ class DatabaseApplicationType(ApplicationType):
                     state=f"{IMPORT_SERIALIZED_IMPORTING_TABLE}{table['id']}"
                 )
 
-            # We want to insert the rows in bulk because there could potentially be
-            # hundreds of thousands of rows in there and this will result in better
-            # performance.
-            for chunk in grouper(512, rows_to_be_inserted):
-                model.objects.bulk_create(chunk, batch_size=512)
+            # We want to copy the rows, and the relations of the many to many fields,
+            # in bulk because there could potentially be hundreds of thousands of rows
+            # in there and this will result in better performance.
+            for chunk in grouper(
+                IMPORT_SERIALIZED_COPY_CHUNK_SIZE, rows_to_be_inserted
+            ):
+                copy_rows(model, chunk)
                 progress.increment(
                     len(chunk),
                     state=f"{IMPORT_SERIALIZED_IMPORTING_TABLE}{table['id']}",
@@ -82,6 +82,7 @@ class DatabaseConfig(AppConfig):
             MoveRowActionType,
             UpdateRowActionType,
             UpdateRowsActionType,
+            UpsertRowsActionType,
         )
 
         action_type_registry.register(CreateRowActionType())
@@ -91,6 +92,7 @@ class DatabaseConfig(AppConfig):
         action_type_registry.register(MoveRowActionType())
         action_type_registry.register(UpdateRowActionType())
         action_type_registry.register(UpdateRowsActionType())
+        action_type_registry.register(UpsertRowsActionType())
 
         from baserow.contrib.database.views.actions import (
             CreateViewActionType,
@@ -344,6 +346,11 @@ class DatabaseConfig(AppConfig):
         webhook_event_type_registry.register(RowUpdatedEventType())
         webhook_event_type_registry.register(RowDeletedEventType())
 
+        from .rows.registries import row_metadata_registry
+        from .rows.row_metadata_types import StaleFieldIdsMetadataType
+
+        row_metadata_registry.register(StaleFieldIdsMetadataType())
+
         from .airtable.airtable_column_types import (
             TextAirtableColumnType,
             DateAirtableColumnType,
@@ -377,6 +384,21 @@ class DatabaseConfig(AppConfig):
         # The signals must always be imported last because they use the registries
         # which need to be filled first.
         import baserow.contrib.database.ws.signals  # noqa: F403, F401
+        import baserow.contrib.database.rows.counts  # noqa: F401
+        import baserow.contrib.database.table.search_index  # noqa: F401
+        import baserow.contrib.database.fields.trigram_indexes  # noqa: F401
+        import baserow.contrib.database.fields.indexes  # noqa: F401
+        import baserow.contrib.database.views.aggregation_deltas  # noqa: F401
+
+        from celery.signals import task_prerun, task_postrun
+
+        from .fields.field_cache import (
+            enter_shared_field_cache_for_task,
+            exit_shared_field_cache_for_task,
+        )
+
+        task_prerun.connect(enter_shared_field_cache_for_task, weak=False)
+        task_postrun.connect(exit_shared_field_cache_for_task, weak=False)
 
         post_migrate.connect(safely_update_formula_versions, sender=self)
         post_migrate.connect(clear_generated_model_cache_receiver, sender=self)
@@ -386,6 +408,11 @@ class DatabaseConfig(AppConfig):
 def clear_generated_model_cache_receiver(sender, **kwargs):
     clear_generated_model_cache()
 
+    if settings.WARM_MODEL_CACHE_AFTER_MIGRATION_LIMIT > 0:
+        from baserow.contrib.database.table.tasks import warm_model_cache
+
+        warm_model_cache.delay(limit=settings.WARM_MODEL_CACHE_AFTER_MIGRATION_LIMIT)
+
 
 # noinspection PyPep8Naming
 def safely_update_formula_versions(sender, **kwargs):
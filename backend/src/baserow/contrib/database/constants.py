@@ -1,2 +1,5 @@
 IMPORT_SERIALIZED_IMPORTING = "importing"
 IMPORT_SERIALIZED_IMPORTING_TABLE = "importing-table-"
+# The amount of rows copied into a table at once when importing a serialized
+# database. The import progress is updated after every chunk.
+IMPORT_SERIALIZED_COPY_CHUNK_SIZE = 5000
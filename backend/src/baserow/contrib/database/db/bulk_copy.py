@@ -0,0 +1,254 @@
+"""
+Inserts rows of generated table models, and the relations of their many to many
+fields, using PostgreSQL's `COPY ... FROM STDIN`. Copying the rows is a lot faster than
+inserting them with `INSERT` statements, which makes a big difference when importing
+large tables from templates and exports.
+
+Every column is encoded using the same database preparation as `bulk_create`, after
+which the prepared value is written in the COPY text format by the encoder of its
+type. Values that are SQL expressions, like the formulas or the next value of a
+sequence, can't be copied, so their columns are left out and get their default value
+instead. The formulas are calculated for all the copied rows at once afterwards.
+"""
+
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+from uuid import UUID
+
+from django.db import connection
+from django.db.models import Field, ManyToManyField, Model
+
+from baserow.contrib.database.fields.fields import BaserowExpressionField
+from baserow.contrib.database.formula import FormulaHandler
+
+COPY_NULL = "\\N"
+COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+PENDING_MANY_TO_MANY_ATTRIBUTE = "_pending_many_to_many_values"
+
+
+def encode_text(value: Any) -> str:
+    return str(value).translate(COPY_ESCAPES)
+
+
+def encode_boolean(value: bool) -> str:
+    return "t" if value else "f"
+
+
+def encode_iso_format(value: Any) -> str:
+    return value.isoformat()
+
+
+def encode_json(value: Any) -> str:
+    return encode_text(json.dumps(value))
+
+
+# The encoders of the values prepared for the database, by the exact type of the
+# value. The values of all the other types are encoded as text.
+COPY_VALUE_ENCODERS: Dict[type, Callable[[Any], str]] = {
+    str: encode_text,
+    bool: encode_boolean,
+    int: str,
+    float: repr,
+    Decimal: str,
+    datetime: encode_iso_format,
+    date: encode_iso_format,
+    time: encode_iso_format,
+    UUID: str,
+    dict: encode_json,
+    list: encode_json,
+}
+
+
+def encode_copy_value(value: Any) -> str:
+    """
+    Encodes a value prepared for the database in the COPY text format.
+    """
+
+    if value is None:
+        return COPY_NULL
+    return COPY_VALUE_ENCODERS.get(type(value), encode_text)(value)
+
+
+def add_pending_many_to_many_values(row: Model, field_name: str, values: List[int]):
+    """
+    Stores the related ids of a many to many field on a row which has not been
+    inserted yet, so that `copy_rows` inserts the relations together with the row.
+
+    :param row: The row instance that will be inserted by `copy_rows`. Its id must
+        already be set.
+    :param field_name: The name of the many to many field.
+    :param values: The ids of the related objects.
+    """
+
+    pending = row.__dict__.setdefault(PENDING_MANY_TO_MANY_ATTRIBUTE, {})
+    pending[field_name] = list(values)
+
+
+class CopyFile:
+    """
+    A read only file like object streaming the lines of an iterator, which can be
+    passed to `cursor.copy_expert`.
+    """
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._buffer = ""
+
+    def read(self, size: int = -1) -> str:
+        chunks = [self._buffer]
+        length = len(self._buffer)
+        while size < 0 or length < size:
+            line = next(self._lines, None)
+            if line is None:
+                break
+            chunks.append(line)
+            length += len(line)
+
+        data = "".join(chunks)
+        if size < 0:
+            self._buffer = ""
+            return data
+        self._buffer = data[size:]
+        return data[:size]
+
+
+def copy_into_table(table_name: str, columns: List[str], lines: Iterator[str]):
+    """
+    Copies the lines into the provided columns of the table.
+
+    :param table_name: The name of the database table.
+    :param columns: The names of the columns in the order of the values in a line.
+    :param lines: The tab separated lines in the COPY text format, every line
+        ending with a newline.
+    """
+
+    quote_name = connection.ops.quote_name
+    sql = (
+        f"COPY {quote_name(table_name)} "
+        f"({', '.join(quote_name(column) for column in columns)}) FROM STDIN"
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(sql, CopyFile(lines))
+
+
+def copy_rows(
+    model: Type[Model],
+    rows: Iterable[Model],
+    include_pk: Optional[bool] = None,
+):
+    """
+    Inserts the unsaved row instances of the model, and the many to many relations
+    added using `add_pending_many_to_many_values`, using COPY. Just like with
+    `bulk_create` the values are prepared using the `pre_save` and
+    `get_db_prep_save` methods of the model fields, but no signals are sent and the
+    ids of the rows are not set on the instances. The values of the formula fields
+    are calculated after the rows have been copied.
+
+    :param model: The model of the rows.
+    :param rows: The rows to insert.
+    :param include_pk: Whether the primary keys set on the rows must be inserted.
+        By default they are inserted if the first row has a primary key.
+    :raises ValueError: When relations must be inserted or formulas must be
+        calculated for rows without a primary key.
+    """
+
+    rows = list(rows)
+    if not rows:
+        return
+
+    if include_pk is None:
+        include_pk = rows[0].pk is not None
+
+    fields: List[Field] = [
+        field
+        for field in model._meta.concrete_fields
+        if include_pk or not field.primary_key
+    ]
+
+    relations_per_field = {}
+    for row in rows:
+        pending = row.__dict__.get(PENDING_MANY_TO_MANY_ATTRIBUTE)
+        if not pending:
+            continue
+        if row.pk is None:
+            raise ValueError(
+                "The many to many relations of a row can only be copied if its "
+                "primary key is set."
+            )
+        for field_name, related_ids in pending.items():
+            relations = relations_per_field.setdefault(field_name, [])
+            relations.extend((row.pk, related_id) for related_id in related_ids)
+
+    # The rows are copied per set of columns having an expression as value.
+    lines_per_skipped_columns: Dict[Tuple[str, ...], List[str]] = {}
+    for row in rows:
+        values = []
+        skipped_columns = []
+        for field in fields:
+            value = field.pre_save(row, True)
+            if hasattr(value, "resolve_expression"):
+                skipped_columns.append(field.column)
+            else:
+                values.append(
+                    encode_copy_value(
+                        field.get_db_prep_save(value, connection=connection)
+                    )
+                )
+        lines_per_skipped_columns.setdefault(tuple(skipped_columns), []).append(
+            "\t".join(values) + "\n"
+        )
+
+    all_skipped_columns = {
+        column for columns in lines_per_skipped_columns.keys() for column in columns
+    }
+    expression_fields = [
+        field
+        for field in fields
+        if field.column in all_skipped_columns
+        and isinstance(field, BaserowExpressionField)
+        and field.expression is not None
+    ]
+    if expression_fields and any(row.pk is None for row in rows):
+        raise ValueError(
+            "The formulas of a row can only be calculated if its primary key is set."
+        )
+
+    for skipped_columns, lines in lines_per_skipped_columns.items():
+        copy_into_table(
+            model._meta.db_table,
+            [field.column for field in fields if field.column not in skipped_columns],
+            iter(lines),
+        )
+
+    for field_name, relations in relations_per_field.items():
+        model_field: ManyToManyField = model._meta.get_field(field_name)
+        copy_into_table(
+            model_field.remote_field.through._meta.db_table,
+            [model_field.m2m_column_name(), model_field.m2m_reverse_name()],
+            (f"{row_id}\t{related_id}\n" for row_id, related_id in relations),
+        )
+
+    # Calculated after the relations have been inserted because the formulas can
+    # depend on them.
+    if expression_fields:
+        update_statements = {
+            field.attname: FormulaHandler.baserow_expression_to_update_django_expression(
+                field.expression, model
+            )
+            for field in expression_fields
+        }
+        model._base_manager.filter(pk__in=[row.pk for row in rows]).update(
+            **update_statements
+        )
@@ -0,0 +1,80 @@
+"""
+Updates rows of generated table models using one `UPDATE ... FROM (VALUES ...)`
+statement per set of updated columns. Django's `bulk_update` writes every provided
+column of every row using a `CASE WHEN id = ... THEN ...` expression per column, which
+makes the statement grow with the amount of rows times the amount of columns and
+forces unchanged columns to be written. Here only the columns which have changed are
+written and every row only adds a single line of values to the statement.
+"""
+
+from collections import defaultdict
+from typing import Iterable, Tuple, Type
+
+from django.db import connection
+from django.db.models import Model
+
+VALUES_ALIAS = "baserow_values"
+
+
+def bulk_update_from_values(
+    model: Type[Model], updates: Iterable[Tuple[Model, Iterable[str]]]
+) -> int:
+    """
+    Writes the values of the provided fields of every row instance to the database.
+    The rows are grouped by the fields that must be updated and every group is
+    updated using a single statement.
+
+    The values are prepared using the `get_db_prep_save` method of the model field
+    and cast to the column type, so they must be plain values and not expressions.
+
+    :param model: The model of the rows.
+    :param updates: The row instances and the names of the fields whose values must
+        be written for that row.
+    :return: The amount of updated rows.
+    """
+
+    rows_per_field_names = defaultdict(list)
+    for row, field_names in updates:
+        field_names = tuple(sorted(set(field_names)))
+        if field_names:
+            rows_per_field_names[field_names].append(row)
+
+    quote_name = connection.ops.quote_name
+    table_name = quote_name(model._meta.db_table)
+    pk_field = model._meta.pk
+    pk_column = quote_name(pk_field.column)
+
+    updated_rows = 0
+    with connection.cursor() as cursor:
+        for field_names, rows in rows_per_field_names.items():
+            fields = [model._meta.get_field(name) for name in field_names]
+            values_fields = [pk_field] + fields
+
+            assignments = ", ".join(
+                f"{quote_name(field.column)} = "
+                f"{VALUES_ALIAS}.{quote_name(field.column)}"
+                for field in fields
+            )
+            row_placeholder = "({})".format(
+                ", ".join(
+                    f"%s::{field.cast_db_type(connection)}" for field in values_fields
+                )
+            )
+            columns = ", ".join(quote_name(field.column) for field in values_fields)
+            sql = (
+                f"UPDATE {table_name} SET {assignments} "
+                f"FROM (VALUES {', '.join([row_placeholder] * len(rows))}) "
+                f"AS {VALUES_ALIAS} ({columns}) "
+                f"WHERE {table_name}.{pk_column} = {VALUES_ALIAS}.{pk_column}"
+            )
+            params = [
+                field.get_db_prep_save(
+                    getattr(row, field.attname), connection=connection
+                )
+                for row in rows
+                for field in values_fields
+            ]
+            cursor.execute(sql, params)
+            updated_rows += cursor.rowcount
+
+    return updated_rows
@@ -22,6 +22,9 @@
 # this query so it works with our own database models and structure.
 #
 
+from baserow.contrib.database.fields.dependencies.graph import (
+    get_field_dependency_graphs,
+)
 from baserow.contrib.database.fields.dependencies.models import FieldDependency
 from django.conf import settings
 
@@ -31,6 +34,23 @@ def will_cause_circular_dep(from_field, to_field):
 
 
 def get_all_field_dependencies(field):
+    """
+    Returns the ids of all the fields the provided field directly or indirectly
+    depends on using the cached dependency graph of its database.
+    """
+
+    all_dependencies = set()
+    for graph in get_field_dependency_graphs([field.id]).values():
+        all_dependencies.update(graph.get_all_dependency_ids(field.id))
+    return all_dependencies
+
+
+def query_all_field_dependencies(field):
+    """
+    Returns the ids of all the fields the provided field directly or indirectly
+    depends on using a recursive query.
+    """
+
     from baserow.contrib.database.fields.models import Field
 
     query_parameters = {
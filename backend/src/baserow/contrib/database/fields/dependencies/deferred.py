@@ -0,0 +1,281 @@
+"""
+Tables with `defer_dependant_updates` enabled don't update the formula and lookup
+fields depending on their rows, through a link row field, when a row is created,
+updated, moved or deleted. Instead a `DeferredDependantUpdate` is stored for every
+changed field which has such dependants and the `update_deferred_dependant_fields`
+task is scheduled. The task updates the dependants of all the pending rows of the
+table in batches, so that many row changes made in a short amount of time result in
+a few update statements.
+
+Until the task has run the cells of the dependant fields are stale, which is exposed
+via the `stale_field_ids` row metadata.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from baserow.contrib.database.fields.signals import field_updated
+from baserow.contrib.database.table.models import Table
+
+from .graph import FieldDependencyGraph, get_field_dependency_graph
+from .handler import FieldDependencyHandler
+from .models import DeferredDependantUpdate
+from .update_collector import CachingFieldUpdateCollector
+
+
+def deferred_dependant_updates_scheduled_key(table_id: int) -> str:
+    return f"deferred_dependant_updates_scheduled_{table_id}"
+
+
+def get_deferred_dependant_ids(
+    graph: FieldDependencyGraph, field_ids: Iterable[int]
+) -> Set[int]:
+    """
+    :param graph: The dependency graph of the database containing the fields.
+    :param field_ids: The fields whose cells have changed.
+    :return: The ids of the read only fields, like formula and lookup fields, which
+        depend on the provided fields through a link row field. Their cell values
+        are the ones which are updated by the deferred dependant updates.
+    """
+
+    from baserow.contrib.database.fields.registries import field_type_registry
+
+    return {
+        field_id
+        for field_id in graph.get_dependant_ids_via_link_rows(field_ids)
+        if field_type_registry.get_by_model(
+            graph.get_field(field_id).specific_class
+        ).read_only
+    }
+
+
+def defer_dependant_updates(
+    table: Table, row_ids: Iterable[int], field_ids: Iterable[int]
+) -> bool:
+    """
+    Stores that the dependants of the provided fields must be updated for the
+    provided rows and schedules the task updating them, if the table defers the
+    updates of its dependant fields.
+
+    :param table: The table where the rows have changed.
+    :param row_ids: The ids of the rows which have been created, updated, moved or
+        deleted.
+    :param field_ids: The ids of the fields whose cells have changed.
+    :return: Whether the updates have been deferred. If False the dependant fields
+        must be updated immediately.
+    """
+
+    if not table.defer_dependant_updates:
+        return False
+
+    graph = get_field_dependency_graph(table.database_id)
+    field_ids = [
+        field_id
+        for field_id in set(field_ids)
+        if get_deferred_dependant_ids(graph, [field_id])
+    ]
+    if field_ids:
+        DeferredDependantUpdate.objects.bulk_create(
+            [
+                DeferredDependantUpdate(table=table, field_id=field_id, row_id=row_id)
+                for row_id in row_ids
+                for field_id in field_ids
+            ],
+            batch_size=1000,
+        )
+        schedule_deferred_dependant_updates(table.id)
+    return True
+
+
+def schedule_deferred_dependant_updates(table_id: int):
+    """
+    Schedules the task updating the deferred dependants of the table when the
+    current transaction commits. The task is not scheduled again while it's waiting
+    to be executed, so that the changes are coalesced.
+
+    :param table_id: The table having pending deferred dependant updates.
+    """
+
+    from baserow.contrib.database.rows.tasks import update_deferred_dependant_fields
+
+    def schedule():
+        if cache.add(
+            deferred_dependant_updates_scheduled_key(table_id),
+            True,
+            timeout=settings.CELERY_TIME_LIMIT,
+        ):
+            update_deferred_dependant_fields.apply_async(
+                (table_id,), countdown=settings.DEFERRED_DEPENDANT_UPDATES_DELAY
+            )
+
+    transaction.on_commit(schedule)
+
+
+def apply_deferred_dependant_updates(table_id: int, batch_size: int = None) -> int:
+    """
+    Updates the dependant fields of all the pending deferred dependant updates of the
+    table. Every batch locks its pending updates, updates the dependants of all the
+    rows in the batch at once and then deletes the pending updates.
+
+    :param table_id: The table whose deferred dependant updates must be applied.
+    :param batch_size: The maximum amount of pending updates handled in one batch.
+        Defaults to the DEFERRED_DEPENDANT_UPDATES_BATCH_SIZE setting.
+    :return: The amount of rows whose dependants have been updated.
+    """
+
+    # Deleted before the pending updates are selected, so that changes committed
+    # while this runs schedule the task again.
+    cache.delete(deferred_dependant_updates_scheduled_key(table_id))
+
+    if batch_size is None:
+        batch_size = settings.DEFERRED_DEPENDANT_UPDATES_BATCH_SIZE
+
+    try:
+        table = Table.objects_and_trash.select_related("database").get(id=table_id)
+    except Table.DoesNotExist:
+        return 0
+
+    updated_rows = 0
+    while True:
+        with transaction.atomic():
+            pending = list(
+                DeferredDependantUpdate.objects.filter(table_id=table_id)
+                .select_for_update(skip_locked=True)
+                .order_by("id")
+                .values_list("id", "row_id", "field_id")[:batch_size]
+            )
+            if not pending:
+                break
+
+            row_ids = sorted({row_id for _, row_id, _ in pending})
+            field_ids = {field_id for _, _, field_id in pending}
+            _update_dependants(table, row_ids, field_ids)
+            DeferredDependantUpdate.objects.filter(
+                id__in=[pending_id for pending_id, _, _ in pending]
+            ).delete()
+
+        updated_rows += len(row_ids)
+    return updated_rows
+
+
+def _update_dependants(table: Table, row_ids: List[int], field_ids: Iterable[int]):
+    model = table.get_model()
+    rows = list(model.objects_and_trash.filter(id__in=row_ids))
+    update_collector = CachingFieldUpdateCollector(
+        table, starting_row_id=row_ids, existing_model=model
+    )
+    for (
+        dependant_field,
+        dependant_field_type,
+        path_to_starting_table,
+    ) in FieldDependencyHandler.get_dependant_fields_with_type(
+        field_ids, update_collector
+    ):
+        dependant_field_type.row_of_dependency_updated(
+            dependant_field, rows, update_collector, path_to_starting_table
+        )
+    updated_fields = update_collector.apply_updates_and_get_updated_fields()
+
+    from baserow.contrib.database.views.handler import ViewHandler
+
+    # Invalidates the cached aggregations, row counts and row ids of the views
+    # depending on the updated cells, like when the dependants are updated
+    # immediately.
+    ViewHandler().field_value_updated(updated_fields)
+
+    # The rows have already been returned and broadcast before the dependants were
+    # updated, so the updated fields of every table, including the starting one, are
+    # sent to let the clients know their values have changed.
+    if updated_fields:
+        field_updated.send(
+            update_collector,
+            field=updated_fields[0],
+            related_fields=updated_fields[1:],
+            user=None,
+        )
+    update_collector.send_additional_field_updated_signals()
+
+
+def get_stale_field_ids_per_row(
+    table: Table, row_ids: Iterable[int]
+) -> Dict[int, List[int]]:
+    """
+    Finds the cells of the provided rows which are stale because the deferred updates
+    of the fields they depend on have not been applied yet. Only the rows which are
+    pending themselves or which are directly linked to a pending row are detected.
+
+    :param table: The table containing the rows.
+    :param row_ids: The rows to check.
+    :return: A dict with the row id as key and the ids of the stale fields as value.
+        Rows without stale cells are not included.
+    """
+
+    row_ids = list(row_ids)
+    if not row_ids:
+        return {}
+
+    pending_field_ids_per_table = defaultdict(set)
+    for pending_table_id, field_id in (
+        DeferredDependantUpdate.objects.filter(table__database_id=table.database_id)
+        .values_list("table_id", "field_id")
+        .distinct()
+    ):
+        pending_field_ids_per_table[pending_table_id].add(field_id)
+    if not pending_field_ids_per_table:
+        return {}
+
+    from baserow.contrib.database.fields.models import LinkRowField
+
+    graph = get_field_dependency_graph(table.database_id)
+    stale_field_ids_per_row = defaultdict(set)
+    for pending_table_id, field_ids in pending_field_ids_per_table.items():
+        stale_field_ids = {
+            field_id
+            for field_id in get_deferred_dependant_ids(graph, field_ids)
+            if graph.get_field(field_id).table_id == table.id
+        }
+        if not stale_field_ids:
+            continue
+
+        pending_row_ids = DeferredDependantUpdate.objects.filter(
+            table_id=pending_table_id
+        ).values("row_id")
+        if pending_table_id == table.id:
+            stale_row_ids = pending_row_ids.filter(row_id__in=row_ids).values_list(
+                "row_id", flat=True
+            )
+        else:
+            link_row_fields = list(
+                LinkRowField.objects.filter(
+                    table=table, link_row_table_id=pending_table_id
+                )
+            )
+            if not link_row_fields:
+                continue
+            model = table.get_model(
+                field_ids=[link_row_field.id for link_row_field in link_row_fields]
+            )
+            linked_to_pending_row = Q()
+            for link_row_field in link_row_fields:
+                linked_to_pending_row |= Q(
+                    **{f"{link_row_field.db_column}__in": pending_row_ids}
+                )
+            stale_row_ids = (
+                model.objects_and_trash.filter(id__in=row_ids)
+                .filter(linked_to_pending_row)
+                .values_list("id", flat=True)
+                .distinct()
+            )
+
+        for row_id in stale_row_ids:
+            stale_field_ids_per_row[row_id].update(stale_field_ids)
+
+    return {
+        row_id: sorted(field_ids)
+        for row_id, field_ids in stale_field_ids_per_row.items()
+    }
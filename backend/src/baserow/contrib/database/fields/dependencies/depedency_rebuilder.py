@@ -7,12 +7,16 @@ if TYPE_CHECKING:
 from baserow.contrib.database.fields.dependencies.circular_reference_checker import (
     will_cause_circular_dep,
 )
+from baserow.contrib.database.fields.dependencies.graph import (
+    invalidate_field_dependency_graph,
+)
 from baserow.contrib.database.fields.dependencies.exceptions import (
     CircularFieldDependencyError,
     SelfReferenceFieldDependencyError,
 )
 from baserow.contrib.database.fields.dependencies.models import FieldDependency
 from baserow.contrib.database.fields.field_cache import FieldCache
+from baserow.contrib.database.table.cache import invalidate_table_in_model_cache
 
 
 def break_dependencies_for_field(field):
@@ -25,13 +29,18 @@ def break_dependencies_for_field(field):
 
     from baserow.contrib.database.fields.models import LinkRowField
 
-    FieldDependency.objects.filter(dependant=field).delete()
-    field.dependants.update(dependency=None, broken_reference_field_name=field.name)
+    deleted, _ = FieldDependency.objects.filter(dependant=field).delete()
+    updated = field.dependants.update(
+        dependency=None, broken_reference_field_name=field.name
+    )
     if isinstance(field, LinkRowField):
-        field.vias.update(
+        updated += field.vias.update(
             dependency=None, broken_reference_field_name=field.name, via=None
         )
 
+    if deleted or updated:
+        invalidate_field_dependency_graph(field.table.database_id)
+
 
 def update_fields_with_broken_references(field: "field_models.Field"):
     """
@@ -61,6 +70,8 @@ def update_fields_with_broken_references(field: "field_models.Field"):
     FieldDependency.objects.bulk_update(
         updated_deps, ["dependency", "broken_reference_field_name"]
     )
+    if updated_deps:
+        invalidate_field_dependency_graph(field.table.database_id)
 
     return len(updated_deps) > 0
 
@@ -200,3 +211,9 @@ def rebuild_field_dependencies(
     # remaining ones are old dependencies which should no longer exist. Delete them.
     delete_ids = [dep.id for dep in current_deps_by_str.values()]
     FieldDependency.objects.filter(pk__in=delete_ids).delete()
+
+    if new_dependencies_to_create or delete_ids:
+        # The same table dependencies of every field are stored in the generated
+        # models cache so it must be invalidated when they change.
+        invalidate_table_in_model_cache(field_instance.table_id)
+        invalidate_field_dependency_graph(field_instance.table.database_id)
@@ -0,0 +1,383 @@
+"""
+This file is responsible for keeping an in memory graph of the field dependencies of
+every database, so that the dependants, dependencies and update order of fields can be
+found without querying the database for every level of dependencies.
+
+Every database can have a graph version stored in the
+`field_dependency_graph_version_{database_id}_{BASEROW_VERSION}` key of the generated
+models cache. It is incremented every time the field dependencies in the database
+change, see `invalidate_field_dependency_graph`. Every process keeps a small least
+recently used cache of the graphs keyed by `(database_id, graph_version)`, so a graph is
+loaded from the database with two queries and then used until the dependencies of the
+database change.
+
+The graph only contains the ids of the fields and of the field dependencies. The field
+instances are still looked up using a `FieldCache`.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+
+from baserow.contrib.database.table.cache import (
+    GeneratedModelLRUCache,
+    generated_models_cache,
+    _initial_model_version,
+)
+from baserow.version import VERSION as BASEROW_VERSION
+
+from .models import FieldDependency
+
+
+class FieldDependencyGraph:
+    """
+    An immutable snapshot of all the fields and field dependencies in a database.
+    """
+
+    def __init__(
+        self,
+        database_id: int,
+        fields: Iterable[Tuple[int, int, str, int, bool]],
+        dependencies: Iterable[Tuple[int, int, Optional[int], Optional[int]]],
+    ):
+        """
+        :param database_id: The database the graph belongs to.
+        :param fields: The id, table id, name, content type id and trashed state of
+            every field in the database.
+        :param dependencies: The id, dependant id, dependency id and via id of every
+            field dependency of the fields in the database, ordered by id.
+        """
+
+        self.database_id = database_id
+        self._fields = {field[0]: field[1:] for field in fields}
+        self._dependants = defaultdict(list)
+        self._dependencies = defaultdict(list)
+        for dependency in dependencies:
+            field_dependency_id, dependant_id, dependency_id, via_id = dependency
+            self._dependants[dependency_id].append(
+                (field_dependency_id, dependant_id, via_id)
+            )
+            self._dependencies[dependant_id].append(dependency_id)
+        self._update_orders = {}
+
+    def __contains__(self, field_id: int) -> bool:
+        return field_id in self._fields
+
+    def get_field(self, field_id: int):
+        """
+        :param field_id: The id of the field.
+        :return: An unsaved non-specific field instance containing the table, name,
+            content type and trashed state of the field which can be used to look up
+            the specific field in a `FieldCache`. None if the field is not in the
+            graph.
+        """
+
+        from baserow.contrib.database.fields.models import Field
+
+        try:
+            table_id, name, content_type_id, trashed = self._fields[field_id]
+        except KeyError:
+            return None
+        return Field(
+            id=field_id,
+            table_id=table_id,
+            name=name,
+            content_type_id=content_type_id,
+            trashed=trashed,
+        )
+
+    def get_dependants(
+        self, field_ids: Iterable[int]
+    ) -> List[Tuple[int, Optional[int]]]:
+        """
+        :param field_ids: The fields to get the direct dependants for.
+        :return: The dependant field id and via field id of every field dependency
+            on one of the provided fields, in the order the dependencies were created.
+        """
+
+        dependants = []
+        for field_id in set(field_ids):
+            dependants += self._dependants.get(field_id, [])
+        dependants.sort()
+        return [(dependant_id, via_id) for _, dependant_id, via_id in dependants]
+
+    def get_all_dependency_ids(
+        self, field_id: int, max_depth: Optional[int] = None
+    ) -> Set[Optional[int]]:
+        """
+        :param field_id: The field to get the dependencies for.
+        :param max_depth: The maximum depth of the dependencies, defaults to the
+            MAX_FIELD_REFERENCE_DEPTH setting.
+        :return: The ids of the fields the provided field directly or indirectly
+            depends on. Contains None if one of the dependencies is broken.
+        """
+
+        if max_depth is None:
+            max_depth = settings.MAX_FIELD_REFERENCE_DEPTH
+
+        found = set()
+        level = [field_id]
+        depth = 0
+        while level and depth < max_depth:
+            depth += 1
+            next_level = []
+            for level_field_id in level:
+                for dependency_id in self._dependencies.get(level_field_id, []):
+                    if dependency_id not in found:
+                        found.add(dependency_id)
+                        if dependency_id is not None:
+                            next_level.append(dependency_id)
+            level = next_level
+        return found
+
+    def has_dependencies(self, field_id: int) -> bool:
+        """
+        :param field_id: The field to check.
+        :return: Whether the field depends on at least one field, including broken
+            dependencies.
+        """
+
+        return len(self._dependencies.get(field_id, [])) > 0
+
+    def will_cause_circular_dep(self, from_field_id: int, to_field_id: int) -> bool:
+        return from_field_id in self.get_all_dependency_ids(to_field_id)
+
+    def get_dependant_ids_via_link_rows(self, field_ids: Iterable[int]) -> Set[int]:
+        """
+        :param field_ids: The fields that have changed.
+        :return: The ids of the fields which directly or indirectly depend on one of
+            the provided fields through at least one link row field. Unlike the
+            fields which only depend on fields in their own table, the cell values of
+            these fields are not calculated when a row is saved.
+        """
+
+        found = set()
+        seen = set()
+        level = [(field_id, False) for field_id in set(field_ids)]
+        while level:
+            next_level = []
+            for field_id, via_link_row in level:
+                for _, dependant_id, via_id in self._dependants.get(field_id, []):
+                    state = (dependant_id, via_link_row or via_id is not None)
+                    if state not in seen:
+                        seen.add(state)
+                        next_level.append(state)
+                        if state[1]:
+                            found.add(dependant_id)
+            level = next_level
+        return found
+
+    def get_update_order(
+        self, field_ids: Iterable[int], include_changed: bool = False
+    ) -> List[int]:
+        """
+        Returns all the fields which directly or indirectly depend on the provided
+        fields in the order in which they must be updated, so that every field comes
+        after all the fields it depends on. The result is cached per set of fields.
+
+        :param field_ids: The fields that have changed.
+        :param include_changed: Whether the provided fields themselves must also be
+            included in the order, for example because all of them must be
+            recalculated.
+        :return: The ids of the dependant fields in topological order.
+        """
+
+        key = (frozenset(field_ids), include_changed)
+        if key not in self._update_orders:
+            self._update_orders[key] = self._calculate_update_order(*key)
+        return self._update_orders[key]
+
+    def _calculate_update_order(
+        self, field_ids: frozenset, include_changed: bool
+    ) -> List[int]:
+        to_update = set(field_ids) if include_changed else set()
+        level = list(field_ids)
+        while level:
+            next_level = []
+            for field_id in level:
+                for _, dependant_id, _ in self._dependants.get(field_id, []):
+                    if dependant_id not in to_update and dependant_id not in field_ids:
+                        to_update.add(dependant_id)
+                        next_level.append(dependant_id)
+            level = next_level
+
+        # Kahn's algorithm, the fields which are ready at the same time are updated in
+        # the order of their id to make the order deterministic.
+        pending_dependencies = {
+            field_id: set(self._dependencies.get(field_id, [])) & to_update
+            for field_id in to_update
+        }
+        ready = [
+            field_id
+            for field_id, pending in pending_dependencies.items()
+            if not pending
+        ]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            field_id = heapq.heappop(ready)
+            order.append(field_id)
+            for _, dependant_id, _ in self._dependants.get(field_id, []):
+                pending = pending_dependencies.get(dependant_id)
+                if pending is not None and field_id in pending:
+                    pending.remove(field_id)
+                    if not pending:
+                        heapq.heappush(ready, dependant_id)
+
+        # Fields in a circular dependency can't be ordered, they are updated last.
+        ordered = set(order)
+        order += sorted(field_id for field_id in to_update if field_id not in ordered)
+        return order
+
+
+field_dependency_graph_local_cache = GeneratedModelLRUCache(
+    settings.GENERATED_MODEL_LOCAL_CACHE_SIZE
+)
+
+
+def field_dependency_graph_version_key(database_id: int) -> str:
+    return f"field_dependency_graph_version_{database_id}_{BASEROW_VERSION}"
+
+
+def get_field_dependency_graph_version(database_id: int) -> int:
+    """
+    :param database_id: The database to get the graph version for.
+    :return: The latest dependency graph version of the database. Initializes it if
+        not set yet.
+    """
+
+    return generated_models_cache.get_or_set(
+        field_dependency_graph_version_key(database_id),
+        _initial_model_version(),
+        timeout=None,
+    )
+
+
+def load_field_dependency_graph(database_id: int) -> FieldDependencyGraph:
+    """
+    Loads the dependency graph of the database using two queries without caching it.
+    """
+
+    return load_field_dependency_graphs([database_id])[database_id]
+
+
+def load_field_dependency_graphs(
+    database_ids: Iterable[int],
+) -> Dict[int, FieldDependencyGraph]:
+    """
+    Loads the dependency graphs of multiple databases using two queries without
+    caching them.
+
+    :param database_ids: The databases to load the dependency graph for.
+    :return: A dict with the database id as key and the graph as value.
+    """
+
+    from baserow.contrib.database.fields.models import Field
+
+    database_ids = list(database_ids)
+    fields = defaultdict(list)
+    for database_id, *field in Field.objects_and_trash.filter(
+        table__database_id__in=database_ids
+    ).values_list(
+        "table__database_id", "id", "table_id", "name", "content_type_id", "trashed"
+    ):
+        fields[database_id].append(field)
+
+    dependencies = defaultdict(list)
+    for database_id, *dependency in (
+        FieldDependency.objects.filter(dependant__table__database_id__in=database_ids)
+        .order_by("id")
+        .values_list(
+            "dependant__table__database_id",
+            "id",
+            "dependant_id",
+            "dependency_id",
+            "via_id",
+        )
+    ):
+        dependencies[database_id].append(dependency)
+
+    return {
+        database_id: FieldDependencyGraph(
+            database_id, fields[database_id], dependencies[database_id]
+        )
+        for database_id in database_ids
+    }
+
+
+def get_field_dependency_graph(database_id: int) -> FieldDependencyGraph:
+    """
+    :param database_id: The database to get the dependency graph for.
+    :return: The latest dependency graph of the database, loaded from the database if
+        it's not in the per process cache yet.
+    """
+
+    key = (database_id, get_field_dependency_graph_version(database_id))
+    graph = field_dependency_graph_local_cache.get(key)
+    if graph is None:
+        graph = load_field_dependency_graph(database_id)
+        field_dependency_graph_local_cache.set(key, graph)
+    return graph
+
+
+def get_field_dependency_graphs(
+    field_ids: Iterable[int],
+) -> Dict[int, FieldDependencyGraph]:
+    """
+    Finds the dependency graphs containing the provided fields. The database of a
+    field is only queried if it is not in one of the cached graphs.
+
+    :param field_ids: The fields to get the dependency graphs for.
+    :return: A dict with the database id as key and the latest graph as value.
+    """
+
+    from baserow.contrib.database.fields.models import Field
+
+    database_ids = set()
+    missing_field_ids = set(field_ids)
+    for graph in field_dependency_graph_local_cache.values():
+        if not missing_field_ids:
+            break
+        found_field_ids = {
+            field_id for field_id in missing_field_ids if field_id in graph
+        }
+        if found_field_ids:
+            database_ids.add(graph.database_id)
+            missing_field_ids -= found_field_ids
+
+    if missing_field_ids:
+        database_ids.update(
+            Field.objects_and_trash.filter(id__in=missing_field_ids)
+            .values_list("table__database_id", flat=True)
+            .distinct()
+        )
+
+    return {
+        database_id: get_field_dependency_graph(database_id)
+        for database_id in database_ids
+    }
+
+
+def invalidate_field_dependency_graph(database_id: int):
+    """
+    Must be called after the field dependencies of fields in the database have
+    changed. Increments the graph version immediately, so that the current
+    transaction sees the changes, and again when the transaction commits, so that
+    other processes can't keep using a graph they loaded before the changes were
+    committed.
+
+    :param database_id: The database whose dependencies have changed.
+    """
+
+    def increment_version():
+        key = field_dependency_graph_version_key(database_id)
+        try:
+            generated_models_cache.incr(key)
+        except ValueError:
+            get_field_dependency_graph_version(database_id)
+
+    increment_version()
+    transaction.on_commit(increment_version)
@@ -1,4 +1,5 @@
-from typing import Optional, List, Tuple
+from collections import defaultdict
+from typing import Optional, List, Tuple, Dict
 
 from baserow.contrib.database.fields.dependencies.depedency_rebuilder import (
     rebuild_field_dependencies,
@@ -7,8 +8,10 @@ from baserow.contrib.database.fields.dependencies.depedency_rebuilder import (
 )
 from baserow.contrib.database.fields.registries import field_type_registry, FieldType
 from baserow.contrib.database.fields.field_cache import FieldCache
-from baserow.contrib.database.fields.models import Field
+from baserow.contrib.database.fields.models import Field, LinkRowField
+from baserow.core.db import get_specific_instances
 
+from .graph import FieldDependencyGraph, get_field_dependency_graphs
 from .models import FieldDependency
 
 
@@ -23,10 +26,32 @@ class FieldDependencyHandler:
         :return: A list of specific field instances.
         """
 
-        return [
-            dep.specific
-            for dep in field.field_dependencies.filter(table=field.table).all()
-        ]
+        return get_specific_instances(
+            field.field_dependencies.filter(table=field.table).all()
+        )
+
+    @classmethod
+    def get_same_table_dependency_ids(cls, table) -> Dict[int, List[int]]:
+        """
+        Returns the ids of the fields that every field in the provided table directly
+        depends on which are in the same table using a single query.
+
+        :param table: The table to get the dependencies for.
+        :return: A dict with the dependant field id as key and a list of the ids of
+            the fields it depends on as value.
+        """
+
+        dependency_ids = defaultdict(list)
+        queryset = FieldDependency.objects.filter(
+            dependant__table=table,
+            dependency__table=table,
+            dependency__trashed=False,
+        ).order_by("id")
+        for dependant_id, dependency_id in queryset.values_list(
+            "dependant_id", "dependency_id"
+        ):
+            dependency_ids[dependant_id].append(dependency_id)
+        return dict(dependency_ids)
 
     @classmethod
     def rebuild_dependencies(cls, field, field_cache: FieldCache):
@@ -60,7 +85,9 @@ class FieldDependencyHandler:
     ) -> List[Tuple[Field, FieldType, str]]:
         """
         Finds the unique dependant fields of the provided field ids efficiently with the
-        least amount of queries.
+        least amount of queries. The dependencies are looked up in the cached
+        dependency graph of the database, so only the specific instances of the
+        dependant fields which are not in the field cache yet are queried.
 
         :param field_ids: The field ids for which we need to find the dependent fields.
         :param field_cache: A field cache used to find and store the specific object
@@ -71,27 +98,112 @@ class FieldDependencyHandler:
             path to starting table.
         """
 
-        queryset = (
-            FieldDependency.objects.filter(dependency_id__in=field_ids)
-            .select_related("dependant")
-            .order_by("id")
+        dependants = []
+        for graph in get_field_dependency_graphs(field_ids).values():
+            for dependant_id, via_id in graph.get_dependants(field_ids):
+                dependants.append((graph, dependant_id, via_id))
+
+        fields_by_id = cls._lookup_specific_fields(
+            {
+                field_id: graph
+                for graph, dependant_id, via_id in dependants
+                for field_id in (dependant_id, via_id)
+                if field_id is not None
+            },
+            field_cache,
         )
+        via_fields_by_id = {
+            via_id: fields_by_id[via_id]
+            for _, _, via_id in dependants
+            if via_id in fields_by_id
+        }
+        missing_via_field_ids = {
+            via_id
+            for _, _, via_id in dependants
+            if via_id is not None and via_id not in via_fields_by_id
+        }
+        if missing_via_field_ids:
+            # A via field is not in the field cache if it is trashed.
+            via_fields_by_id.update(
+                LinkRowField.objects_and_trash.in_bulk(missing_via_field_ids)
+            )
 
         result = []
-        for field_dependency in queryset:
-            dependant_field = field_cache.lookup_specific(field_dependency.dependant)
+        for _, dependant_id, via_id in dependants:
+            dependant_field = fields_by_id.get(dependant_id)
             if dependant_field is None:
                 # If somehow the dependant is trashed it will be None. We can't really
                 # trigger any updates for it so ignore it.
                 continue
             dependant_field_type = field_type_registry.get_by_model(dependant_field)
-            if field_dependency.via is not None:
+            if via_id is not None:
+                if via_id not in via_fields_by_id:
+                    continue
                 via_path_to_starting_table = (
                     starting_via_path_to_starting_table or []
-                ) + [field_dependency.via]
+                ) + [via_fields_by_id[via_id]]
             else:
                 via_path_to_starting_table = starting_via_path_to_starting_table
             result.append(
                 (dependant_field, dependant_field_type, via_path_to_starting_table)
             )
         return result
+
+    @classmethod
+    def _lookup_specific_fields(
+        cls,
+        graph_per_field_id: Dict[int, FieldDependencyGraph],
+        field_cache: FieldCache,
+    ) -> Dict[int, Field]:
+        """
+        Looks up the specific instances of the provided fields in the field cache,
+        caching the missing ones using one query per field type. The name of a field
+        in the graph can be outdated, in that case the field is fetched by id.
+
+        :param graph_per_field_id: The fields to look up and the dependency graph
+            containing them.
+        :param field_cache: The field cache to look the fields up in.
+        :return: A dict with the field id as key and the specific field as value.
+            Trashed fields are left out.
+        """
+
+        graph_fields = [
+            graph.get_field(field_id) for field_id, graph in graph_per_field_id.items()
+        ]
+        graph_fields = [field for field in graph_fields if field is not None]
+        field_cache.cache_fields(graph_fields)
+
+        fields_by_id = {}
+        for field in graph_fields:
+            specific_field = field_cache.lookup_specific(field)
+            if specific_field is not None and specific_field.id == field.id:
+                fields_by_id[field.id] = specific_field
+
+        missing_field_ids = [
+            field_id for field_id in graph_per_field_id if field_id not in fields_by_id
+        ]
+        if missing_field_ids:
+            fields = list(Field.objects_and_trash.filter(id__in=missing_field_ids))
+            field_cache.cache_fields(fields)
+            for field in fields:
+                specific_field = field_cache.lookup_specific(field)
+                if specific_field is not None:
+                    fields_by_id[field.id] = specific_field
+
+        return fields_by_id
+
+    @classmethod
+    def get_update_order(cls, field_ids: List[int]) -> List[int]:
+        """
+        Returns the ids of all the fields which directly or indirectly depend on the
+        provided fields, ordered so that every field comes after all the fields it
+        depends on.
+
+        :param field_ids: The ids of the fields that have changed.
+        :return: The ids of the dependant fields in the order they must be updated.
+        """
+
+        update_order = []
+        for graph in get_field_dependency_graphs(field_ids).values():
+            update_order += graph.get_update_order(field_ids)
+        return update_order
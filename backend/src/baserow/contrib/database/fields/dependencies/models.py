@@ -49,3 +49,28 @@ class FieldDependency(models.Model):
         """
 
         return f"{self.dependant_id}__{self._dependency_postfix()}"
+
+
+class DeferredDependantUpdate(models.Model):
+    """
+    Indicates that the dependants of a field still have to be updated because a row
+    of a table which defers the updates of its dependant fields has changed. The
+    dependants are updated in the background by the
+    `update_deferred_dependant_fields` task, which deletes the entries afterwards.
+    """
+
+    table = models.ForeignKey(
+        "database.Table",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    field = models.ForeignKey(
+        "database.Field",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    row_id = models.PositiveIntegerField()
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["table", "row_id"])]
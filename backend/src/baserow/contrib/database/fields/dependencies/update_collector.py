@@ -1,7 +1,7 @@
 from collections import defaultdict
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, Type
 
-from django.db.models import Expression
+from django.db.models import Expression, QuerySet
 
 from baserow.contrib.database.fields.dependencies.exceptions import InvalidViaPath
 from baserow.contrib.database.fields.field_cache import FieldCache
@@ -71,6 +71,31 @@ class PathBasedUpdateStatementCollector:
             qs = qs.filter(**{path_to_starting_table_id_column: starting_row_id})
         qs.update(**self.update_statements)
 
+        if self.table.search_index_enabled and self.update_statements:
+            self._update_search_index(
+                model, qs, path_to_starting_table, starting_row_id
+            )
+
+    def _update_search_index(
+        self,
+        model: Type[GeneratedTableModel],
+        qs: QuerySet,
+        path_to_starting_table: List[str],
+        starting_row_id: Optional[int],
+    ):
+        from baserow.contrib.database.table.search_index import (
+            invalidate_search_index,
+            update_search_index,
+        )
+
+        if starting_row_id is None:
+            # All the rows have been updated, so the index is rebuilt in the
+            # background instead.
+            invalidate_search_index(self.table)
+        elif path_to_starting_table:
+            # The rows of the starting table are updated by the row handler.
+            update_search_index(model, qs.values("id"))
+
 
 class CachingFieldUpdateCollector(FieldCache):
     """
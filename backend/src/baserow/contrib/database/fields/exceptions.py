@@ -148,3 +148,11 @@ class InvalidLookupTargetField(Exception):
 
 class IncompatibleFieldTypeForUniqueValues(Exception):
     """Raised when the unique values of an incompatible field are requested."""
+
+
+class IncompatibleFieldTypeForUpsert(Exception):
+    """Raised when rows are upserted using the values of an incompatible field."""
+
+
+class IncompatibleFieldTypeForIndex(Exception):
+    """Raised when a field whose type doesn't support an index is indexed."""
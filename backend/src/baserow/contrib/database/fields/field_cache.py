@@ -1,9 +1,13 @@
 from collections import defaultdict
-from typing import Optional, Type
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Optional, Type
 
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Model
 
+from baserow.core.db import get_specific_instances
+
 
 class FieldCache:
     """
@@ -13,6 +17,10 @@ class FieldCache:
     return it, otherwise if the field does not exist None will be returned.
 
     Trashed fields are excluded from the cache.
+
+    When a shared field cache is active, see `shared_field_cache`, the specific
+    fields which are not in this cache yet are looked up in, and added to, the shared
+    cache first, so that they are fetched at most once per request or task.
     """
 
     def __init__(
@@ -48,15 +56,61 @@ class FieldCache:
             self._model_cache[table_id] = table.get_model()
         return self._model_cache[table_id]
 
+    def get_cached_model(self, table_id: int) -> Optional[Type[Model]]:
+        return self._model_cache.get(table_id)
+
+    def uncache_table(self, table_id: int):
+        """
+        Removes all the cached fields of the table and all the cached models from the
+        cache. All models are removed because the models of other tables can contain
+        the model of this table via link row fields.
+
+        :param table_id: The table that has changed.
+        """
+
+        self._cached_field_by_name_per_table.pop(table_id, None)
+        self._model_cache.clear()
+
     def uncache_field(self, field):
         return self._cached_field_by_name_per_table[field.table_id].pop(
             field.name, None
         )
 
+    def _get_shared_cache(self) -> Optional["FieldCache"]:
+        shared_cache = get_shared_field_cache()
+        if (
+            shared_cache is None
+            or shared_cache._cached_field_by_name_per_table
+            is self._cached_field_by_name_per_table
+        ):
+            return None
+        return shared_cache
+
+    def _get_cached_specific(self, field):
+        cached_field = self._cached_field_by_name_per_table[field.table_id].get(
+            field.name
+        )
+        if cached_field is not None and cached_field.id == field.id:
+            return cached_field
+        return None
+
     def cache_field(self, field):
         if not field.trashed:
             cached_fields = self._cached_field_by_name_per_table[field.table_id]
 
+            shared_cache = self._get_shared_cache()
+            if shared_cache is not None and not _is_specific(field):
+                # Only non-specific fields are resolved using the shared cache because
+                # a provided specific field can have changes which are not in the
+                # shared cache.
+                specific_field = shared_cache._get_cached_specific(field)
+                if specific_field is None:
+                    specific_field = shared_cache.cache_field(field)
+                if specific_field is None:
+                    return None
+                cached_fields[field.name] = specific_field
+                return specific_field
+
             try:
                 specific_field = field.specific
             except ObjectDoesNotExist:
@@ -67,6 +121,36 @@ class FieldCache:
         else:
             return None
 
+    def cache_fields(self, fields: Iterable):
+        """
+        Caches the specific version of multiple fields at once. The specific
+        instances of the fields which haven't been cached yet are fetched using one
+        query per field type instead of one query per field.
+
+        :param fields: The specific or non-specific fields to cache.
+        """
+
+        fields_to_cache = [
+            field
+            for field in fields
+            if not field.trashed
+            and field.name not in self._cached_field_by_name_per_table[field.table_id]
+        ]
+
+        shared_cache = self._get_shared_cache()
+        if shared_cache is not None:
+            non_specific_fields = [
+                field for field in fields_to_cache if not _is_specific(field)
+            ]
+            shared_cache.cache_fields(non_specific_fields)
+            for field in non_specific_fields:
+                specific_field = shared_cache._get_cached_specific(field)
+                if specific_field is not None:
+                    field.specific = specific_field
+
+        for specific_field in get_specific_instances(fields_to_cache):
+            self.cache_field(specific_field)
+
     def lookup_specific(self, non_specific_field):
         try:
             return self._cached_field_by_name_per_table[non_specific_field.table_id][
@@ -83,3 +167,72 @@ class FieldCache:
                 return self.cache_field(table.field_set.get(name=field_name))
             except ObjectDoesNotExist:
                 return None
+
+
+def _is_specific(field) -> bool:
+    if "specific" in field.__dict__:
+        return True
+    specific_class = field.specific_class
+    return specific_class is None or isinstance(field, specific_class)
+
+
+_shared_field_cache: ContextVar[Optional[FieldCache]] = ContextVar(
+    "shared_field_cache", default=None
+)
+
+
+def get_shared_field_cache() -> Optional[FieldCache]:
+    """
+    :return: The field cache shared by everything running in the current request or
+        Celery task, or None if no shared field cache is active.
+    """
+
+    return _shared_field_cache.get()
+
+
+@contextmanager
+def shared_field_cache():
+    """
+    Shares a single field cache between all handlers and signal receivers running
+    within the block. Generated table models, see `Table.get_model`, and specific
+    fields are then only fetched once. When the model of a table is invalidated, the
+    fields of that table and all the models are removed from the shared cache.
+
+    Does nothing if a shared field cache is already active.
+    """
+
+    if _shared_field_cache.get() is not None:
+        yield _shared_field_cache.get()
+        return
+
+    token = _shared_field_cache.set(FieldCache())
+    try:
+        yield _shared_field_cache.get()
+    finally:
+        _shared_field_cache.reset(token)
+
+
+_shared_field_cache_task_tokens: Dict[str, object] = {}
+
+
+# noinspection PyUnusedLocal
+def enter_shared_field_cache_for_task(task_id=None, **kwargs):
+    """
+    Activates a shared field cache for the duration of a Celery task. Must be
+    connected to the `task_prerun` Celery signal.
+    """
+
+    if _shared_field_cache.get() is None:
+        _shared_field_cache_task_tokens[task_id] = _shared_field_cache.set(FieldCache())
+
+
+# noinspection PyUnusedLocal
+def exit_shared_field_cache_for_task(task_id=None, **kwargs):
+    """
+    Deactivates the shared field cache activated for the Celery task. Must be
+    connected to the `task_postrun` Celery signal.
+    """
+
+    token = _shared_field_cache_task_tokens.pop(task_id, None)
+    if token is not None:
+        _shared_field_cache.reset(token)
@@ -22,6 +22,7 @@ from pytz import timezone
 from rest_framework import serializers
 
 from baserow.contrib.database.export_serialized import DatabaseExportSerializedStructure
+from baserow.contrib.database.db.bulk_copy import add_pending_many_to_many_values
 from baserow.contrib.database.api.fields.errors import (
     ERROR_LINK_ROW_TABLE_NOT_IN_SAME_DATABASE,
     ERROR_LINK_ROW_TABLE_NOT_PROVIDED,
@@ -126,6 +127,9 @@ class TextFieldMatchingRegexFieldType(FieldType, ABC):
           altering a column to being an email type.
     """
 
+    can_upsert_by = True
+    can_have_trigram_index = True
+
     @property
     @abstractmethod
     def regex(self):
@@ -204,6 +208,8 @@ class CharFieldMatchingRegexFieldType(TextFieldMatchingRegexFieldType):
           altering a column to being an email type.
     """
 
+    can_have_db_index = True
+
     @property
     @abstractmethod
     def max_length(self):
@@ -229,6 +235,8 @@ class CharFieldMatchingRegexFieldType(TextFieldMatchingRegexFieldType):
 
 class TextFieldType(FieldType):
     type = "text"
+    can_upsert_by = True
+    can_have_trigram_index = True
     model_class = TextField
     allowed_fields = ["text_default"]
     serializer_field_names = ["text_default"]
@@ -268,6 +276,7 @@ class TextFieldType(FieldType):
 class LongTextFieldType(FieldType):
     type = "long_text"
     model_class = LongTextField
+    can_have_trigram_index = True
 
     def get_serializer_field(self, instance, **kwargs):
         required = kwargs.get("required", False)
@@ -317,6 +326,8 @@ class NumberFieldType(FieldType):
     MAX_DIGITS = 50
 
     type = "number"
+    can_upsert_by = True
+    can_have_db_index = True
     model_class = NumberField
     allowed_fields = ["number_decimal_places", "number_negative"]
     serializer_field_names = ["number_decimal_places", "number_negative", "number_type"]
@@ -451,6 +462,7 @@ class NumberFieldType(FieldType):
 
 class RatingFieldType(FieldType):
     type = "rating"
+    can_have_db_index = True
     model_class = RatingField
     allowed_fields = ["max_value", "color", "style"]
     serializer_field_names = ["max_value", "color", "style"]
@@ -615,6 +627,7 @@ class BooleanFieldType(FieldType):
 
 class DateFieldType(FieldType):
     type = "date"
+    can_have_db_index = True
     model_class = DateField
     allowed_fields = ["date_format", "date_include_time", "date_time_format"]
     serializer_field_names = ["date_format", "date_include_time", "date_time_format"]
@@ -975,6 +988,7 @@ class LinkRowFieldType(FieldType):
 
     type = "link_row"
     model_class = LinkRowField
+    value_depends_on_other_rows = True
     allowed_fields = [
         "link_row_table",
         "link_row_related_field",
@@ -1216,6 +1230,9 @@ class LinkRowFieldType(FieldType):
         apps.do_pending_operations(model_field.remote_field.through)
         apps.clear_cache()
 
+    def get_related_model_table_ids(self, instance):
+        return [instance.link_row_table_id]
+
     def prepare_values(self, values, user):
         """
         This method checks if the provided link row table is an int because then it
@@ -1483,7 +1500,8 @@ class LinkRowFieldType(FieldType):
     def set_import_serialized_value(
         self, row, field_name, value, id_mapping, files_zip, storage
     ):
-        getattr(row, field_name).set(value)
+        # The relations are copied into the through table together with the row.
+        add_pending_many_to_many_values(row, field_name, value)
 
     def get_other_fields_to_trash_restore_always_together(self, field) -> List[Any]:
         return [field.link_row_related_field]
@@ -2304,7 +2322,8 @@ class MultipleSelectFieldType(SelectOptionBaseFieldType):
         mapped_values = [
             id_mapping["database_field_select_options"][item] for item in value
         ]
-        getattr(row, field_name).set(mapped_values)
+        # The relations are copied into the through table together with the row.
+        add_pending_many_to_many_values(row, field_name, mapped_values)
 
     def contains_query(self, field_name, value, model_field, field):
         value = value.strip()
@@ -2410,6 +2429,7 @@ class FormulaFieldType(ReadOnlyFieldType):
     can_be_primary_field = False
     can_be_in_form_view = False
     field_data_is_derived_from_attrs = True
+    value_depends_on_other_rows = True
 
     CORE_FORMULA_FIELDS = [
         "formula",
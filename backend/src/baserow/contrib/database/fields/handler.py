@@ -56,6 +56,7 @@ from .exceptions import (
     InvalidBaserowFieldName,
     MaxFieldNameLengthExceeded,
     IncompatibleFieldTypeForUniqueValues,
+    IncompatibleFieldTypeForIndex,
 )
 from .models import Field, SelectOption, SpecificFieldForUpdate
 from .registries import (
@@ -365,6 +366,9 @@ class FieldHandler:
             new_model_class = to_field_type.model_class
             field.change_polymorphic_type_to(new_model_class)
 
+            if not to_field_type.can_have_db_index:
+                field.db_index = False
+
             # If the field type changes it could be that some dependencies,
             # like filters or sortings need to be changed.
             ViewHandler().field_type_changed(field)
@@ -406,6 +410,19 @@ class FieldHandler:
             user,
         )
 
+        if baserow_field_type_changed:
+            # The indexes of the field would be rebuilt when the column is altered.
+            # They're created again afterwards if the field still needs them.
+            from baserow.contrib.database.fields.indexes import (
+                drop_field_index_of_field,
+            )
+            from baserow.contrib.database.fields.trigram_indexes import (
+                drop_trigram_index_of_field,
+            )
+
+            drop_field_index_of_field(old_field)
+            drop_trigram_index_of_field(old_field)
+
         # Try to find a data converter that can be applied.
         converter = field_converter_registry.find_applicable_converter(
             from_model, old_field, field
@@ -859,6 +876,39 @@ class FieldHandler:
             else:
                 raise e
 
+    def update_field_index(
+        self, user: AbstractUser, field: Field, db_index: bool
+    ) -> Field:
+        """
+        Enables or disables the B-tree index on the column of the field. The index is
+        created or dropped concurrently by a background task after the transaction
+        commits.
+
+        :param user: The user on whose behalf the index is changed.
+        :param field: The field whose index must be changed.
+        :param db_index: Indicates whether the field must be indexed.
+        :raises IncompatibleFieldTypeForIndex: When the field type doesn't support
+            an index.
+        :return: The updated field instance.
+        """
+
+        from .indexes import schedule_field_index_sync
+
+        group = field.table.database.group
+        group.has_user(user, raise_error=True)
+
+        field_type = field_type_registry.get_by_model(field.specific_class)
+        if db_index and not field_type.can_have_db_index:
+            raise IncompatibleFieldTypeForIndex(
+                f"The field type `{field_type.type}` can't be indexed."
+            )
+
+        field.db_index = db_index
+        field.save(update_fields=["db_index"])
+        schedule_field_index_sync(field.table_id)
+
+        return field
+
     def get_unique_row_values(
         self, field: Field, limit: int, split_comma_separated: bool = False
     ) -> List[str]:
@@ -0,0 +1,308 @@
+"""
+Manages B-tree indexes on the columns of fields, which speed up sorting and filtering
+the rows of large tables by those fields.
+
+Generated tables only have an index on their `order` and `id` columns, so sorting or
+filtering the rows by a field results in a sequential scan of the table. An index
+exists for every field with `db_index`, which is managed by the user, and, if the
+AUTO_CREATE_FIELD_INDEXES setting is enabled, for every field recommended by the
+advisor. The advisor recommends the fields of tables with at least
+FIELD_INDEX_MIN_ROW_COUNT rows which are used by the sorts or by the filters of non
+trashed views that can use an index.
+
+Like the trigram indexes, the indexes are created and dropped `CONCURRENTLY` by a
+background task which compares the indexes which should exist with the ones that do.
+When the type of a field changes its index is dropped right away, because it would
+otherwise be rebuilt when the column is altered.
+"""
+
+import re
+from typing import Dict, List, NamedTuple, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count
+from django.dispatch import receiver
+
+from baserow.contrib.database.table.models import Table
+from baserow.contrib.database.views import signals as view_signals
+
+from . import signals as field_signals
+from .models import Field
+from .trigram_indexes import execute_index_statement
+
+FIELD_INDEX_SUFFIX = "_idx"
+# The view filter types whose filters compare the column of the field with a value in
+# a way that can use a B-tree index.
+FIELD_INDEX_FILTER_TYPES = [
+    "equal",
+    "higher_than",
+    "lower_than",
+    "date_before",
+    "date_after",
+]
+
+
+class FieldIndexRecommendation(NamedTuple):
+    field: Field
+    # The amount of non trashed views sorting and filtering by the field.
+    sort_count: int
+    filter_count: int
+
+
+def get_field_index_name(table_id: int, field_id: int) -> str:
+    return (
+        f"{Table.USER_TABLE_DATABASE_NAME_PREFIX}{table_id}_field_{field_id}"
+        f"{FIELD_INDEX_SUFFIX}"
+    )
+
+
+def field_index_sync_scheduled_key(table_id: int) -> str:
+    return f"field_index_sync_scheduled_{table_id}"
+
+
+def get_field_index_recommendations(table: Table) -> List[FieldIndexRecommendation]:
+    """
+    Recommends indexing the fields of the table which are used by the sorts and
+    filters of its views, if the table has enough rows for the index to be worth
+    slowing down writing the rows. The fields that already have `db_index` are not
+    recommended.
+
+    :param table: The table whose fields must be checked.
+    :return: The recommendations, the fields used by the most views first.
+    """
+
+    from baserow.contrib.database.rows.counts import get_table_row_count
+    from baserow.contrib.database.views.models import ViewFilter, ViewSort
+
+    from .registries import field_type_registry
+
+    row_count = get_table_row_count(table.get_model(field_ids=[]))
+    if row_count < settings.FIELD_INDEX_MIN_ROW_COUNT:
+        return []
+
+    def count_views(queryset):
+        return dict(
+            queryset.filter(view__table_id=table.id, view__trashed=False)
+            .values("field_id")
+            .annotate(count=Count("view_id", distinct=True))
+            .values_list("field_id", "count")
+        )
+
+    sort_counts = count_views(ViewSort.objects.all())
+    filter_counts = count_views(
+        ViewFilter.objects.filter(type__in=FIELD_INDEX_FILTER_TYPES)
+    )
+    fields = Field.objects.filter(
+        id__in=set(sort_counts) | set(filter_counts),
+        table_id=table.id,
+        trashed=False,
+        db_index=False,
+    )
+
+    recommendations = [
+        FieldIndexRecommendation(
+            field.specific,
+            sort_counts.get(field.id, 0),
+            filter_counts.get(field.id, 0),
+        )
+        for field in fields
+        if field_type_registry.get_by_model(field.specific_class).can_have_db_index
+    ]
+    recommendations.sort(key=lambda r: (-(r.sort_count + r.filter_count), r.field.id))
+    return recommendations
+
+
+def get_fields_needing_index(table: Table) -> Set[int]:
+    """
+    :param table: The table whose fields must be checked.
+    :return: The ids of the non trashed fields of the table which have `db_index`
+        or, if enabled, are recommended by the advisor.
+    """
+
+    from .registries import field_type_registry
+
+    fields = Field.objects.filter(table_id=table.id, trashed=False, db_index=True)
+    field_ids = {
+        field.id
+        for field in fields
+        if field_type_registry.get_by_model(field.specific_class).can_have_db_index
+    }
+
+    if settings.AUTO_CREATE_FIELD_INDEXES:
+        field_ids |= {
+            recommendation.field.id
+            for recommendation in get_field_index_recommendations(table)
+        }
+
+    return field_ids
+
+
+def get_existing_field_indexes(table_id: int) -> Dict[str, bool]:
+    """
+    :param table_id: The table whose field indexes must be returned.
+    :return: The names of the field indexes on the table with whether the index is
+        valid. A concurrently created index is invalid if its creation failed.
+    """
+
+    table_name = f"{Table.USER_TABLE_DATABASE_NAME_PREFIX}{table_id}"
+    index_name_regex = re.compile(
+        rf"{re.escape(table_name)}_field_\d+{re.escape(FIELD_INDEX_SUFFIX)}"
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT index_class.relname, pg_index.indisvalid
+            FROM pg_index
+            JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+            JOIN pg_class table_class ON table_class.oid = pg_index.indrelid
+            WHERE table_class.relname = %s
+            AND pg_table_is_visible(table_class.oid)
+            """,
+            [table_name],
+        )
+        return {
+            index_name: valid
+            for index_name, valid in cursor.fetchall()
+            if index_name_regex.fullmatch(index_name)
+        }
+
+
+def field_index_exists(field: Field) -> bool:
+    """
+    :param field: The field whose index must be checked.
+    :return: Whether the index of the field has been created and can be used.
+    """
+
+    index_name = get_field_index_name(field.table_id, field.id)
+    return get_existing_field_indexes(field.table_id).get(index_name, False)
+
+
+def create_field_index(table_id: int, field_id: int):
+    # The rows are sorted with the empty values first, so the index is created in
+    # the same order to be usable for sorting in both directions.
+    quote_name = connection.ops.quote_name
+    execute_index_statement(
+        f"CREATE INDEX {{concurrently}}IF NOT EXISTS "
+        f"{quote_name(get_field_index_name(table_id, field_id))} "
+        f"ON {quote_name(f'{Table.USER_TABLE_DATABASE_NAME_PREFIX}{table_id}')} "
+        f"({quote_name(f'field_{field_id}')} NULLS FIRST)"
+    )
+
+
+def drop_field_index(index_name: str):
+    execute_index_statement(
+        f"DROP INDEX {{concurrently}}IF EXISTS {connection.ops.quote_name(index_name)}"
+    )
+
+
+def drop_field_index_of_field(field: Field):
+    """
+    Drops the index of the field, if it has one, in the current transaction. Must be
+    called before the column of the field is altered.
+
+    :param field: The field whose index must be dropped.
+    """
+
+    index_name = get_field_index_name(field.table_id, field.id)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP INDEX IF EXISTS {connection.ops.quote_name(index_name)}")
+
+
+def sync_field_indexes(table_id: int):
+    """
+    Creates the indexes that the fields of the table need and drops the ones that
+    they don't need anymore. The indexes are created and dropped concurrently if
+    this is called outside of a transaction.
+
+    :param table_id: The table whose field indexes must be synced.
+    """
+
+    # Deleted before the fields are selected, so that the changes committed while
+    # this runs schedule the task again.
+    cache.delete(field_index_sync_scheduled_key(table_id))
+
+    try:
+        table = Table.objects.get(id=table_id)
+    except Table.DoesNotExist:
+        return
+
+    needed = {
+        get_field_index_name(table_id, field_id): field_id
+        for field_id in get_fields_needing_index(table)
+    }
+    existing = get_existing_field_indexes(table_id)
+
+    for index_name, valid in existing.items():
+        if index_name not in needed or not valid:
+            drop_field_index(index_name)
+
+    for index_name, field_id in needed.items():
+        if not existing.get(index_name, False):
+            create_field_index(table_id, field_id)
+
+
+def schedule_field_index_sync(table_id: int):
+    """
+    Schedules the task syncing the field indexes of the table when the current
+    transaction commits. The task is not scheduled again while it's waiting to be
+    executed.
+
+    :param table_id: The table whose fields, views, sorts or filters have changed.
+    """
+
+    from baserow.contrib.database.fields.tasks import (
+        sync_field_indexes as sync_field_indexes_task,
+    )
+
+    def schedule():
+        if cache.add(
+            field_index_sync_scheduled_key(table_id),
+            True,
+            timeout=settings.CELERY_TIME_LIMIT,
+        ):
+            sync_field_indexes_task.delay(table_id)
+
+    transaction.on_commit(schedule)
+
+
+def view_usage_changed(table_id: int):
+    # Only the recommended fields depend on the sorts and filters of the views.
+    if settings.AUTO_CREATE_FIELD_INDEXES:
+        schedule_field_index_sync(table_id)
+
+
+@receiver(view_signals.view_sort_created)
+@receiver(view_signals.view_sort_updated)
+@receiver(view_signals.view_sort_deleted)
+def view_sort_changed(sender, view_sort, **kwargs):
+    view_usage_changed(view_sort.view.table_id)
+
+
+@receiver(view_signals.view_filter_created)
+@receiver(view_signals.view_filter_updated)
+@receiver(view_signals.view_filter_deleted)
+def view_filter_changed(sender, view_filter, **kwargs):
+    view_usage_changed(view_filter.view.table_id)
+
+
+@receiver(view_signals.view_created)
+@receiver(view_signals.view_deleted)
+def view_created_or_deleted(sender, view, **kwargs):
+    view_usage_changed(view.table_id)
+
+
+@receiver(field_signals.field_updated)
+@receiver(field_signals.field_deleted)
+@receiver(field_signals.field_restored)
+def field_changed(sender, field, **kwargs):
+    from .handler import FieldHandler
+
+    # The field updated signals sent by update collectors only indicate that the
+    # values of the field have changed.
+    if isinstance(sender, FieldHandler) and (
+        field.db_index or settings.AUTO_CREATE_FIELD_INDEXES
+    ):
+        schedule_field_index_sync(field.table_id)
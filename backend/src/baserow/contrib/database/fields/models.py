@@ -80,6 +80,11 @@ class Field(
         help_text="Indicates if the field is a primary field. If `true` the field "
         "cannot be deleted and the value should represent the whole row.",
     )
+    db_index = models.BooleanField(
+        default=False,
+        help_text="Indicates whether a B-tree index is maintained on the column of "
+        "this field to speed up sorting and filtering by it.",
+    )
     content_type = models.ForeignKey(
         ContentType,
         verbose_name="content type",
@@ -91,6 +91,34 @@ class FieldType(
     `FieldHandler::get_unique_row_values` method.
     """
 
+    can_upsert_by = False
+    """
+    Indicates whether the values of this field can be used to match existing rows
+    when rows are upserted using the `RowHandler::upsert_rows` method.
+    """
+
+    can_have_trigram_index = False
+    """
+    Indicates whether a trigram index can be created on the column of this field to
+    speed up the `contains` view filter. Only field types whose `contains_query`
+    compiles to an `icontains` lookup on their own text column should set this.
+    """
+
+    can_have_db_index = False
+    """
+    Indicates whether a B-tree index can be created on the column of this field to
+    speed up sorting and filtering by it. Only field types storing small values
+    directly in their own column should set this, because a B-tree index can't
+    contain values larger than a few kilobytes.
+    """
+
+    value_depends_on_other_rows = False
+    """
+    Indicates whether the value of a row can change because other rows change, like
+    the values of link row or formula fields. The aggregations of such fields can't
+    be updated using only the changed rows.
+    """
+
     read_only = False
     """Indicates whether the field allows inserting/updating row values or if it is
     read only."""
@@ -320,6 +348,20 @@ class FieldType(
         :type manytomany_models: dict
         """
 
+    # noinspection PyMethodMayBeStatic
+    def get_related_model_table_ids(self, instance: Field) -> List[int]:
+        """
+        Should return the ids of the tables whose models are generated in the
+        `after_model_generation` method of this field. This is used to fetch the
+        cached field attrs of all the related tables at once when a model is
+        generated.
+
+        :param instance: The field instance object.
+        :return: A list of table ids.
+        """
+
+        return []
+
     def random_value(self, instance, fake, cache):
         """
         Should return a random value that can be used as value for the field. This is
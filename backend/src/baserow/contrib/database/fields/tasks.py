@@ -0,0 +1,33 @@
+from baserow.config.celery import app
+
+
+# noinspection PyUnusedLocal
+@app.task(bind=True, queue="export")
+def sync_trigram_indexes(self, table_id: int):
+    """
+    Creates and drops the trigram indexes of the fields of a table depending on which
+    fields are used by `contains` view filters.
+
+    :param table_id: The table whose trigram indexes must be synced.
+    """
+
+    from baserow.contrib.database.fields.trigram_indexes import (
+        sync_trigram_indexes as sync,
+    )
+
+    sync(table_id)
+
+
+# noinspection PyUnusedLocal
+@app.task(bind=True, queue="export")
+def sync_field_indexes(self, table_id: int):
+    """
+    Creates and drops the B-tree indexes of the fields of a table depending on which
+    fields are indexed by the user or recommended by the advisor.
+
+    :param table_id: The table whose field indexes must be synced.
+    """
+
+    from baserow.contrib.database.fields.indexes import sync_field_indexes as sync
+
+    sync(table_id)
@@ -0,0 +1,247 @@
+"""
+Manages `pg_trgm` GIN indexes on the columns of text-like fields which are filtered
+using the `contains` view filter.
+
+The `contains` filter compiles to `UPPER("field_1"::text) LIKE UPPER('%value%')`,
+which can't use a regular B-tree index, so filtering a view of a large table results
+in a sequential scan. An index on that exact expression using the `gin_trgm_ops`
+operator class can be used by PostgreSQL instead.
+
+Because every index slows down writing the rows of the table, an index only exists
+for the fields which are used by a `contains` filter of a non trashed view. Every
+time the filters, views or fields of a table change, the `sync_trigram_indexes` task
+compares the indexes which should exist with the ones that do and creates or drops
+them `CONCURRENTLY`, so that the rows of the table can still be changed meanwhile.
+When the type of a field changes its index is dropped right away, because it would
+otherwise be rebuilt when the column is altered.
+"""
+
+import logging
+from typing import Dict, Set
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection, transaction
+from django.dispatch import receiver
+
+from baserow.contrib.database.table.models import Table
+from baserow.contrib.database.views import signals as view_signals
+
+from . import signals as field_signals
+from .models import Field
+
+logger = logging.getLogger(__name__)
+
+TRIGRAM_INDEX_SUFFIX = "_trgm"
+# The view filter types whose filters can use the trigram index of the field.
+TRIGRAM_INDEX_FILTER_TYPES = ["contains"]
+
+
+def get_trigram_index_name(table_id: int, field_id: int) -> str:
+    return (
+        f"{Table.USER_TABLE_DATABASE_NAME_PREFIX}{table_id}_field_{field_id}"
+        f"{TRIGRAM_INDEX_SUFFIX}"
+    )
+
+
+def trigram_index_sync_scheduled_key(table_id: int) -> str:
+    return f"trigram_index_sync_scheduled_{table_id}"
+
+
+def get_fields_needing_trigram_index(table_id: int) -> Set[int]:
+    """
+    :param table_id: The table whose fields must be checked.
+    :return: The ids of the non trashed fields of the table which support a trigram
+        index and are used by a `contains` filter of a non trashed view.
+    """
+
+    from baserow.contrib.database.views.models import ViewFilter
+
+    from .registries import field_type_registry
+
+    field_ids = ViewFilter.objects.filter(
+        view__table_id=table_id,
+        view__trashed=False,
+        type__in=TRIGRAM_INDEX_FILTER_TYPES,
+    ).values("field_id")
+    fields = Field.objects.filter(id__in=field_ids, table_id=table_id, trashed=False)
+
+    return {
+        field.id
+        for field in fields
+        if field_type_registry.get_by_model(field.specific_class).can_have_trigram_index
+    }
+
+
+def get_existing_trigram_indexes(table_id: int) -> Dict[str, bool]:
+    """
+    :param table_id: The table whose trigram indexes must be returned.
+    :return: The names of the trigram indexes on the table with whether the index
+        is valid. A concurrently created index is invalid if its creation failed.
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT index_class.relname, pg_index.indisvalid
+            FROM pg_index
+            JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid
+            JOIN pg_class table_class ON table_class.oid = pg_index.indrelid
+            WHERE table_class.relname = %s
+            AND pg_table_is_visible(table_class.oid)
+            AND index_class.relname LIKE %s
+            """,
+            [
+                f"{Table.USER_TABLE_DATABASE_NAME_PREFIX}{table_id}",
+                f"%{TRIGRAM_INDEX_SUFFIX}",
+            ],
+        )
+        return dict(cursor.fetchall())
+
+
+def execute_index_statement(sql: str):
+    # Indexes can only be created and dropped concurrently outside of a transaction.
+    concurrently = "" if connection.in_atomic_block else "CONCURRENTLY "
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(concurrently=concurrently))
+
+
+def create_trigram_index(table_id: int, field_id: int):
+    quote_name = connection.ops.quote_name
+    execute_index_statement(
+        f"CREATE INDEX {{concurrently}}IF NOT EXISTS "
+        f"{quote_name(get_trigram_index_name(table_id, field_id))} "
+        f"ON {quote_name(f'{Table.USER_TABLE_DATABASE_NAME_PREFIX}{table_id}')} "
+        f"USING gin ((UPPER({quote_name(f'field_{field_id}')}::text)) "
+        f"gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(index_name: str):
+    execute_index_statement(
+        f"DROP INDEX {{concurrently}}IF EXISTS {connection.ops.quote_name(index_name)}"
+    )
+
+
+def drop_trigram_index_of_field(field: Field):
+    """
+    Drops the trigram index of the field, if it has one, in the current
+    transaction. Must be called before the column of the field is altered.
+
+    :param field: The field whose index must be dropped.
+    """
+
+    index_name = get_trigram_index_name(field.table_id, field.id)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DROP INDEX IF EXISTS {connection.ops.quote_name(index_name)}")
+
+
+def ensure_trigram_extension() -> bool:
+    """
+    Creates the `pg_trgm` extension if it doesn't exist yet.
+
+    :return: Whether the extension is available.
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone():
+            return True
+        try:
+            with transaction.atomic():
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except DatabaseError as e:
+            logger.warning(
+                f"The pg_trgm extension could not be created, so no trigram indexes "
+                f"are created: {e}"
+            )
+            return False
+    return True
+
+
+def sync_trigram_indexes(table_id: int):
+    """
+    Creates the trigram indexes that the fields of the table need and drops the ones
+    that they don't need anymore. The indexes are created and dropped concurrently
+    if this is called outside of a transaction.
+
+    :param table_id: The table whose trigram indexes must be synced.
+    """
+
+    # Deleted before the filters are selected, so that the changes committed while
+    # this runs schedule the task again.
+    cache.delete(trigram_index_sync_scheduled_key(table_id))
+
+    if not Table.objects.filter(id=table_id).exists():
+        return
+
+    needed = {
+        get_trigram_index_name(table_id, field_id): field_id
+        for field_id in get_fields_needing_trigram_index(table_id)
+    }
+    existing = get_existing_trigram_indexes(table_id)
+
+    for index_name, valid in existing.items():
+        if index_name not in needed or not valid:
+            drop_trigram_index(index_name)
+
+    to_create = [
+        field_id
+        for index_name, field_id in needed.items()
+        if not existing.get(index_name, False)
+    ]
+    if to_create and ensure_trigram_extension():
+        for field_id in to_create:
+            create_trigram_index(table_id, field_id)
+
+
+def schedule_trigram_index_sync(table_id: int):
+    """
+    Schedules the task syncing the trigram indexes of the table when the current
+    transaction commits. The task is not scheduled again while it's waiting to be
+    executed.
+
+    :param table_id: The table whose filters, views or fields have changed.
+    """
+
+    if settings.DISABLE_TRIGRAM_INDEXES:
+        return
+
+    from baserow.contrib.database.fields.tasks import (
+        sync_trigram_indexes as sync_trigram_indexes_task,
+    )
+
+    def schedule():
+        if cache.add(
+            trigram_index_sync_scheduled_key(table_id),
+            True,
+            timeout=settings.CELERY_TIME_LIMIT,
+        ):
+            sync_trigram_indexes_task.delay(table_id)
+
+    transaction.on_commit(schedule)
+
+
+@receiver(view_signals.view_filter_created)
+@receiver(view_signals.view_filter_updated)
+@receiver(view_signals.view_filter_deleted)
+def view_filter_changed(sender, view_filter, **kwargs):
+    schedule_trigram_index_sync(view_filter.view.table_id)
+
+
+@receiver(view_signals.view_created)
+@receiver(view_signals.view_deleted)
+def view_created_or_deleted(sender, view, **kwargs):
+    schedule_trigram_index_sync(view.table_id)
+
+
+@receiver(field_signals.field_updated)
+@receiver(field_signals.field_deleted)
+@receiver(field_signals.field_restored)
+def field_changed(sender, field, **kwargs):
+    from .handler import FieldHandler
+
+    # The field updated signals sent by update collectors only indicate that the
+    # values of the field have changed.
+    if isinstance(sender, FieldHandler):
+        schedule_trigram_index_sync(field.table_id)
@@ -1,7 +1,18 @@
-from typing import Type, Dict, Set, Optional
-
+import copy
+import functools
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Type, Dict, Set, Optional, List
+
+from django.conf import settings
+from django.db import connection, transaction
 from django.db.models import Model, Expression, Q
 
+from baserow.contrib.database.fields.dependencies.graph import (
+    FieldDependencyGraph,
+    load_field_dependency_graphs,
+)
 from baserow.contrib.database.fields.dependencies.types import FieldDependencies
 from baserow.contrib.database.fields.field_cache import FieldCache
 from baserow.contrib.database.formula import (
@@ -17,10 +28,12 @@ from baserow.contrib.database.formula.expression_generator.generator import (
     baserow_expression_to_single_row_update_django_expression,
     baserow_expression_to_insert_django_expression,
 )
+from baserow.contrib.database.formula.parser.exceptions import MaximumFormulaSizeError
 from baserow.contrib.database.formula.parser.ast_mapper import (
     raw_formula_to_untyped_expression,
 )
 from baserow.contrib.database.formula.parser.parser import get_parse_tree_for_formula
+from baserow.contrib.database.formula.registries import formula_function_registry
 from baserow.contrib.database.formula.parser.update_field_names import (
     update_field_names,
 )
@@ -39,29 +52,85 @@ from baserow.contrib.database.formula.types.visitors import (
     FunctionsUsedVisitor,
     FieldReferenceExtractingVisitor,
 )
-from baserow.core.db import LockedAtomicTransaction
+from baserow.contrib.database.table.cache import invalidate_table_in_model_cache
 
 
-def _recalculate_depth_first(f, already_recalculated, field_lookup_cache):
-    from baserow.contrib.database.fields.models import FormulaField
+def _recalculate_database_formulas(
+    graph: FieldDependencyGraph, outdated_formula_ids: List[int]
+) -> int:
+    """
+    Recalculates the outdated formulas of a single database, and all the formulas
+    depending on them, in dependency order in a single transaction.
 
-    recalculated_dependant = False
-    if f.id in already_recalculated:
-        return True
-    for dep in f.field_dependencies.all():
-        recalculated_dependant = recalculated_dependant or _recalculate_depth_first(
-            dep, already_recalculated, field_lookup_cache
+    :param graph: The dependency graph of the database.
+    :param outdated_formula_ids: The ids of the formulas in the database which are
+        not at the latest formula version.
+    :return: The number of recalculated formulas.
+    """
+
+    from baserow.contrib.database.fields.models import Field, FormulaField
+
+    with transaction.atomic():
+        # Concurrent processes recalculating the same database wait for each other
+        # here, after which the formulas which are still outdated are rechecked.
+        outdated_formula_ids = list(
+            FormulaField.objects.filter(id__in=outdated_formula_ids)
+            .exclude(version=FormulaHandler.BASEROW_FORMULA_VERSION)
+            .select_for_update(of=("self",))
+            .values_list("id", flat=True)
+        )
+        if not outdated_formula_ids:
+            return 0
+
+        field_cache = FieldCache()
+        field_cache.cache_fields(
+            Field.objects.filter(table__database_id=graph.database_id).select_related(
+                "table"
+            )
         )
 
-    f = field_lookup_cache.lookup_specific(f)
+        recalculated = []
+        for field_id in graph.get_update_order(
+            outdated_formula_ids, include_changed=True
+        ):
+            field = graph.get_field(field_id)
+            if field is None:
+                continue
+            field = field_cache.lookup_specific(field)
+            if isinstance(field, FormulaField):
+                field.recalculate_internal_fields(field_lookup_cache=field_cache)
+                recalculated.append(field)
+
+        FormulaField.objects.bulk_update(
+            recalculated,
+            [
+                model_field.name
+                for model_field in FormulaField._meta.local_concrete_fields
+                if not model_field.primary_key
+            ],
+            batch_size=1000,
+        )
+        for table_id in {field.table_id for field in recalculated}:
+            invalidate_table_in_model_cache(table_id)
 
-    if isinstance(f, FormulaField) and (
-        f.version != FormulaHandler.BASEROW_FORMULA_VERSION or recalculated_dependant
-    ):
-        f.save(field_lookup_cache=field_lookup_cache, raise_if_invalid=False)
-        recalculated_dependant = True
-        already_recalculated.add(f.id)
-    return recalculated_dependant
+    return len(recalculated)
+
+
+@functools.lru_cache(maxsize=settings.FORMULA_PARSE_CACHE_SIZE)
+def _get_cached_untyped_expression(
+    formula_string: str,
+    formula_version: int,
+    function_registry_id: int,
+    function_registry_version: int,
+) -> BaserowExpression:
+    """
+    Caches the untyped expression of a formula. Besides the formula string, the
+    cache key contains the formula version and the identity and version of the
+    registered formula functions, so that the expression is recalculated when the
+    functions change.
+    """
+
+    return raw_formula_to_untyped_expression(formula_string)
 
 
 def _expression_requires_refresh_after_insert(expression: BaserowExpression):
@@ -267,10 +336,28 @@ class FormulaHandler:
         objects. This form is much easier to inspect, transform and perform calculations
         on compared to the raw string.
 
+        The untyped expressions of the most recently used formulas are cached in
+        memory. A copy of the cached expression is returned because typing an
+        expression changes it.
+
         :param formula_string: A string containing a formula in the Baserow Formula
             expression language.
         """
-        return raw_formula_to_untyped_expression(formula_string)
+
+        registry = formula_function_registry.registry
+        expression = _get_cached_untyped_expression(
+            formula_string, cls.BASEROW_FORMULA_VERSION, id(registry), registry.version
+        )
+        # The function definitions are the registered instances, so they must not
+        # be copied.
+        memo = {
+            id(function_def): function_def
+            for function_def in formula_function_registry.get_all()
+        }
+        try:
+            return copy.deepcopy(expression, memo)
+        except RecursionError:
+            raise MaximumFormulaSizeError()
 
     @classmethod
     def get_formula_type_from_field(cls, formula_field) -> BaserowFormulaType:
@@ -374,45 +461,85 @@ class FormulaHandler:
         return get_parse_tree_for_formula(formula)
 
     @classmethod
-    def recalculate_formulas_according_to_version(cls):
+    def recalculate_formulas_according_to_version(
+        cls, workers: Optional[int] = None
+    ) -> int:
         """
         Ensures all formulas are updated to the latest formula version being used by
         the code. Essentially recalculates the internal formula attributes in dependency
         order if the version of the formula in the database does not match this classes
         BASEROW_FORMULA_VERSION attribute.
+
+        The fields and field dependencies of all the databases containing outdated
+        formulas are loaded up front. Every database is then recalculated in its own
+        transaction, so that formulas in other databases can still be edited, and
+        independent databases are recalculated concurrently using multiple threads.
+
+        :param workers: The number of databases to recalculate concurrently, defaults
+            to the FORMULA_RECALCULATION_WORKERS setting.
+        :return: The number of recalculated formulas.
         """
 
         from baserow.contrib.database.fields.models import FormulaField
 
-        field_lookup_cache = FieldCache()
-        already_recalculated = set()
-
-        def formulas_need_update():
-            return FormulaField.objects.filter(
-                ~Q(version=cls.BASEROW_FORMULA_VERSION)
-            ).exists()
-
-        if formulas_need_update():
-            with LockedAtomicTransaction(FormulaField):
-                # Another process might have gotten the lock first and already done
-                # the update so we recheck once we have the lock.
-                if formulas_need_update():
-                    for field in FormulaField.objects.all():
-                        _recalculate_depth_first(
-                            field, already_recalculated, field_lookup_cache
-                        )
-
-                    num_updated = FormulaField.objects.update(
-                        version=cls.BASEROW_FORMULA_VERSION,
-                    )
-                    print(f"Updated {num_updated} formulas which were out of date.")
-                else:
-                    print(
-                        "Some other process updated the formulas before this one "
-                        "could... "
-                    )
-        else:
+        if workers is None:
+            workers = settings.FORMULA_RECALCULATION_WORKERS
+
+        outdated_formula_ids = defaultdict(list)
+        for database_id, formula_id in FormulaField.objects.filter(
+            ~Q(version=cls.BASEROW_FORMULA_VERSION)
+        ).values_list("table__database_id", "id"):
+            outdated_formula_ids[database_id].append(formula_id)
+
+        if not outdated_formula_ids:
             print("All formulas were already upto date, no update required!")
+            return 0
+
+        start = time.perf_counter()
+        graphs = load_field_dependency_graphs(outdated_formula_ids.keys())
+        durations = {}
+        num_updated = 0
+
+        def recalculate(database_id):
+            database_start = time.perf_counter()
+            try:
+                updated = _recalculate_database_formulas(
+                    graphs[database_id], outdated_formula_ids[database_id]
+                )
+            finally:
+                if workers > 1:
+                    # Every thread uses its own database connection which must be
+                    # closed when the thread is done with it.
+                    connection.close()
+            return updated, time.perf_counter() - database_start
+
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(recalculate, database_id): database_id
+                    for database_id in graphs.keys()
+                }
+                results = [
+                    (futures[future], future.result())
+                    for future in as_completed(futures)
+                ]
+        else:
+            results = [
+                (database_id, recalculate(database_id)) for database_id in graphs.keys()
+            ]
+
+        for database_id, (updated, duration) in results:
+            num_updated += updated
+            durations[database_id] = duration
+
+        slowest_database_id = max(durations, key=durations.get)
+        print(
+            f"Updated {num_updated} formulas which were out of date in "
+            f"{len(durations)} databases in {time.perf_counter() - start:.2f}s. "
+            f"Database {slowest_database_id} was the slowest and took "
+            f"{durations[slowest_database_id]:.2f}s."
+        )
+        return num_updated
 
     @classmethod
     def recalculate_formula_and_get_update_expression(
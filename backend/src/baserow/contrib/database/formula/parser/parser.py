@@ -1,6 +1,9 @@
+import functools
+
 from antlr4 import InputStream, CommonTokenStream
 from antlr4.BufferedTokenStream import BufferedTokenStream
 from antlr4.error.ErrorListener import ErrorListener
+from django.conf import settings
 
 from baserow.contrib.database.formula.parser.exceptions import BaserowFormulaSyntaxError
 from baserow.contrib.database.formula.parser.generated.BaserowFormula import (
@@ -36,8 +39,17 @@ def get_parse_tree_for_formula(formula: str):
     """
     WARNING: This function is directly used by migration code. Please ensure
     backwards compatability .
+
+    The parse trees of the most recently parsed formulas are cached in memory because
+    running the ANTLR lexer and parser is slow. The returned parse tree can therefore
+    be shared and must not be changed.
     """
 
+    return _get_cached_parse_tree_for_formula(formula)
+
+
+@functools.lru_cache(maxsize=settings.FORMULA_PARSE_CACHE_SIZE)
+def _get_cached_parse_tree_for_formula(formula: str):
     lexer = BaserowFormulaLexer(InputStream(formula))
     stream = CommonTokenStream(lexer)
     parser = BaserowFormula(stream)
@@ -1,15 +1,16 @@
 import sys
 from collections import defaultdict
 from decimal import Decimal
-from math import ceil
 
 from django.core.management.base import BaseCommand
-from django.db.models import Max
 from django.db.models.fields.related import ForeignKey
 from faker import Faker
 
+from baserow.contrib.database.rows.counts import invalidate_table_row_count
 from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.rows.order import allocate_orders_at_end
 from baserow.contrib.database.table.models import Table
+from baserow.contrib.database.table.search_index import invalidate_search_index
 
 
 class Command(BaseCommand):
@@ -45,8 +46,9 @@ def fill_table_rows(limit, table):
     row_handler = RowHandler()
     cache = {}
     model = table.get_model()
-    # Find out what the highest order is because we want to append the new rows.
-    order = ceil(model.objects.aggregate(max=Max("order")).get("max") or Decimal("0"))
+    # Allocate the orders after the highest order because we want to append the new
+    # rows.
+    order = allocate_orders_at_end(model, limit) - limit
 
     rows = []
     for i in range(0, limit):
@@ -75,6 +77,10 @@ def fill_table_rows(limit, table):
     # First create the rows in bulk because that's more efficient than creating them
     # one by one.
     model.objects.bulk_create([row for (row, relations) in rows])
+    # The rows are inserted without sending the row signals, so the stored count and
+    # the search index aren't updated.
+    invalidate_table_row_count(table.id)
+    invalidate_search_index(table)
 
     # Construct an object where the key is the field name of the many to many field
     # that must be populated. The value contains the objects that must be inserted in
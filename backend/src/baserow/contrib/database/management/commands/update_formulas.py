@@ -9,5 +9,16 @@ class Command(BaseCommand):
         "formula version."
     )
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="The number of databases to recalculate concurrently, defaults to "
+            "the BASEROW_FORMULA_RECALCULATION_WORKERS environment variable.",
+        )
+
     def handle(self, *args, **options):
-        FormulaHandler.recalculate_formulas_according_to_version()
+        FormulaHandler.recalculate_formulas_according_to_version(
+            workers=options["workers"]
+        )
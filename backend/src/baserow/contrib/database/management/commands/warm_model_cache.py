@@ -0,0 +1,87 @@
+import time
+
+from django.core.management import BaseCommand
+from tqdm import tqdm
+
+from baserow.contrib.database.table.handler import TableHandler
+from baserow.core.utils import Progress
+
+
+class Command(BaseCommand):
+    help = (
+        "Fills Baserow's internal generated model cache for the most recently used "
+        "tables, or all tables, so that the first request to them is fast again after "
+        "the cache has been cleared."
+    )
+
+    def add_arguments(self, parser):
+        group = parser.add_mutually_exclusive_group(required=True)
+        group.add_argument(
+            "--limit",
+            type=int,
+            help="The amount of most recently used tables to warm the cache for.",
+        )
+        group.add_argument(
+            "--all",
+            action="store_true",
+            help="Warm the cache for all tables.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Also rebuild the cache of tables which have already been cached.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="The amount of tables processed in every batch.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="The amount of batches processed in parallel.",
+        )
+
+    def handle(self, *args, **options):
+        handler = TableHandler()
+        table_ids = handler.get_tables_to_warm_in_model_cache(
+            None if options["all"] else options["limit"]
+        )
+
+        if len(table_ids) == 0:
+            self.stdout.write("There are no tables to warm the model cache for.")
+            return
+
+        start = time.perf_counter()
+        with tqdm(total=len(table_ids)) as progress_bar:
+            progress = Progress(len(table_ids))
+
+            def progress_updated(percentage, state):
+                progress_bar.update(progress.progress - progress_bar.n)
+
+            progress.register_updated_event(progress_updated)
+
+            timings = handler.warm_model_cache(
+                table_ids,
+                force=options["force"],
+                batch_size=options["batch_size"],
+                workers=options["workers"],
+                progress=progress,
+            )
+
+        total = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Warmed the model cache of {len(timings)} out of {len(table_ids)} "
+                f"tables in {total:.2f}s."
+            )
+        )
+        if len(timings) > 0:
+            slowest_table_id = max(timings, key=timings.get)
+            self.stdout.write(
+                f"Average {sum(timings.values()) / len(timings):.3f}s per table, "
+                f"slowest was table {slowest_table_id} with "
+                f"{timings[slowest_table_id]:.3f}s."
+            )
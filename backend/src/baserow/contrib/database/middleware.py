@@ -0,0 +1,15 @@
+from baserow.contrib.database.fields.field_cache import shared_field_cache
+
+
+class SharedFieldCacheMiddleware:
+    """
+    Shares a single field cache, containing the generated table models and specific
+    fields, between all the handlers and signal receivers handling the request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with shared_field_cache():
+            return self.get_response(request)
@@ -0,0 +1,62 @@
+# Generated by Django 3.2.12 on 2022-05-02 10:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database", "0071_alter_linkrowfield_link_row_relation_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="table",
+            name="defer_dependant_updates",
+            field=models.BooleanField(
+                default=False,
+                help_text="Indicates whether the formula and lookup fields depending "
+                "on the rows of this table are updated in the background instead of "
+                "immediately when a row is created, updated or deleted.",
+            ),
+        ),
+        migrations.CreateModel(
+            name="DeferredDependantUpdate",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("row_id", models.PositiveIntegerField()),
+                ("created_on", models.DateTimeField(auto_now_add=True)),
+                (
+                    "field",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="database.field",
+                    ),
+                ),
+                (
+                    "table",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="database.table",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="deferreddependantupdate",
+            index=models.Index(
+                fields=["table", "row_id"], name="database_de_table_i_12ca3d_idx"
+            ),
+        ),
+    ]
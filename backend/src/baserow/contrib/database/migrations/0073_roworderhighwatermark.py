@@ -0,0 +1,38 @@
+# Generated by Django 3.2.12 on 2022-05-04 09:21
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database", "0072_deferred_dependant_updates"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RowOrderHighWaterMark",
+            fields=[
+                (
+                    "table",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="database.table",
+                    ),
+                ),
+                (
+                    "highest_order",
+                    models.DecimalField(
+                        decimal_places=20,
+                        help_text="The highest order that has been handed out to a "
+                        "row of the table.",
+                        max_digits=40,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.2.12 on 2022-05-09 10:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database", "0073_roworderhighwatermark"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TableRowCount",
+            fields=[
+                (
+                    "table",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="database.table",
+                    ),
+                ),
+                (
+                    "count",
+                    models.BigIntegerField(
+                        help_text="The amount of non trashed rows in the table."
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.12 on 2022-05-11 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database", "0074_tablerowcount"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="table",
+            name="search_index_enabled",
+            field=models.BooleanField(
+                default=False,
+                help_text="Indicates whether a full-text search index is maintained "
+                "for the rows of this table.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="table",
+            name="search_index_ready",
+            field=models.BooleanField(
+                default=False,
+                help_text="Indicates whether the search index contains all the rows "
+                "of this table, so that it can be used to search the rows.",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.12 on 2022-05-16 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database", "0075_table_search_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="field",
+            name="db_index",
+            field=models.BooleanField(
+                default=False,
+                help_text="Indicates whether a B-tree index is maintained on the "
+                "column of this field to speed up sorting and filtering by it.",
+            ),
+        ),
+    ]
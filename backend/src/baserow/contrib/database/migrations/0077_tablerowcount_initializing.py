@@ -0,0 +1,23 @@
+# Generated by Django 3.2.12 on 2022-05-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database", "0076_field_db_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tablerowcount",
+            name="initializing",
+            field=models.BooleanField(
+                default=False,
+                help_text="Indicates that the rows of the table are being counted. "
+                "The count then only holds the difference caused by the rows created "
+                "or deleted since the counting started.",
+            ),
+        ),
+    ]
@@ -0,0 +1,16 @@
+# Generated by Django 3.2.13 on 2022-05-20 08:47
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("database", "0077_tablerowcount_initializing"),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name="RowOrderHighWaterMark",
+        ),
+    ]
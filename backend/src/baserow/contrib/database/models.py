@@ -1,6 +1,6 @@
 from baserow.core.models import Application
 
-from .table.models import Table
+from .table.models import Table, TableRowCount
 from .views.models import (
     View,
     GridView,
@@ -33,12 +33,16 @@ from .webhooks.models import (
 )
 from .airtable.models import AirtableImportJob
 
-from baserow.contrib.database.fields.dependencies.models import FieldDependency
+from baserow.contrib.database.fields.dependencies.models import (
+    FieldDependency,
+    DeferredDependantUpdate,
+)
 
 
 __all__ = [
     "Database",
     "Table",
+    "TableRowCount",
     "View",
     "GridView",
     "GridViewFieldOptions",
@@ -66,6 +70,7 @@ __all__ = [
     "TableWebhookCall",
     "AirtableImportJob",
     "FieldDependency",
+    "DeferredDependantUpdate",
 ]
 
 
@@ -2,7 +2,7 @@ import dataclasses
 from copy import deepcopy
 
 from decimal import Decimal
-from typing import Any, Dict, Optional, Type, List
+from typing import Any, Dict, Optional, Tuple, Type, List
 
 from django.contrib.auth.models import AbstractUser
 from baserow.contrib.database.table.handler import TableHandler
@@ -595,3 +595,90 @@ class UpdateRowsActionType(ActionType):
     def redo(cls, user: AbstractUser, params: Params, action_being_redone: Action):
         table = TableHandler().get_table(params.table_id)
         RowHandler().update_rows(user, table, params.new_rows)
+
+
+class UpsertRowsActionType(ActionType):
+    type = "upsert_rows"
+
+    @dataclasses.dataclass
+    class Params:
+        table_id: int
+        created_row_ids: List[int]
+        original_rows_values: List
+        new_rows: List
+        trashed_rows_entry_id: Optional[int] = None
+
+    @classmethod
+    def do(
+        cls,
+        user: AbstractUser,
+        table: Table,
+        rows_values: List[Dict[str, Any]],
+        match_field_id: int,
+        model: Optional[Type[GeneratedTableModel]] = None,
+    ) -> Tuple[List[GeneratedTableModel], List[GeneratedTableModelForUpdate]]:
+        """
+        Updates the rows matching the provided rows values and creates the other
+        rows. See the baserow.contrib.database.rows.handler.RowHandler.upsert_rows
+        for more information.
+        Undoing this action trashes the created rows and restores the original values
+        of the updated rows. Redoing restores the created rows and sets the new
+        values again.
+
+        :param user: The user of whose behalf the rows are upserted.
+        :param table: The table in which the rows must be upserted.
+        :param rows_values: The values of the rows to upsert.
+        :param match_field_id: The id of the field whose values are used to match the
+            existing rows.
+        :param model: If the correct model has already been generated it can be
+            provided so that it does not have to be generated for a second time.
+        :return: The created rows and the updated rows.
+        """
+
+        (
+            created_rows,
+            updated_rows,
+            original_rows_values,
+            new_rows,
+        ) = RowHandler().upsert_rows(
+            user, table, rows_values, match_field_id, model=model
+        )
+
+        params = cls.Params(
+            table.id,
+            [row.id for row in created_rows],
+            original_rows_values,
+            new_rows,
+        )
+        cls.register_action(user, params, cls.scope(table.id))
+
+        return created_rows, updated_rows
+
+    @classmethod
+    def scope(cls, table_id) -> ActionScopeStr:
+        return TableActionScopeType.value(table_id)
+
+    @classmethod
+    def undo(cls, user: AbstractUser, params: Params, action_being_undone: Action):
+        table = TableHandler().get_table(params.table_id)
+        if params.created_row_ids:
+            trashed_rows_entry = RowHandler().delete_rows(
+                user, table, params.created_row_ids
+            )
+            params.trashed_rows_entry_id = trashed_rows_entry.id
+            action_being_undone.params = params
+        if params.original_rows_values:
+            RowHandler().update_rows(user, table, params.original_rows_values)
+
+    @classmethod
+    def redo(cls, user: AbstractUser, params: Params, action_being_redone: Action):
+        if params.trashed_rows_entry_id is not None:
+            TrashHandler.restore_item(
+                user,
+                "rows",
+                params.trashed_rows_entry_id,
+                parent_trash_item_id=params.table_id,
+            )
+        if params.new_rows:
+            table = TableHandler().get_table(params.table_id)
+            RowHandler().update_rows(user, table, params.new_rows)
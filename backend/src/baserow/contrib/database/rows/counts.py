@@ -0,0 +1,333 @@
+"""
+Counts the rows of tables without counting all their rows every time.
+
+The amount of non trashed rows of a table is stored in its `TableRowCount`. It's
+initialized by a background task the first time the rows of the table are counted
+and is incremented or decremented in the same transaction as the rows are created,
+trashed, restored or deleted, so that it's always exact. The table isn't locked
+while it's initialized, the rows created or deleted while they are counted are
+reconciled with the count afterwards instead.
+
+The counts of filtered views are cached by the `ViewHandler`. Those cached counts
+are invalidated by bumping a version per table when the rows of the table change
+and a version per view when the filters of the view change.
+
+For very large tables, the count of filtered rows can optionally be approximated
+using the estimate of the PostgreSQL query planner instead.
+"""
+
+import json
+import time
+from typing import Iterable, NamedTuple, Optional, Type
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import F, QuerySet
+from django.dispatch import receiver
+
+from baserow.contrib.database.fields import signals as field_signals
+from baserow.contrib.database.table.models import (
+    GeneratedTableModel,
+    Table,
+    TableRowCount,
+)
+
+from . import signals as row_signals
+
+ROW_COUNT_MODE_EXACT = "exact"
+ROW_COUNT_MODE_CACHED = "cached"
+ROW_COUNT_MODE_APPROXIMATE = "approximate"
+# Filters comparing with the current date, like `date_equals_today`, can match other
+# rows without the rows or the filters changing, so the cached counts of views expire.
+VIEW_ROW_COUNT_CACHE_TIMEOUT = 60 * 5
+# The second key of the advisory lock taken on the table id while the rows of the
+# table are changed. The ids of the fields, used as second key by the upsert locks,
+# start at 1, so they never conflict.
+ROW_COUNT_LOCK_KEY = 0
+# How many times and how long to wait for the transactions changing the rows of the
+# table to finish before the rows are counted.
+ROW_COUNT_LOCK_ATTEMPTS = 50
+ROW_COUNT_LOCK_RETRY_DELAY = 0.1
+
+
+class RowCount(NamedTuple):
+    count: int
+    # Indicates whether the count has just been computed, comes from the cache or
+    # is estimated.
+    mode: str
+
+
+def table_rows_version_cache_key(table_id: int) -> str:
+    return f"table_rows_version__{table_id}"
+
+
+def table_row_count_initialization_scheduled_key(table_id: int) -> str:
+    return f"table_row_count_initialization_scheduled__{table_id}"
+
+
+def increment_cache_version(cache_key: str):
+    try:
+        cache.incr(cache_key, 1)
+    except ValueError:
+        # No cache key, we create one
+        cache.set(cache_key, 2)
+
+
+def bump_table_rows_version(table_ids: Iterable[int]):
+    """
+    Invalidates the cached row counts of the views of the tables because their rows
+    have changed. The versions are bumped again when the transaction commits, so
+    that a count computed by another request before the changes were visible to it
+    isn't used afterwards.
+
+    :param table_ids: The ids of the tables whose rows have changed.
+    """
+
+    cache_keys = [table_rows_version_cache_key(table_id) for table_id in table_ids]
+
+    def bump():
+        for cache_key in cache_keys:
+            increment_cache_version(cache_key)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def get_table_row_count(model: Type[GeneratedTableModel]) -> int:
+    """
+    Returns the amount of non trashed rows in the table. If the count of the table
+    isn't stored yet, the rows are counted and the task storing the count is
+    scheduled.
+
+    :param model: The model of the table whose rows must be counted.
+    :return: The amount of non trashed rows.
+    """
+
+    stored = (
+        TableRowCount.objects.filter(table_id=model._table_id)
+        .values_list("count", "initializing")
+        .first()
+    )
+    if stored is not None and not stored[1]:
+        return stored[0]
+
+    schedule_table_row_count_initialization(model._table_id)
+    return model.objects.count()
+
+
+def schedule_table_row_count_initialization(table_id: int):
+    """
+    Schedules the task storing the count of the table when the current transaction
+    commits. The task is not scheduled again while it's waiting to be executed.
+
+    :param table_id: The table whose count must be stored.
+    """
+
+    from baserow.contrib.database.rows.tasks import initialize_table_row_count as task
+
+    def schedule():
+        if cache.add(table_row_count_initialization_scheduled_key(table_id), True):
+            task.delay(table_id)
+
+    transaction.on_commit(schedule)
+
+
+def initialize_table_row_count(table_id: int) -> Optional[int]:
+    """
+    Counts the rows of the table and stores the count without blocking the
+    transactions changing the rows.
+
+    The stored count is first created with a value of 0 and marked as
+    initializing, so that it holds the difference caused by the rows created or
+    deleted from then on. After the transactions which could have changed rows
+    before the stored count existed are finished, the rows and that difference are
+    counted in the same snapshot. The rows counted already include the difference at
+    that moment, so it's subtracted from the stored count and only the difference
+    caused by the rows changed afterwards remains.
+
+    :param table_id: The table whose count must be stored.
+    :return: The amount of rows counted, or None if the count is already stored or
+        couldn't be initialized.
+    """
+
+    cache.delete(table_row_count_initialization_scheduled_key(table_id))
+
+    try:
+        table = Table.objects.get(id=table_id)
+    except Table.DoesNotExist:
+        return None
+
+    model = table.get_model(field_ids=[])
+    quote_name = connection.ops.quote_name
+    table_name = quote_name(model._meta.db_table)
+    row_count_table = quote_name(TableRowCount._meta.db_table)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {row_count_table} (table_id, count, initializing) "
+            f"VALUES (%s, 0, true) ON CONFLICT (table_id) DO NOTHING",
+            [table_id],
+        )
+        if not TableRowCount.objects.filter(
+            table_id=table_id, initializing=True
+        ).exists():
+            return None
+
+        # The lock is only held for an instant once no transaction changing rows
+        # holds it anymore, instead of waiting in line and blocking the transactions
+        # requesting it afterwards.
+        for _ in range(ROW_COUNT_LOCK_ATTEMPTS):
+            with transaction.atomic():
+                cursor.execute(
+                    "SELECT pg_try_advisory_xact_lock(%s, %s)",
+                    [table_id, ROW_COUNT_LOCK_KEY],
+                )
+                locked = cursor.fetchone()[0]
+            if locked:
+                break
+            time.sleep(ROW_COUNT_LOCK_RETRY_DELAY)
+        else:
+            return None
+
+        cursor.execute(
+            f"SELECT (SELECT count(*) FROM {table_name} WHERE NOT trashed), "
+            f"(SELECT count FROM {row_count_table} WHERE table_id = %s)",
+            [table_id],
+        )
+        count, difference = cursor.fetchone()
+        if difference is None:
+            return None
+
+        cursor.execute(
+            f"UPDATE {row_count_table} SET count = count + %s, initializing = false "
+            f"WHERE table_id = %s AND initializing",
+            [count - difference, table_id],
+        )
+
+    return count
+
+
+def adjust_table_row_count(table_id: int, difference: int):
+    """
+    Changes the stored count of the table by the provided difference. Nothing
+    happens if the count isn't stored yet because the rows are counted when it's
+    initialized.
+
+    :param table_id: The table whose rows have been created or deleted.
+    :param difference: The amount of rows that have been created, or a negative
+        amount if they have been deleted.
+    """
+
+    if difference:
+        # Held until the transaction commits, so that the initialization of the
+        # count can wait for the rows changed before the count existed.
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock_shared(%s, %s)",
+                [table_id, ROW_COUNT_LOCK_KEY],
+            )
+        TableRowCount.objects.filter(table_id=table_id).update(
+            count=F("count") + difference
+        )
+
+
+def invalidate_table_row_count(table_id: int):
+    """
+    Removes the stored count of the table, so that the rows are counted again the
+    next time. Must be called after rows have been inserted or deleted without
+    sending the related row signals.
+
+    :param table_id: The table whose rows have changed.
+    """
+
+    TableRowCount.objects.filter(table_id=table_id).delete()
+    bump_table_rows_version([table_id])
+
+
+def can_approximate_row_count(model: Type[GeneratedTableModel]) -> bool:
+    """
+    Indicates whether the table has so many rows that the count of its filtered rows
+    may be approximated if requested.
+    """
+
+    return get_table_row_count(model) > settings.APPROXIMATE_ROW_COUNT_THRESHOLD
+
+
+def estimate_row_count(queryset: QuerySet) -> int:
+    """
+    Returns the amount of rows the PostgreSQL query planner expects the queryset to
+    return without executing it. The estimate is based on the statistics of the
+    table, so it takes the same time for any amount of rows, but it can be far off
+    for complex or very selective filters.
+
+    :param queryset: The queryset whose rows must be estimated.
+    :return: The estimated amount of rows.
+    """
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def count_rows(
+    queryset: QuerySet, filtered: bool = True, approximate: bool = False
+) -> RowCount:
+    """
+    Counts the rows of a table queryset. The stored count of the table is used if
+    the queryset isn't filtered or searched.
+
+    :param queryset: The queryset of the table model whose rows must be counted.
+    :param filtered: Indicates whether the queryset is filtered or searched. If not,
+        the stored count of the table is returned.
+    :param approximate: Indicates whether the count may be estimated if the table
+        has more rows than the `APPROXIMATE_ROW_COUNT_THRESHOLD` setting.
+    :return: The count and how it has been determined.
+    """
+
+    model = queryset.model
+
+    if not filtered:
+        return RowCount(get_table_row_count(model), ROW_COUNT_MODE_EXACT)
+
+    if approximate and can_approximate_row_count(model):
+        return RowCount(estimate_row_count(queryset), ROW_COUNT_MODE_APPROXIMATE)
+
+    return RowCount(queryset.count(), ROW_COUNT_MODE_EXACT)
+
+
+@receiver(row_signals.row_created)
+def row_created(sender, table, **kwargs):
+    adjust_table_row_count(table.id, 1)
+    bump_table_rows_version([table.id])
+
+
+@receiver(row_signals.rows_created)
+def rows_created(sender, rows, table, **kwargs):
+    adjust_table_row_count(table.id, len(rows))
+    bump_table_rows_version([table.id])
+
+
+@receiver(row_signals.row_deleted)
+def row_deleted(sender, table, **kwargs):
+    adjust_table_row_count(table.id, -1)
+    bump_table_rows_version([table.id])
+
+
+@receiver(row_signals.rows_deleted)
+def rows_deleted(sender, rows, table, **kwargs):
+    adjust_table_row_count(table.id, -len(rows))
+    bump_table_rows_version([table.id])
+
+
+@receiver(field_signals.field_deleted)
+@receiver(field_signals.field_restored)
+def field_deleted_or_restored(sender, field, **kwargs):
+    # The filters of the trashed field are not applied anymore or again.
+    bump_table_rows_version([field.table_id])
@@ -14,3 +14,19 @@ class RowIdsNotUnique(Exception):
     def __init__(self, ids, *args, **kwargs):
         self.ids = ids
         super().__init__(*args, **kwargs)
+
+
+class UpsertMatchValuesNotUnique(Exception):
+    """Raised when multiple upserted rows have the same value for the match field."""
+
+    def __init__(self, values, *args, **kwargs):
+        self.values = values
+        super().__init__(*args, **kwargs)
+
+
+class UpsertMatchValuesMatchMultipleRows(Exception):
+    """Raised when an upserted row matches more than one existing row."""
+
+    def __init__(self, values, *args, **kwargs):
+        self.values = values
+        super().__init__(*args, **kwargs)
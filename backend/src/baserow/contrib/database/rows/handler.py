@@ -1,18 +1,30 @@
 import re
 from collections import defaultdict
+from copy import deepcopy
 from decimal import Decimal
-from math import floor, ceil
-from typing import cast, Any, Dict, List, NewType, Optional, Type
+from typing import cast, Any, Dict, List, NewType, Optional, Tuple, Type
 
 from django.contrib.auth.models import AbstractUser
-from django.db import transaction
-from django.db.models import Max, F, QuerySet
+from django.db import connection, transaction
+from django.db.models import QuerySet, prefetch_related_objects
 from django.db.models.fields.related import ManyToManyField, ForeignKey
 
+from baserow.contrib.database.db.bulk_update import bulk_update_from_values
+from baserow.contrib.database.fields.exceptions import (
+    FieldDoesNotExist,
+    IncompatibleFieldTypeForUpsert,
+)
+from baserow.contrib.database.fields.fields import BaserowExpressionField
 from baserow.contrib.database.table.models import Table, GeneratedTableModel
 from baserow.core.trash.handler import TrashHandler
 from baserow.contrib.database.trash.models import TrashedRows
-from .exceptions import RowDoesNotExist, RowIdsNotUnique
+from .exceptions import (
+    RowDoesNotExist,
+    RowIdsNotUnique,
+    UpsertMatchValuesMatchMultipleRows,
+    UpsertMatchValuesNotUnique,
+)
+from .order import allocate_orders_at_end, allocate_orders_before_row
 from .signals import (
     before_row_update,
     before_row_delete,
@@ -28,6 +40,12 @@ from .signals import (
 from baserow.contrib.database.fields.dependencies.update_collector import (
     CachingFieldUpdateCollector,
 )
+from baserow.contrib.database.fields.dependencies.deferred import (
+    defer_dependant_updates,
+)
+from baserow.contrib.database.fields.dependencies.graph import (
+    get_field_dependency_graph,
+)
 from baserow.contrib.database.fields.dependencies.handler import FieldDependencyHandler
 from baserow.core.utils import get_non_unique_values
 
@@ -198,8 +216,8 @@ class RowHandler:
         Calculates a new unique order lower than the provided before row
         order and a step representing the change needed between multiple rows if
         multiple rows are being placed at once.
-        This order can be used by existing or new rows. Several other rows
-        could be updated as their order might need to change.
+        This order can be used by existing or new rows. Other rows are only
+        updated if the gap before the provided before row is exhausted.
 
         :param before: The row instance where the before order must be calculated for.
         :type before: Table
@@ -213,29 +231,14 @@ class RowHandler:
         """
 
         if before:
-            # When the rows are being inserted before an existing row, the order
-            # of the last new row is calculated by subtracting a fraction of
-            # the "before" row order.
-            # The same fraction is also going to be subtracted from the other
-            # rows that have been placed before. By using these fractions we don't
-            # have to re-order every row in the table.
-            step = Decimal("0.00000000000000000001")
-            order_last_row = before.order - step
-            model.objects.filter(
-                order__gt=floor(order_last_row), order__lte=order_last_row
-            ).update(order=F("order") - (step * amount))
+            # The rows are placed in the gap between the before row and the row
+            # preceding it, so that the order of other rows doesn't have to change.
+            return allocate_orders_before_row(before, model, amount)
         else:
-            # Because the rows are by default added as last, we have to figure out
-            # what the highest order in the table is currently and increase that by
-            # the number of rows being inserted.
-            # The order of new rows should always be a whole number so the number is
-            # rounded up.
+            # Because the rows are by default added as last, the next whole numbers
+            # after the highest order handed out for the table are used.
             step = Decimal("1.00000000000000000000")
-            order_last_row = ceil(
-                model.objects.aggregate(max=Max("order")).get("max") or Decimal("0")
-            ) + (step * amount)
-
-        return order_last_row, step
+            return allocate_orders_at_end(model, amount), step
 
     def get_row(
         self,
@@ -420,6 +423,41 @@ class RowHandler:
 
         return instance
 
+    def prepare_created_rows_for_return(
+        self, model: Type[GeneratedTableModel], rows: List[GeneratedTableModel]
+    ) -> List[GeneratedTableModel]:
+        """
+        Makes the rows inserted using `bulk_create` ready to be serialized without
+        selecting them again. The inserted values, including the ones returned by the
+        `INSERT ... RETURNING` statement, are already set on the instances, so only
+        the fields requiring a refresh after insert are selected and the related
+        objects added by the `enhance_queryset` method of the field types are
+        prefetched.
+
+        :param model: The model of the rows.
+        :param rows: The inserted rows.
+        :return: The same rows in the same order.
+        """
+
+        refresh_field_names = model.fields_requiring_refresh_after_insert()
+        if refresh_field_names:
+            refreshed_values = {
+                values["id"]: values
+                for values in model.objects_and_trash.filter(
+                    id__in=[row.id for row in rows]
+                ).values("id", *refresh_field_names)
+            }
+            for row in rows:
+                for field_name in refresh_field_names:
+                    setattr(row, field_name, refreshed_values[row.id][field_name])
+
+        # The field types only enhance the queryset with prefetches, which can also be
+        # done for the rows that have already been fetched.
+        enhanced_queryset = model.objects.all().enhance_by_fields()
+        prefetch_related_objects(rows, *enhanced_queryset._prefetch_related_lookups)
+
+        return rows
+
     def force_create_row(
         self, table, values=None, model=None, before=None, user_field_names=False
     ):
@@ -480,16 +518,17 @@ class RowHandler:
                 update_collector,
             )
 
-        for (
-            dependant_field,
-            dependant_field_type,
-            path_to_starting_table,
-        ) in FieldDependencyHandler.get_dependant_fields_with_type(
-            field_ids, update_collector
-        ):
-            dependant_field_type.row_of_dependency_created(
-                dependant_field, instance, update_collector, path_to_starting_table
-            )
+        if not defer_dependant_updates(table, [instance.id], field_ids):
+            for (
+                dependant_field,
+                dependant_field_type,
+                path_to_starting_table,
+            ) in FieldDependencyHandler.get_dependant_fields_with_type(
+                field_ids, update_collector
+            ):
+                dependant_field_type.row_of_dependency_created(
+                    dependant_field, instance, update_collector, path_to_starting_table
+                )
         update_collector.apply_updates_and_get_updated_fields()
 
         if model.fields_requiring_refresh_after_insert():
@@ -621,16 +660,17 @@ class RowHandler:
         update_collector = CachingFieldUpdateCollector(
             table, starting_row_id=row.id, existing_model=model
         )
-        for (
-            dependant_field,
-            dependant_field_type,
-            path_to_starting_table,
-        ) in FieldDependencyHandler.get_dependant_fields_with_type(
-            updated_field_ids, update_collector
-        ):
-            dependant_field_type.row_of_dependency_updated(
-                dependant_field, row, update_collector, path_to_starting_table
-            )
+        if not defer_dependant_updates(table, [row.id], updated_field_ids):
+            for (
+                dependant_field,
+                dependant_field_type,
+                path_to_starting_table,
+            ) in FieldDependencyHandler.get_dependant_fields_with_type(
+                updated_field_ids, update_collector
+            ):
+                dependant_field_type.row_of_dependency_updated(
+                    dependant_field, row, update_collector, path_to_starting_table
+                )
         update_collector.apply_updates_and_get_updated_fields()
         # We need to refresh here as ExpressionFields might have had their values
         # updated. Django does not support UPDATE .... RETURNING and so we need to
@@ -754,19 +794,22 @@ class RowHandler:
                 update_collector,
             )
 
-        for (
-            dependant_field,
-            dependant_field_type,
-            path_to_starting_table,
-        ) in FieldDependencyHandler.get_dependant_fields_with_type(
-            field_ids, update_collector
+        if not defer_dependant_updates(
+            table, [row.id for row in inserted_rows], field_ids
         ):
-            dependant_field_type.row_of_dependency_created(
+            for (
                 dependant_field,
-                inserted_rows,
-                update_collector,
+                dependant_field_type,
                 path_to_starting_table,
-            )
+            ) in FieldDependencyHandler.get_dependant_fields_with_type(
+                field_ids, update_collector
+            ):
+                dependant_field_type.row_of_dependency_created(
+                    dependant_field,
+                    inserted_rows,
+                    update_collector,
+                    path_to_starting_table,
+                )
         update_collector.apply_updates_and_get_updated_fields()
 
         from baserow.contrib.database.views.handler import ViewHandler
@@ -774,11 +817,7 @@ class RowHandler:
         updated_fields = [o["field"] for o in model._field_objects.values()]
         ViewHandler().field_value_updated(updated_fields)
 
-        rows_to_return = list(
-            model.objects.all()
-            .enhance_by_fields()
-            .filter(id__in=[row.id for row in inserted_rows])
-        )
+        rows_to_return = self.prepare_created_rows_for_return(model, inserted_rows)
 
         rows_created.send(
             self,
@@ -847,18 +886,53 @@ class RowHandler:
                 if field_id in row_values or field["name"] in row_values:
                     updated_field_ids.add(field_id)
 
-        before_return = before_rows_update.send(
-            self,
-            rows=list(rows_to_update),
-            user=user,
-            table=table,
-            model=model,
-            updated_field_ids=updated_field_ids,
-        )
+        # Serializing the rows before they are updated is expensive, so it's only
+        # done when there is a receiver that needs the old rows.
+        before_return = []
+        if before_rows_update.has_listeners(self):
+            before_return = before_rows_update.send(
+                self,
+                rows=list(rows_to_update),
+                user=user,
+                table=table,
+                model=model,
+                updated_field_ids=updated_field_ids,
+            )
+
+        # Only the formula fields depending on the updated fields, on the fields
+        # which change implicitly like the last modified fields, or on no field at
+        # all like `now()` have to be recalculated. The other fields requiring a
+        # refresh are always updated.
+        graph = get_field_dependency_graph(table.database_id)
+        refreshed_field_names = model.fields_requiring_refresh_after_update()
+        changed_field_ids = set(updated_field_ids)
+        for field_id, field_object in model._field_objects.items():
+            if field_object["name"] in refreshed_field_names and (
+                not isinstance(
+                    model._meta.get_field(field_object["name"]),
+                    BaserowExpressionField,
+                )
+                or not graph.has_dependencies(field_id)
+            ):
+                changed_field_ids.add(field_id)
+        recalculated_field_names = {
+            model._field_objects[field_id]["name"]
+            for field_id in graph.get_update_order(
+                changed_field_ids, include_changed=True
+            )
+            if field_id in model._field_objects
+        }
+        fields_with_pre_save = [
+            field_name
+            for field_name in refreshed_field_names
+            if field_name in recalculated_field_names
+        ]
 
         rows_relationships = []
+        updated_field_names_per_row = []
+        expression_field_names = set()
         for obj in rows_to_update:
-            # The `updated_on` field is not updated with `bulk_update`,
+            # The `updated_on` field is not updated when the rows are updated in bulk,
             # so we manually set the value here.
             obj.updated_on = model._meta.get_field("updated_on").pre_save(
                 obj, add=False
@@ -878,13 +952,15 @@ class RowHandler:
             }
             rows_relationships.append(relations)
 
-            fields_with_pre_save = model.fields_requiring_refresh_after_update()
+            updated_field_names = list(values.keys()) + ["updated_on"]
             for field_name in fields_with_pre_save:
-                setattr(
-                    obj,
-                    field_name,
-                    model._meta.get_field(field_name).pre_save(obj, add=False),
-                )
+                value = model._meta.get_field(field_name).pre_save(obj, add=False)
+                setattr(obj, field_name, value)
+                if hasattr(value, "resolve_expression"):
+                    expression_field_names.add(field_name)
+                else:
+                    updated_field_names.append(field_name)
+            updated_field_names_per_row.append((obj, updated_field_names))
 
         many_to_many = defaultdict(list)
         row_column_name = None
@@ -936,34 +1012,33 @@ class RowHandler:
             delete_qs._raw_delete(delete_qs.db)
             through.objects.bulk_create([v for v in values if v is not None])
 
-        # For now all fields that don't represent a relationship will be used in
-        # the bulk_update() call. This could be optimized in the future if we can
-        # select just fields that need to be updated (fields that are passed in +
-        # read only fields that need updating too)
-        bulk_update_fields = [
-            field["name"]
-            for field in model._field_objects.values()
-            if not isinstance(model._meta.get_field(field["name"]), ManyToManyField)
-        ] + ["updated_on"]
-        if len(bulk_update_fields) > 0:
-            model.objects.bulk_update(rows_to_update, bulk_update_fields)
+        # Only the provided and refreshed values are written, using one statement
+        # per set of updated fields.
+        bulk_update_from_values(model, updated_field_names_per_row)
+
+        # The formula values are expressions calculated using the values of every
+        # individual row, so they can't be provided as values and are updated
+        # afterwards.
+        if expression_field_names:
+            model.objects.bulk_update(rows_to_update, list(expression_field_names))
 
         update_collector = CachingFieldUpdateCollector(
             table, starting_row_id=row_ids, existing_model=model
         )
-        for (
-            dependant_field,
-            dependant_field_type,
-            path_to_starting_table,
-        ) in FieldDependencyHandler.get_dependant_fields_with_type(
-            updated_field_ids, update_collector
-        ):
-            dependant_field_type.row_of_dependency_updated(
+        if not defer_dependant_updates(table, row_ids, updated_field_ids):
+            for (
                 dependant_field,
-                rows_to_update,
-                update_collector,
+                dependant_field_type,
                 path_to_starting_table,
-            )
+            ) in FieldDependencyHandler.get_dependant_fields_with_type(
+                updated_field_ids, update_collector
+            ):
+                dependant_field_type.row_of_dependency_updated(
+                    dependant_field,
+                    rows_to_update,
+                    update_collector,
+                    path_to_starting_table,
+                )
         update_collector.apply_updates_and_get_updated_fields()
 
         from baserow.contrib.database.views.handler import ViewHandler
@@ -999,6 +1074,171 @@ class RowHandler:
             .filter(id__in=row_ids),
         )
 
+    def match_rows_for_upsert(
+        self,
+        model: Type[GeneratedTableModel],
+        match_field_id: int,
+        rows_values: List[Dict[str, Any]],
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], RowsForUpdate]:
+        """
+        Splits the rows values into the values of rows that must be created and the
+        values of existing rows that must be updated, by matching the value of the
+        match field with the values of that field in the table. All the existing rows
+        are matched using a single query and are locked for update. Concurrent upserts
+        using the same match field are serialized until the transaction commits, so
+        that they can't both create a row for the same value.
+
+        Rows values without a value for the match field never match an existing row.
+
+        :param model: The model of the table to upsert the rows in.
+        :param match_field_id: The id of the field whose values are used to match the
+            existing rows.
+        :param rows_values: The values of the rows to upsert.
+        :raises FieldDoesNotExist: When the match field is not in the table.
+        :raises IncompatibleFieldTypeForUpsert: When the field type of the match field
+            can't be used to match rows.
+        :raises UpsertMatchValuesNotUnique: When multiple rows values have the same
+            value for the match field.
+        :raises UpsertMatchValuesMatchMultipleRows: When a value of the match field
+            matches more than one existing row.
+        :return: The values of the rows to create, the values including the id of the
+            rows to update and the existing rows to update.
+        """
+
+        if match_field_id not in model._field_objects:
+            raise FieldDoesNotExist(
+                f"The field with id {match_field_id} does not exist."
+            )
+
+        match_field_object = model._field_objects[match_field_id]
+        match_field = match_field_object["field"]
+        match_field_type = match_field_object["type"]
+        match_field_name = match_field_object["name"]
+
+        if not match_field_type.can_upsert_by:
+            raise IncompatibleFieldTypeForUpsert(
+                f"The values of the {match_field_type.type} field type can't be used "
+                f"to match rows."
+            )
+
+        match_values = []
+        for row_values in rows_values:
+            value = None
+            if match_field_id in row_values or match_field_name in row_values:
+                value = match_field_type.prepare_value_for_db(
+                    match_field,
+                    row_values.get(match_field_id, row_values.get(match_field_name)),
+                )
+            match_values.append(None if value == "" else value)
+
+        provided_values = [value for value in match_values if value is not None]
+        non_unique_values = get_non_unique_values(provided_values)
+        if len(non_unique_values) > 0:
+            raise UpsertMatchValuesNotUnique(sorted(map(str, non_unique_values)))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_xact_lock(%s, %s)",
+                [model._table_id, match_field_id],
+            )
+
+        rows_to_update = cast(
+            RowsForUpdate,
+            model.objects.select_for_update()
+            .enhance_by_fields()
+            .filter(**{f"{match_field_name}__in": provided_values}),
+        )
+        row_ids_by_value = defaultdict(list)
+        for row in rows_to_update:
+            row_ids_by_value[getattr(row, match_field_name)].append(row.id)
+
+        ambiguous_values = [
+            value for value, row_ids in row_ids_by_value.items() if len(row_ids) > 1
+        ]
+        if len(ambiguous_values) > 0:
+            raise UpsertMatchValuesMatchMultipleRows(sorted(map(str, ambiguous_values)))
+
+        rows_values_to_create = []
+        rows_values_to_update = []
+        for row_values, value in zip(rows_values, match_values):
+            if value is not None and value in row_ids_by_value:
+                row_values = dict(row_values, id=row_ids_by_value[value][0])
+                rows_values_to_update.append(row_values)
+            else:
+                rows_values_to_create.append(row_values)
+
+        return rows_values_to_create, rows_values_to_update, rows_to_update
+
+    def upsert_rows(
+        self,
+        user: AbstractUser,
+        table: Table,
+        rows_values: List[Dict[str, Any]],
+        match_field_id: int,
+        model: Optional[Type[GeneratedTableModel]] = None,
+    ) -> Tuple[
+        List[GeneratedTableModel],
+        List[GeneratedTableModelForUpdate],
+        List[Dict[str, Any]],
+        List[Dict[str, Any]],
+    ]:
+        """
+        Updates the existing rows having the same value for the match field as the
+        provided rows values and creates new rows for the other rows values. See the
+        `match_rows_for_upsert` method for how the rows are matched.
+
+        :param user: The user of whose behalf the rows are upserted.
+        :param table: The table in which the rows must be upserted.
+        :param rows_values: The values of the rows to upsert.
+        :param match_field_id: The id of the field whose values are used to match the
+            existing rows.
+        :param model: If the correct model has already been generated it can be
+            provided so that it does not have to be generated for a second time.
+        :return: The created rows, the updated rows, the original values and the new
+            values, including the id, of the updated rows.
+        """
+
+        group = table.database.group
+        group.has_user(user, raise_error=True)
+
+        if model is None:
+            model = table.get_model()
+
+        (
+            rows_values_to_create,
+            rows_values_to_update,
+            rows_to_update,
+        ) = self.match_rows_for_upsert(model, match_field_id, rows_values)
+
+        rows_keys_map = {row["id"]: row.keys() for row in rows_values_to_update}
+        original_rows_values = []
+        for row in rows_to_update:
+            original_row_values = self.get_internal_values_for_fields(
+                row, rows_keys_map[row.id]
+            )
+            original_row_values["id"] = row.id
+            original_rows_values.append(original_row_values)
+
+        new_rows_values = deepcopy(rows_values_to_update)
+
+        created_rows = []
+        if rows_values_to_create:
+            created_rows = self.create_rows(
+                user, table, rows_values_to_create, model=model
+            )
+
+        updated_rows = []
+        if rows_values_to_update:
+            updated_rows = self.update_rows(
+                user,
+                table,
+                rows_values_to_update,
+                model=model,
+                rows_to_update=rows_to_update,
+            )
+
+        return created_rows, updated_rows, original_rows_values, new_rows_values
+
     def move_row_by_id(
         self,
         user: AbstractUser,
@@ -1063,16 +1303,17 @@ class RowHandler:
             table, starting_row_id=row.id, existing_model=model
         )
         updated_field_ids = [field_id for field_id in model._field_objects.keys()]
-        for (
-            dependant_field,
-            dependant_field_type,
-            path_to_starting_table,
-        ) in FieldDependencyHandler.get_dependant_fields_with_type(
-            updated_field_ids, update_collector
-        ):
-            dependant_field_type.row_of_dependency_moved(
-                dependant_field, row, update_collector, path_to_starting_table
-            )
+        if not defer_dependant_updates(table, [row.id], updated_field_ids):
+            for (
+                dependant_field,
+                dependant_field_type,
+                path_to_starting_table,
+            ) in FieldDependencyHandler.get_dependant_fields_with_type(
+                updated_field_ids, update_collector
+            ):
+                dependant_field_type.row_of_dependency_moved(
+                    dependant_field, row, update_collector, path_to_starting_table
+                )
         update_collector.apply_updates_and_get_updated_fields()
 
         from baserow.contrib.database.views.handler import ViewHandler
@@ -1152,16 +1393,17 @@ class RowHandler:
             table, starting_row_id=row.id, existing_model=model
         )
         updated_field_ids = [field_id for field_id in model._field_objects.keys()]
-        for (
-            dependant_field,
-            dependant_field_type,
-            path_to_starting_table,
-        ) in FieldDependencyHandler.get_dependant_fields_with_type(
-            updated_field_ids, update_collector
-        ):
-            dependant_field_type.row_of_dependency_deleted(
-                dependant_field, row, update_collector, path_to_starting_table
-            )
+        if not defer_dependant_updates(table, [row.id], updated_field_ids):
+            for (
+                dependant_field,
+                dependant_field_type,
+                path_to_starting_table,
+            ) in FieldDependencyHandler.get_dependant_fields_with_type(
+                updated_field_ids, update_collector
+            ):
+                dependant_field_type.row_of_dependency_deleted(
+                    dependant_field, row, update_collector, path_to_starting_table
+                )
         update_collector.apply_updates_and_get_updated_fields()
 
         from baserow.contrib.database.views.handler import ViewHandler
@@ -1234,16 +1476,17 @@ class RowHandler:
         update_collector = CachingFieldUpdateCollector(
             table, starting_row_id=row_ids, existing_model=model
         )
-        for (
-            dependant_field,
-            dependant_field_type,
-            path_to_starting_table,
-        ) in FieldDependencyHandler.get_dependant_fields_with_type(
-            updated_field_ids, update_collector
-        ):
-            dependant_field_type.row_of_dependency_deleted(
-                dependant_field, rows, update_collector, path_to_starting_table
-            )
+        if not defer_dependant_updates(table, row_ids, updated_field_ids):
+            for (
+                dependant_field,
+                dependant_field_type,
+                path_to_starting_table,
+            ) in FieldDependencyHandler.get_dependant_fields_with_type(
+                updated_field_ids, update_collector
+            ):
+                dependant_field_type.row_of_dependency_deleted(
+                    dependant_field, rows, update_collector, path_to_starting_table
+                )
         update_collector.apply_updates_and_get_updated_fields()
 
         from baserow.contrib.database.views.handler import ViewHandler
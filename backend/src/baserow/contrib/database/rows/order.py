@@ -0,0 +1,253 @@
+"""
+Allocates the order values of rows without aggregating over the whole table and
+without rewriting the order of other rows.
+
+Rows which are appended get the next whole numbers after the highest order handed
+out for the table, which are taken from a sequence owned by the order column of the
+table. Because sequences are not transactional, concurrent appends don't have to wait
+for each other to commit.
+
+Rows placed before another row get orders evenly spaced between that row and the row
+preceding it. Because the order only has 20 decimal places, the gap between two rows
+can be exhausted after many rows have been placed at the same position. The rows
+between the surrounding whole numbers are then spaced evenly again and the orders of
+all the rows of the table are renormalized to whole numbers in the background.
+"""
+
+from decimal import Decimal, ROUND_DOWN, localcontext
+from math import ceil, floor
+from typing import Tuple, Type
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Max
+
+from baserow.contrib.database.db.bulk_update import bulk_update_from_values
+from baserow.contrib.database.table.models import GeneratedTableModel, Table
+
+from .signals import row_orders_renormalized
+
+SMALLEST_ORDER_STEP = Decimal("0.00000000000000000001")
+# The order has 40 digits, a higher precision is used during calculations so that the
+# orders are never rounded before they are quantized.
+ORDER_CALCULATION_PRECISION = 50
+# The second key of the advisory locks taken on the table id while the order sequence
+# of the table is created or a block of orders is allocated. The row count and upsert
+# locks use keys starting at 0, so they never conflict.
+ROW_ORDER_LOCK_KEY = -1
+
+
+def row_order_renormalization_scheduled_key(table_id: int) -> str:
+    return f"row_order_renormalization_scheduled_{table_id}"
+
+
+def get_row_order_sequence_name(model: Type[GeneratedTableModel]) -> str:
+    return f"{model._meta.db_table}_order_seq"
+
+
+def _ensure_row_order_sequence(model: Type[GeneratedTableModel], cursor):
+    """
+    Creates the sequence handing out the orders of the rows appended to the table if
+    it doesn't exist yet. The sequence starts after the highest order in the table and
+    is dropped together with the table.
+    """
+
+    sequence_name = get_row_order_sequence_name(model)
+    cursor.execute("SELECT to_regclass(%s)", [sequence_name])
+    if cursor.fetchone()[0] is not None:
+        return
+
+    # A transaction creating the same sequence at the same time is waited for, which
+    # only happens the first time orders are allocated for the table.
+    cursor.execute(
+        "SELECT pg_advisory_xact_lock(%s, %s)", [model._table_id, ROW_ORDER_LOCK_KEY]
+    )
+    highest_order = model.objects_and_trash.aggregate(max=Max("order")).get(
+        "max"
+    ) or Decimal("0")
+    quote_name = connection.ops.quote_name
+    cursor.execute(
+        f"CREATE SEQUENCE IF NOT EXISTS {quote_name(sequence_name)} "
+        f"MINVALUE 0 START WITH %s OWNED BY "
+        f"{quote_name(model._meta.db_table)}.{quote_name('order')}",
+        [ceil(highest_order) + 1],
+    )
+
+
+def allocate_orders_at_end(
+    model: Type[GeneratedTableModel], amount: int = 1
+) -> Decimal:
+    """
+    Hands out the next whole number orders after the highest order of the table. The
+    orders are taken from the order sequence of the table, which is only locked while
+    the orders are allocated, so that concurrent appends never get the same orders
+    without waiting for each other to commit. If the table doesn't have an order
+    sequence yet, it's created starting after the highest order in the table.
+
+    :param model: The model of the table to allocate the orders for.
+    :param amount: The amount of orders to allocate.
+    :return: The highest allocated order. The other allocated orders are the whole
+        numbers right before it.
+    """
+
+    sequence_name = get_row_order_sequence_name(model)
+    with connection.cursor() as cursor:
+        # Makes the renormalization of the row orders wait until the rows using the
+        # allocated orders are committed, see `renormalize_row_orders`. This lock
+        # doesn't conflict with the other transactions changing rows.
+        if connection.in_atomic_block:
+            cursor.execute(
+                f"LOCK TABLE {connection.ops.quote_name(model._meta.db_table)} "
+                f"IN ROW EXCLUSIVE MODE"
+            )
+        _ensure_row_order_sequence(model, cursor)
+        # The session lock only makes sure that the block of orders is not
+        # interleaved with the orders allocated at the same time, it's released
+        # right away instead of when the transaction commits.
+        cursor.execute(
+            "SELECT pg_advisory_lock(%s, %s)", [model._table_id, ROW_ORDER_LOCK_KEY]
+        )
+        try:
+            cursor.execute(
+                "SELECT setval(%s, nextval(%s) + %s - 1)",
+                [sequence_name, sequence_name, amount],
+            )
+            highest_order = cursor.fetchone()[0]
+        finally:
+            cursor.execute(
+                "SELECT pg_advisory_unlock(%s, %s)",
+                [model._table_id, ROW_ORDER_LOCK_KEY],
+            )
+
+    return Decimal(highest_order)
+
+
+def allocate_orders_before_row(
+    before: GeneratedTableModel, model: Type[GeneratedTableModel], amount: int = 1
+) -> Tuple[Decimal, Decimal]:
+    """
+    Finds orders for rows that must be placed right before the provided row. The
+    orders are evenly spaced between the order of the row preceding the before row
+    and the order of the before row, so that no other rows have to be updated.
+
+    If the gap between the two rows is too small, the rows in the same whole number
+    interval are spaced evenly again to make room and the renormalization of the
+    orders of the table is scheduled.
+
+    :param before: The row before which the rows must be placed.
+    :param model: The model of the table.
+    :param amount: The amount of orders to allocate.
+    :return: The order for the last placed row and the step between the orders of
+        the placed rows.
+    """
+
+    previous_order = model.objects_and_trash.filter(order__lt=before.order).aggregate(
+        max=Max("order")
+    )["max"]
+    if previous_order is None:
+        previous_order = before.order - 1
+
+    with localcontext() as context:
+        context.prec = ORDER_CALCULATION_PRECISION
+        step = ((before.order - previous_order) / (amount + 1)).quantize(
+            SMALLEST_ORDER_STEP, rounding=ROUND_DOWN
+        )
+        if step >= SMALLEST_ORDER_STEP:
+            return previous_order + step * amount, step
+
+        # The gap is exhausted, so the rows between the whole numbers around the
+        # previous order are evenly spaced again, leaving room for the new rows right
+        # before the before row.
+        lowest_order = Decimal(floor(previous_order))
+        rows_in_window = list(
+            model.objects_and_trash.filter(
+                order__gt=lowest_order, order__lt=lowest_order + 1
+            )
+            .order_by("order", "id")
+            .only("id", "order")
+        )
+        step = (Decimal("1") / (len(rows_in_window) + amount + 1)).quantize(
+            SMALLEST_ORDER_STEP, rounding=ROUND_DOWN
+        )
+        before_index = next(
+            (index for index, row in enumerate(rows_in_window) if row.id == before.id),
+            len(rows_in_window),
+        )
+        for index, row in enumerate(rows_in_window):
+            position = index + 1 + (amount if index >= before_index else 0)
+            row.order = lowest_order + step * position
+            if row.id == before.id:
+                before.order = row.order
+        bulk_update_from_values(model, [(row, ["order"]) for row in rows_in_window])
+        order_last_row = lowest_order + step * (before_index + amount)
+
+    schedule_row_order_renormalization(model._table_id)
+    return order_last_row, step
+
+
+def schedule_row_order_renormalization(table_id: int):
+    """
+    Schedules the task renormalizing the row orders of the table when the current
+    transaction commits. The task is not scheduled again while it's waiting to be
+    executed.
+
+    :param table_id: The table whose row orders must be renormalized.
+    """
+
+    from baserow.contrib.database.rows.tasks import renormalize_row_orders
+
+    def schedule():
+        if cache.add(row_order_renormalization_scheduled_key(table_id), True):
+            renormalize_row_orders.delay(table_id)
+
+    transaction.on_commit(schedule)
+
+
+def renormalize_row_orders(table_id: int) -> int:
+    """
+    Changes the orders of all the rows of the table, including the trashed ones, to
+    whole numbers starting at 1 while keeping the order of the rows. This restores
+    the gaps between the rows, so that new rows can be placed anywhere without
+    shifting other rows.
+
+    :param table_id: The table whose row orders must be renormalized.
+    :return: The amount of rows whose order has changed.
+    """
+
+    cache.delete(row_order_renormalization_scheduled_key(table_id))
+
+    try:
+        table = Table.objects.get(id=table_id)
+    except Table.DoesNotExist:
+        return 0
+
+    model = table.get_model(field_ids=[])
+    quote_name = connection.ops.quote_name
+    table_name = quote_name(model._meta.db_table)
+    sequence_name = get_row_order_sequence_name(model)
+    with transaction.atomic(), connection.cursor() as cursor:
+        # Waits for the transactions which changed the rows or allocated orders to
+        # commit and blocks new ones until the orders are renormalized, so that the
+        # order sequence can be reset to the amount of rows.
+        cursor.execute(f"LOCK TABLE {table_name} IN SHARE ROW EXCLUSIVE MODE")
+        cursor.execute(
+            f"UPDATE {table_name} SET {quote_name('order')} = numbered.new_order "
+            f"FROM (SELECT id, row_number() OVER ("
+            f"ORDER BY {quote_name('order')}, id) AS new_order "
+            f"FROM {table_name}) AS numbered "
+            f"WHERE {table_name}.id = numbered.id "
+            f"AND {table_name}.{quote_name('order')} != numbered.new_order"
+        )
+        updated_rows = cursor.rowcount
+
+        if updated_rows:
+            row_orders_renormalized.send(renormalize_row_orders, table=table)
+
+        # Changing the sequence can't be rolled back, so it's done last.
+        _ensure_row_order_sequence(model, cursor)
+        cursor.execute(
+            f"SELECT setval(%s, (SELECT count(*) FROM {table_name}))",
+            [sequence_name],
+        )
+
+    return updated_rows
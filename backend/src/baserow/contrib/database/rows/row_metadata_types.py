@@ -0,0 +1,25 @@
+from typing import List, Dict, Any
+
+from rest_framework import serializers
+from rest_framework.fields import Field
+
+from baserow.contrib.database.fields.dependencies.deferred import (
+    get_stale_field_ids_per_row,
+)
+from baserow.contrib.database.rows.registries import RowMetadataType
+
+
+class StaleFieldIdsMetadataType(RowMetadataType):
+    type = "stale_field_ids"
+
+    def generate_metadata_for_rows(self, table, row_ids: List[int]) -> Dict[int, Any]:
+        return get_stale_field_ids_per_row(table, row_ids)
+
+    def get_example_serializer_field(self) -> Field:
+        return serializers.ListField(
+            child=serializers.IntegerField(),
+            help_text="The ids of the fields whose cell values of this row are "
+            "stale because the table defers the updates of the dependant fields and "
+            "the cells are still waiting to be updated in the background.",
+            required=False,
+        )
@@ -14,3 +14,6 @@ row_updated = Signal()
 rows_updated = Signal()
 row_deleted = Signal()
 rows_deleted = Signal()
+
+# Sent when the orders of all the rows of a table have been renormalized.
+row_orders_renormalized = Signal()
@@ -0,0 +1,68 @@
+import logging
+
+from baserow.config.celery import app
+
+
+logger = logging.getLogger(__name__)
+
+
+# noinspection PyUnusedLocal
+@app.task(bind=True)
+def update_deferred_dependant_fields(self, table_id: int):
+    """
+    Updates the formula and lookup fields depending on the rows of a table which
+    defers the updates of its dependant fields.
+
+    :param table_id: The table whose deferred dependant updates must be applied.
+    """
+
+    from baserow.contrib.database.fields.dependencies.deferred import (
+        apply_deferred_dependant_updates,
+    )
+
+    updated_rows = apply_deferred_dependant_updates(table_id)
+    if updated_rows:
+        logger.info(
+            f"Updated the dependant fields of {updated_rows} rows of table "
+            f"{table_id}."
+        )
+
+
+# noinspection PyUnusedLocal
+@app.task(bind=True)
+def renormalize_row_orders(self, table_id: int):
+    """
+    Renormalizes the orders of the rows of a table whose gaps between the row orders
+    have been exhausted.
+
+    :param table_id: The table whose row orders must be renormalized.
+    """
+
+    from baserow.contrib.database.rows.order import (
+        renormalize_row_orders as renormalize,
+    )
+
+    updated_rows = renormalize(table_id)
+    if updated_rows:
+        logger.info(
+            f"Renormalized the order of {updated_rows} rows of table {table_id}."
+        )
+
+
+# noinspection PyUnusedLocal
+@app.task(bind=True)
+def initialize_table_row_count(self, table_id: int):
+    """
+    Counts the rows of a table and stores the count, so that the rows don't have to
+    be counted anymore.
+
+    :param table_id: The table whose count must be stored.
+    """
+
+    from baserow.contrib.database.rows.counts import (
+        initialize_table_row_count as initialize,
+    )
+
+    count = initialize(table_id)
+    if count is not None:
+        logger.info(f"Counted {count} rows of table {table_id}.")
@@ -185,9 +185,20 @@ class UpdateTableActionType(ActionType):
         table_id: int
         original_table_name: str
         new_table_name: str
+        original_defer_dependant_updates: Optional[bool] = None
+        new_defer_dependant_updates: Optional[bool] = None
+        original_search_index_enabled: Optional[bool] = None
+        new_search_index_enabled: Optional[bool] = None
 
     @classmethod
-    def do(cls, user: AbstractUser, table: TableForUpdate, name: str) -> TableForUpdate:
+    def do(
+        cls,
+        user: AbstractUser,
+        table: TableForUpdate,
+        name: str,
+        defer_dependant_updates: Optional[bool] = None,
+        search_index_enabled: Optional[bool] = None,
+    ) -> TableForUpdate:
         """
         Updates the table.
         See baserow.contrib.database.table.handler.TableHandler.update_table
@@ -197,19 +208,35 @@ class UpdateTableActionType(ActionType):
 
         :param user: The user on whose behalf the table is updated.
         :param table: The table instance that needs to be updated.
-        :param kwargs: The fields that need to be updated.
+        :param name: The new name of the table.
+        :param defer_dependant_updates: If provided, indicates whether the dependant
+            fields of the rows must be updated in the background.
+        :param search_index_enabled: If provided, indicates whether a full-text
+            search index must be maintained for the rows.
         :raises ValueError: When the provided table is not an instance of Table.
         :return: The updated table instance.
         """
 
         original_table_name = table.name
+        original_defer_dependant_updates = table.defer_dependant_updates
+        original_search_index_enabled = table.search_index_enabled
 
-        TableHandler().update_table(user, table, name=name)
+        TableHandler().update_table(
+            user,
+            table,
+            name=name,
+            defer_dependant_updates=defer_dependant_updates,
+            search_index_enabled=search_index_enabled,
+        )
 
         params = cls.Params(
             table.id,
             original_table_name,
             new_table_name=name,
+            original_defer_dependant_updates=original_defer_dependant_updates,
+            new_defer_dependant_updates=defer_dependant_updates,
+            original_search_index_enabled=original_search_index_enabled,
+            new_search_index_enabled=search_index_enabled,
         )
 
         cls.register_action(user, params, cls.scope(table.database_id))
@@ -222,11 +249,19 @@ class UpdateTableActionType(ActionType):
     @classmethod
     def undo(cls, user: AbstractUser, params: Params, action_being_undone: Action):
         TableHandler().update_table_by_id(
-            user, params.table_id, name=params.original_table_name
+            user,
+            params.table_id,
+            name=params.original_table_name,
+            defer_dependant_updates=params.original_defer_dependant_updates,
+            search_index_enabled=params.original_search_index_enabled,
         )
 
     @classmethod
     def redo(cls, user: AbstractUser, params: Params, action_being_redone: Action):
         TableHandler().update_table_by_id(
-            user, params.table_id, name=params.new_table_name
+            user,
+            params.table_id,
+            name=params.new_table_name,
+            defer_dependant_updates=params.new_defer_dependant_updates,
+            search_index_enabled=params.new_search_index_enabled,
         )
@@ -20,19 +20,161 @@ When we construct a model we:
 By using different keys for different versions of the model we can
 be sure concurrent changes to the model aren't going to overwrite each others
 changes to the cached field_attrs.
+
+The field_attrs are not cached as is because they contain pickled Django model fields
+and specific field instances, which are large and slow to unpickle. Instead a compact
+JSON representation containing the field type and the column values of every field is
+cached, see `compact_field_attrs`. This is rehydrated into field instances and model
+fields locally when the model is generated.
+
+When a model is generated, the model versions and field_attrs of the table and of all
+the tables related to it via link row fields are fetched in as few cache calls as
+possible using `get_latest_cached_models_field_attrs`. With the Redis cache backend
+this is a single Lua script call per level of related tables instead of two calls per
+table.
+
+On top of the shared cache every process keeps a small in memory LRU cache of fully
+generated model classes keyed by `(table_id, model_version)`. Because every change to a
+table increments its model version, an entry in this local cache can never be served
+after the table has changed. Models containing link row fields also embed the models of
+the related tables, so the local entry remembers the model versions of those related
+tables and is only used when they are all still the latest ones. Models containing only
+a subset of the fields, generated with `get_model(field_ids=...)`, are stored in the
+same cache keyed by `(table_id, model_version, field_ids)`.
+
+Finally the usage of the table models is recorded, see `record_table_model_usage`, so
+that the cache of the most recently used tables can be warmed up again after it has been
+cleared using the `warm_model_cache` management command.
 """
 
-from typing import Dict, Any
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Any, Optional, Iterable, Tuple, Type, Callable, List
 
 from django.conf import settings
 from django.core.cache import caches
 from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
 
+from baserow.contrib.database.fields.field_cache import get_shared_field_cache
 from baserow.version import VERSION as BASEROW_VERSION
 
 generated_models_cache = caches[settings.GENERATED_MODEL_CACHE_NAME]
 
 
+class GeneratedModelLRUCache:
+    """
+    A bounded, thread safe and per process least recently used cache for generated
+    table model classes. It keeps track of the amount of hits and misses so that the
+    effectiveness of the cache can be inspected.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple, is_valid: Optional[Callable[[Any], bool]] = None):
+        """
+        :param key: The key of the entry to look up.
+        :param is_valid: An optional callable which receives the cached value and
+            must return False if the value can't be used anymore. An invalid entry is
+            removed from the cache and counted as a miss.
+        :return: The cached value or None if there is no valid entry.
+        """
+
+        with self._lock:
+            value = self._entries.get(key)
+
+        if value is not None and is_valid is not None and not is_valid(value):
+            self.delete(key)
+            value = None
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+
+        return value
+
+    def set(self, key: Tuple, value: Any):
+        if self.max_size <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def peek_latest(self, table_id: int) -> Optional[Any]:
+        """
+        :param table_id: The table to look up.
+        :return: The most recently used value of the table regardless of the model
+            version, without counting it as a hit or miss.
+        """
+
+        with self._lock:
+            for key in reversed(self._entries.keys()):
+                if key[0] == table_id:
+                    return self._entries[key]
+        return None
+
+    def delete(self, key: Tuple):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_table(self, table_id: int):
+        """
+        Removes all the entries of the provided table, regardless of the model version.
+        """
+
+        with self._lock:
+            for key in [k for k in self._entries.keys() if k[0] == table_id]:
+                del self._entries[key]
+
+    def values(self) -> List[Any]:
+        """
+        :return: All the cached values, the most recently used first, without
+            counting them as hits or misses.
+        """
+
+        with self._lock:
+            return list(reversed(self._entries.values()))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+generated_models_local_cache = GeneratedModelLRUCache(
+    settings.GENERATED_MODEL_LOCAL_CACHE_SIZE
+)
+
+
 def table_model_cache_version_key(table_id: int) -> str:
     return f"full_table_model_version_{table_id}_{BASEROW_VERSION}"
 
@@ -45,30 +187,354 @@ def all_model_version_table_model_cache_entry_key(table_id: int) -> str:
     return f"full_table_model_{table_id}_*"
 
 
-def get_latest_cached_model_field_attrs(table_id: int) -> Dict[str, Any]:
+# Increment this when the structure of the compact field attrs changes, entries in
+# another format are then ignored.
+COMPACT_FIELD_ATTRS_FORMAT = 2
+
+CompactFieldAttrs = Dict[str, Any]
+
+
+def compact_field_attrs(
+    field_attrs: Dict[str, Any],
+    same_table_dependency_ids: Optional[Dict[int, List[int]]] = None,
+) -> str:
     """
-    :param table_id: The table to lookup any cached mode field attrs for.
-    :return: The latest cached field attrs for the table's model or None if nothing has
-        been cached yet.
+    Converts the field_attrs generated by `Table._fetch_and_generate_field_attrs` into
+    a compact JSON string. Only the field type and the values of the concrete columns
+    of every specific field instance are included, which is everything needed to
+    rehydrate the field instances and their model fields without querying the
+    database.
+
+    :param field_attrs: The field_attrs to compact.
+    :param same_table_dependency_ids: The ids of the fields in the same table that
+        every field directly depends on. These are used to generate models
+        containing a subset of the fields from the cache.
+    :return: A JSON string containing the compact field attrs.
+    """
+
+    if same_table_dependency_ids is None:
+        same_table_dependency_ids = {}
+
+    fields = []
+    related_table_ids = set()
+    for field_objects_key, trashed in [
+        ("_field_objects", False),
+        ("_trashed_field_objects", True),
+    ]:
+        for field_object in field_attrs[field_objects_key].values():
+            field = field_object["field"]
+            field_type = field_object["type"]
+            fields.append(
+                {
+                    "type": field_type.type,
+                    "trashed": trashed,
+                    "dependency_ids": same_table_dependency_ids.get(field.id, []),
+                    "values": {
+                        model_field.attname: getattr(field, model_field.attname)
+                        for model_field in field._meta.concrete_fields
+                    },
+                }
+            )
+            related_table_ids.update(field_type.get_related_model_table_ids(field))
+
+    return json.dumps(
+        {
+            "format": COMPACT_FIELD_ATTRS_FORMAT,
+            "primary_field_id": field_attrs["_primary_field_id"],
+            "related_table_ids": sorted(related_table_ids),
+            "fields": fields,
+        },
+        cls=DjangoJSONEncoder,
+        separators=(",", ":"),
+    )
+
+
+def load_compact_field_attrs(entry: Any) -> Optional[CompactFieldAttrs]:
+    """
+    :param entry: The raw value stored in the generated models cache.
+    :return: The loaded compact field attrs or None if the entry is missing or stored
+        in another format.
+    """
+
+    if not isinstance(entry, str):
+        return None
+
+    compact = json.loads(entry)
+    if compact.get("format") != COMPACT_FIELD_ATTRS_FORMAT:
+        return None
+    return compact
+
+
+def field_from_compact_descriptor(descriptor: Dict[str, Any]):
+    """
+    Rehydrates a specific field instance from a field descriptor of the compact field
+    attrs without querying the database.
+
+    :param descriptor: One of the `fields` of the compact field attrs.
+    :return: The specific field instance and its field type.
+    """
+
+    from baserow.contrib.database.fields.registries import field_type_registry
+
+    field_type = field_type_registry.get(descriptor["type"])
+    model_class = field_type.model_class
+    values = descriptor["values"]
+    concrete_fields = model_class._meta.concrete_fields
+    field = model_class.from_db(
+        "default",
+        [model_field.attname for model_field in concrete_fields],
+        [
+            model_field.to_python(values.get(model_field.attname))
+            for model_field in concrete_fields
+        ],
+    )
+    return field, field_type
+
+
+def _initial_model_version() -> int:
+    """
+    The model version of a table starts at the current time in milliseconds instead of
+    0. This makes sure that the versions never go back to a value that has been used
+    before when the cache is cleared, which would otherwise make the per process model
+    cache serve outdated models.
+    """
+
+    return int(time.time() * 1000)
+
+
+def get_latest_model_version(table_id: int) -> int:
+    """
+    :param table_id: The table to get the latest model version for.
+    :return: The latest model version of the table. Initializes it if not set yet.
     """
 
     model_version_key = table_model_cache_version_key(table_id)
-    latest_model_version = generated_models_cache.get_or_set(
-        model_version_key, 0, timeout=None
+    return generated_models_cache.get_or_set(
+        model_version_key, _initial_model_version(), timeout=None
     )
 
-    cache_key = table_model_cache_entry_key(table_id, latest_model_version)
 
-    return generated_models_cache.get(cache_key)
+def get_latest_model_versions(table_ids: Iterable[int]) -> Dict[int, int]:
+    """
+    Fetches the latest model versions of multiple tables in a single cache call.
+
+    :param table_ids: The tables to get the latest model version for.
+    :return: A dict with the table id as key and the latest model version as value.
+    """
+
+    keys = {table_model_cache_version_key(table_id): table_id for table_id in table_ids}
+    versions = generated_models_cache.get_many(keys.keys())
+    latest_versions = {}
+    for key, table_id in keys.items():
+        if key in versions:
+            latest_versions[table_id] = versions[key]
+        else:
+            latest_versions[table_id] = get_latest_model_version(table_id)
+    return latest_versions
+
+
+# Resolves the latest model version, initializing it if needed, and the cached
+# compact field_attrs of that version for every table in a single round trip.
+#   KEYS: the model version keys of the tables.
+#   ARGV[1]: the initial model version.
+#   ARGV[i * 2] and ARGV[i * 2 + 1]: the part of the i-th entry key before and after
+#       the model version.
+FETCH_LATEST_FIELD_ATTRS_LUA_SCRIPT = """
+local result = {}
+for i, version_key in ipairs(KEYS) do
+    local version = redis.call('GET', version_key)
+    if not version then
+        redis.call('SET', version_key, ARGV[1])
+        version = ARGV[1]
+    end
+    local entry = redis.call('GET', ARGV[i * 2] .. version .. ARGV[i * 2 + 1])
+    result[#result + 1] = version
+    result[#result + 1] = entry
+end
+return result
+"""
+
+_fetch_latest_field_attrs_script = None
 
+MODEL_VERSION_PLACEHOLDER = "__model_version__"
 
-def set_cached_model_field_attrs(table_id: int, field_attrs: Dict[str, Any]):
+LatestCachedFieldAttrs = Tuple[int, Optional[CompactFieldAttrs]]
+
+
+def _get_redis_client():
     """
-    Will increment the latest model version for table_id and store field_attrs in the
-    cache entry for that model version.
+    :return: The raw redis client of the generated models cache or None if the
+        cache isn't backed by Redis.
+    """
+
+    client = getattr(generated_models_cache, "client", None)
+    if client is None or not hasattr(client, "get_client"):
+        return None
+    return client
+
+
+def _fetch_latest_field_attrs_with_lua(
+    client, table_ids: List[int]
+) -> Dict[int, LatestCachedFieldAttrs]:
+    global _fetch_latest_field_attrs_script
+
+    redis_client = client.get_client(write=True)
+    if _fetch_latest_field_attrs_script is None:
+        _fetch_latest_field_attrs_script = redis_client.register_script(
+            FETCH_LATEST_FIELD_ATTRS_LUA_SCRIPT
+        )
+
+    keys = []
+    args = [_initial_model_version()]
+    for table_id in table_ids:
+        keys.append(client.make_key(table_model_cache_version_key(table_id)))
+        entry_key = str(
+            client.make_key(
+                table_model_cache_entry_key(table_id, MODEL_VERSION_PLACEHOLDER)
+            )
+        )
+        args.extend(entry_key.split(MODEL_VERSION_PLACEHOLDER, 1))
+
+    result = _fetch_latest_field_attrs_script(keys=keys, args=args, client=redis_client)
+
+    latest = {}
+    for index, table_id in enumerate(table_ids):
+        version, entry = result[index * 2], result[index * 2 + 1]
+        field_attrs = None if entry is None else client.decode(entry)
+        latest[table_id] = (int(version), load_compact_field_attrs(field_attrs))
+    return latest
+
+
+def get_latest_cached_models_field_attrs(
+    table_ids: Iterable[int],
+) -> Dict[int, LatestCachedFieldAttrs]:
+    """
+    Resolves the latest model version and the cached field_attrs of that version for
+    multiple tables at once. With a Redis backed cache this is a single round trip,
+    otherwise two cache calls are made regardless of the amount of tables.
+
+    :param table_ids: The tables to lookup the cached field attrs for.
+    :return: A dict with the table id as key and a tuple containing the latest model
+        version and the cached compact field attrs, or None if not cached, as value.
+    """
+
+    table_ids = list(table_ids)
+    if len(table_ids) == 0:
+        return {}
+
+    client = _get_redis_client()
+    if client is not None:
+        return _fetch_latest_field_attrs_with_lua(client, table_ids)
+
+    versions = get_latest_model_versions(table_ids)
+    keys = {
+        table_model_cache_entry_key(table_id, version): table_id
+        for table_id, version in versions.items()
+    }
+    entries = generated_models_cache.get_many(keys.keys())
+    return {
+        table_id: (versions[table_id], load_compact_field_attrs(entries.get(key)))
+        for key, table_id in keys.items()
+    }
+
+
+# Contains the latest model versions and field_attrs which have been fetched upfront
+# for all the tables involved in generating a model and its related models.
+_prefetched_field_attrs: ContextVar[
+    Optional[Dict[int, LatestCachedFieldAttrs]]
+] = ContextVar("prefetched_field_attrs", default=None)
+
+
+def fetch_latest_cached_model_field_attrs_with_related(
+    table_id: int,
+) -> Dict[int, LatestCachedFieldAttrs]:
+    """
+    Fetches the latest model versions and cached field_attrs of the table and all the
+    tables it's related to, directly or indirectly, via fields that generate related
+    models. Every level of related tables costs one batched cache call.
+
+    :param table_id: The table to fetch the cached field attrs for.
+    :return: A dict with the table id as key and a tuple containing the latest model
+        version and the cached compact field attrs, or None if not cached, as value.
+    """
+
+    fetched = {}
+    to_fetch = [table_id]
+    while to_fetch:
+        fetched.update(get_latest_cached_models_field_attrs(to_fetch))
+        to_fetch = []
+        for field_attrs in [attrs for _, attrs in fetched.values() if attrs]:
+            for related_table_id in field_attrs["related_table_ids"]:
+                if related_table_id not in fetched and related_table_id not in to_fetch:
+                    to_fetch.append(related_table_id)
+    return fetched
+
+
+@contextmanager
+def prefetched_model_field_attrs(table_id: int):
+    """
+    Prefetches the cached field attrs of the table and all its related tables so that
+    generating the related models in `after_model_generation` doesn't need any
+    additional cache round trips. Nested usages reuse the already prefetched values.
+
+    :param table_id: The table whose model is going to be generated.
+    """
+
+    if _prefetched_field_attrs.get() is not None:
+        yield
+        return
+
+    token = _prefetched_field_attrs.set(
+        fetch_latest_cached_model_field_attrs_with_related(table_id)
+    )
+    try:
+        yield
+    finally:
+        _prefetched_field_attrs.reset(token)
+
+
+def get_latest_cached_model_field_attrs_with_version(
+    table_id: int,
+) -> LatestCachedFieldAttrs:
+    """
+    :param table_id: The table to lookup any cached model field attrs for.
+    :return: A tuple containing the latest model version and the latest cached
+        compact field attrs, or None if nothing has been cached yet. Prefetched values
+        are used when available.
+    """
+
+    prefetched = _prefetched_field_attrs.get()
+    if prefetched is not None and table_id in prefetched:
+        return prefetched[table_id]
+
+    return get_latest_cached_models_field_attrs([table_id])[table_id]
+
+
+def get_latest_cached_model_field_attrs(table_id: int) -> Optional[CompactFieldAttrs]:
+    """
+    :param table_id: The table to lookup any cached mode field attrs for.
+    :return: The latest cached compact field attrs for the table's model or None if
+        nothing has been cached yet.
+    """
+
+    return get_latest_cached_model_field_attrs_with_version(table_id)[1]
+
+
+def set_cached_model_field_attrs(
+    table_id: int,
+    field_attrs: Dict[str, Any],
+    same_table_dependency_ids: Optional[Dict[int, List[int]]] = None,
+) -> Tuple[int, CompactFieldAttrs]:
+    """
+    Will increment the latest model version for table_id and store the compact
+    representation of field_attrs in the cache entry for that model version.
 
     :param table_id: The table to lookup any cached mode field attrs for.
     :param field_attrs: The field_attrs for table_id to cache.
+    :param same_table_dependency_ids: The ids of the fields in the same table that
+        every field directly depends on.
+    :return: The model version the field_attrs have been stored for and the compact
+        field attrs that have been stored.
     """
 
     model_version_key = table_model_cache_version_key(table_id)
@@ -80,11 +546,160 @@ def set_cached_model_field_attrs(table_id: int, field_attrs: Dict[str, Any]):
     # queried the database at different times and constructed different field_attrs.
     next_model_version = generated_models_cache.incr(model_version_key)
     cache_key = table_model_cache_entry_key(table_id, next_model_version)
-    generated_models_cache.set(cache_key, field_attrs, timeout=None)
+    entry = compact_field_attrs(field_attrs, same_table_dependency_ids)
+    generated_models_cache.set(cache_key, entry, timeout=None)
+    return next_model_version, load_compact_field_attrs(entry)
+
+
+def _local_cache_key(
+    table_id: int, model_version: int, field_ids: Optional[Iterable[int]]
+) -> Tuple:
+    if field_ids is None:
+        return table_id, model_version
+    return table_id, model_version, tuple(sorted(set(field_ids)))
+
+
+def get_local_cached_model(
+    table_id: int, field_ids: Optional[Iterable[int]] = None
+) -> Tuple[Optional[Type], int]:
+    """
+    Looks up a generated model class in the per process model cache. The latest
+    model versions of the table and of the related tables of the most recently cached
+    model are fetched in a single cache call.
+
+    :param table_id: The table to get the model for.
+    :param field_ids: If provided the model containing only these fields, and their
+        dependencies, is looked up instead of the model containing all fields.
+    :return: A tuple containing the cached model, or None if there is no usable model
+        in the cache, and the latest model version of the table.
+    """
+
+    latest_entry = generated_models_local_cache.peek_latest(table_id)
+    related_table_ids = [] if latest_entry is None else list(latest_entry[1].keys())
+    versions = get_latest_model_versions([table_id, *related_table_ids])
+
+    def related_tables_unchanged(entry):
+        _, related_model_versions = entry
+        missing = [t for t in related_model_versions.keys() if t not in versions]
+        if missing:
+            versions.update(get_latest_model_versions(missing))
+        return all(
+            versions[related_table_id] == related_model_version
+            for related_table_id, related_model_version in (
+                related_model_versions.items()
+            )
+        )
+
+    model_version = versions[table_id]
+    entry = generated_models_local_cache.get(
+        _local_cache_key(table_id, model_version, field_ids),
+        is_valid=related_tables_unchanged,
+    )
+    return (None if entry is None else entry[0]), model_version
+
+
+def set_local_cached_model(
+    table_id: int,
+    model_version: int,
+    model: Type,
+    related_model_versions: Dict[int, int],
+    field_ids: Optional[Iterable[int]] = None,
+):
+    """
+    Stores a generated model class in the per process model cache.
+
+    :param table_id: The table the model belongs to.
+    :param model_version: The model version the model was generated for.
+    :param model: The generated model class.
+    :param related_model_versions: The model versions of all the related tables whose
+        models have been generated as part of this model.
+    :param field_ids: The field ids the model was generated for if it doesn't contain
+        all the fields of the table.
+    """
+
+    generated_models_local_cache.set(
+        _local_cache_key(table_id, model_version, field_ids),
+        (model, related_model_versions),
+    )
+
+
+# The usage of table models is tracked in a key which doesn't start with
+# `full_table_model_` so that it survives clearing the generated model cache and can be
+# used to warm it up again afterwards.
+TABLE_MODEL_USAGE_CACHE_KEY = f"table_model_usage_{BASEROW_VERSION}"
+# The minimum amount of seconds between two recordings of the usage of the same table
+# by the same process.
+TABLE_MODEL_USAGE_RECORD_INTERVAL = 60
+TABLE_MODEL_USAGE_MAX_TRACKED_TABLES = 10000
+
+# The tables whose usage has been recorded by this process during the last interval,
+# ordered by the time of the recording.
+_table_model_usage_recorded_at: "OrderedDict[int, float]" = OrderedDict()
+_table_model_usage_lock = threading.Lock()
+
+
+def record_table_model_usage(table_id: int):
+    """
+    Records that the model of the table has been used, so that the most recently used
+    tables can be found when warming up the cache. To keep the overhead low a process
+    only records the usage of the same table once every
+    `TABLE_MODEL_USAGE_RECORD_INTERVAL` seconds.
+
+    :param table_id: The table whose model has been used.
+    """
+
+    now = time.time()
+    with _table_model_usage_lock:
+        # The recordings older than the interval don't throttle anything anymore, so
+        # they're removed to keep the amount of tracked tables bounded.
+        while _table_model_usage_recorded_at:
+            recorded_at = next(iter(_table_model_usage_recorded_at.values()))
+            if now - recorded_at < TABLE_MODEL_USAGE_RECORD_INTERVAL:
+                break
+            _table_model_usage_recorded_at.popitem(last=False)
+
+        if table_id in _table_model_usage_recorded_at:
+            return
+        _table_model_usage_recorded_at[table_id] = now
+
+    client = _get_redis_client()
+    if client is not None:
+        redis_client = client.get_client(write=True)
+        key = client.make_key(TABLE_MODEL_USAGE_CACHE_KEY)
+        pipeline = redis_client.pipeline()
+        pipeline.zadd(key, {table_id: now})
+        pipeline.zremrangebyrank(key, 0, -TABLE_MODEL_USAGE_MAX_TRACKED_TABLES - 1)
+        pipeline.execute()
+    else:
+        usage = generated_models_cache.get(TABLE_MODEL_USAGE_CACHE_KEY, {})
+        usage[table_id] = now
+        generated_models_cache.set(TABLE_MODEL_USAGE_CACHE_KEY, usage, timeout=None)
+
+
+def get_most_recently_used_table_ids(limit: int) -> List[int]:
+    """
+    :param limit: The maximum amount of table ids to return.
+    :return: The ids of the tables whose models have been used most recently, most
+        recent first.
+    """
+
+    if limit <= 0:
+        return []
+
+    client = _get_redis_client()
+    if client is not None:
+        redis_client = client.get_client(write=False)
+        key = client.make_key(TABLE_MODEL_USAGE_CACHE_KEY)
+        return [int(t) for t in redis_client.zrevrange(key, 0, limit - 1)]
+
+    usage = generated_models_cache.get(TABLE_MODEL_USAGE_CACHE_KEY, {})
+    return sorted(usage.keys(), key=lambda t: usage[t], reverse=True)[:limit]
 
 
 def clear_generated_model_cache():
     print("Clearing Baserow's internal generated model cache...")
+    generated_models_local_cache.clear()
+    _table_model_usage_recorded_at.clear()
     if hasattr(generated_models_cache, "delete_pattern"):
         generated_models_cache.delete_pattern("full_table_model_*")
     elif settings.TESTS:
@@ -111,7 +726,7 @@ def invalidate_table_in_model_cache(
     """
 
     model_version_key = table_model_cache_version_key(table_id)
-    model_version = generated_models_cache.get_or_set(model_version_key, 0)
+    model_version = get_latest_model_version(table_id)
 
     if invalidate_related_tables:
         _invalidate_all_related_models(table_id, model_version)
@@ -126,20 +741,24 @@ def invalidate_table_in_model_cache(
         )
 
     generated_models_cache.incr(model_version_key)
+    generated_models_local_cache.delete_table(table_id)
+
+    shared_cache = get_shared_field_cache()
+    if shared_cache is not None:
+        shared_cache.uncache_table(table_id)
 
     return model_version
 
 
 def _invalidate_all_related_models(table_id: int, related_model_version: int):
-    from baserow.contrib.database.fields.registries import field_type_registry
-
     this_version_cache_key = table_model_cache_entry_key(
         table_id, related_model_version
     )
-    field_attrs = generated_models_cache.get(this_version_cache_key)
+    field_attrs = load_compact_field_attrs(
+        generated_models_cache.get(this_version_cache_key)
+    )
     if field_attrs is not None:
-        for field_obj in field_attrs.get("_field_objects", []).values():
-            field = field_obj.get("field", None)
-            if field is not None:
-                field_type = field_type_registry.get_by_model(field)
+        for descriptor in field_attrs["fields"]:
+            if not descriptor["trashed"]:
+                field, field_type = field_from_compact_descriptor(descriptor)
                 field_type.before_table_model_invalidated(field)
@@ -1,10 +1,16 @@
-from typing import Any, cast, NewType, List, Tuple, Optional, Type
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, cast, NewType, List, Tuple, Optional, Type, Dict
 
 from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.db import connection
 from django.db.models import QuerySet
 
 from baserow.contrib.database.fields.constants import RESERVED_BASEROW_FIELD_NAMES
+from baserow.contrib.database.fields.dependencies.deferred import (
+    schedule_deferred_dependant_updates,
+)
 from baserow.contrib.database.fields.exceptions import (
     MaxFieldLimitExceeded,
     MaxFieldNameLengthExceeded,
@@ -24,7 +30,13 @@ from baserow.contrib.database.models import Database
 from baserow.contrib.database.views.handler import ViewHandler
 from baserow.contrib.database.views.view_types import GridViewType
 from baserow.core.trash.handler import TrashHandler
+from baserow.core.utils import Progress
+from baserow.contrib.database.db.bulk_copy import copy_rows
 from baserow.contrib.database.db.schema import safe_django_schema_editor
+from .cache import (
+    get_latest_cached_models_field_attrs,
+    get_most_recently_used_table_ids,
+)
 from .exceptions import (
     TableDoesNotExist,
     TableNotInDatabase,
@@ -33,6 +45,7 @@ from .exceptions import (
     InitialTableDataDuplicateName,
 )
 from .models import GeneratedTableModel, Table
+from .search_index import create_search_index, drop_search_index
 from .signals import table_created, table_updated, table_deleted, tables_reordered
 
 
@@ -244,17 +257,21 @@ class TableHandler:
 
         ViewHandler().create_view(user, table, GridViewType.type, name="Grid")
 
-        bulk_data = [
-            model(
-                order=index + 1,
-                **{
-                    f"field_{fields[index].id}": str(value)
-                    for index, value in enumerate(row)
-                },
-            )
-            for index, row in enumerate(data)
-        ]
-        model.objects.bulk_create(bulk_data)
+        # The rows are streamed into the table using COPY because the initial data
+        # can contain a lot of rows.
+        copy_rows(
+            model,
+            (
+                model(
+                    order=index + 1,
+                    **{
+                        f"field_{fields[index].id}": str(value)
+                        for index, value in enumerate(row)
+                    },
+                )
+                for index, row in enumerate(data)
+            ),
+        )
 
     def fill_example_table_data(self, user: AbstractUser, table: Table):
         """
@@ -286,21 +303,43 @@ class TableHandler:
         model.objects.create(name="Tesla", active=True, order=1)
         model.objects.create(name="Amazon", active=False, order=2)
 
-    def update_table_by_id(self, user: AbstractUser, table_id: int, name: str) -> Table:
+    def update_table_by_id(
+        self,
+        user: AbstractUser,
+        table_id: int,
+        name: str,
+        defer_dependant_updates: Optional[bool] = None,
+        search_index_enabled: Optional[bool] = None,
+    ) -> Table:
         """
         Updates an existing table instance.
 
         :param user: The user on whose behalf the table is updated.
         :param table_id: The id of the table that needs to be updated.
         :param name: The name to be updated.
+        :param defer_dependant_updates: If provided, indicates whether the dependant
+            fields of the rows must be updated in the background.
+        :param search_index_enabled: If provided, indicates whether a full-text
+            search index must be maintained for the rows.
         :raises ValueError: When the provided table is not an instance of Table.
         :return: The updated table instance.
         """
         table = self.get_table_for_update(table_id)
-        return self.update_table(user, table, name)
+        return self.update_table(
+            user,
+            table,
+            name,
+            defer_dependant_updates=defer_dependant_updates,
+            search_index_enabled=search_index_enabled,
+        )
 
     def update_table(
-        self, user: AbstractUser, table: TableForUpdate, name: str
+        self,
+        user: AbstractUser,
+        table: TableForUpdate,
+        name: str,
+        defer_dependant_updates: Optional[bool] = None,
+        search_index_enabled: Optional[bool] = None,
     ) -> TableForUpdate:
         """
         Updates an existing table instance.
@@ -308,6 +347,13 @@ class TableHandler:
         :param user: The user on whose behalf the table is updated.
         :param table: The table instance that needs to be updated.
         :param name: The name to be updated.
+        :param defer_dependant_updates: If provided, indicates whether the formula
+            and lookup fields depending on the rows of the table must be updated in
+            the background instead of immediately when a row changes. The pending
+            updates are applied when this is disabled.
+        :param search_index_enabled: If provided, indicates whether a full-text
+            search index must be maintained for the rows of the table. The index is
+            filled in the background after enabling it and dropped when disabling it.
         :raises ValueError: When the provided table is not an instance of Table.
         :return: The updated table instance.
         """
@@ -318,6 +364,18 @@ class TableHandler:
         table.database.group.has_user(user, raise_error=True)
 
         table.name = name
+        if defer_dependant_updates is not None:
+            if table.defer_dependant_updates and not defer_dependant_updates:
+                schedule_deferred_dependant_updates(table.id)
+            table.defer_dependant_updates = defer_dependant_updates
+        if (
+            search_index_enabled is not None
+            and search_index_enabled != table.search_index_enabled
+        ):
+            if search_index_enabled:
+                create_search_index(table)
+            else:
+                drop_search_index(table)
         table.save()
 
         table_updated.send(self, table=table, user=user)
@@ -383,3 +441,96 @@ class TableHandler:
         TrashHandler.trash(user, table.database.group, table.database, table)
 
         table_deleted.send(self, table_id=table_id, table=table, user=user)
+
+    def get_tables_to_warm_in_model_cache(
+        self, limit: Optional[int] = None
+    ) -> List[int]:
+        """
+        Returns the ids of the tables whose generated model cache should be warmed
+        up.
+
+        :param limit: If provided only the ids of the `limit` most recently used
+            tables are returned, otherwise the ids of all tables.
+        :return: The ids of the tables, most recently used first if a limit is
+            provided.
+        """
+
+        if limit is None:
+            return list(Table.objects.order_by("id").values_list("id", flat=True))
+
+        table_ids = get_most_recently_used_table_ids(limit)
+        existing_table_ids = set(
+            Table.objects.filter(id__in=table_ids).values_list("id", flat=True)
+        )
+        return [table_id for table_id in table_ids if table_id in existing_table_ids]
+
+    def warm_model_cache(
+        self,
+        table_ids: List[int],
+        force: bool = False,
+        batch_size: int = 50,
+        workers: int = 1,
+        progress: Optional[Progress] = None,
+    ) -> Dict[int, float]:
+        """
+        Fills the generated model cache with the field_attrs of the provided tables
+        so that the first request to those tables doesn't have to fetch and generate
+        them. The tables are processed in batches of which multiple can be processed
+        in parallel.
+
+        :param table_ids: The ids of the tables to warm the model cache for.
+        :param force: Indicates whether the field_attrs of tables that have already
+            been cached must be rebuilt as well.
+        :param batch_size: The amount of tables in every batch.
+        :param workers: The amount of batches processed in parallel, each worker
+            uses its own database connection.
+        :param progress: If provided, incremented by one for every processed table.
+        :return: A dict containing the id of every table whose field_attrs have been
+            cached as key and the amount of seconds it took as value.
+        """
+
+        batches = [
+            table_ids[i : i + batch_size] for i in range(0, len(table_ids), batch_size)
+        ]
+        timings = {}
+
+        def batch_done(batch, batch_timings):
+            timings.update(batch_timings)
+            if progress is not None:
+                progress.increment(by=len(batch))
+
+        if workers <= 1:
+            for batch in batches:
+                batch_done(batch, self._warm_model_cache_batch(batch, force))
+            return timings
+
+        def warm_batch_in_thread(batch):
+            try:
+                return self._warm_model_cache_batch(batch, force)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(warm_batch_in_thread, batch): batch for batch in batches
+            }
+            for future in as_completed(futures):
+                batch_done(futures[future], future.result())
+
+        return timings
+
+    def _warm_model_cache_batch(
+        self, table_ids: List[int], force: bool
+    ) -> Dict[int, float]:
+        cached = get_latest_cached_models_field_attrs(table_ids)
+        tables = Table.objects.filter(id__in=table_ids)
+        timings = {}
+
+        for table in tables:
+            _, cached_field_attrs = cached.get(table.id, (None, None))
+            if force or cached_field_attrs is None:
+                start = time.perf_counter()
+                table.cache_model_field_attrs()
+                timings[table.id] = time.perf_counter() - start
+
+        return timings
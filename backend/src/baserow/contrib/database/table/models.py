@@ -1,4 +1,5 @@
 import re
+from contextlib import nullcontext
 from typing import Dict, Any, Union, Type
 
 from django.db import models
@@ -17,12 +18,19 @@ from baserow.contrib.database.fields.field_filters import (
 )
 from baserow.contrib.database.fields.field_sortings import AnnotatedOrder
 from baserow.contrib.database.fields.registries import field_type_registry
+from baserow.contrib.database.fields.field_cache import get_shared_field_cache
 from baserow.contrib.database.table.cache import (
-    get_latest_cached_model_field_attrs,
+    field_from_compact_descriptor,
+    get_latest_cached_model_field_attrs_with_version,
+    get_local_cached_model,
+    prefetched_model_field_attrs,
+    record_table_model_usage,
     set_cached_model_field_attrs,
+    set_local_cached_model,
 )
 from baserow.contrib.database.views.exceptions import ViewFilterTypeNotAllowedForField
 from baserow.contrib.database.views.registries import view_filter_type_registry
+from baserow.core.db import get_specific_instances
 from baserow.core.mixins import (
     OrderableMixin,
     CreatedAndUpdatedOnMixin,
@@ -56,7 +64,8 @@ class TableModelQuerySet(models.QuerySet):
         Performs a very broad search across all supported fields with the given search
         query. If the primary key value matches then that result will be returned
         otherwise all field types other than link row and boolean fields are currently
-        searched.
+        searched. If the table has a ready search index and all the fields are
+        searched, the index is used instead.
 
         :param search: The search query.
         :type search: str
@@ -68,6 +77,15 @@ class TableModelQuerySet(models.QuerySet):
         :rtype: QuerySet
         """
 
+        if only_search_by_field_ids is None:
+            from baserow.contrib.database.table.search_index import (
+                get_search_index_filter,
+            )
+
+            search_index_filter = get_search_index_filter(self.model, search)
+            if search_index_filter is not None:
+                return self.filter(search_index_filter)
+
         filter_builder = FilterBuilder(filter_type=FILTER_TYPE_OR).filter(
             Q(id__contains=search)
         )
@@ -349,6 +367,22 @@ class Table(
     database = models.ForeignKey("database.Database", on_delete=models.CASCADE)
     order = models.PositiveIntegerField()
     name = models.CharField(max_length=255)
+    defer_dependant_updates = models.BooleanField(
+        default=False,
+        help_text="Indicates whether the formula and lookup fields depending on the "
+        "rows of this table are updated in the background instead of immediately "
+        "when a row is created, updated or deleted.",
+    )
+    search_index_enabled = models.BooleanField(
+        default=False,
+        help_text="Indicates whether a full-text search index is maintained for the "
+        "rows of this table.",
+    )
+    search_index_ready = models.BooleanField(
+        default=False,
+        help_text="Indicates whether the search index contains all the rows of this "
+        "table, so that it can be used to search the rows.",
+    )
 
     class Meta:
         ordering = ("order",)
@@ -413,9 +447,79 @@ class Table(
         if not fields:
             fields = []
 
+        # Only a model that isn't generated as a related model of another table model
+        # can be stored in, or served from, the per process model cache. A related
+        # model is tied to the model that is being generated because the
+        # `after_model_generation` of the link row field modifies both of them.
+        use_local_cache = not manytomany_models and not managed
+
         if not manytomany_models:
             manytomany_models = {}
 
+        # A model containing only the fields with the provided `field_ids`, and their
+        # dependencies, can also be generated from the cache.
+        use_cache = (
+            use_cache
+            and len(fields) == 0
+            and field_names is None
+            and add_dependencies is True
+            and attribute_names is False
+        )
+        use_local_cache = use_local_cache and use_cache
+
+        # The full model is shared by everything running in the same request or task
+        # when a shared field cache is active.
+        shared_cache = (
+            get_shared_field_cache() if use_local_cache and field_ids is None else None
+        )
+        if shared_cache is not None:
+            model = shared_cache.get_cached_model(self.id)
+            if model is not None:
+                return model
+
+        if use_local_cache:
+            record_table_model_usage(self.id)
+            model, _ = get_local_cached_model(self.id, field_ids)
+            if model is not None:
+                if shared_cache is not None:
+                    shared_cache.cache_model(model)
+                return model
+
+        # The cached field attrs of this table and all of its related tables are
+        # fetched upfront so that generating the related models doesn't need any
+        # additional round trips to the cache.
+        with prefetched_model_field_attrs(self.id) if use_cache else nullcontext():
+            model = self._generate_model(
+                fields,
+                field_ids,
+                field_names,
+                attribute_names,
+                manytomany_models,
+                add_dependencies,
+                managed,
+                use_cache,
+                use_local_cache,
+                filtered,
+            )
+
+        if shared_cache is not None:
+            shared_cache.cache_model(model)
+
+        return model
+
+    def _generate_model(
+        self,
+        fields,
+        field_ids,
+        field_names,
+        attribute_names,
+        manytomany_models,
+        add_dependencies,
+        managed,
+        use_cache,
+        use_local_cache,
+        filtered,
+    ) -> Type[GeneratedTableModel]:
         app_label = "database_table"
         meta = type(
             "Meta",
@@ -469,18 +573,24 @@ class Table(
             "__str__": __str__,
         }
 
-        use_cache = (
-            use_cache
-            and len(fields) == 0
-            and field_ids is None
-            and add_dependencies is True
-            and attribute_names is False
-        )
+        model_version = None
+        field_attrs = None
 
         if use_cache:
-            field_attrs = get_latest_cached_model_field_attrs(self.id)
-        else:
-            field_attrs = None
+            (
+                model_version,
+                cached_field_attrs,
+            ) = get_latest_cached_model_field_attrs_with_version(self.id)
+            if cached_field_attrs is not None:
+                field_attrs = self._generate_field_attrs_from_compact(
+                    cached_field_attrs, field_ids
+                )
+            elif field_ids is not None:
+                # Only the field_attrs of all the fields can be cached. Instead of
+                # generating those we only fetch the requested fields because the
+                # full model will be cached the next time it's generated.
+                use_cache = use_local_cache = False
+                model_version = None
 
         if field_attrs is None:
             field_attrs = self._fetch_and_generate_field_attrs(
@@ -493,9 +603,16 @@ class Table(
             )
 
             if use_cache:
-                set_cached_model_field_attrs(self.id, field_attrs)
+                model_version, _ = set_cached_model_field_attrs(
+                    self.id,
+                    field_attrs,
+                    FieldDependencyHandler.get_same_table_dependency_ids(self),
+                )
 
         attrs.update(**field_attrs)
+        # The model version that the field_attrs belong to, or None if the model
+        # has not been generated from cacheable field_attrs.
+        attrs["_table_model_version"] = model_version
 
         # Create the model class.
         model = type(
@@ -523,8 +640,38 @@ class Table(
                 field_object["field"], model, field_object["name"], manytomany_models
             )
 
+        if use_local_cache:
+            related_model_versions = {
+                table_id: related_model._table_model_version
+                for table_id, related_model in manytomany_models.items()
+                if table_id != self.id
+            }
+            if None not in related_model_versions.values():
+                set_local_cached_model(
+                    self.id, model_version, model, related_model_versions, field_ids
+                )
+
         return model
 
+    def cache_model_field_attrs(self) -> int:
+        """
+        Fetches all the fields of the table from the database and stores their
+        field_attrs as a new version in the generated model cache, regardless of
+        whether they have already been cached.
+
+        :return: The new model version the field_attrs have been cached for.
+        """
+
+        field_attrs = self._fetch_and_generate_field_attrs(
+            True, False, None, None, [], False
+        )
+        model_version, _ = set_cached_model_field_attrs(
+            self.id,
+            field_attrs,
+            FieldDependencyHandler.get_same_table_dependency_ids(self),
+        )
+        return model_version
+
     def _fetch_and_generate_field_attrs(
         self,
         add_dependencies,
@@ -534,15 +681,7 @@ class Table(
         fields,
         filtered,
     ):
-        field_attrs = {
-            "_primary_field_id": -1,
-            # An object containing the table fields, field types and the chosen
-            # names with the table field id as key.
-            "_field_objects": {},
-            # An object containing the trashed table fields, field types and the
-            # chosen names with the table field id as key.
-            "_trashed_field_objects": {},
-        }
+        field_attrs = self._get_empty_field_attrs()
         # Construct a query to fetch all the fields of that table. We need to
         # include any trashed fields so the created model still has them present
         # as the column is still actually there. If the model did not have the
@@ -565,8 +704,9 @@ class Table(
             else:
                 fields_query = fields_query.filter(name__in=field_names)
         # Create a combined list of fields that must be added and belong to the this
-        # table.
-        fields = list(fields) + [field for field in fields_query]
+        # table. The specific instances of all of them are fetched upfront using one
+        # query per field type.
+        fields = get_specific_instances(list(fields) + list(fields_query))
         # If there are duplicate field names we have to store them in a list so we
         # know later which ones are duplicate.
         duplicate_field_names = []
@@ -606,32 +746,103 @@ class Table(
                 if field_name in duplicate_field_names:
                     field_name = f"{field_name}_{field.db_column}"
 
-            field_objects_dict = (
-                "_trashed_field_objects" if trashed else "_field_objects"
+            self._add_field_to_field_attrs(
+                field_attrs, field, field_type, field_name, trashed
             )
-            # Add the generated objects and information to the dict that
-            # optionally can be returned. We exclude trashed fields here so they
-            # are not displayed by baserow anywhere.
-            field_attrs[field_objects_dict][field.id] = {
-                "field": field,
-                "type": field_type,
-                "name": field_name,
-            }
-            if field.primary:
-                field_attrs["_primary_field_id"] = field.id
-
-            # Add the field to the attribute dict that is used to generate the
-            # model. All the kwargs that are passed to the `get_model_field`
-            # method are going to be passed along to the model field.
-            field_attrs[field_name] = field_type.get_model_field(
-                field,
-                db_column=field.db_column,
-                verbose_name=field.name,
+        return field_attrs
+
+    def _generate_field_attrs_from_compact(self, compact_field_attrs, field_ids=None):
+        """
+        Rehydrates the field_attrs from the compact field attrs stored in the
+        generated models cache without querying the database. If `field_ids` is
+        provided then only those fields and the fields they depend on in this table
+        are included.
+        """
+
+        descriptors = compact_field_attrs["fields"]
+
+        if field_ids is not None:
+            descriptors_by_id = {d["values"]["id"]: d for d in descriptors}
+            to_include = [i for i in field_ids if i in descriptors_by_id]
+            included_ids = set(to_include)
+            while len(to_include) > 0:
+                for dependency_id in descriptors_by_id[to_include.pop()][
+                    "dependency_ids"
+                ]:
+                    if (
+                        dependency_id in descriptors_by_id
+                        and dependency_id not in included_ids
+                    ):
+                        to_include.append(dependency_id)
+                        included_ids.add(dependency_id)
+            descriptors = [d for d in descriptors if d["values"]["id"] in included_ids]
+
+        field_attrs = self._get_empty_field_attrs()
+        for descriptor in descriptors:
+            field, field_type = field_from_compact_descriptor(descriptor)
+            self._add_field_to_field_attrs(
+                field_attrs, field, field_type, field.db_column, descriptor["trashed"]
             )
         return field_attrs
 
+    @staticmethod
+    def _get_empty_field_attrs():
+        return {
+            "_primary_field_id": -1,
+            # An object containing the table fields, field types and the chosen
+            # names with the table field id as key.
+            "_field_objects": {},
+            # An object containing the trashed table fields, field types and the
+            # chosen names with the table field id as key.
+            "_trashed_field_objects": {},
+        }
+
+    @staticmethod
+    def _add_field_to_field_attrs(field_attrs, field, field_type, field_name, trashed):
+        field_objects_dict = "_trashed_field_objects" if trashed else "_field_objects"
+        # Add the generated objects and information to the dict that
+        # optionally can be returned. We exclude trashed fields here so they
+        # are not displayed by baserow anywhere.
+        field_attrs[field_objects_dict][field.id] = {
+            "field": field,
+            "type": field_type,
+            "name": field_name,
+        }
+        if field.primary:
+            field_attrs["_primary_field_id"] = field.id
+
+        # Add the field to the attribute dict that is used to generate the
+        # model. All the kwargs that are passed to the `get_model_field`
+        # method are going to be passed along to the model field.
+        field_attrs[field_name] = field_type.get_model_field(
+            field,
+            db_column=field.db_column,
+            verbose_name=field.name,
+        )
+
     # Use our own custom index name as the default models.Index
     # naming scheme causes 5+ collisions on average per 1000 new
     # tables.
     def get_collision_safe_order_id_idx_name(self):
         return f"tbl_order_id_{self.id}_idx"
+
+
+class TableRowCount(models.Model):
+    """
+    Keeps track of the amount of non trashed rows in the table, so that the rows
+    don't have to be counted every time. See
+    `baserow.contrib.database.rows.counts`.
+    """
+
+    table = models.OneToOneField(
+        Table, on_delete=models.CASCADE, primary_key=True, related_name="+"
+    )
+    count = models.BigIntegerField(
+        help_text="The amount of non trashed rows in the table."
+    )
+    initializing = models.BooleanField(
+        default=False,
+        help_text="Indicates that the rows of the table are being counted. The count "
+        "then only holds the difference caused by the rows created or deleted since "
+        "the counting started.",
+    )
@@ -0,0 +1,312 @@
+"""
+Maintains an opt-in full-text search index for the rows of a table.
+
+Searching a table normally compares the search query with the value of every field
+of every row, which means that every search results in a sequential scan of the
+table. Tables with `search_index_enabled` get an additional
+`database_table_{id}_search` table containing a `tsvector` of the human readable
+values of every row, which is indexed with a GIN index.
+
+The entries of the rows are updated in the same transaction as the rows are created
+or updated, including the rows whose formula and lookup fields are updated because
+a row of another table has changed. When the values of all the rows might have
+changed, for example because a field has been created, updated or deleted, the
+index is rebuilt by a background task. Until it has been rebuilt for the first time
+or after such a change, `search_index_ready` is false and the rows are searched
+without the index.
+
+Contrary to the regular search, which matches any part of a value, the index only
+matches the words of the values which start with the words of the search query.
+"""
+
+import re
+from typing import Iterable, List, Optional, Type, Union
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Q, QuerySet
+from django.db.models.expressions import RawSQL
+from django.dispatch import receiver
+
+from baserow.contrib.database.fields import signals as field_signals
+from baserow.contrib.database.rows import signals as row_signals
+
+from .models import GeneratedTableModel, Table
+
+# The text search configuration used to convert the values to lexemes. The simple
+# configuration doesn't stem the words, so that they can be searched in any language.
+SEARCH_INDEX_CONFIG = "simple"
+# A `tsvector` can't be larger than 1MB, so very long values are truncated.
+MAX_SEARCH_TEXT_LENGTH = 100000
+
+
+def get_search_index_table_name(table_id: int) -> str:
+    return f"{Table.USER_TABLE_DATABASE_NAME_PREFIX}{table_id}_search"
+
+
+def search_index_rebuild_scheduled_key(table_id: int) -> str:
+    return f"search_index_rebuild_scheduled_{table_id}"
+
+
+def create_search_index(table: Table):
+    """
+    Creates the search index table of the provided table and schedules the task
+    filling it. The table instance is changed accordingly, but must be saved by the
+    caller.
+
+    :param table: The table for which the search index must be created.
+    """
+
+    quote_name = connection.ops.quote_name
+    search_table_name = get_search_index_table_name(table.id)
+
+    # The entries of the rows are deleted together with the rows.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {quote_name(search_table_name)} ("
+            f"row_id integer PRIMARY KEY "
+            f"REFERENCES {quote_name(table.get_database_table_name())} (id) "
+            f"ON DELETE CASCADE, tsv tsvector NOT NULL)"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {quote_name(f'{search_table_name}_tsv')} "
+            f"ON {quote_name(search_table_name)} USING gin (tsv)"
+        )
+
+    table.search_index_enabled = True
+    table.search_index_ready = False
+    schedule_search_index_rebuild(table.id)
+
+
+def drop_search_index(table: Table):
+    """
+    Drops the search index table of the provided table. The table instance is changed
+    accordingly, but must be saved by the caller.
+
+    :param table: The table whose search index must be dropped.
+    """
+
+    search_table_name = get_search_index_table_name(table.id)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DROP TABLE IF EXISTS {connection.ops.quote_name(search_table_name)}"
+        )
+
+    table.search_index_enabled = False
+    table.search_index_ready = False
+
+
+def get_row_search_text(model: Type[GeneratedTableModel], row) -> str:
+    """
+    :param model: The model of the table containing all its fields.
+    :param row: The row, fetched using `enhance_by_fields`.
+    :return: The text containing the id and the human readable value of every field
+        of the row, which is converted to the `tsvector` of the row.
+    """
+
+    values = [str(row.id)]
+    for field_object in model._field_objects.values():
+        value = field_object["type"].get_human_readable_value(
+            getattr(row, field_object["name"]), field_object
+        )
+        if value:
+            values.append(value)
+
+    return " ".join(values)[:MAX_SEARCH_TEXT_LENGTH]
+
+
+def _write_search_index_entries(
+    table_id: int, model: Type[GeneratedTableModel], rows: List
+):
+    if not rows:
+        return
+
+    search_table_name = connection.ops.quote_name(get_search_index_table_name(table_id))
+    placeholder = f"(%s, to_tsvector('{SEARCH_INDEX_CONFIG}', %s))"
+    params = []
+    for row in rows:
+        params += [row.id, get_row_search_text(model, row)]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {search_table_name} (row_id, tsv) "
+            f"VALUES {', '.join([placeholder] * len(rows))} "
+            f"ON CONFLICT (row_id) DO UPDATE SET tsv = EXCLUDED.tsv",
+            params,
+        )
+
+
+def update_search_index(
+    model: Type[GeneratedTableModel], row_ids: Union[Iterable[int], QuerySet]
+):
+    """
+    Updates the search index entries of the provided rows of a table with
+    `search_index_enabled`.
+
+    :param model: The model of the table containing all its fields.
+    :param row_ids: The ids of the rows whose values have changed, or a queryset
+        selecting them.
+    """
+
+    rows = list(model.objects_and_trash.filter(id__in=row_ids).enhance_by_fields())
+    _write_search_index_entries(model._table_id, model, rows)
+
+
+def schedule_search_index_rebuild(table_id: int):
+    """
+    Schedules the task rebuilding the search index of the table when the current
+    transaction commits. The task is not scheduled again while it's waiting to be
+    executed, so that many changes result in a single rebuild.
+
+    :param table_id: The table whose search index must be rebuilt.
+    """
+
+    from baserow.contrib.database.table.tasks import rebuild_table_search_index
+
+    def schedule():
+        if cache.add(
+            search_index_rebuild_scheduled_key(table_id),
+            True,
+            timeout=settings.CELERY_TIME_LIMIT,
+        ):
+            rebuild_table_search_index.delay(table_id)
+
+    transaction.on_commit(schedule)
+
+
+def invalidate_search_index(table: Table):
+    """
+    Stops using the search index of the table for searching, because the values of
+    all its rows might have changed, and schedules the task rebuilding it.
+
+    :param table: The table whose rows have changed.
+    """
+
+    if not table.search_index_enabled:
+        return
+
+    Table.objects_and_trash.filter(id=table.id).update(search_index_ready=False)
+    table.search_index_ready = False
+    schedule_search_index_rebuild(table.id)
+
+
+def rebuild_search_index(table_id: int, batch_size: Optional[int] = None) -> int:
+    """
+    Writes the search index entries of all the rows of the table in batches and
+    starts using the index for searching afterwards.
+
+    :param table_id: The table whose search index must be rebuilt.
+    :param batch_size: The amount of rows written at once. Defaults to the
+        SEARCH_INDEX_REBUILD_BATCH_SIZE setting.
+    :return: The amount of rows which have been indexed.
+    """
+
+    # Deleted before the rows are selected, so that the changes committed while this
+    # runs schedule the task again.
+    cache.delete(search_index_rebuild_scheduled_key(table_id))
+
+    if batch_size is None:
+        batch_size = settings.SEARCH_INDEX_REBUILD_BATCH_SIZE
+
+    try:
+        table = Table.objects.get(id=table_id, search_index_enabled=True)
+    except Table.DoesNotExist:
+        return 0
+
+    model = table.get_model()
+    last_row_id = 0
+    indexed_rows = 0
+    while True:
+        with transaction.atomic():
+            if not Table.objects.filter(
+                id=table_id, search_index_enabled=True
+            ).exists():
+                return indexed_rows
+
+            rows = list(
+                model.objects.filter(id__gt=last_row_id)
+                .order_by("id")
+                .enhance_by_fields()[:batch_size]
+            )
+            _write_search_index_entries(table_id, model, rows)
+
+        if not rows:
+            break
+
+        last_row_id = rows[-1].id
+        indexed_rows += len(rows)
+
+    # If the rows have changed again in the meantime the next rebuild marks the index
+    # as ready.
+    if not cache.get(search_index_rebuild_scheduled_key(table_id)):
+        Table.objects.filter(id=table_id, search_index_enabled=True).update(
+            search_index_ready=True
+        )
+
+    return indexed_rows
+
+
+def get_search_index_filter(
+    model: Type[GeneratedTableModel], search: str
+) -> Optional[Q]:
+    """
+    Returns a filter matching the rows whose words start with all the words of the
+    search query using the search index of the table. None is returned if the table
+    doesn't have a ready search index or if the search query doesn't contain any
+    words, in which case the rows must be searched without the index.
+
+    :param model: The model of the table which must be searched.
+    :param search: The search query.
+    :return: The filter, or None if the index can't be used.
+    """
+
+    if not re.search(r"\w", search):
+        return None
+
+    if not Table.objects.filter(
+        id=model._table_id, search_index_enabled=True, search_index_ready=True
+    ).exists():
+        return None
+
+    search_table_name = connection.ops.quote_name(
+        get_search_index_table_name(model._table_id)
+    )
+    # The search query is split into lexemes by the same parser as the values, and
+    # every lexeme is matched as a prefix.
+    return Q(
+        id__in=RawSQL(
+            f"SELECT row_id FROM {search_table_name} WHERE tsv @@ ("
+            f"SELECT to_tsquery('{SEARCH_INDEX_CONFIG}', "
+            f"string_agg(quote_literal(lexeme) || ':*', ' & ')) "
+            f"FROM unnest(to_tsvector('{SEARCH_INDEX_CONFIG}', %s)))",
+            [search],
+        )
+    )
+
+
+@receiver(row_signals.row_created)
+@receiver(row_signals.row_updated)
+def row_created_or_updated(sender, row, table, model, **kwargs):
+    if table.search_index_enabled:
+        update_search_index(model, [row.id])
+
+
+@receiver(row_signals.rows_created)
+@receiver(row_signals.rows_updated)
+def rows_created_or_updated(sender, rows, table, model, **kwargs):
+    if table.search_index_enabled:
+        update_search_index(model, [row.id for row in rows])
+
+
+@receiver(field_signals.field_created)
+@receiver(field_signals.field_updated)
+@receiver(field_signals.field_deleted)
+@receiver(field_signals.field_restored)
+def field_changed(sender, field, **kwargs):
+    from baserow.contrib.database.fields.handler import FieldHandler
+
+    # The values changed by update collectors in other situations are updated by
+    # the collector itself.
+    if isinstance(sender, FieldHandler):
+        invalidate_search_index(field.table)
@@ -0,0 +1,64 @@
+import logging
+import time
+from typing import Optional
+
+from baserow.config.celery import app
+
+
+logger = logging.getLogger(__name__)
+
+
+# noinspection PyUnusedLocal
+@app.task(bind=True, queue="export")
+def warm_model_cache(
+    self,
+    limit: Optional[int] = None,
+    force: bool = False,
+    batch_size: int = 50,
+    workers: int = 1,
+):
+    """
+    Fills the generated model cache for the most recently used tables, or all
+    tables, in the background.
+
+    :param limit: The amount of most recently used tables to warm the cache for. If
+        None the cache of all tables is warmed.
+    :param force: Indicates whether tables which have already been cached must be
+        rebuilt as well.
+    :param batch_size: The amount of tables processed in every batch.
+    :param workers: The amount of batches processed in parallel.
+    """
+
+    from baserow.contrib.database.table.handler import TableHandler
+
+    handler = TableHandler()
+    table_ids = handler.get_tables_to_warm_in_model_cache(limit)
+
+    start = time.perf_counter()
+    timings = handler.warm_model_cache(
+        table_ids, force=force, batch_size=batch_size, workers=workers
+    )
+    logger.info(
+        f"Warmed the model cache of {len(timings)} out of {len(table_ids)} tables in "
+        f"{time.perf_counter() - start:.2f}s."
+    )
+
+
+# noinspection PyUnusedLocal
+@app.task(bind=True, queue="export")
+def rebuild_table_search_index(self, table_id: int):
+    """
+    Writes the search index entries of all the rows of a table with
+    `search_index_enabled`.
+
+    :param table_id: The table whose search index must be rebuilt.
+    """
+
+    from baserow.contrib.database.table.search_index import rebuild_search_index
+
+    start = time.perf_counter()
+    indexed_rows = rebuild_search_index(table_id)
+    logger.info(
+        f"Indexed {indexed_rows} rows of table {table_id} in "
+        f"{time.perf_counter() - start:.2f}s."
+    )
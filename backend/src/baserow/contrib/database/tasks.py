@@ -0,0 +1,12 @@
+from .table.tasks import warm_model_cache, rebuild_table_search_index
+from .rows.tasks import update_deferred_dependant_fields, renormalize_row_orders
+from .fields.tasks import sync_trigram_indexes, sync_field_indexes
+
+__all__ = [
+    "warm_model_cache",
+    "rebuild_table_search_index",
+    "update_deferred_dependant_fields",
+    "renormalize_row_orders",
+    "sync_trigram_indexes",
+    "sync_field_indexes",
+]
@@ -12,6 +12,7 @@ from baserow.contrib.database.fields.models import Field
 from baserow.contrib.database.fields.registries import field_type_registry
 from baserow.contrib.database.rows.signals import row_created, rows_created
 from baserow.contrib.database.table.models import Table, GeneratedTableModel
+from baserow.contrib.database.table.search_index import drop_search_index
 from baserow.contrib.database.table.signals import table_created
 from baserow.contrib.database.views.handler import ViewHandler
 from baserow.contrib.database.views.models import View
@@ -95,6 +96,9 @@ class TableTrashableItemType(TrashableItemType):
             # it still exists.
             trash_item_lookup_cache["row_table_model_cache"].pop(trashed_item.id, None)
 
+        if trashed_item.search_index_enabled:
+            drop_search_index(trashed_item)
+
         with safe_django_schema_editor() as schema_editor:
             model = trashed_item.get_model()
             schema_editor.delete_model(model)
@@ -367,6 +371,8 @@ class RowsTrashableItemType(TrashableItemType):
                 )
         update_collector.apply_updates_and_get_updated_fields()
 
+        ViewHandler().field_value_updated(updated_fields)
+
         rows_created.send(
             self,
             rows=rows_to_restore,
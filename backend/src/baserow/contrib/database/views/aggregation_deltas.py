@@ -0,0 +1,237 @@
+"""
+Maintains the cached field aggregations of the grid views when rows are created,
+updated, deleted or restored, instead of computing them again from all the rows.
+
+The decomposable aggregation types, like the sum or the empty count, cache the state
+from which their value is derived next to it. When rows change, the states of only
+the changed rows which match the filters of the view are computed right before and
+after the change, and the difference is applied to the cached state when the
+transaction commits. This keeps the cost of a write proportional to the amount of
+changed rows, even for views with millions of rows.
+
+The version of every tracked aggregation is bumped by the change, so that readers
+never use a value that doesn't include it. The delta is only applied if the cached
+value was valid before the change and if nothing else has bumped the version since.
+In any other case, or when the new state can't be derived from the changed rows
+like when the row having the minimum value changes, the value is invalidated and
+computed again by the next reader.
+"""
+
+from functools import partial
+from typing import Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.dispatch import receiver
+
+from baserow.contrib.database.fields.models import Field
+from baserow.contrib.database.rows import signals as row_signals
+from baserow.contrib.database.table.models import GeneratedTableModel, Table
+
+from .handler import AggregationDelta, ViewHandler
+from .models import GridView, GridViewFieldOptions
+from .registries import view_aggregation_type_registry
+
+ViewAggregations = List[Tuple[GridView, List[Tuple[Field, str]]]]
+
+
+def get_decomposable_view_aggregations(
+    table: Table, model: GeneratedTableModel
+) -> ViewAggregations:
+    """
+    :param table: The table whose views must be returned.
+    :param model: The model of the table.
+    :return: The non trashed grid views of the table with their decomposable
+        aggregations, as (field, aggregation type) couples, which can be maintained
+        incrementally.
+    """
+
+    field_options = (
+        GridViewFieldOptions.objects.filter(
+            grid_view__table_id=table.id, grid_view__trashed=False
+        )
+        .exclude(aggregation_raw_type="")
+        .select_related("grid_view")
+    )
+
+    views = {}
+    for options in field_options:
+        if options.field_id not in model._field_objects:
+            continue
+
+        field = model._field_objects[options.field_id]["field"]
+        field_type = model._field_objects[options.field_id]["type"]
+        aggregation_type = view_aggregation_type_registry.get(
+            options.aggregation_raw_type
+        )
+        # The values of these fields can change because other rows change, which
+        # isn't reflected by the states of the changed rows.
+        if (
+            not aggregation_type.is_decomposable
+            or field_type.value_depends_on_other_rows
+        ):
+            continue
+
+        views.setdefault(options.grid_view_id, (options.grid_view, []))[1].append(
+            (field, options.aggregation_raw_type)
+        )
+
+    return list(views.values())
+
+
+class AggregationDeltaTracker:
+    """
+    Tracks the changes of the states of the decomposable aggregations of the views
+    of a table caused by changing some rows of that table.
+    """
+
+    def __init__(
+        self, table: Table, model: GeneratedTableModel, row_ids: Iterable[int]
+    ):
+        self.table = table
+        self.model = model
+        self.row_ids = list(row_ids)
+        self.handler = ViewHandler()
+        # The tracked (view, aggregations, versions before, states before) tuples.
+        self.tracked = []
+
+    def before_change(self, created: bool = False):
+        """
+        Computes the states of the changed rows before the change for every
+        aggregation having a valid cached value.
+
+        :param created: Indicates that the rows have just been created or restored.
+            There are no states before the change then and the version of the
+            cached values has already been bumped once by the creation.
+        """
+
+        view_aggregations = get_decomposable_view_aggregations(self.table, self.model)
+        if not view_aggregations:
+            return
+
+        cached_of_views = self.handler.get_cached_aggregations_of_views(
+            [
+                (view, [field.db_column for field, _ in aggregations])
+                for view, aggregations in view_aggregations
+            ]
+        )
+
+        to_track = []
+        for view, aggregations in view_aggregations:
+            versions = {}
+            for name, (cached_value, version) in cached_of_views[view.id].items():
+                # The creation of the rows has bumped the version once.
+                version_before = version - 1 if created else version
+                if (
+                    cached_value is not None
+                    and cached_value["version"] == version_before
+                    and "state" in cached_value
+                ):
+                    versions[name] = version_before
+
+            aggregations = [
+                (field, aggregation_type_name)
+                for field, aggregation_type_name in aggregations
+                if field.db_column in versions
+            ]
+            if aggregations:
+                to_track.append((view, aggregations, versions))
+
+        for view, aggregations, versions in to_track:
+            # The rows that have just been created didn't exist before.
+            removed = self.handler.get_field_aggregation_states(
+                view, aggregations, self.model, [] if created else self.row_ids
+            )
+            self.tracked.append((view, aggregations, versions, removed))
+
+    def after_change(self):
+        """
+        Computes the states of the changed rows after the change and applies the
+        difference to the cached values when the transaction commits.
+        """
+
+        if not self.tracked:
+            return
+
+        views_names = [
+            (view, [field.db_column for field, _ in aggregations])
+            for view, aggregations, _, _ in self.tracked
+        ]
+        for view, names in views_names:
+            # Bumped even if the values of the field didn't change, because the
+            # rows can start or stop matching the filters of the view.
+            self.handler.clear_aggregation_cache(view, names)
+        cached_of_views = self.handler.get_cached_aggregations_of_views(views_names)
+
+        for view, aggregations, versions, removed in self.tracked:
+            cached = cached_of_views[view.id]
+            added = self.handler.get_field_aggregation_states(
+                view, aggregations, self.model, self.row_ids
+            )
+
+            deltas = [
+                AggregationDelta(
+                    name=field.db_column,
+                    aggregation_type_name=aggregation_type_name,
+                    version_before=versions[field.db_column],
+                    version_after=cached[field.db_column][1],
+                    removed=removed[field.db_column],
+                    added=added[field.db_column],
+                )
+                for field, aggregation_type_name in aggregations
+            ]
+            transaction.on_commit(
+                partial(self.handler.apply_aggregation_deltas, view, deltas)
+            )
+
+
+def track_before_change(
+    table: Table, model: GeneratedTableModel, row_ids: Iterable[int]
+) -> AggregationDeltaTracker:
+    tracker = AggregationDeltaTracker(table, model, row_ids)
+    tracker.before_change()
+    return tracker
+
+
+def track_after_change(tracker: Optional[AggregationDeltaTracker]):
+    if tracker is not None:
+        tracker.after_change()
+
+
+def track_created(table: Table, model: GeneratedTableModel, row_ids: Iterable[int]):
+    tracker = AggregationDeltaTracker(table, model, row_ids)
+    tracker.before_change(created=True)
+    tracker.after_change()
+
+
+@receiver(row_signals.before_row_update)
+@receiver(row_signals.before_row_delete)
+def before_row_update_or_delete(sender, row, table, model, **kwargs):
+    return track_before_change(table, model, [row.id])
+
+
+@receiver(row_signals.before_rows_update)
+@receiver(row_signals.before_rows_delete)
+def before_rows_update_or_delete(sender, rows, table, model, **kwargs):
+    return track_before_change(table, model, [row.id for row in rows])
+
+
+@receiver(row_signals.row_updated)
+@receiver(row_signals.row_deleted)
+def row_updated_or_deleted(sender, before_return, **kwargs):
+    track_after_change(dict(before_return).get(before_row_update_or_delete))
+
+
+@receiver(row_signals.rows_updated)
+@receiver(row_signals.rows_deleted)
+def rows_updated_or_deleted(sender, before_return, **kwargs):
+    track_after_change(dict(before_return).get(before_rows_update_or_delete))
+
+
+@receiver(row_signals.row_created)
+def row_created(sender, row, table, model, **kwargs):
+    track_created(table, model, [row.id])
+
+
+@receiver(row_signals.rows_created)
+def rows_created(sender, rows, table, model, **kwargs):
+    track_created(table, model, [row.id for row in rows])
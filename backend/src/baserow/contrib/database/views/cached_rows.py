@@ -0,0 +1,75 @@
+"""
+Serves the pages of sorted or filtered views using a cached ordered list of the ids
+of all their rows.
+
+Every page of a view is normally fetched by filtering and sorting all the rows of the
+table again, which is slow for expensive sorts like the ones of single select or link
+row fields. If the VIEW_ROW_IDS_CACHE_MAX_ROWS setting is enabled, the ids of the
+rows of the view are selected once in the right order and cached as a packed array
+of integers. A page is then fetched by slicing the ids and selecting the rows by
+their primary key.
+
+The cached ids are invalidated using the version of the rows of the table, which is
+bumped whenever the rows or fields of the table change, and a version per view which
+is bumped whenever its filters or sorts change.
+"""
+
+from array import array
+from typing import Iterable, List, Type
+
+from baserow.contrib.database.rows.counts import RowCount
+from baserow.contrib.database.table.models import GeneratedTableModel
+
+# The ids of the rows of a table fit in a 4 bytes signed integer.
+ROW_IDS_TYPECODE = "i"
+
+
+def pack_row_ids(row_ids: Iterable[int]) -> bytes:
+    return array(ROW_IDS_TYPECODE, row_ids).tobytes()
+
+
+def unpack_row_ids(packed: bytes) -> array:
+    row_ids = array(ROW_IDS_TYPECODE)
+    row_ids.frombytes(packed)
+    return row_ids
+
+
+class CachedViewRows:
+    """
+    A sliceable sequence of the rows of a view, which only fetches the rows of the
+    requested slice using the ordered ids of all the rows of the view. It can be
+    paginated in the same way as the queryset of the view.
+    """
+
+    # Prevents the paginator from warning about an unordered object list.
+    ordered = True
+
+    def __init__(
+        self, model: Type[GeneratedTableModel], row_ids: array, row_count_mode: str
+    ):
+        """
+        :param model: The model of the table of the view.
+        :param row_ids: The ids of all the rows of the view in the right order.
+        :param row_count_mode: Whether the ids have just been selected or come from
+            the cache.
+        """
+
+        self.model = model
+        self.row_ids = row_ids
+        self.row_count = RowCount(len(row_ids), row_count_mode)
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def count(self) -> int:
+        return len(self.row_ids)
+
+    def __getitem__(self, item: slice) -> List[GeneratedTableModel]:
+        if not isinstance(item, slice):
+            raise TypeError("The rows can only be sliced.")
+
+        row_ids = self.row_ids[item].tolist()
+        rows = self.model.objects.filter(id__in=row_ids).enhance_by_fields()
+        rows_by_id = {row.id: row for row in rows}
+        # A row could have been deleted since the ids have been selected.
+        return [rows_by_id[row_id] for row_id in row_ids if row_id in rows_by_id]
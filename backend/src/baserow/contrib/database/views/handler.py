@@ -30,6 +30,19 @@ from baserow.contrib.database.fields.field_filters import FilterBuilder
 from baserow.contrib.database.fields.field_sortings import AnnotatedOrder
 from baserow.contrib.database.fields.models import Field
 from baserow.contrib.database.fields.registries import field_type_registry
+from baserow.contrib.database.rows.counts import (
+    ROW_COUNT_MODE_APPROXIMATE,
+    ROW_COUNT_MODE_CACHED,
+    ROW_COUNT_MODE_EXACT,
+    VIEW_ROW_COUNT_CACHE_TIMEOUT,
+    RowCount,
+    bump_table_rows_version,
+    can_approximate_row_count,
+    count_rows,
+    estimate_row_count,
+    increment_cache_version,
+    table_rows_version_cache_key,
+)
 from baserow.contrib.database.rows.handler import RowHandler
 from baserow.contrib.database.rows.signals import row_created
 from baserow.contrib.database.table.models import Table, GeneratedTableModel
@@ -58,6 +71,7 @@ from .exceptions import (
     DecoratorValueProviderTypeNotCompatible,
     NoAuthorizationToPubliclySharedView,
 )
+from .cached_rows import CachedViewRows, pack_row_ids, unpack_row_ids
 from .models import View, ViewDecoration, ViewFilter, ViewSort
 from .registries import (
     view_type_registry,
@@ -88,6 +102,24 @@ from .validators import EMPTY_VALUES
 FieldOptionsDict = Dict[int, Dict[str, Any]]
 
 
+@dataclass
+class AggregationDelta:
+    """
+    The change of the state of a decomposable aggregation of a view caused by changing
+    some rows, which is applied to the cached state when the transaction commits.
+    """
+
+    name: str
+    aggregation_type_name: str
+    # The version of the cached value, which must be valid, before the change.
+    version_before: int
+    # The version after the change, which nothing else must have bumped since.
+    version_after: int
+    # The states of the changed rows before and after the change.
+    removed: Dict[str, Any]
+    added: Dict[str, Any]
+
+
 class ViewHandler:
     PUBLIC_VIEW_TOKEN_ALGORITHM = "HS256"  # nosec
 
@@ -231,6 +263,10 @@ class ViewHandler:
         if "filters_disabled" in view_values:
             view_type.after_filter_update(view)
 
+        if "filter_type" in view_values or "filters_disabled" in view_values:
+            self.clear_row_count_cache(view.id)
+            self.clear_row_ids_cache(view.id)
+
         view_updated.send(self, view=view, user=user)
 
         return view
@@ -424,7 +460,8 @@ class ViewHandler:
         modification, deletion. This method is called for each directly or indirectly
         affected list of fields.
 
-        Calls the `.after_field_value_update(updated_fields)` of each view type.
+        Calls the `.after_field_value_update(updated_fields)` of each view type and
+        invalidates the cached row counts of the views of the related tables.
 
         :param updated_fields: The field or list of fields that are affected.
         """
@@ -432,6 +469,8 @@ class ViewHandler:
         if not isinstance(updated_fields, list):
             updated_fields = [updated_fields]
 
+        bump_table_rows_version({field.table_id for field in updated_fields})
+
         # Call each view types hook
         for view_type in view_type_registry.get_all():
             view_type.after_field_value_update(updated_fields)
@@ -441,7 +480,8 @@ class ViewHandler:
         Called for each field modification. This include indirect modification when
         fields depends from another (like formula fields or lookup fields).
 
-        Calls the `.after_field_update(updated_fields)` of each view type.
+        Calls the `.after_field_update(updated_fields)` of each view type and
+        invalidates the cached row counts of the views of the related tables.
 
         :param updated_fields: The field or list of fields that are updated.
         """
@@ -449,6 +489,8 @@ class ViewHandler:
         if not isinstance(updated_fields, list):
             updated_fields = [updated_fields]
 
+        bump_table_rows_version({field.table_id for field in updated_fields})
+
         # Call each view types hook
         for view_type in view_type_registry.get_all():
             view_type.after_field_update(updated_fields)
@@ -1299,6 +1341,191 @@ class ViewHandler:
 
         return (valid_cached_values, need_computation)
 
+    def _get_row_count_cache_key(self, view_id: int):
+        """
+        Returns the row count cache key for the specified view id.
+        """
+
+        return f"view_row_count__{view_id}"
+
+    def _get_row_count_version_cache_key(self, view_id: int):
+        """
+        Returns the row count version cache key for the specified view id.
+        """
+
+        return f"view_row_count_version__{view_id}"
+
+    def clear_row_count_cache(self, view_id: int):
+        """
+        Increments the version of the cached row count of the specified view id. This
+        happens automatically when a filter of the view is saved or deleted.
+        """
+
+        increment_cache_version(self._get_row_count_version_cache_key(view_id))
+
+    def get_view_row_count(
+        self,
+        view: View,
+        queryset: Optional[QuerySet] = None,
+        model: Optional[GeneratedTableModel] = None,
+        search: Optional[str] = None,
+        approximate: bool = False,
+        no_cache: bool = False,
+    ) -> RowCount:
+        """
+        Counts the rows of the view. If the view doesn't have any active filters, the
+        stored count of the table is used. The count of a filtered view is cached
+        until the rows of the table or the filters of the view change. Unless the
+        search parameter is set to a non empty string, in which case the rows are
+        always counted.
+
+        :param view: The view to count the rows of.
+        :param queryset: The queryset of the view to count. If not specified then it's
+            generated using the `get_queryset` method.
+        :param model: The model for this view table to generate the queryset from, if
+            not specified then the model will be generated automatically.
+        :param search: The search string that is applied to the queryset.
+        :param approximate: Whether the count of the filtered rows may be estimated by
+            the query planner if the table has more rows than the
+            `APPROXIMATE_ROW_COUNT_THRESHOLD` setting.
+        :param no_cache: Should be set if the queryset is filtered by more than the
+            filters of the view, so that the count isn't cached.
+        :return: The count and how it has been determined.
+        """
+
+        if queryset is None:
+            queryset = self.get_queryset(view, search, model)
+
+        view_type = view_type_registry.get_by_model(view.specific_class)
+        filtered = (
+            view_type.can_filter
+            and not view.filters_disabled
+            and view.viewfilter_set.exists()
+        )
+        no_cache = no_cache or bool(search)
+
+        if no_cache or not filtered:
+            return count_rows(
+                queryset, filtered=filtered or no_cache, approximate=approximate
+            )
+
+        if approximate and can_approximate_row_count(queryset.model):
+            return RowCount(estimate_row_count(queryset), ROW_COUNT_MODE_APPROXIMATE)
+
+        # The versions are fetched before counting, so that a count of rows which
+        # changed in the meantime is stored with an outdated version.
+        cache_key = self._get_row_count_cache_key(view.id)
+        version_cache_keys = [
+            table_rows_version_cache_key(view.table_id),
+            self._get_row_count_version_cache_key(view.id),
+        ]
+        cached = cache.get_many([cache_key] + version_cache_keys)
+        versions = [cached.get(key, 1) for key in version_cache_keys]
+        cached_count = cached.get(cache_key, {"versions": None})
+
+        if cached_count["versions"] == versions:
+            return RowCount(cached_count["count"], ROW_COUNT_MODE_CACHED)
+
+        count = queryset.count()
+        cache.set(
+            cache_key,
+            {"count": count, "versions": versions},
+            timeout=VIEW_ROW_COUNT_CACHE_TIMEOUT,
+        )
+        return RowCount(count, ROW_COUNT_MODE_EXACT)
+
+    def _get_row_ids_cache_key(self, view_id: int):
+        """
+        Returns the ordered row ids cache key for the specified view id.
+        """
+
+        return f"view_row_ids__{view_id}"
+
+    def _get_row_ids_version_cache_key(self, view_id: int):
+        """
+        Returns the ordered row ids version cache key for the specified view id.
+        """
+
+        return f"view_row_ids_version__{view_id}"
+
+    def clear_row_ids_cache(self, view_id: int):
+        """
+        Increments the version of the cached ordered row ids of the specified view
+        id. This happens automatically when a filter or sort of the view is saved or
+        deleted.
+        """
+
+        increment_cache_version(self._get_row_ids_version_cache_key(view_id))
+
+    def get_cached_view_rows(
+        self, view: View, queryset: QuerySet
+    ) -> Optional[CachedViewRows]:
+        """
+        Returns the rows of a sorted or filtered view as a sequence which fetches
+        only the rows of the requested slice using the cached ordered ids of all the
+        rows. The ids are cached until the rows of the table or the filters and sorts
+        of the view change. None is returned if the VIEW_ROW_IDS_CACHE_MAX_ROWS
+        setting is disabled, if the view isn't sorted nor filtered, in which case
+        the rows are fetched quickly enough without the cache, or if the view has
+        more rows than the setting allows.
+
+        :param view: The view whose rows must be returned.
+        :param queryset: The queryset of the view generated using the
+            `get_queryset` method without any search.
+        :return: The sliceable rows of the view or None if the ids can't be cached.
+        """
+
+        max_rows = settings.VIEW_ROW_IDS_CACHE_MAX_ROWS
+        if not max_rows:
+            return None
+
+        view_type = view_type_registry.get_by_model(view.specific_class)
+        sorted_or_filtered = (view_type.can_sort and view.viewsort_set.exists()) or (
+            view_type.can_filter
+            and not view.filters_disabled
+            and view.viewfilter_set.exists()
+        )
+        if not sorted_or_filtered:
+            return None
+
+        # The versions are fetched before selecting the ids, so that the ids of
+        # rows which changed in the meantime are stored with an outdated version.
+        cache_key = self._get_row_ids_cache_key(view.id)
+        version_cache_keys = [
+            table_rows_version_cache_key(view.table_id),
+            self._get_row_ids_version_cache_key(view.id),
+        ]
+        cached = cache.get_many([cache_key] + version_cache_keys)
+        versions = [cached.get(key, 1) for key in version_cache_keys]
+        cached_row_ids = cached.get(cache_key, {"versions": None})
+
+        if cached_row_ids["versions"] == versions:
+            if cached_row_ids["row_ids"] is None:
+                return None
+            return CachedViewRows(
+                queryset.model,
+                unpack_row_ids(cached_row_ids["row_ids"]),
+                ROW_COUNT_MODE_CACHED,
+            )
+
+        # The prefetches of the queryset can't be combined with selecting the ids.
+        ids_queryset = queryset.prefetch_related(None).values_list("id", flat=True)
+        row_ids = list(ids_queryset[: max_rows + 1])
+        # Views with too many rows are remembered as well, so that their ids aren't
+        # selected again for every page.
+        packed_row_ids = pack_row_ids(row_ids) if len(row_ids) <= max_rows else None
+        cache.set(
+            cache_key,
+            {"row_ids": packed_row_ids, "versions": versions},
+            timeout=VIEW_ROW_COUNT_CACHE_TIMEOUT,
+        )
+
+        if packed_row_ids is None:
+            return None
+        return CachedViewRows(
+            queryset.model, unpack_row_ids(packed_row_ids), ROW_COUNT_MODE_EXACT
+        )
+
     def get_view_field_aggregations(
         self,
         view: View,
@@ -1361,7 +1588,7 @@ class ViewHandler:
             used_lock = True
 
         # Do we need to compute some aggregations?
-        if need_computation or with_total:
+        if need_computation:
             db_result = self.get_field_aggregations(
                 view,
                 [
@@ -1369,19 +1596,23 @@ class ViewHandler:
                     for n in need_computation.values()
                 ],
                 model,
-                with_total=with_total,
                 search=search,
+                with_states=not search,
             )
+            states = db_result.pop("states", {})
 
             if not search:
                 to_cache = {}
                 for key, value in db_result.items():
-                    # We don't cache total value
-                    if key != "total":
-                        to_cache[self._get_aggregation_value_cache_key(view, key)] = {
-                            "value": value,
-                            "version": need_computation[key]["version"],
-                        }
+                    cached_value = {
+                        "value": value,
+                        "version": need_computation[key]["version"],
+                    }
+                    # The state allows to update the value when rows change.
+                    if key in states:
+                        cached_value["state"] = states[key]
+                    cache_key = self._get_aggregation_value_cache_key(view, key)
+                    to_cache[cache_key] = cached_value
 
                 # Let's cache the newly computed values
                 cache.set_many(to_cache)
@@ -1389,6 +1620,12 @@ class ViewHandler:
             # Merged cached values and computed one
             values.update(db_result)
 
+        if with_total:
+            # The total is the row count of the view, which has its own cache.
+            values["total"] = self.get_view_row_count(
+                view, model=model, search=search
+            ).count
+
         if used_lock:
             try:
                 cache_lock.release()
@@ -1406,11 +1643,14 @@ class ViewHandler:
         model: Union[GeneratedTableModel, None] = None,
         with_total: bool = False,
         search: Union[str, None] = None,
+        with_states: bool = False,
     ) -> Dict[str, Any]:
         """
         Returns a dict of aggregation for given (field, aggregation_type) couple list.
         The dict keys are field names and value are aggregation values. The total is
-        included in result if the with_total is specified.
+        included in result if the with_total is specified. The states of the
+        decomposable aggregations are included in the result as a dict by field name
+        under the `states` key if with_states is specified.
 
         :param view: The view to get the field aggregation for.
         :param aggregations: A list of (field_instance, aggregation_type).
@@ -1420,6 +1660,8 @@ class ViewHandler:
         :param with_total: Whether the total row count should be returned in the
             result.
         :param search: the search string to considerate.
+        :param with_states: Whether the states of the decomposable aggregations
+            should be returned in the result.
         :raises FieldAggregationNotSupported: When the view type doesn't support
             field aggregation.
         :raises FieldNotInTable: When one of the field doesn't belong to the specified
@@ -1467,11 +1709,215 @@ class ViewHandler:
                 field_name, model_field, field
             )
 
+        state_aggregations = {}
+        if with_states:
+            state_aggregations = self._get_state_aggregations(view, aggregations, model)
+            aggregation_dict.update(
+                self._flatten_state_aggregations(state_aggregations)
+            )
+
         # Add total to allow further calculation on the client if required
         if with_total:
             aggregation_dict["total"] = Count("id", distinct=True)
 
-        return queryset.aggregate(**aggregation_dict)
+        result = queryset.aggregate(**aggregation_dict)
+
+        if with_states:
+            result["states"] = self._extract_states(result, state_aggregations)
+
+        return result
+
+    def _get_state_aggregations(
+        self,
+        view: View,
+        aggregations: Iterable[Tuple[django_models.Field, str]],
+        model: GeneratedTableModel,
+    ) -> Dict[str, Dict[str, django_models.Aggregate]]:
+        """
+        Returns the aggregations computing the states of the decomposable
+        aggregations by field name. There are no states for the fields whose values
+        can change because other rows change, because they can't be updated using
+        only the changed rows.
+        """
+
+        state_aggregations = {}
+
+        for (field_instance, aggregation_type_name) in aggregations:
+            if field_instance.table_id != view.table_id:
+                raise FieldNotInTable(
+                    f"The field {field_instance.pk} does not belong to table "
+                    f"{view.table.id}."
+                )
+
+            field_name = field_instance.db_column
+            field = model._field_objects[field_instance.id]["field"]
+            field_type = model._field_objects[field_instance.id]["type"]
+            aggregation_type = view_aggregation_type_registry.get(aggregation_type_name)
+            if (
+                not aggregation_type.is_decomposable
+                or field_type.value_depends_on_other_rows
+            ):
+                continue
+
+            model_field = model._meta.get_field(field_name)
+            state_aggregations[field_name] = aggregation_type.get_state_aggregations(
+                field_name, model_field, field
+            )
+
+        return state_aggregations
+
+    def _flatten_state_aggregations(
+        self, state_aggregations: Dict[str, Dict[str, django_models.Aggregate]]
+    ) -> Dict[str, django_models.Aggregate]:
+        return {
+            f"{field_name}_state_{key}": aggregation
+            for field_name, aggregations in state_aggregations.items()
+            for key, aggregation in aggregations.items()
+        }
+
+    def _extract_states(
+        self,
+        result: Dict[str, Any],
+        state_aggregations: Dict[str, Dict[str, django_models.Aggregate]],
+    ) -> Dict[str, Dict[str, Any]]:
+        return {
+            field_name: {
+                key: result.pop(f"{field_name}_state_{key}") for key in aggregations
+            }
+            for field_name, aggregations in state_aggregations.items()
+        }
+
+    def get_field_aggregation_states(
+        self,
+        view: View,
+        aggregations: Iterable[Tuple[django_models.Field, str]],
+        model: GeneratedTableModel,
+        row_ids: Iterable[int],
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the states of the decomposable aggregations of only the provided
+        rows which match the filters of the view. Used to compute the change of the
+        state of the aggregations of a view when those rows change.
+
+        :param view: The view to get the aggregation states for.
+        :param aggregations: A list of (field_instance, aggregation_type).
+        :param model: The model for this view table.
+        :param row_ids: The ids of the rows whose states must be computed.
+        :return: A dict of aggregation states by field name.
+        """
+
+        row_ids = list(row_ids)
+        if row_ids:
+            queryset = self.apply_filters(view, model.objects.filter(id__in=row_ids))
+        else:
+            # The states of no rows are computed without querying the database.
+            queryset = model.objects.none()
+        state_aggregations = self._get_state_aggregations(view, aggregations, model)
+        result = queryset.aggregate(
+            **self._flatten_state_aggregations(state_aggregations)
+        )
+        return self._extract_states(result, state_aggregations)
+
+    def get_cached_aggregations(
+        self, view: View, names: List[str]
+    ) -> Dict[str, Tuple[Optional[Dict[str, Any]], int]]:
+        """
+        Returns the cached aggregations of the view with their current version. A
+        cached aggregation is valid if its version is the current one.
+
+        :param view: The view to get the cached aggregations for.
+        :param names: The names of the aggregated fields.
+        :return: A dict of (cached aggregation or None, current version) by name.
+        """
+
+        return self.get_cached_aggregations_of_views([(view, names)])[view.id]
+
+    def get_cached_aggregations_of_views(
+        self, views_names: List[Tuple[View, List[str]]]
+    ) -> Dict[int, Dict[str, Tuple[Optional[Dict[str, Any]], int]]]:
+        """
+        Returns the cached aggregations of multiple views with their current
+        version, using a single cache request.
+
+        :param views_names: The views with the names of their aggregated fields.
+        :return: A dict of (cached aggregation or None, current version) by name
+            by view id.
+        """
+
+        keys = {
+            (view.id, name): (
+                self._get_aggregation_value_cache_key(view, name),
+                self._get_aggregation_version_cache_key(view, name),
+            )
+            for view, names in views_names
+            for name in names
+        }
+        cached = cache.get_many([key for pair in keys.values() for key in pair])
+
+        result = {view.id: {} for view, _ in views_names}
+        for (view_id, name), (value_key, version_key) in keys.items():
+            result[view_id][name] = (cached.get(value_key), cached.get(version_key, 1))
+        return result
+
+    def apply_aggregation_deltas(self, view: View, deltas: List[AggregationDelta]):
+        """
+        Updates the cached values of the decomposable aggregations of the view with
+        the changes of the rows that have been committed. A value is only updated if
+        it's still the one that was valid before the change and if nothing else has
+        bumped its version since, otherwise it's invalidated because it could have
+        been computed while the change wasn't committed yet.
+
+        :param view: The view whose cached aggregations must be updated.
+        :param deltas: The changes of the states of the aggregations.
+        """
+
+        use_lock = hasattr(cache, "lock")
+        if use_lock:
+            cache_lock = cache.lock(
+                self._get_aggregation_lock_cache_key(view), timeout=10
+            )
+            cache_lock.acquire()
+
+        cached = self.get_cached_aggregations(view, [delta.name for delta in deltas])
+        to_cache = {}
+        to_clear = []
+
+        for delta in deltas:
+            cached_value, version = cached[delta.name]
+            state = None
+            if (
+                version == delta.version_after
+                and cached_value is not None
+                and cached_value["version"] == delta.version_before
+                and "state" in cached_value
+            ):
+                aggregation_type = view_aggregation_type_registry.get(
+                    delta.aggregation_type_name
+                )
+                state = aggregation_type.apply_state_delta(
+                    cached_value["state"], delta.removed, delta.added
+                )
+
+            if state is None:
+                to_clear.append(delta.name)
+            else:
+                to_cache[self._get_aggregation_value_cache_key(view, delta.name)] = {
+                    "value": aggregation_type.get_value_from_state(state),
+                    "state": state,
+                    "version": version,
+                }
+
+        cache.set_many(to_cache)
+        if to_clear:
+            self.clear_aggregation_cache(view, to_clear)
+
+        if use_lock:
+            try:
+                cache_lock.release()
+            except LockNotOwnedError:
+                # If the lock release fails, it might be because of the timeout
+                # and it's been stolen so we don't really care
+                pass
 
     def rotate_view_slug(self, user: AbstractUser, view: View) -> View:
         """
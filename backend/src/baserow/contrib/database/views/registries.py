@@ -704,6 +704,15 @@ class ViewAggregationType(Instance):
     aggregation. For example you can compute a sum of all values of a field in a table.
     """
 
+    is_decomposable = False
+    """
+    Indicates whether the value can be derived from a state that can be updated using
+    only the state of the changed rows. If True, the cached values are updated when
+    rows are created, updated or deleted instead of being computed again from all the
+    rows of the view. The `get_state_aggregations`, `apply_state_delta` and
+    `get_value_from_state` methods must then be implemented.
+    """
+
     def get_aggregation(
         self,
         field_name: str,
@@ -727,6 +736,64 @@ class ViewAggregationType(Instance):
             "Each aggregation type must have his own get_aggregation method."
         )
 
+    def get_state_aggregations(
+        self,
+        field_name: str,
+        model_field: django_models.Field,
+        field: "Field",
+    ) -> Dict[str, django_models.Aggregate]:
+        """
+        Should return the django aggregation objects computing the state from which
+        the value of a decomposable aggregation type is derived. Aggregating rows
+        without values, like no rows at all, must result in a state for which
+        `apply_state_delta` doesn't change anything.
+
+        :param field_name: The name of the field that needs to be aggregated.
+        :param model_field: The field extracted from the model.
+        :param field: The instance of the underlying baserow field.
+        :return: A dict of django aggregation objects by state key.
+        """
+
+        raise NotImplementedError(
+            "Each decomposable aggregation type must have his own "
+            "get_state_aggregations method."
+        )
+
+    def apply_state_delta(
+        self,
+        state: Dict[str, Any],
+        removed: Dict[str, Any],
+        added: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Should return the state of all the rows of a view after some rows have
+        changed.
+
+        :param state: The state of all the rows of the view before the change.
+        :param removed: The state of the changed rows before the change.
+        :param added: The state of the changed rows after the change.
+        :return: The new state or None if it can't be derived from the provided
+            states, in which case the value is computed again from all the rows.
+        """
+
+        raise NotImplementedError(
+            "Each decomposable aggregation type must have his own "
+            "apply_state_delta method."
+        )
+
+    def get_value_from_state(self, state: Dict[str, Any]) -> Any:
+        """
+        Should return the value of the aggregation derived from the provided state.
+
+        :param state: The state of all the rows of the view.
+        :return: The aggregation value.
+        """
+
+        raise NotImplementedError(
+            "Each decomposable aggregation type must have his own "
+            "get_value_from_state method."
+        )
+
     def field_is_compatible(self, field: "Field") -> bool:
         """
         Given a particular instance of a field returns whether the field is supported
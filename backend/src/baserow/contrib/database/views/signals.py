@@ -1,9 +1,10 @@
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import Signal, receiver
 
 from baserow.contrib.database.fields import signals as field_signals
 from baserow.contrib.database.fields.models import FileField
 
-from .models import GalleryView
+from .models import GalleryView, ViewFilter, ViewSort
 
 
 view_created = Signal()
@@ -42,3 +43,20 @@ def field_deleted(sender, field, **kwargs):
         decorator_value_provider_type
     ) in decorator_value_provider_type_registry.get_all():
         decorator_value_provider_type.after_field_delete(field)
+
+
+@receiver(post_save, sender=ViewFilter)
+@receiver(post_delete, sender=ViewFilter)
+def view_filter_saved_or_deleted(sender, instance, **kwargs):
+    from baserow.contrib.database.views.handler import ViewHandler
+
+    ViewHandler().clear_row_count_cache(instance.view_id)
+    ViewHandler().clear_row_ids_cache(instance.view_id)
+
+
+@receiver(post_save, sender=ViewSort)
+@receiver(post_delete, sender=ViewSort)
+def view_sort_saved_or_deleted(sender, instance, **kwargs):
+    from baserow.contrib.database.views.handler import ViewHandler
+
+    ViewHandler().clear_row_ids_cache(instance.view_id)
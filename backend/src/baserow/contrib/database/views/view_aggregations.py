@@ -1,3 +1,6 @@
+from decimal import Decimal
+from operator import gt, lt
+
 from .registries import ViewAggregationType
 from django.db.models import Count, Min, Max, Sum, StdDev, Variance, Avg
 
@@ -34,6 +37,39 @@ from baserow.contrib.database.formula import (
 # https://docs.djangoproject.com/en/4.0/ref/models/querysets/#aggregation-functions
 
 
+def apply_sum_delta(state, removed, added):
+    """
+    Updates the sum and the count of the values of all the rows of a view.
+    """
+
+    return {
+        key: (state[key] or 0) - (removed[key] or 0) + (added[key] or 0)
+        for key in ["sum", "count"]
+    }
+
+
+def apply_extremum_delta(state, removed, added, is_beyond):
+    """
+    Updates the minimum or maximum value of all the rows of a view. If a changed row
+    had the extremum value, the new one can't be known without the other rows, so
+    None is returned to compute it again.
+    """
+
+    value = state["value"]
+    removed_value = removed["value"]
+    added_value = added["value"]
+
+    if removed_value is not None and (
+        value is None or not is_beyond(value, removed_value)
+    ):
+        return None
+
+    if added_value is not None and (value is None or is_beyond(added_value, value)):
+        value = added_value
+
+    return {"value": value}
+
+
 class EmptyCountViewAggregationType(ViewAggregationType):
     """
     The empty count aggregation counts how many values are considered empty for
@@ -41,6 +77,7 @@ class EmptyCountViewAggregationType(ViewAggregationType):
     """
 
     type = "empty_count"
+    is_decomposable = True
 
     compatible_field_types = [
         TextFieldType.type,
@@ -75,6 +112,17 @@ class EmptyCountViewAggregationType(ViewAggregationType):
             filter=field_type.empty_query(field_name, model_field, field),
         )
 
+    def get_state_aggregations(self, field_name, model_field, field):
+        return {"count": self.get_aggregation(field_name, model_field, field)}
+
+    def apply_state_delta(self, state, removed, added):
+        return {
+            "count": state["count"] - (removed["count"] or 0) + (added["count"] or 0)
+        }
+
+    def get_value_from_state(self, state):
+        return state["count"]
+
 
 class NotEmptyCountViewAggregationType(EmptyCountViewAggregationType):
     """
@@ -134,6 +182,7 @@ class MinViewAggregationType(ViewAggregationType):
     """
 
     type = "min"
+    is_decomposable = True
 
     compatible_field_types = [
         DateFieldType.type,
@@ -151,6 +200,16 @@ class MinViewAggregationType(ViewAggregationType):
     def get_aggregation(self, field_name, model_field, field):
         return Min(field_name)
 
+    def get_state_aggregations(self, field_name, model_field, field):
+        return {"value": self.get_aggregation(field_name, model_field, field)}
+
+    def apply_state_delta(self, state, removed, added):
+        # A removed value higher than the minimum doesn't change it.
+        return apply_extremum_delta(state, removed, added, lt)
+
+    def get_value_from_state(self, state):
+        return state["value"]
+
 
 class MaxViewAggregationType(ViewAggregationType):
     """
@@ -158,6 +217,7 @@ class MaxViewAggregationType(ViewAggregationType):
     """
 
     type = "max"
+    is_decomposable = True
 
     compatible_field_types = [
         DateFieldType.type,
@@ -175,6 +235,16 @@ class MaxViewAggregationType(ViewAggregationType):
     def get_aggregation(self, field_name, model_field, field):
         return Max(field_name)
 
+    def get_state_aggregations(self, field_name, model_field, field):
+        return {"value": self.get_aggregation(field_name, model_field, field)}
+
+    def apply_state_delta(self, state, removed, added):
+        # A removed value lower than the maximum doesn't change it.
+        return apply_extremum_delta(state, removed, added, gt)
+
+    def get_value_from_state(self, state):
+        return state["value"]
+
 
 class SumViewAggregationType(ViewAggregationType):
     """
@@ -182,6 +252,7 @@ class SumViewAggregationType(ViewAggregationType):
     """
 
     type = "sum"
+    is_decomposable = True
 
     compatible_field_types = [
         NumberFieldType.type,
@@ -194,6 +265,16 @@ class SumViewAggregationType(ViewAggregationType):
     def get_aggregation(self, field_name, model_field, field):
         return Sum(field_name)
 
+    def get_state_aggregations(self, field_name, model_field, field):
+        # The count of the values is needed to know whether the sum is empty.
+        return {"sum": Sum(field_name), "count": Count(field_name)}
+
+    def apply_state_delta(self, state, removed, added):
+        return apply_sum_delta(state, removed, added)
+
+    def get_value_from_state(self, state):
+        return state["sum"] if state["count"] else None
+
 
 class AverageViewAggregationType(ViewAggregationType):
     """
@@ -201,6 +282,7 @@ class AverageViewAggregationType(ViewAggregationType):
     """
 
     type = "average"
+    is_decomposable = True
 
     compatible_field_types = [
         NumberFieldType.type,
@@ -218,6 +300,23 @@ class AverageViewAggregationType(ViewAggregationType):
             filter=~field_type.empty_query(field_name, model_field, field),
         )
 
+    def get_state_aggregations(self, field_name, model_field, field):
+        field_type = field_type_registry.get_by_model(field)
+        not_empty = ~field_type.empty_query(field_name, model_field, field)
+
+        return {
+            "sum": Sum(field_name, filter=not_empty),
+            "count": Count(field_name, filter=not_empty),
+        }
+
+    def apply_state_delta(self, state, removed, added):
+        return apply_sum_delta(state, removed, added)
+
+    def get_value_from_state(self, state):
+        if not state["count"]:
+            return None
+        return Decimal(state["sum"]) / state["count"]
+
 
 class StdDevViewAggregationType(ViewAggregationType):
     """
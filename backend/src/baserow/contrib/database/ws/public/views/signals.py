@@ -3,6 +3,7 @@ from django.dispatch import receiver
 
 from baserow.contrib.database.api.views.grid.serializers import PublicFieldSerializer
 from baserow.contrib.database.fields.registries import field_type_registry
+from baserow.contrib.database.rows import signals as row_signals
 from baserow.contrib.database.views import signals as view_signals
 from baserow.contrib.database.views.registries import view_type_registry
 from baserow.ws.registries import page_registry
@@ -40,6 +41,12 @@ def public_view_filter_deleted(sender, view_filter_id, view_filter, user, **kwar
     _send_force_rows_refresh_if_view_public(view_filter.view)
 
 
+@receiver(row_signals.row_orders_renormalized)
+def public_row_orders_renormalized(sender, table, **kwargs):
+    for view in table.view_set.filter(public=True):
+        _send_force_rows_refresh_if_view_public(view)
+
+
 @receiver(view_signals.view_field_options_updated)
 def public_view_field_options_updated(sender, view, user, **kwargs):
     if view.public:
@@ -116,6 +116,24 @@ def rows_updated(
     )
 
 
+@receiver(row_signals.row_orders_renormalized)
+def row_orders_renormalized(sender, table, **kwargs):
+    # The orders of the rows known by the clients have changed, so every view of the
+    # table must fetch its rows again.
+    table_page_type = page_registry.get("table")
+    view_ids = list(table.view_set.values_list("id", flat=True))
+
+    def broadcast():
+        for view_id in view_ids:
+            table_page_type.broadcast(
+                {"type": "force_view_rows_refresh", "view_id": view_id},
+                None,
+                table_id=table.id,
+            )
+
+    transaction.on_commit(broadcast)
+
+
 @receiver(row_signals.before_row_delete)
 def before_row_delete(sender, row, user, table, model, **kwargs):
     # Generate a serialized version of the row before it is deleted. The
@@ -0,0 +1,67 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIHandler
+from django.http import StreamingHttpResponse
+
+
+class AsyncStreamingHttpResponse(StreamingHttpResponse):
+    """
+    A streaming response which can also be iterated asynchronously. The
+    `BaserowASGIHandler` sends the asynchronous content, so that it can be generated
+    using the database without blocking the event loop. Other handlers, like the
+    WSGI handler, iterate over the synchronous content.
+    """
+
+    def __init__(self, streaming_content, async_streaming_content, *args, **kwargs):
+        """
+        :param streaming_content: The iterator used by the other handlers.
+        :param async_streaming_content: The asynchronous iterator yielding the same
+            content, used by the `BaserowASGIHandler`.
+        """
+
+        super().__init__(streaming_content, *args, **kwargs)
+        self.async_streaming_content = async_streaming_content
+
+    async def __aiter__(self):
+        async for part in self.async_streaming_content:
+            yield self.make_bytes(part)
+
+
+class BaserowASGIHandler(ASGIHandler):
+    """
+    Django only supports asynchronous streaming responses starting from version
+    4.2. Until then, the iterator of a streaming response is consumed synchronously
+    in the event loop, where the database can't be used. This handler sends the
+    content of an `AsyncStreamingHttpResponse` using its asynchronous iterator
+    instead.
+    """
+
+    async def send_response(self, response, send):
+        if not isinstance(response, AsyncStreamingHttpResponse):
+            return await super().send_response(response, send)
+
+        response_headers = []
+        for header, value in response.items():
+            if isinstance(header, str):
+                header = header.encode("ascii")
+            if isinstance(value, str):
+                value = value.encode("latin1")
+            response_headers.append((bytes(header), bytes(value)))
+        for cookie in response.cookies.values():
+            response_headers.append(
+                (b"Set-Cookie", cookie.output(header="").encode("ascii").strip())
+            )
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status_code,
+                "headers": response_headers,
+            }
+        )
+        async for part in response:
+            for chunk, _ in self.chunk_bytes(part):
+                await send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+        await send({"type": "http.response.body"})
+        await sync_to_async(response.close, thread_sensitive=True)()
@@ -1,7 +1,67 @@
+from collections import defaultdict
+from typing import Iterable, List, Union
+
+from django.contrib.contenttypes.models import ContentType
 from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model, QuerySet
 from django.db.transaction import Atomic, get_connection
 
 
+def get_specific_instances(
+    queryset_or_list: Union[QuerySet, Iterable[Model]],
+) -> List[Model]:
+    """
+    Resolves the specific instances of a queryset or list of polymorphic model
+    instances, see `PolymorphicContentTypeMixin`, using one query per content type
+    instead of one query per instance like calling `.specific` on every instance
+    would. Instances that already are in their most specific form are not fetched
+    again.
+
+    The resolved specific instance is also set as the `specific` of the provided
+    instance and the related and prefetched objects which have already been fetched
+    for the provided instance are copied to the specific instance.
+
+    :param queryset_or_list: The queryset or instances to get the specific
+        instances of.
+    :return: The specific instances in the same order. Instances whose specific row
+        doesn't exist anymore are left out.
+    """
+
+    items = list(queryset_or_list)
+    ids_per_content_type = defaultdict(set)
+    for item in items:
+        if "specific" in item.__dict__:
+            continue
+        model_class = item.specific_class
+        if model_class is not None and not isinstance(item, model_class):
+            ids_per_content_type[item.content_type_id].add(item.id)
+
+    specific_objects = {}
+    for content_type_id, ids in ids_per_content_type.items():
+        model_class = ContentType.objects.get_for_id(content_type_id).model_class()
+        for specific_object in model_class._base_manager.filter(id__in=ids):
+            specific_objects[(content_type_id, specific_object.id)] = specific_object
+
+    result = []
+    for item in items:
+        if "specific" in item.__dict__:
+            result.append(item.specific)
+        elif item.id not in ids_per_content_type.get(item.content_type_id, ()):
+            result.append(item)
+        elif (item.content_type_id, item.id) in specific_objects:
+            specific_object = specific_objects[(item.content_type_id, item.id)]
+            for name, value in item._state.fields_cache.items():
+                specific_object._state.fields_cache.setdefault(name, value)
+            if hasattr(item, "_prefetched_objects_cache"):
+                specific_object._prefetched_objects_cache = (
+                    item._prefetched_objects_cache
+                )
+            item.specific = specific_object
+            result.append(specific_object)
+
+    return result
+
+
 class LockedAtomicTransaction(Atomic):
     """
     Does a atomic transaction, but also locks the entire table for any transactions,
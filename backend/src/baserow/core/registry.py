@@ -1,5 +1,6 @@
 import contextlib
-from typing import TypeVar, Generic, Dict, List, ValuesView, Tuple, Type
+from weakref import WeakKeyDictionary
+from typing import TypeVar, Generic, Dict, List, ValuesView, Tuple, Type, Optional
 
 from django.core.exceptions import ImproperlyConfigured
 
@@ -206,6 +207,53 @@ T = TypeVar("T", bound=Instance)
 K = TypeVar("K")
 
 
+class RegistryDict(dict):
+    """
+    The dict containing the instances of a registry. It keeps track of a version
+    which is incremented on every change, so that lookup indexes derived from the
+    registered instances know when they must be rebuilt. This also works when the
+    dict is changed directly, for example using `unittest.mock.patch.dict`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def _changed(self):
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+
 class Registry(Generic[T]):
     name = None
     """The unique name that is used when raising exceptions."""
@@ -223,7 +271,17 @@ class Registry(Generic[T]):
                 "InstanceModelRegistry to raise proper errors."
             )
 
-        self.registry: Dict[str, T] = {}
+        self.registry: Dict[str, T] = RegistryDict()
+
+    @property
+    def registry(self) -> Dict[str, T]:
+        return self._registry
+
+    @registry.setter
+    def registry(self, value: Dict[str, T]):
+        if not isinstance(value, RegistryDict):
+            value = RegistryDict(value)
+        self._registry = value
 
     def get(self, type_name: str) -> T:
         """
@@ -328,7 +386,13 @@ P = TypeVar("P")
 class ModelRegistryMixin(Generic[P, T]):
     def get_by_model(self, model_instance: P) -> T:
         """
-        Returns a registered instance of the given model class.
+        Returns a registered instance of the given model class. The instances are
+        looked up in an index keyed by model class, which contains the model classes
+        of all the registered instances. The most specific instance for any other
+        class, like a subclass of a registered model class, is resolved once and then
+        remembered as long as that class exists. Those classes are only weakly
+        referenced because they can be created dynamically, like the generated table
+        models.
 
         :param model_instance: The value that must be or must be an instance of the
             model_class.
@@ -339,12 +403,77 @@ class ModelRegistryMixin(Generic[P, T]):
         :rtype: Instance
         """
 
+        is_class = isinstance(model_instance, type)
+        model_class = model_instance if is_class else model_instance.__class__
+        index, resolved = self._get_model_class_index()
+
+        try:
+            return index[(is_class, model_class)]
+        except KeyError:
+            pass
+
+        resolved_for_class = resolved.setdefault(model_class, {})
+        try:
+            return resolved_for_class[is_class]
+        except KeyError:
+            pass
+
+        most_specific_value = self._find_most_specific_by_model(is_class, model_class)
+        if most_specific_value is not None:
+            resolved_for_class[is_class] = most_specific_value
+            return most_specific_value
+
+        raise self.does_not_exist_exception_class(
+            f"The {self.name} model instance {model_instance} does not exist."
+        )
+
+    def _get_model_class_index(
+        self,
+    ) -> Tuple[Dict[Tuple[bool, Type], T], "WeakKeyDictionary[Type, Dict[bool, T]]"]:
+        """
+        Returns the index of the registered model classes and the weakly keyed
+        instances resolved for other classes used by `get_by_model`, rebuilding them
+        if the registered instances have changed since they were built.
+        """
+
+        registry = self.registry
+        index_version = (id(registry), registry.version)
+        if getattr(self, "_model_class_index_version", None) != index_version:
+            index = {}
+            for value in registry.values():
+                for is_class in (True, False):
+                    key = (is_class, value.model_class)
+                    if key not in index:
+                        index[key] = self._find_most_specific_by_model(*key)
+            self._model_class_index = index
+            self._resolved_model_classes = WeakKeyDictionary()
+            self._model_class_index_version = index_version
+        return self._model_class_index, self._resolved_model_classes
+
+    def _find_most_specific_by_model(
+        self, is_class: bool, model_class: Type
+    ) -> Optional[T]:
+        """
+        Finds the most specific registered instance for the model class by checking
+        all the registered instances.
+
+        :param is_class: Whether the model class itself is looked up or an instance of
+            the model class.
+        :param model_class: The model class to find the instance for.
+        :return: The most specific registered instance or None if there is none.
+        """
+
         most_specific_value = None
         for value in self.registry.values():
             value_model_class = value.model_class
-            if value_model_class == model_instance or isinstance(
-                model_instance, value_model_class
-            ):
+            if is_class:
+                matches = value_model_class == model_class or isinstance(
+                    model_class, value_model_class
+                )
+            else:
+                matches = issubclass(model_class, value_model_class)
+
+            if matches:
                 if most_specific_value is None:
                     most_specific_value = value
                 else:
@@ -358,12 +487,7 @@ class ModelRegistryMixin(Generic[P, T]):
                     if value_num_base_classes > most_specific_num_base_classes:
                         most_specific_value = value
 
-        if most_specific_value is not None:
-            return most_specific_value
-
-        raise self.does_not_exist_exception_class(
-            f"The {self.name} model instance {model_instance} does not exist."
-        )
+        return most_specific_value
 
 
 class CustomFieldsRegistryMixin:
@@ -1,6 +1,8 @@
+from unittest.mock import patch
+
 import pytest
 
-from baserow.contrib.database.fields.field_cache import FieldCache
+from baserow.contrib.database.fields.field_cache import FieldCache, shared_field_cache
 from baserow.contrib.database.fields.models import Field
 
 
@@ -168,3 +170,66 @@ def test_can_get_model_via_cache(api_client, data_fixture, django_assert_num_que
     with django_assert_num_queries(0):
         second_time_looked_up_model = field_cache.get_model(field.table)
     assert second_time_looked_up_model == looked_up_model
+
+
+@pytest.mark.django_db
+def test_shared_field_cache_shares_specific_fields_between_field_caches(
+    api_client, data_fixture, django_assert_num_queries
+):
+    field = data_fixture.create_text_field(name="field")
+    non_specific = Field.objects.get(id=field.id)
+    other_non_specific = Field.objects.get(id=field.id)
+
+    with shared_field_cache():
+        with django_assert_num_queries(1):
+            specific_field = FieldCache().lookup_specific(non_specific)
+        with django_assert_num_queries(0):
+            assert FieldCache().lookup_specific(other_non_specific) is specific_field
+            field_cache = FieldCache()
+            field_cache.cache_fields([other_non_specific])
+            assert field_cache.lookup_by_name(field.table, "field") is specific_field
+
+    # Outside of the block the fields are not shared anymore.
+    non_specific = Field.objects.get(id=field.id)
+    with django_assert_num_queries(1):
+        assert FieldCache().lookup_specific(non_specific) == field
+
+
+@pytest.mark.django_db
+def test_shared_field_cache_forgets_table_when_model_invalidated(
+    api_client, data_fixture, django_assert_num_queries
+):
+    field = data_fixture.create_text_field(name="field")
+    table = field.table
+
+    with shared_field_cache() as shared_cache:
+        FieldCache().lookup_specific(Field.objects.get(id=field.id))
+        model = table.get_model()
+        assert shared_cache.get_cached_model(table.id) is model
+
+        field.name = "renamed"
+        field.save()
+
+        assert shared_cache.get_cached_model(table.id) is None
+        non_specific = Field.objects.get(id=field.id)
+        with django_assert_num_queries(1):
+            assert FieldCache().lookup_specific(non_specific).name == "renamed"
+
+
+@pytest.mark.django_db
+def test_shared_field_cache_shares_generated_models(
+    api_client, data_fixture, django_assert_num_queries
+):
+    table, table_b, link_field = data_fixture.create_two_linked_tables()
+
+    with shared_field_cache():
+        model = table.get_model()
+        with patch(
+            "baserow.contrib.database.table.models.get_local_cached_model"
+        ) as mock_get_local_cached_model, django_assert_num_queries(0):
+            assert table.get_model() is model
+            assert FieldCache().get_model(table) is model
+            mock_get_local_cached_model.assert_not_called()
+
+        # Models containing a subset of the fields are not shared.
+        assert table.get_model(field_ids=[]) is not model
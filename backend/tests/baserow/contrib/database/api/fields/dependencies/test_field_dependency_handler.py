@@ -7,6 +7,8 @@ from baserow.contrib.database.fields.dependencies.models import (
 )
 from baserow.contrib.database.fields.dependencies.circular_reference_checker import (
     will_cause_circular_dep,
+    get_all_field_dependencies,
+    query_all_field_dependencies,
 )
 
 
@@ -20,9 +22,14 @@ def test_deep_circular_ref(data_fixture, django_assert_num_queries):
         FieldDependency.objects.create(dependant=previous_field, dependency=new_field)
         previous_field = new_field
 
-    with django_assert_num_queries(1):
+    assert get_all_field_dependencies(starting_field) == query_all_field_dependencies(
+        starting_field
+    )
+
+    # The dependency graph of the database has been loaded by the previous check.
+    with django_assert_num_queries(0):
         assert will_cause_circular_dep(previous_field, starting_field)
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert not will_cause_circular_dep(starting_field, previous_field)
 
 
@@ -603,3 +603,85 @@ def test_unique_row_values_incompatible_field_type(api_client, data_fixture):
     response_json = response.json()
     assert response.status_code == HTTP_400_BAD_REQUEST
     assert response_json["error"] == "ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_UNIQUE_VALUES"
+
+
+@pytest.mark.django_db
+def test_field_index(api_client, data_fixture):
+    user, token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    number_field = data_fixture.create_number_field(table=table)
+    field_2 = data_fixture.create_number_field()
+
+    url = reverse("api:database:fields:index", kwargs={"field_id": number_field.id})
+    response = api_client.post(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_200_OK
+    # The index is created in the background.
+    assert response.json() == {
+        "field_id": number_field.id,
+        "db_index": True,
+        "index_exists": False,
+    }
+    number_field.refresh_from_db()
+    assert number_field.db_index is True
+
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_200_OK
+    assert response.json()["db_index"] is True
+
+    response = api_client.delete(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_204_NO_CONTENT
+    number_field.refresh_from_db()
+    assert number_field.db_index is False
+
+    url = reverse("api:database:fields:index", kwargs={"field_id": text_field.id})
+    response = api_client.post(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_INDEX"
+
+    url = reverse("api:database:fields:index", kwargs={"field_id": field_2.id})
+    response = api_client.post(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_USER_NOT_IN_GROUP"
+
+    url = reverse("api:database:fields:index", kwargs={"field_id": 99999})
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_404_NOT_FOUND
+    assert response.json()["error"] == "ERROR_FIELD_DOES_NOT_EXIST"
+
+
+@pytest.mark.django_db
+def test_field_index_recommendations(api_client, data_fixture, settings):
+    user, token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    number_field = data_fixture.create_number_field(table=table)
+    view = data_fixture.create_grid_view(table=table)
+    data_fixture.create_view_sort(view=view, field=number_field)
+    table.get_model().objects.create()
+
+    url = reverse(
+        "api:database:fields:index_recommendations", kwargs={"table_id": table.id}
+    )
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_200_OK
+    assert response.json() == []
+
+    settings.FIELD_INDEX_MIN_ROW_COUNT = 1
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_200_OK
+    assert response.json() == [
+        {
+            "field_id": number_field.id,
+            "field_name": number_field.name,
+            "sort_count": 1,
+            "filter_count": 0,
+        }
+    ]
+
+    table_2 = data_fixture.create_database_table()
+    url = reverse(
+        "api:database:fields:index_recommendations", kwargs={"table_id": table_2.id}
+    )
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_USER_NOT_IN_GROUP"
@@ -538,12 +538,12 @@ def test_batch_create_rows_ordering_before_row(api_client, data_fixture):
             {
                 "id": 3,
                 f"field_{number_field.id}": "120",
-                "order": "1.99999999999999999998",
+                "order": "1.33333333333333333333",
             },
             {
                 "id": 4,
                 f"field_{number_field.id}": "240",
-                "order": "1.99999999999999999999",
+                "order": "1.66666666666666666666",
             },
         ]
     }
@@ -1811,6 +1811,144 @@ def test_batch_update_rows_num_of_queries(api_client, data_fixture):
     )
 
 
+# Upsert
+
+
+@pytest.mark.django_db
+@pytest.mark.api_rows
+def test_batch_upsert_rows_token_no_update_permission(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    no_update_perm_token = TokenHandler().create_token(
+        user, table.database.group, "no permissions"
+    )
+    TokenHandler().update_token_permissions(
+        user, no_update_perm_token, True, True, False, True
+    )
+    url = reverse("api:database:rows:batch-upsert", kwargs={"table_id": table.id})
+
+    response = api_client.post(
+        f"{url}?match_field_id={text_field.id}",
+        {"items": [{f"field_{text_field.id}": "a"}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"Token {no_update_perm_token.key}",
+    )
+
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+    assert response.json()["error"] == "ERROR_NO_PERMISSION_TO_TABLE"
+
+
+@pytest.mark.django_db
+@pytest.mark.api_rows
+def test_batch_upsert_rows_invalid_match_field(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    boolean_field = data_fixture.create_boolean_field(table=table)
+    other_field = data_fixture.create_text_field()
+    url = reverse("api:database:rows:batch-upsert", kwargs={"table_id": table.id})
+    request_body = {"items": [{f"field_{boolean_field.id}": True}]}
+
+    response = api_client.post(
+        url,
+        request_body,
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_QUERY_PARAMETER_VALIDATION"
+
+    response = api_client.post(
+        f"{url}?match_field_id={other_field.id}",
+        request_body,
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_404_NOT_FOUND
+    assert response.json()["error"] == "ERROR_FIELD_DOES_NOT_EXIST"
+
+    response = api_client.post(
+        f"{url}?match_field_id={boolean_field.id}",
+        request_body,
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_INCOMPATIBLE_FIELD_TYPE_FOR_UPSERT"
+
+
+@pytest.mark.django_db
+@pytest.mark.api_rows
+def test_batch_upsert_rows_match_values_not_unique(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    email_field = data_fixture.create_email_field(table=table, name="Email")
+    url = reverse("api:database:rows:batch-upsert", kwargs={"table_id": table.id})
+
+    response = api_client.post(
+        f"{url}?match_field_id={email_field.id}&user_field_names",
+        {"items": [{"Email": "a@baserow.io"}, {"Email": "a@baserow.io"}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_UPSERT_MATCH_VALUES_NOT_UNIQUE"
+
+    model = table.get_model()
+    model.objects.create(**{f"field_{email_field.id}": "b@baserow.io"})
+    model.objects.create(**{f"field_{email_field.id}": "b@baserow.io"})
+    response = api_client.post(
+        f"{url}?match_field_id={email_field.id}&user_field_names",
+        {"items": [{"Email": "b@baserow.io"}]},
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_UPSERT_MATCH_VALUES_MATCH_MULTIPLE_ROWS"
+    assert model.objects.count() == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.api_rows
+def test_batch_upsert_rows(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_text_field(table=table, name="Key")
+    name_field = data_fixture.create_text_field(table=table, name="Name")
+    model = table.get_model()
+    row_1 = model.objects.create(
+        **{f"field_{key_field.id}": "a", f"field_{name_field.id}": "A"}
+    )
+    row_2 = model.objects.create(
+        **{f"field_{key_field.id}": "b", f"field_{name_field.id}": "B"}
+    )
+    url = reverse("api:database:rows:batch-upsert", kwargs={"table_id": table.id})
+
+    response = api_client.post(
+        f"{url}?match_field_id={key_field.id}&user_field_names",
+        {
+            "items": [
+                {"Key": "b", "Name": "Updated"},
+                {"Key": "c", "Name": "Created"},
+            ]
+        },
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+
+    assert response.status_code == HTTP_200_OK
+    response_json = response.json()
+    assert response_json["updated_row_ids"] == [row_2.id]
+    assert len(response_json["created_row_ids"]) == 1
+    row_3 = model.objects.get(id=response_json["created_row_ids"][0])
+    assert getattr(row_3, f"field_{key_field.id}") == "c"
+    assert getattr(row_3, f"field_{name_field.id}") == "Created"
+    row_1.refresh_from_db()
+    row_2.refresh_from_db()
+    assert getattr(row_1, f"field_{name_field.id}") == "A"
+    assert getattr(row_2, f"field_{name_field.id}") == "Updated"
+
+
 # Delete
 
 
@@ -1,7 +1,14 @@
+import json
+from collections import Counter
 from decimal import Decimal
+from unittest.mock import patch
 
 import pytest
+from asgiref.sync import async_to_sync
+from channels.testing import HttpCommunicator
+from django.db import connection
 from django.shortcuts import reverse
+from django.test.utils import CaptureQueriesContext
 from rest_framework.status import (
     HTTP_200_OK,
     HTTP_400_BAD_REQUEST,
@@ -9,10 +16,14 @@ from rest_framework.status import (
     HTTP_404_NOT_FOUND,
 )
 
+from baserow.config.asgi import application
 from baserow.contrib.database.fields.handler import FieldHandler
 from baserow.contrib.database.fields.registries import field_type_registry
 from baserow.contrib.database.rows.handler import RowHandler
-from baserow.contrib.database.table.cache import invalidate_table_in_model_cache
+from baserow.contrib.database.table.cache import (
+    get_local_cached_model,
+    invalidate_table_in_model_cache,
+)
 from baserow.contrib.database.tokens.handler import TokenHandler
 from baserow.test_utils.helpers import setup_interesting_test_table
 
@@ -534,7 +545,7 @@ def test_create_row(api_client, data_fixture):
     assert response_json_row_5[f"field_{number_field.id}"] == "480"
     assert not response_json_row_5[f"field_{boolean_field.id}"]
     assert response_json_row_5[f"field_{text_field_2.id}"] == ""
-    assert response_json_row_5["order"] == "2.99999999999999999999"
+    assert response_json_row_5["order"] == "2.50000000000000000000"
 
     token.refresh_from_db()
     assert token.handled_calls == 2
@@ -1131,12 +1142,12 @@ def test_move_row(api_client, data_fixture):
     response_json_row_1 = response.json()
     assert response.status_code == HTTP_200_OK
     assert response_json_row_1["id"] == row_1.id
-    assert response_json_row_1["order"] == "2.99999999999999999999"
+    assert response_json_row_1["order"] == "2.50000000000000000000"
 
     row_1.refresh_from_db()
     row_2.refresh_from_db()
     row_3.refresh_from_db()
-    assert row_1.order == Decimal("2.99999999999999999999")
+    assert row_1.order == Decimal("2.50000000000000000000")
     assert row_2.order == Decimal("2.00000000000000000000")
     assert row_3.order == Decimal("3.00000000000000000000")
 
@@ -1492,6 +1503,72 @@ def test_list_rows_with_attribute_names(api_client, data_fixture):
     )
 
 
+@pytest.mark.django_db
+def test_list_rows_with_cursor_pagination(api_client, data_fixture, settings):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    number_field = data_fixture.create_number_field(name="Number", table=table)
+    text_field = data_fixture.create_text_field(name="Text", table=table)
+    model = table.get_model()
+    for number, text in [
+        (1, "b"),
+        (None, "a"),
+        (2, "a"),
+        (1, None),
+        (None, None),
+        (2, "a"),
+        (1, "a"),
+    ]:
+        model.objects.create(
+            **{f"field_{number_field.id}": number, f"field_{text_field.id}": text}
+        )
+
+    url = reverse("api:database:rows:list", kwargs={"table_id": table.id})
+    order_by = f"-field_{number_field.id},field_{text_field.id}"
+    response = api_client.get(
+        f"{url}?order_by={order_by}&size=100",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    expected_ids = [row["id"] for row in response.json()["results"]]
+    assert len(expected_ids) == 7
+
+    ids = []
+    next_url = f"{url}?order_by={order_by}&size=2&cursor="
+    while next_url:
+        response = api_client.get(next_url, HTTP_AUTHORIZATION=f"JWT {jwt_token}")
+        assert response.status_code == HTTP_200_OK
+        response_json = response.json()
+        assert "count" not in response_json
+        assert len(response_json["results"]) <= 2
+        ids += [row["id"] for row in response_json["results"]]
+        next_url = response_json["next"]
+
+    assert ids == expected_ids
+
+    response = api_client.get(
+        f"{url}?size=5&cursor=&include_count",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    response_json = response.json()
+    assert response_json["count"] == 7
+    assert len(response_json["results"]) == 5
+    assert response_json["previous"] is None
+
+    response = api_client.get(
+        f"{url}?cursor=invalid",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_INVALID_CURSOR"
+
+    response = api_client.get(
+        f"{url}?cursor=&size={settings.ROW_PAGE_SIZE_LIMIT + 1}",
+        HTTP_AUTHORIZATION=f"JWT {jwt_token}",
+    )
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_PAGE_SIZE_LIMIT"
+
+
 @pytest.mark.django_db
 def test_list_rows_returns_https_next_url(api_client, data_fixture, settings):
     user, jwt_token = data_fixture.create_user_and_token(
@@ -1717,3 +1794,242 @@ def test_list_row_names(api_client, data_fixture):
     )
     assert response.status_code == HTTP_404_NOT_FOUND
     assert response.json()["error"] == "ERROR_TABLE_DOES_NOT_EXIST"
+
+
+@pytest.mark.django_db
+def test_create_and_update_row_share_models_and_fields_in_request(
+    api_client, data_fixture
+):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table, table_b, link_field = data_fixture.create_two_linked_tables(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="text")
+    FieldHandler().create_field(
+        user,
+        table_b,
+        "lookup",
+        name="lookup",
+        through_field_id=link_field.link_row_related_field_id,
+        target_field_id=text_field.id,
+    )
+    FieldHandler().create_field(
+        user, table, "formula", name="formula", formula="field('text')"
+    )
+    row_b = table_b.get_model().objects.create()
+
+    def count_model_lookups_and_lookup_field_queries(method, url, data):
+        with patch(
+            "baserow.contrib.database.table.models.get_local_cached_model",
+            wraps=get_local_cached_model,
+        ) as mock_get_local_cached_model, CaptureQueriesContext(connection) as captured:
+            response = getattr(api_client, method)(
+                url, data, format="json", HTTP_AUTHORIZATION=f"JWT {jwt_token}"
+            )
+        assert response.status_code == HTTP_200_OK, response.json()
+
+        # Only the lookups of the models containing all the fields are counted.
+        model_lookups = Counter(
+            c.args[0]
+            for c in mock_get_local_cached_model.call_args_list
+            if c.args[1] is None
+        )
+        lookup_field_queries = [
+            q
+            for q in captured.captured_queries
+            if 'FROM "database_lookupfield"' in q["sql"]
+        ]
+        return response, model_lookups, lookup_field_queries
+
+    (
+        response,
+        model_lookups,
+        lookup_field_queries,
+    ) = count_model_lookups_and_lookup_field_queries(
+        "post",
+        reverse("api:database:rows:list", kwargs={"table_id": table.id}),
+        {f"field_{text_field.id}": "a", f"field_{link_field.id}": [row_b.id]},
+    )
+    # Every table model is only looked up once and shared by all the handlers and
+    # signal receivers in the request.
+    assert model_lookups[table.id] == 1
+    assert set(model_lookups.values()) == {1}
+    assert len(lookup_field_queries) == 1
+
+    row_id = response.json()["id"]
+    (
+        response,
+        model_lookups,
+        lookup_field_queries,
+    ) = count_model_lookups_and_lookup_field_queries(
+        "patch",
+        reverse(
+            "api:database:rows:item",
+            kwargs={"table_id": table.id, "row_id": row_id},
+        ),
+        {f"field_{text_field.id}": "b"},
+    )
+    assert model_lookups[table.id] == 1
+    assert set(model_lookups.values()) == {1}
+    assert len(lookup_field_queries) == 1
+    assert response.json()[f"field_{text_field.id}"] == "b"
+
+
+@pytest.mark.django_db
+def test_stream_rows(api_client, data_fixture):
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    table_2 = data_fixture.create_database_table(user=user)
+    name_field = data_fixture.create_text_field(name="Name", table=table, primary=True)
+    price_field = data_fixture.create_number_field(name="Price", table=table)
+    model = table.get_model()
+    row_1 = model.objects.create(
+        **{f"field_{name_field.id}": "Apple", f"field_{price_field.id}": 30}
+    )
+    row_2 = model.objects.create(
+        **{f"field_{name_field.id}": "Banana", f"field_{price_field.id}": 10}
+    )
+    row_3 = model.objects.create(
+        **{f"field_{name_field.id}": "Cherry", f"field_{price_field.id}": 20}
+    )
+    view = data_fixture.create_grid_view(table=table)
+    data_fixture.create_view_filter(
+        view=view, field=price_field, type="higher_than", value="15"
+    )
+    data_fixture.create_view_sort(view=view, field=price_field, order="ASC")
+    view_2 = data_fixture.create_grid_view(table=table_2)
+
+    token = TokenHandler().create_token(user, table.database.group, "Good")
+    wrong_token = TokenHandler().create_token(user, table.database.group, "Wrong")
+    TokenHandler().update_token_permissions(user, wrong_token, True, False, True, True)
+
+    def stream(query="", **kwargs):
+        url = reverse("api:database:rows:stream", kwargs={"table_id": table.id})
+        kwargs.setdefault("HTTP_AUTHORIZATION", f"JWT {jwt_token}")
+        response = api_client.get(f"{url}{query}", **kwargs)
+        if response.status_code != HTTP_200_OK:
+            return response, None
+        content = b"".join(response.streaming_content).decode()
+        return response, [json.loads(line) for line in content.splitlines()]
+
+    response, rows = stream()
+    assert response.status_code == HTTP_200_OK
+    assert response["Content-Type"] == "application/x-ndjson"
+    assert rows == [
+        {
+            "id": row_1.id,
+            "order": "1.00000000000000000000",
+            f"field_{name_field.id}": "Apple",
+            f"field_{price_field.id}": "30",
+        },
+        {
+            "id": row_2.id,
+            "order": "1.00000000000000000000",
+            f"field_{name_field.id}": "Banana",
+            f"field_{price_field.id}": "10",
+        },
+        {
+            "id": row_3.id,
+            "order": "1.00000000000000000000",
+            f"field_{name_field.id}": "Cherry",
+            f"field_{price_field.id}": "20",
+        },
+    ]
+
+    response, rows = stream("?user_field_names&include=Name&order_by=-Price&search=an")
+    assert rows == [
+        {"id": row_2.id, "order": "1.00000000000000000000", "Name": "Banana"}
+    ]
+
+    response, rows = stream(f"?filter__field_{price_field.id}__lower_than=25")
+    assert [row["id"] for row in rows] == [row_2.id, row_3.id]
+
+    response, rows = stream(f"?view_id={view.id}&include=field_{name_field.id}")
+    assert rows == [
+        {
+            "id": row_3.id,
+            "order": "1.00000000000000000000",
+            f"field_{name_field.id}": "Cherry",
+        },
+        {
+            "id": row_1.id,
+            "order": "1.00000000000000000000",
+            f"field_{name_field.id}": "Apple",
+        },
+    ]
+
+    response, rows = stream(f"?view_id={view.id}&order_by=-field_{price_field.id}")
+    assert [row["id"] for row in rows] == [row_1.id, row_3.id]
+
+    response, rows = stream(f"?view_id={view_2.id}")
+    assert response.status_code == HTTP_404_NOT_FOUND
+    assert response.json()["error"] == "ERROR_VIEW_DOES_NOT_EXIST"
+
+    response, rows = stream("?filter__field_9999__equal=test")
+    assert response.status_code == HTTP_400_BAD_REQUEST
+    assert response.json()["error"] == "ERROR_FILTER_FIELD_NOT_FOUND"
+
+    response, rows = stream(HTTP_AUTHORIZATION=f"Token {wrong_token.key}")
+    assert response.status_code == HTTP_401_UNAUTHORIZED
+    assert response.json()["error"] == "ERROR_NO_PERMISSION_TO_TABLE"
+
+    response, rows = stream(HTTP_AUTHORIZATION=f"Token {token.key}")
+    assert [row["id"] for row in rows] == [row_1.id, row_2.id, row_3.id]
+
+    # The rows are fetched and sent in chunks while the response is iterated.
+    url = reverse("api:database:rows:stream", kwargs={"table_id": table.id})
+    with patch("baserow.contrib.database.api.rows.views.StreamRowsView.chunk_size", 2):
+        response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {jwt_token}")
+        chunks = [chunk.decode().splitlines() for chunk in response.streaming_content]
+    assert [[json.loads(line)["id"] for line in chunk] for chunk in chunks] == [
+        [row_1.id, row_2.id],
+        [row_3.id],
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_stream_rows_through_asgi(data_fixture, monkeypatch):
+    # The database can't be used while the response is iterated in the event loop.
+    monkeypatch.delenv("DJANGO_ALLOW_ASYNC_UNSAFE", raising=False)
+    user, jwt_token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    name_field = data_fixture.create_text_field(name="Name", table=table, primary=True)
+    model = table.get_model()
+    row_1 = model.objects.create(**{f"field_{name_field.id}": "Apple"})
+    row_2 = model.objects.create(**{f"field_{name_field.id}": "Banana"})
+    row_3 = model.objects.create(**{f"field_{name_field.id}": "Cherry"})
+
+    url = reverse("api:database:rows:stream", kwargs={"table_id": table.id})
+    communicator = HttpCommunicator(
+        application,
+        "GET",
+        f"{url}?user_field_names",
+        headers=[
+            (b"host", b"localhost"),
+            (b"authorization", f"JWT {jwt_token}".encode()),
+        ],
+    )
+
+    async def get_response():
+        await communicator.send_input({"type": "http.request", "body": b""})
+        response_start = await communicator.receive_output(timeout=10)
+        body_parts = []
+        while True:
+            message = await communicator.receive_output(timeout=10)
+            if not message.get("more_body", False):
+                return response_start, body_parts
+            body_parts.append(message["body"])
+
+    with patch("baserow.contrib.database.api.rows.views.StreamRowsView.chunk_size", 2):
+        response_start, body_parts = async_to_sync(get_response)()
+
+    assert response_start["status"] == HTTP_200_OK
+    assert (b"Content-Type", b"application/x-ndjson") in response_start["headers"]
+    # Every chunk of rows is sent as soon as it has been fetched.
+    assert [
+        [json.loads(line) for line in part.decode().splitlines()] for part in body_parts
+    ] == [
+        [
+            {"id": row_1.id, "order": "1.00000000000000000000", "Name": "Apple"},
+            {"id": row_2.id, "order": "1.00000000000000000000", "Name": "Banana"},
+        ],
+        [{"id": row_3.id, "order": "1.00000000000000000000", "Name": "Cherry"}],
+    ]
@@ -454,6 +454,30 @@ def test_update_table(api_client, data_fixture):
 
     assert response_json["id"] == table_1.id
     assert response_json["name"] == table_1.name == "New name"
+    assert response_json["defer_dependant_updates"] is False
+
+    response = api_client.patch(
+        url,
+        {"name": "New name", "defer_dependant_updates": True},
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {token}",
+    )
+    assert response.status_code == HTTP_200_OK
+    table_1.refresh_from_db()
+    assert response.json()["defer_dependant_updates"] is True
+    assert table_1.defer_dependant_updates is True
+
+    response = api_client.patch(
+        url,
+        {"name": "New name", "search_index_enabled": True},
+        format="json",
+        HTTP_AUTHORIZATION=f"JWT {token}",
+    )
+    assert response.status_code == HTTP_200_OK
+    table_1.refresh_from_db()
+    assert response.json()["search_index_enabled"] is True
+    assert response.json()["search_index_ready"] is False
+    assert table_1.search_index_enabled is True
 
     url = reverse("api:database:tables:item", kwargs={"table_id": table_2.id})
     response = api_client.patch(
@@ -409,6 +409,125 @@ def test_list_filtered_rows(api_client, data_fixture):
     assert f"field_{boolean_field.id}" in response_json[0]
 
 
+@pytest.mark.django_db
+def test_list_rows_with_cursor_pagination(api_client, data_fixture):
+    user, token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="text")
+    single_select_field = data_fixture.create_single_select_field(table=table)
+    option_a = data_fixture.create_select_option(field=single_select_field, value="A")
+    option_b = data_fixture.create_select_option(field=single_select_field, value="B")
+    grid = data_fixture.create_grid_view(table=table, public=True)
+    data_fixture.create_view_sort(view=grid, field=single_select_field, order="DESC")
+    data_fixture.create_view_sort(view=grid, field=text_field, order="ASC")
+    model = table.get_model()
+    for text, option in [
+        ("b", option_a),
+        (None, option_b),
+        ("a", None),
+        ("a", option_a),
+        (None, None),
+        ("c", option_b),
+        ("a", option_a),
+    ]:
+        model.objects.create(
+            **{
+                f"field_{text_field.id}": text,
+                f"field_{single_select_field.id}": option,
+            }
+        )
+
+    url = reverse("api:database:views:grid:list", kwargs={"view_id": grid.id})
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    expected_ids = [row["id"] for row in response.json()["results"]]
+    assert len(expected_ids) == 7
+
+    ids = []
+    next_url = f"{url}?size=3&cursor="
+    while next_url:
+        response = api_client.get(next_url, HTTP_AUTHORIZATION=f"JWT {token}")
+        assert response.status_code == HTTP_200_OK
+        response_json = response.json()
+        assert "count" not in response_json
+        ids += [row["id"] for row in response_json["results"]]
+        next_url = response_json["next"]
+
+    assert ids == expected_ids
+
+    public_url = reverse(
+        "api:database:views:grid:public_rows", kwargs={"slug": grid.slug}
+    )
+    response = api_client.get(f"{public_url}?size=3&cursor=&include_count")
+    response_json = response.json()
+    assert response.status_code == HTTP_200_OK
+    assert response_json["count"] == 7
+    assert len(response_json["results"]) == 3
+    response = api_client.get(response_json["next"])
+    assert response.status_code == HTTP_200_OK
+    assert len(response.json()["results"]) == 3
+
+
+@pytest.mark.django_db
+def test_list_rows_row_count_mode(api_client, data_fixture, settings):
+    user, token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    grid = data_fixture.create_grid_view(table=table, public=True)
+    RowHandler().create_rows(
+        user,
+        table,
+        [{f"field_{text_field.id}": "a"}, {f"field_{text_field.id}": "b"}, {}],
+    )
+
+    url = reverse("api:database:views:grid:list", kwargs={"view_id": grid.id})
+    response = api_client.get(f"{url}?count", HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_200_OK
+    assert response.json() == {"count": 3}
+    assert response["Baserow-Row-Count-Mode"] == "exact"
+
+    data_fixture.create_view_filter(
+        view=grid, field=text_field, type="equal", value="a"
+    )
+    response = api_client.get(url, HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.json()["count"] == 1
+    assert response["Baserow-Row-Count-Mode"] == "exact"
+    response = api_client.get(f"{url}?limit=1", HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.json()["count"] == 1
+    assert response["Baserow-Row-Count-Mode"] == "cached"
+    response = api_client.get(f"{url}?search=b", HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.json()["count"] == 0
+    assert response["Baserow-Row-Count-Mode"] == "exact"
+
+    settings.APPROXIMATE_ROW_COUNT_THRESHOLD = 2
+    response = api_client.get(
+        f"{url}?count&approximate_count", HTTP_AUTHORIZATION=f"JWT {token}"
+    )
+    assert response.status_code == HTTP_200_OK
+    assert isinstance(response.json()["count"], int)
+    assert response["Baserow-Row-Count-Mode"] == "approximate"
+
+    public_url = reverse(
+        "api:database:views:grid:public_rows", kwargs={"slug": grid.slug}
+    )
+    response = api_client.get(public_url)
+    assert response.json()["count"] == 1
+    assert response["Baserow-Row-Count-Mode"] == "cached"
+    response = api_client.get(
+        f"{public_url}?filter__field_{text_field.id}__equal=b&count"
+    )
+    assert response.json() == {"count": 0}
+    assert response["Baserow-Row-Count-Mode"] == "exact"
+
+    aggregations_url = reverse(
+        "api:database:views:grid:field-aggregations", kwargs={"view_id": grid.id}
+    )
+    response = api_client.get(
+        f"{aggregations_url}?include=total", HTTP_AUTHORIZATION=f"JWT {token}"
+    )
+    assert response.json() == {"total": 1}
+    assert response["Baserow-Row-Count-Mode"] == "cached"
+
+
 @pytest.mark.django_db
 def test_field_aggregation(api_client, data_fixture):
     user, token = data_fixture.create_user_and_token(
@@ -699,11 +818,13 @@ def test_view_aggregations(api_client, data_fixture):
     assert cache.get(f"aggregation_value__{grid.id}_{number_field.db_column}") == {
         "value": None,
         "version": 1,
+        "state": {"sum": None, "count": 0},
     }
     assert cache.get(f"aggregation_version__{grid.id}_{number_field.db_column}") is None
     assert cache.get(f"aggregation_value__{grid.id}_{boolean_field.db_column}") == {
         "value": 0,
         "version": 1,
+        "state": {"count": 0},
     }
     assert (
         cache.get(f"aggregation_version__{grid.id}_{boolean_field.db_column}") is None
@@ -801,11 +922,13 @@ def test_view_aggregations(api_client, data_fixture):
     assert cache.get(f"aggregation_value__{grid.id}_{number_field.db_column}") == {
         "value": 1210.0,
         "version": 4,
+        "state": {"sum": Decimal(1210), "count": 3},
     }
     assert cache.get(f"aggregation_version__{grid.id}_{number_field.db_column}") == 4
     assert cache.get(f"aggregation_value__{grid.id}_{boolean_field.db_column}") == {
         "value": 2,
         "version": 6,
+        "state": {"count": 2},
     }
     assert cache.get(f"aggregation_version__{grid.id}_{boolean_field.db_column}") == 6
 
@@ -853,10 +976,12 @@ def test_view_aggregations(api_client, data_fixture):
     assert cache.get(f"aggregation_value__{grid.id}_{number_field.db_column}") == {
         "value": Decimal(1210),
         "version": 4,
+        "state": {"sum": Decimal(1210), "count": 3},
     }
     assert cache.get(f"aggregation_value__{grid.id}_{boolean_field.db_column}") == {
         "value": 2,
         "version": 6,
+        "state": {"count": 2},
     }
     assert cache.get(f"aggregation_version__{grid.id}_{number_field.db_column}") == 5
     assert cache.get(f"aggregation_version__{grid.id}_{boolean_field.db_column}") == 7
@@ -877,10 +1002,12 @@ def test_view_aggregations(api_client, data_fixture):
     assert cache.get(f"aggregation_value__{grid.id}_{number_field.db_column}") == {
         "value": Decimal(1200),
         "version": 5,
+        "state": {"sum": Decimal(1200), "count": 1},
     }
     assert cache.get(f"aggregation_value__{grid.id}_{boolean_field.db_column}") == {
         "value": 1,
         "version": 7,
+        "state": {"count": 1},
     }
 
 
@@ -1032,6 +1159,7 @@ def test_view_aggregations_cache_invalidation_with_dependant_fields(
     assert cache.get(f"aggregation_value__{grid.id}_{number_field.db_column}") == {
         "value": Decimal(1111),
         "version": 5,
+        "state": {"sum": Decimal(1111), "count": 4},
     }
     assert (
         cache.get(
@@ -1047,6 +1175,7 @@ def test_view_aggregations_cache_invalidation_with_dependant_fields(
     assert cache.get(f"aggregation_value__{grid.id}_{number_field.db_column}") == {
         "value": Decimal(1111),
         "version": 5,
+        "state": {"sum": Decimal(1111), "count": 4},
     }
     assert cache.get(
         f"aggregation_value__{grid2.id}_{sum_formula_on_lookup_field.db_column}"
@@ -1071,6 +1200,7 @@ def test_view_aggregations_cache_invalidation_with_dependant_fields(
     assert cache.get(f"aggregation_value__{grid.id}_{number_field.db_column}") == {
         "value": Decimal(1111),
         "version": 5,
+        "state": {"sum": Decimal(1111), "count": 4},
     }
 
     check_table_2_aggregation_values(
@@ -1080,6 +1210,7 @@ def test_view_aggregations_cache_invalidation_with_dependant_fields(
     assert cache.get(f"aggregation_value__{grid.id}_{number_field.db_column}") == {
         "value": Decimal(1111),
         "version": 5,
+        "state": {"sum": Decimal(1111), "count": 4},
     }
     assert cache.get(
         f"aggregation_value__{grid2.id}_{sum_formula_on_lookup_field.db_column}"
@@ -1093,8 +1224,10 @@ def test_view_aggregations_cache_invalidation_with_dependant_fields(
     assert cache.get(f"aggregation_value__{grid.id}_{number_field.db_column}") == {
         "value": Decimal(1111),
         "version": 5,
+        "state": {"sum": Decimal(1111), "count": 4},
     }
-    assert cache.get(f"aggregation_version__{grid.id}_{number_field.db_column}") == 6
+    # Bumped by the update and by the tracking of the aggregation delta.
+    assert cache.get(f"aggregation_version__{grid.id}_{number_field.db_column}") == 7
     assert cache.get(
         f"aggregation_value__{grid2.id}_{sum_formula_on_lookup_field.db_column}"
     ) == {
@@ -1125,8 +1258,9 @@ def test_view_aggregations_cache_invalidation_with_dependant_fields(
     assert cache.get(f"aggregation_value__{grid.id}_{number_field.db_column}") == {
         "value": Decimal("1111"),
         "version": 5,
+        "state": {"sum": Decimal(1111), "count": 4},
     }
-    assert cache.get(f"aggregation_version__{grid.id}_{number_field.db_column}") == 7
+    assert cache.get(f"aggregation_version__{grid.id}_{number_field.db_column}") == 8
 
     # Should increment cache version
     assert (
@@ -1143,8 +1277,9 @@ def test_view_aggregations_cache_invalidation_with_dependant_fields(
     assert cache.get(f"aggregation_value__{grid.id}_{number_field.db_column}") == {
         "value": Decimal("1111"),
         "version": 5,
+        "state": {"sum": Decimal(1111), "count": 4},
     }
-    assert cache.get(f"aggregation_version__{grid.id}_{number_field.db_column}") == 7
+    assert cache.get(f"aggregation_version__{grid.id}_{number_field.db_column}") == 8
     assert cache.get(
         f"aggregation_value__{grid2.id}_{sum_formula_on_lookup_field.db_column}"
     ) == {
@@ -2780,3 +2915,42 @@ def test_user_in_wrong_group_need_the_password_to_access_password_protected_grid
         HTTP_AUTHORIZATION=f"JWT {other_user_token}",
     )
     assert response.status_code == HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_list_rows_with_cached_row_ids(api_client, data_fixture, settings):
+    settings.VIEW_ROW_IDS_CACHE_MAX_ROWS = 10
+    user, token = data_fixture.create_user_and_token()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    grid = data_fixture.create_grid_view(table=table)
+    row_1, row_2, row_3 = RowHandler().create_rows(
+        user,
+        table,
+        [
+            {f"field_{text_field.id}": "b"},
+            {f"field_{text_field.id}": "c"},
+            {f"field_{text_field.id}": "a"},
+        ],
+    )
+    data_fixture.create_view_sort(view=grid, field=text_field, order="DESC")
+
+    url = reverse("api:database:views:grid:list", kwargs={"view_id": grid.id})
+    response = api_client.get(f"{url}?limit=2", HTTP_AUTHORIZATION=f"JWT {token}")
+    assert response.status_code == HTTP_200_OK
+    response_json = response.json()
+    assert response_json["count"] == 3
+    assert [row["id"] for row in response_json["results"]] == [row_2.id, row_1.id]
+    assert response["Baserow-Row-Count-Mode"] == "exact"
+
+    response = api_client.get(
+        f"{url}?limit=2&offset=2", HTTP_AUTHORIZATION=f"JWT {token}"
+    )
+    response_json = response.json()
+    assert response_json["count"] == 3
+    assert [row["id"] for row in response_json["results"]] == [row_3.id]
+    assert response_json["results"][0][f"field_{text_field.id}"] == "a"
+    assert response["Baserow-Row-Count-Mode"] == "cached"
+
+    response = api_client.get(f"{url}?page=2&size=1", HTTP_AUTHORIZATION=f"JWT {token}")
+    assert [row["id"] for row in response.json()["results"]] == [row_1.id]
@@ -0,0 +1,194 @@
+import pytest
+
+from datetime import date, datetime
+from decimal import Decimal
+from freezegun import freeze_time
+from pytz import UTC
+
+from baserow.contrib.database.api.rows.serializers import get_row_serializer_class
+from baserow.contrib.database.db.bulk_copy import (
+    add_pending_many_to_many_values,
+    copy_rows,
+    encode_copy_value,
+    CopyFile,
+)
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.test_utils.helpers import setup_interesting_test_table
+
+
+def test_encode_copy_value():
+    assert encode_copy_value(None) == "\\N"
+    assert encode_copy_value("text") == "text"
+    assert encode_copy_value("a\tb\nc\rd\\e") == "a\\tb\\nc\\rd\\\\e"
+    assert encode_copy_value("\\N") == "\\\\N"
+    assert encode_copy_value(True) == "t"
+    assert encode_copy_value(False) == "f"
+    assert encode_copy_value(10) == "10"
+    assert encode_copy_value(Decimal("-1.20")) == "-1.20"
+    assert encode_copy_value(0.1) == "0.1"
+    assert encode_copy_value(date(2020, 2, 1)) == "2020-02-01"
+    assert (
+        encode_copy_value(datetime(2020, 2, 1, 1, 23, tzinfo=UTC))
+        == "2020-02-01T01:23:00+00:00"
+    )
+    assert encode_copy_value([{"name": "a\nb"}]) == '[{"name": "a\\\\nb"}]'
+
+
+def test_copy_file_reads_the_lines_in_chunks():
+    copy_file = CopyFile(iter(["abc\n", "de\n", "fghij\n"]))
+
+    assert copy_file.read(2) == "ab"
+    assert copy_file.read(5) == "c\nde\n"
+    assert copy_file.read(100) == "fghij\n"
+    assert copy_file.read(100) == ""
+    assert CopyFile(iter(["a\n", "b\n"])).read() == "a\nb\n"
+
+
+@pytest.mark.django_db
+def test_copy_rows(data_fixture):
+    table = data_fixture.create_database_table()
+    text_field = data_fixture.create_text_field(table=table)
+    number_field = data_fixture.create_number_field(
+        table=table, number_decimal_places=2
+    )
+    boolean_field = data_fixture.create_boolean_field(table=table)
+    model = table.get_model()
+
+    copy_rows(
+        model,
+        [
+            model(
+                order=Decimal("1"),
+                **{
+                    f"field_{text_field.id}": "a\tb\nc\\d",
+                    f"field_{number_field.id}": Decimal("1.25"),
+                    f"field_{boolean_field.id}": True,
+                },
+            ),
+            model(order=Decimal("2")),
+        ],
+    )
+
+    rows = list(model.objects.all())
+    assert len(rows) == 2
+    assert getattr(rows[0], f"field_{text_field.id}") == "a\tb\nc\\d"
+    assert getattr(rows[0], f"field_{number_field.id}") == Decimal("1.25")
+    assert getattr(rows[0], f"field_{boolean_field.id}") is True
+    assert rows[0].created_on is not None
+    assert getattr(rows[1], f"field_{text_field.id}") is None
+    assert getattr(rows[1], f"field_{boolean_field.id}") is False
+
+    # The rows were inserted without id, so the sequence must have been used.
+    assert model.objects.create().id == rows[1].id + 1
+
+
+@pytest.mark.django_db
+def test_copy_rows_with_many_to_many_values(data_fixture):
+    table = data_fixture.create_database_table()
+    row = table.get_model().objects.create()
+    other_table = data_fixture.create_database_table(database=table.database)
+    link_row_field = data_fixture.create_link_row_field(
+        table=other_table, link_row_table=table
+    )
+    model = other_table.get_model()
+
+    first_row = model(id=10, order=Decimal("1"))
+    add_pending_many_to_many_values(first_row, f"field_{link_row_field.id}", [row.id])
+    second_row = model(id=11, order=Decimal("2"))
+    copy_rows(model, [first_row, second_row])
+
+    rows = list(model.objects.all())
+    assert [r.id for r in rows] == [10, 11]
+    assert [r.id for r in getattr(rows[0], f"field_{link_row_field.id}").all()] == [
+        row.id
+    ]
+    assert getattr(rows[1], f"field_{link_row_field.id}").count() == 0
+
+    row_without_id = model(order=Decimal("3"))
+    add_pending_many_to_many_values(
+        row_without_id, f"field_{link_row_field.id}", [row.id]
+    )
+    with pytest.raises(ValueError):
+        copy_rows(model, [row_without_id])
+    assert model.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_copy_rows_calculates_formulas(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="text")
+    number_field = data_fixture.create_number_field(table=table, name="number")
+    date_field = data_fixture.create_date_field(
+        table=table, name="date", date_include_time=False
+    )
+    handler = FieldHandler()
+    number_formula = handler.create_field(
+        user, table, "formula", name="n", formula="field('number') * 2"
+    )
+    boolean_formula = handler.create_field(
+        user, table, "formula", name="b", formula="field('number') > 1"
+    )
+    date_formula = handler.create_field(
+        user, table, "formula", name="d", formula="field('date')"
+    )
+    text_formula = handler.create_field(
+        user, table, "formula", name="t", formula="concat(field('text'), '!')"
+    )
+    model = table.get_model()
+
+    copy_rows(
+        model,
+        [
+            model(
+                id=1,
+                order=Decimal("1"),
+                **{
+                    f"field_{text_field.id}": "a",
+                    f"field_{number_field.id}": 2,
+                    f"field_{date_field.id}": date(2020, 1, 2),
+                },
+            ),
+            model(id=2, order=Decimal("2")),
+        ],
+    )
+
+    first, second = model.objects.order_by("id")
+    assert second.id == 2
+    assert getattr(first, f"field_{number_formula.id}") == 4
+    assert getattr(first, f"field_{boolean_formula.id}") is True
+    assert getattr(first, f"field_{date_formula.id}") == date(2020, 1, 2)
+    assert getattr(first, f"field_{text_formula.id}") == "a!"
+
+    with pytest.raises(ValueError):
+        copy_rows(model, [model(order=Decimal("3"))])
+    assert model.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_copy_rows_of_all_field_types(data_fixture):
+    # The time is frozen because the created on and last modified values are set
+    # when the rows are inserted.
+    with freeze_time("2020-02-01 01:23"):
+        table, user, row, _ = setup_interesting_test_table(data_fixture)
+        model = table.get_model()
+        row = model.objects.get(id=row.id)
+
+        copied_row = model(id=row.id + 1000)
+        for field in model._meta.concrete_fields:
+            if not field.primary_key:
+                setattr(copied_row, field.attname, getattr(row, field.attname))
+        for field in model._meta.many_to_many:
+            add_pending_many_to_many_values(
+                copied_row,
+                field.name,
+                getattr(row, field.name).values_list("id", flat=True),
+            )
+        copy_rows(model, [copied_row])
+
+    serializer_class = get_row_serializer_class(model, is_response=True)
+    rows = model.objects.filter(id__in=[row.id, copied_row.id]).order_by("id")
+    original, copied = serializer_class(rows, many=True).data
+    assert copied.pop("id") == row.id + 1000
+    original.pop("id")
+    assert copied == original
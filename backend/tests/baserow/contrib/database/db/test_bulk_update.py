@@ -0,0 +1,74 @@
+import pytest
+
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from baserow.contrib.database.db.bulk_update import bulk_update_from_values
+
+
+@pytest.mark.django_db
+def test_bulk_update_from_values(data_fixture):
+    table = data_fixture.create_database_table()
+    text_field = data_fixture.create_text_field(table=table)
+    number_field = data_fixture.create_number_field(
+        table=table, number_decimal_places=2
+    )
+    date_field = data_fixture.create_date_field(table=table)
+    single_select_field = data_fixture.create_single_select_field(table=table)
+    option = data_fixture.create_select_option(field=single_select_field)
+    model = table.get_model()
+
+    text = f"field_{text_field.id}"
+    number = f"field_{number_field.id}"
+    date_name = f"field_{date_field.id}"
+    single_select = f"field_{single_select_field.id}"
+    rows = [
+        model.objects.create(**{text: f"row {index}", number: Decimal("1.00")})
+        for index in range(3)
+    ]
+
+    setattr(rows[0], text, "it's \\ new")
+    setattr(rows[0], number, None)
+    setattr(rows[1], text, "also new")
+    setattr(rows[1], number, Decimal("2.50"))
+    setattr(rows[2], date_name, date(2020, 2, 1))
+    setattr(rows[2], single_select, option)
+
+    with CaptureQueriesContext(connection) as captured:
+        updated = bulk_update_from_values(
+            model,
+            [
+                (rows[0], [text, number]),
+                (rows[1], [number, text]),
+                (rows[2], [date_name, single_select]),
+            ],
+        )
+
+    assert updated == 3
+    # One statement per set of updated fields.
+    assert len(captured.captured_queries) == 2
+
+    rows = list(model.objects.all())
+    assert getattr(rows[0], text) == "it's \\ new"
+    assert getattr(rows[0], number) is None
+    assert getattr(rows[1], text) == "also new"
+    assert getattr(rows[1], number) == Decimal("2.50")
+    assert getattr(rows[2], text) == "row 2"
+    assert getattr(rows[2], number) == Decimal("1.00")
+    assert getattr(rows[2], date_name) == date(2020, 2, 1)
+    assert getattr(rows[2], f"{single_select}_id") == option.id
+
+
+@pytest.mark.django_db
+def test_bulk_update_from_values_without_fields(data_fixture):
+    table = data_fixture.create_database_table()
+    model = table.get_model()
+    row = model.objects.create()
+
+    with CaptureQueriesContext(connection) as captured:
+        assert bulk_update_from_values(model, [(row, [])]) == 0
+
+    assert len(captured.captured_queries) == 0
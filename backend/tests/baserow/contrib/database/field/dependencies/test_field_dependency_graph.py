@@ -0,0 +1,127 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from baserow.contrib.database.fields.dependencies.graph import (
+    FieldDependencyGraph,
+    get_field_dependency_graph,
+)
+from baserow.contrib.database.fields.dependencies.handler import FieldDependencyHandler
+from baserow.contrib.database.fields.field_cache import FieldCache
+from baserow.contrib.database.fields.handler import FieldHandler
+
+
+def test_field_dependency_graph():
+    # Field 4 depends on 2 and 3 which both depend on 1, field 5 depends on 4 and 1
+    # and field 6 depends on 2 via the link row field 7.
+    graph = FieldDependencyGraph(
+        1,
+        [(field_id, 1, f"field {field_id}", 1, False) for field_id in range(1, 8)],
+        [
+            (1, 2, 1, None),
+            (2, 3, 1, None),
+            (3, 4, 2, None),
+            (4, 4, 3, None),
+            (5, 5, 4, None),
+            (6, 5, 1, None),
+            (7, 6, 2, 7),
+            (8, 6, None, None),
+        ],
+    )
+
+    assert 1 in graph
+    assert 8 not in graph
+    assert graph.get_field(3).name == "field 3"
+    assert graph.get_field(8) is None
+
+    assert graph.get_dependants([1]) == [(2, None), (3, None), (5, None)]
+    assert graph.get_dependants([2, 3]) == [(4, None), (4, None), (6, 7)]
+    assert graph.get_dependants([5]) == []
+
+    assert graph.get_all_dependency_ids(5) == {1, 2, 3, 4}
+    assert graph.get_all_dependency_ids(5, max_depth=1) == {1, 4}
+    assert graph.get_all_dependency_ids(6) == {1, 2, None}
+    assert graph.will_cause_circular_dep(1, 5)
+    assert not graph.will_cause_circular_dep(5, 1)
+
+    assert graph.get_dependant_ids_via_link_rows([1]) == {6}
+    assert graph.get_dependant_ids_via_link_rows([6]) == set()
+
+    assert graph.get_update_order([1]) == [2, 3, 4, 5, 6]
+    assert graph.get_update_order([3]) == [4, 5]
+    assert graph.get_update_order([3, 2]) == [4, 5, 6]
+    assert graph.get_update_order([5]) == []
+
+
+@pytest.mark.django_db
+def test_field_dependency_graph_is_invalidated_when_dependencies_change(
+    data_fixture,
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="text")
+    handler = FieldHandler()
+    formula_1 = handler.create_field(
+        user, table, "formula", name="formula 1", formula="field('text')"
+    )
+    formula_2 = handler.create_field(
+        user, table, "formula", name="formula 2", formula="field('formula 1')"
+    )
+
+    assert FieldDependencyHandler.get_update_order([text_field.id]) == [
+        formula_1.id,
+        formula_2.id,
+    ]
+
+    handler.update_field(user, formula_2, formula="field('text')")
+    graph = get_field_dependency_graph(table.database_id)
+    assert graph.get_dependants([text_field.id]) == [
+        (formula_1.id, None),
+        (formula_2.id, None),
+    ]
+    assert graph.get_dependants([formula_1.id]) == []
+
+    handler.delete_field(user, text_field)
+    assert (
+        get_field_dependency_graph(table.database_id).get_dependants([text_field.id])
+        == []
+    )
+
+
+@pytest.mark.django_db
+def test_get_dependant_fields_with_type_uses_the_dependency_graph(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="text")
+    handler = FieldHandler()
+    previous_name = "text"
+    formula_fields = []
+    for i in range(10):
+        formula_fields.append(
+            handler.create_field(
+                user,
+                table,
+                "formula",
+                name=f"formula {i}",
+                formula=f"field('{previous_name}')",
+            )
+        )
+        previous_name = f"formula {i}"
+
+    field_cache = FieldCache()
+    FieldDependencyHandler.get_dependant_fields_with_type([text_field.id], field_cache)
+
+    with CaptureQueriesContext(connection) as captured:
+        field_ids = [text_field.id]
+        for formula_field in formula_fields:
+            dependants = FieldDependencyHandler.get_dependant_fields_with_type(
+                field_ids, field_cache
+            )
+            assert [field.id for field, _, _ in dependants] == [formula_field.id]
+            field_ids = [formula_field.id]
+
+    assert not [
+        query
+        for query in captured.captured_queries
+        if "database_fielddependency" in query["sql"]
+    ]
@@ -0,0 +1,110 @@
+import pytest
+
+from baserow.contrib.database.fields.exceptions import IncompatibleFieldTypeForIndex
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.fields.indexes import (
+    get_existing_field_indexes,
+    get_field_index_name,
+    get_field_index_recommendations,
+    sync_field_indexes,
+)
+from baserow.core.trash.handler import TrashHandler
+
+
+@pytest.mark.django_db
+def test_sync_field_indexes(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    number_field = data_fixture.create_number_field(table=table)
+    date_field = data_fixture.create_date_field(table=table)
+    handler = FieldHandler()
+
+    with pytest.raises(IncompatibleFieldTypeForIndex):
+        handler.update_field_index(user, text_field, True)
+
+    handler.update_field_index(user, number_field, True)
+    handler.update_field_index(user, date_field, True)
+    number_index_name = get_field_index_name(table.id, number_field.id)
+    date_index_name = get_field_index_name(table.id, date_field.id)
+    sync_field_indexes(table.id)
+    assert get_existing_field_indexes(table.id) == {
+        number_index_name: True,
+        date_index_name: True,
+    }
+
+    handler.update_field_index(user, date_field, False)
+    sync_field_indexes(table.id)
+    assert get_existing_field_indexes(table.id) == {number_index_name: True}
+
+    # The index of a trashed field is dropped and created again when it's restored.
+    handler.delete_field(user, number_field)
+    sync_field_indexes(table.id)
+    assert get_existing_field_indexes(table.id) == {}
+
+    TrashHandler.restore_item(user, "field", number_field.id)
+    sync_field_indexes(table.id)
+    assert get_existing_field_indexes(table.id) == {number_index_name: True}
+
+
+@pytest.mark.django_db
+def test_field_index_is_dropped_when_field_type_changes(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    number_field = data_fixture.create_number_field(table=table)
+    handler = FieldHandler()
+    handler.update_field_index(user, number_field, True)
+    sync_field_indexes(table.id)
+    assert len(get_existing_field_indexes(table.id)) == 1
+
+    number_field = handler.update_field(user, number_field, new_type_name="rating")
+    assert get_existing_field_indexes(table.id) == {}
+    assert number_field.db_index is True
+
+    # A text field can't be indexed, so the field isn't indexed anymore.
+    text_field = handler.update_field(user, number_field, new_type_name="text")
+    assert text_field.db_index is False
+    sync_field_indexes(table.id)
+    assert get_existing_field_indexes(table.id) == {}
+
+
+@pytest.mark.django_db
+def test_field_index_recommendations(data_fixture, settings):
+    table = data_fixture.create_database_table()
+    text_field = data_fixture.create_text_field(table=table)
+    number_field = data_fixture.create_number_field(table=table)
+    date_field = data_fixture.create_date_field(table=table)
+    data_fixture.create_number_field(table=table)
+    view_1 = data_fixture.create_grid_view(table=table)
+    view_2 = data_fixture.create_grid_view(table=table)
+    trashed_view = data_fixture.create_grid_view(table=table, trashed=True)
+    data_fixture.create_view_sort(view=view_1, field=text_field)
+    data_fixture.create_view_sort(view=view_1, field=date_field)
+    data_fixture.create_view_filter(
+        view=view_1, field=number_field, type="higher_than", value="1"
+    )
+    data_fixture.create_view_filter(
+        view=view_2, field=number_field, type="equal", value="1"
+    )
+    # Filters which can't use an index and trashed views aren't taken into account.
+    data_fixture.create_view_filter(
+        view=view_2, field=date_field, type="empty", value=""
+    )
+    data_fixture.create_view_sort(view=trashed_view, field=date_field)
+    table.get_model().objects.create()
+
+    assert get_field_index_recommendations(table) == []
+
+    settings.FIELD_INDEX_MIN_ROW_COUNT = 1
+    recommendations = get_field_index_recommendations(table)
+    assert [(r.field.id, r.sort_count, r.filter_count) for r in recommendations] == [
+        (number_field.id, 0, 2),
+        (date_field.id, 1, 0),
+    ]
+
+    settings.AUTO_CREATE_FIELD_INDEXES = True
+    sync_field_indexes(table.id)
+    assert set(get_existing_field_indexes(table.id)) == {
+        get_field_index_name(table.id, number_field.id),
+        get_field_index_name(table.id, date_field.id),
+    }
@@ -1,4 +1,5 @@
 import inspect
+from unittest.mock import patch
 
 import pytest
 from django.db.models import TextField
@@ -25,6 +26,9 @@ from baserow.contrib.database.formula import (
     BaserowFormulaNumberType,
 )
 from baserow.contrib.database.formula.ast.tree import BaserowFunctionDefinition
+from baserow.contrib.database.formula.parser.ast_mapper import (
+    raw_formula_to_untyped_expression,
+)
 from baserow.contrib.database.formula.registries import formula_function_registry
 from baserow.contrib.database.rows.handler import RowHandler
 from baserow.contrib.database.views.exceptions import (
@@ -413,6 +417,68 @@ def test_recalculate_formulas_according_to_version(
     assert upto_date_formula_depending_on_old_version.requires_refresh_after_insert
 
 
+def test_raw_formula_to_untyped_expression_is_cached():
+    formula = "CONCAT('cached', UPPER(field('a')), 'formula')"
+    with patch(
+        "baserow.contrib.database.formula.handler.raw_formula_to_untyped_expression",
+        wraps=raw_formula_to_untyped_expression,
+    ) as mock_raw_formula_to_untyped_expression:
+        expression_1 = FormulaHandler.raw_formula_to_untyped_expression(formula)
+        expression_2 = FormulaHandler.raw_formula_to_untyped_expression(formula)
+
+    mock_raw_formula_to_untyped_expression.assert_called_once_with(formula)
+    assert expression_1 is not expression_2
+    assert str(expression_1) == str(expression_2)
+    assert expression_1.function_def is formula_function_registry.get("concat")
+    assert expression_2.function_def is formula_function_registry.get("concat")
+
+    expression_1.with_valid_type(BaserowFormulaTextType())
+    assert expression_2.expression_type is None
+
+
+@pytest.mark.django_db
+def test_recalculate_formulas_according_to_version_per_database(data_fixture):
+    outdated_formulas = []
+    dependant_formulas = []
+    for i in range(2):
+        outdated_formula = data_fixture.create_formula_field(
+            formula="1",
+            internal_formula="",
+            name="a",
+            version=1,
+            recalculate=False,
+            create_field=False,
+        )
+        outdated_formulas.append(outdated_formula)
+        dependant_formulas.append(
+            data_fixture.create_formula_field(
+                table=outdated_formula.table,
+                formula="field('a')",
+                internal_formula="",
+                name="b",
+                version=FormulaHandler.BASEROW_FORMULA_VERSION,
+                recalculate=False,
+                create_field=False,
+            )
+        )
+    assert outdated_formulas[0].table.database_id != (
+        outdated_formulas[1].table.database_id
+    )
+
+    field_cache = FieldCache()
+    for formula_field in FormulaField.objects.all():
+        FieldDependencyHandler().rebuild_dependencies(formula_field, field_cache)
+
+    assert FormulaHandler.recalculate_formulas_according_to_version() == 4
+    for formula_field in outdated_formulas + dependant_formulas:
+        formula_field.refresh_from_db()
+        assert formula_field.version == FormulaHandler.BASEROW_FORMULA_VERSION
+        assert formula_field.formula_type == "number"
+    assert outdated_formulas[0].internal_formula == "error_to_nan(1)"
+
+    assert FormulaHandler.recalculate_formulas_according_to_version() == 0
+
+
 @pytest.mark.django_db
 def test_can_update_lookup_field_value(
     data_fixture, api_client, django_assert_num_queries
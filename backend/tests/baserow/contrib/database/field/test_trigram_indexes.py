@@ -0,0 +1,74 @@
+import pytest
+
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.fields.trigram_indexes import (
+    get_existing_trigram_indexes,
+    get_trigram_index_name,
+    sync_trigram_indexes,
+)
+
+
+@pytest.mark.django_db
+def test_sync_trigram_indexes(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    long_text_field = data_fixture.create_long_text_field(table=table)
+    number_field = data_fixture.create_number_field(table=table)
+    view = data_fixture.create_grid_view(table=table)
+    text_filter = data_fixture.create_view_filter(
+        view=view, field=text_field, type="contains", value="a"
+    )
+    data_fixture.create_view_filter(
+        view=view, field=long_text_field, type="equal", value="a"
+    )
+    data_fixture.create_view_filter(
+        view=view, field=number_field, type="contains", value="1"
+    )
+
+    text_index_name = get_trigram_index_name(table.id, text_field.id)
+    sync_trigram_indexes(table.id)
+    assert get_existing_trigram_indexes(table.id) == {text_index_name: True}
+
+    model = table.get_model()
+    model.objects.create(**{f"field_{text_field.id}": "Banana"})
+    model.objects.create(**{f"field_{text_field.id}": "Cherry"})
+    queryset = model.objects.filter(**{f"field_{text_field.id}__icontains": "nan"})
+    assert queryset.count() == 1
+
+    text_filter.delete()
+    sync_trigram_indexes(table.id)
+    assert get_existing_trigram_indexes(table.id) == {}
+
+    # Indexes of trashed views are dropped.
+    data_fixture.create_view_filter(
+        view=view, field=long_text_field, type="contains", value="a"
+    )
+    long_text_index_name = get_trigram_index_name(table.id, long_text_field.id)
+    sync_trigram_indexes(table.id)
+    assert get_existing_trigram_indexes(table.id) == {long_text_index_name: True}
+
+    view.trashed = True
+    view.save()
+    sync_trigram_indexes(table.id)
+    assert get_existing_trigram_indexes(table.id) == {}
+
+
+@pytest.mark.django_db
+def test_trigram_index_is_dropped_when_field_type_changes(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    view = data_fixture.create_grid_view(table=table)
+    data_fixture.create_view_filter(
+        view=view, field=text_field, type="contains", value="a"
+    )
+    sync_trigram_indexes(table.id)
+    assert len(get_existing_trigram_indexes(table.id)) == 1
+
+    FieldHandler().update_field(user, text_field, new_type_name="number")
+    assert get_existing_trigram_indexes(table.id) == {}
+
+    # The contains filter of a number field can't use the index.
+    sync_trigram_indexes(table.id)
+    assert get_existing_trigram_indexes(table.id) == {}
@@ -0,0 +1,49 @@
+import pytest
+from io import StringIO
+
+from django.core.management import call_command
+
+from baserow.contrib.database.table.cache import (
+    clear_generated_model_cache,
+    get_latest_cached_model_field_attrs,
+    record_table_model_usage,
+)
+
+
+@pytest.mark.django_db
+def test_warm_model_cache_of_most_recently_used_tables(data_fixture):
+    table_a = data_fixture.create_database_table()
+    table_b = data_fixture.create_database_table()
+    clear_generated_model_cache()
+    record_table_model_usage(table_a.id)
+
+    output = StringIO()
+    call_command("warm_model_cache", "--limit", "10", stdout=output)
+
+    assert "Warmed the model cache of 1 out of 1 tables" in output.getvalue()
+    assert get_latest_cached_model_field_attrs(table_a.id) is not None
+    assert get_latest_cached_model_field_attrs(table_b.id) is None
+
+
+@pytest.mark.django_db
+def test_warm_model_cache_of_all_tables(data_fixture):
+    table_a = data_fixture.create_database_table()
+    table_b = data_fixture.create_database_table()
+    clear_generated_model_cache()
+
+    output = StringIO()
+    call_command("warm_model_cache", "--all", stdout=output)
+
+    assert "Warmed the model cache of 2 out of 2 tables" in output.getvalue()
+    assert get_latest_cached_model_field_attrs(table_a.id) is not None
+    assert get_latest_cached_model_field_attrs(table_b.id) is not None
+
+
+@pytest.mark.django_db
+def test_warm_model_cache_without_tables():
+    clear_generated_model_cache()
+
+    output = StringIO()
+    call_command("warm_model_cache", "--limit", "10", stdout=output)
+
+    assert output.getvalue() == "There are no tables to warm the model cache for.\n"
@@ -0,0 +1,281 @@
+import pytest
+from decimal import Decimal
+
+from baserow.contrib.database.fields.dependencies.deferred import (
+    apply_deferred_dependant_updates,
+    get_stale_field_ids_per_row,
+)
+from baserow.contrib.database.fields.dependencies.models import (
+    DeferredDependantUpdate,
+)
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.rows.registries import row_metadata_registry
+from baserow.contrib.database.views.handler import ViewHandler
+
+
+def setup_lookup_of_deferred_table(data_fixture, defer_dependant_updates=True):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    deferred_table = data_fixture.create_database_table(
+        user=user,
+        database=table.database,
+        defer_dependant_updates=defer_dependant_updates,
+    )
+    data_fixture.create_text_field(name="primary", table=table, primary=True)
+    name_field = data_fixture.create_text_field(
+        name="name", table=deferred_table, primary=True
+    )
+    handler = FieldHandler()
+    link_row_field = handler.create_field(
+        user, table, "link_row", name="link", link_row_table=deferred_table
+    )
+    lookup_field = handler.create_field(
+        user,
+        table,
+        "lookup",
+        name="lookup",
+        through_field_id=link_row_field.id,
+        target_field_id=name_field.id,
+    )
+    formula_field = handler.create_field(
+        user, table, "formula", name="formula", formula="join(field('lookup'), ',')"
+    )
+
+    deferred_row = RowHandler().create_row(
+        user, deferred_table, {f"field_{name_field.id}": "a"}
+    )
+    row = RowHandler().create_row(
+        user, table, {f"field_{link_row_field.id}": [deferred_row.id]}
+    )
+    DeferredDependantUpdate.objects.all().delete()
+
+    return (
+        user,
+        table,
+        deferred_table,
+        name_field,
+        lookup_field,
+        formula_field,
+        row,
+        deferred_row,
+    )
+
+
+def get_lookup_and_formula_values(table, row, lookup_field, formula_field):
+    row = table.get_model().objects.get(id=row.id)
+    return (
+        [value["value"] for value in getattr(row, f"field_{lookup_field.id}")],
+        getattr(row, f"field_{formula_field.id}"),
+    )
+
+
+@pytest.mark.django_db
+def test_dependants_of_deferred_table_are_updated_in_the_background(data_fixture):
+    (
+        user,
+        table,
+        deferred_table,
+        name_field,
+        lookup_field,
+        formula_field,
+        row,
+        deferred_row,
+    ) = setup_lookup_of_deferred_table(data_fixture)
+
+    assert get_lookup_and_formula_values(table, row, lookup_field, formula_field) == (
+        ["a"],
+        "a",
+    )
+
+    RowHandler().update_row_by_id(
+        user, deferred_table, deferred_row.id, {f"field_{name_field.id}": "b"}
+    )
+
+    assert get_lookup_and_formula_values(table, row, lookup_field, formula_field) == (
+        ["a"],
+        "a",
+    )
+    assert list(
+        DeferredDependantUpdate.objects.values_list("table_id", "row_id", "field_id")
+    ) == [(deferred_table.id, deferred_row.id, name_field.id)]
+    assert get_stale_field_ids_per_row(table, [row.id]) == {
+        row.id: sorted([lookup_field.id, formula_field.id])
+    }
+    assert get_stale_field_ids_per_row(deferred_table, [deferred_row.id]) == {}
+    assert row_metadata_registry.generate_and_merge_metadata_for_row(table, row.id) == {
+        "stale_field_ids": sorted([lookup_field.id, formula_field.id])
+    }
+
+    assert apply_deferred_dependant_updates(deferred_table.id) == 1
+
+    assert get_lookup_and_formula_values(table, row, lookup_field, formula_field) == (
+        ["b"],
+        "b",
+    )
+    assert DeferredDependantUpdate.objects.count() == 0
+    assert get_stale_field_ids_per_row(table, [row.id]) == {}
+
+
+@pytest.mark.django_db
+def test_deferred_dependant_updates_are_coalesced_in_batches(data_fixture):
+    (
+        user,
+        table,
+        deferred_table,
+        name_field,
+        lookup_field,
+        formula_field,
+        row,
+        deferred_row,
+    ) = setup_lookup_of_deferred_table(data_fixture)
+
+    row_handler = RowHandler()
+    second_deferred_row = row_handler.create_row(
+        user, deferred_table, {f"field_{name_field.id}": "c"}
+    )
+    for name in ["b", "c", "d"]:
+        row_handler.update_row_by_id(
+            user, deferred_table, deferred_row.id, {f"field_{name_field.id}": name}
+        )
+    row_handler.delete_row_by_id(user, deferred_table, second_deferred_row.id)
+
+    assert DeferredDependantUpdate.objects.count() == 5
+    assert apply_deferred_dependant_updates(deferred_table.id, batch_size=2) == 4
+
+    assert get_lookup_and_formula_values(table, row, lookup_field, formula_field) == (
+        ["d"],
+        "d",
+    )
+    assert DeferredDependantUpdate.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_deferred_dependant_updates_are_applied_by_celery_task(
+    data_fixture, django_capture_on_commit_callbacks
+):
+    (
+        user,
+        table,
+        deferred_table,
+        name_field,
+        lookup_field,
+        formula_field,
+        row,
+        deferred_row,
+    ) = setup_lookup_of_deferred_table(data_fixture)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        RowHandler().update_rows(
+            user,
+            deferred_table,
+            [{"id": deferred_row.id, f"field_{name_field.id}": "b"}],
+        )
+
+    assert get_lookup_and_formula_values(table, row, lookup_field, formula_field) == (
+        ["b"],
+        "b",
+    )
+    assert DeferredDependantUpdate.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_dependants_of_not_deferred_table_are_updated_immediately(data_fixture):
+    (
+        user,
+        table,
+        deferred_table,
+        name_field,
+        lookup_field,
+        formula_field,
+        row,
+        deferred_row,
+    ) = setup_lookup_of_deferred_table(data_fixture, defer_dependant_updates=False)
+
+    RowHandler().update_row_by_id(
+        user, deferred_table, deferred_row.id, {f"field_{name_field.id}": "b"}
+    )
+
+    assert get_lookup_and_formula_values(table, row, lookup_field, formula_field) == (
+        ["b"],
+        "b",
+    )
+    assert DeferredDependantUpdate.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_only_fields_with_dependants_via_link_rows_are_deferred(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user, defer_dependant_updates=True)
+    text_field = data_fixture.create_text_field(name="text", table=table)
+    formula_field = FieldHandler().create_field(
+        user, table, "formula", name="formula", formula="field('text')"
+    )
+
+    row = RowHandler().create_row(user, table, {f"field_{text_field.id}": "a"})
+
+    assert DeferredDependantUpdate.objects.count() == 0
+    assert getattr(row, f"field_{formula_field.id}") == "a"
+
+
+@pytest.mark.django_db
+def test_aggregations_of_dependants_are_recomputed_after_deferred_updates(
+    data_fixture,
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    deferred_table = data_fixture.create_database_table(
+        user=user, database=table.database, defer_dependant_updates=True
+    )
+    data_fixture.create_text_field(name="primary", table=table, primary=True)
+    data_fixture.create_text_field(name="name", table=deferred_table, primary=True)
+    number_field = data_fixture.create_number_field(name="number", table=deferred_table)
+    handler = FieldHandler()
+    link_row_field = handler.create_field(
+        user, table, "link_row", name="link", link_row_table=deferred_table
+    )
+    handler.create_field(
+        user,
+        table,
+        "lookup",
+        name="lookup",
+        through_field_id=link_row_field.id,
+        target_field_id=number_field.id,
+    )
+    sum_field = handler.create_field(
+        user, table, "formula", name="sum", formula="sum(field('lookup'))"
+    )
+    grid_view = data_fixture.create_grid_view(table=table)
+    data_fixture.create_grid_view_field_option(
+        grid_view=grid_view,
+        field=sum_field,
+        aggregation_type="whatever",
+        aggregation_raw_type="sum",
+    )
+
+    deferred_row = RowHandler().create_row(
+        user, deferred_table, {f"field_{number_field.id}": 1}
+    )
+    RowHandler().create_row(
+        user, table, {f"field_{link_row_field.id}": [deferred_row.id]}
+    )
+    DeferredDependantUpdate.objects.all().delete()
+
+    view_handler = ViewHandler()
+    assert view_handler.get_view_field_aggregations(grid_view) == {
+        sum_field.db_column: Decimal(1)
+    }
+
+    RowHandler().update_row_by_id(
+        user, deferred_table, deferred_row.id, {f"field_{number_field.id}": 5}
+    )
+    assert view_handler.get_view_field_aggregations(grid_view) == {
+        sum_field.db_column: Decimal(1)
+    }
+
+    assert apply_deferred_dependant_updates(deferred_table.id) == 1
+
+    # The cached aggregation is invalidated by the background update.
+    assert view_handler.get_view_field_aggregations(grid_view) == {
+        sum_field.db_column: Decimal(5)
+    }
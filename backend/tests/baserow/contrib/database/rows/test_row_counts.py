@@ -0,0 +1,127 @@
+import pytest
+
+from django.core.cache import cache
+
+from baserow.contrib.database.rows.counts import (
+    ROW_COUNT_MODE_APPROXIMATE,
+    ROW_COUNT_MODE_EXACT,
+    RowCount,
+    count_rows,
+    estimate_row_count,
+    get_table_row_count,
+    initialize_table_row_count,
+    invalidate_table_row_count,
+    table_rows_version_cache_key,
+)
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.table.models import TableRowCount
+from baserow.core.trash.handler import TrashHandler
+
+
+@pytest.mark.django_db
+def test_get_table_row_count(data_fixture, django_capture_on_commit_callbacks):
+    table = data_fixture.create_database_table()
+    model = table.get_model()
+    model.objects.create()
+    model.objects.create()
+    model.objects.create(trashed=True)
+
+    # The rows are counted and the count is stored in the background.
+    with django_capture_on_commit_callbacks(execute=True):
+        assert get_table_row_count(model) == 2
+    stored = TableRowCount.objects.get(table=table)
+    assert (stored.count, stored.initializing) == (2, False)
+
+    # The stored count is used instead of counting the rows again.
+    model.objects.create()
+    assert get_table_row_count(model) == 2
+
+    invalidate_table_row_count(table.id)
+    assert not TableRowCount.objects.filter(table=table).exists()
+    with django_capture_on_commit_callbacks(execute=True):
+        assert get_table_row_count(model) == 3
+    assert TableRowCount.objects.get(table=table).count == 3
+
+
+@pytest.mark.django_db
+def test_initialize_table_row_count_reconciles_the_changed_rows(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    model = table.get_model()
+    handler = RowHandler()
+    handler.create_rows(user, table, [{}, {}], model=model)
+
+    # The rows created or deleted while the rows are counted are recorded as the
+    # difference, and are already counted as well.
+    TableRowCount.objects.create(table=table, count=0, initializing=True)
+    handler.create_rows(user, table, [{}, {}], model=model)
+    row = handler.create_row(user, table, model=model)
+    handler.delete_row_by_id(user, table, row.id, model=model)
+    assert TableRowCount.objects.get(table=table).count == 2
+    assert get_table_row_count(model) == 4
+
+    assert initialize_table_row_count(table.id) == 4
+    stored = TableRowCount.objects.get(table=table)
+    assert (stored.count, stored.initializing) == (4, False)
+    assert get_table_row_count(model) == 4
+
+    assert initialize_table_row_count(table.id) is None
+    assert TableRowCount.objects.get(table=table).count == 4
+
+
+@pytest.mark.django_db
+def test_table_row_count_is_updated_when_rows_change(
+    data_fixture, django_capture_on_commit_callbacks
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    model = table.get_model()
+    handler = RowHandler()
+    row = handler.create_row(user, table, model=model)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert get_table_row_count(model) == 1
+
+    handler.create_rows(user, table, [{}, {}, {}], model=model)
+    assert get_table_row_count(model) == 4
+
+    rows = list(model.objects.all())
+    handler.delete_rows(user, table, [rows[1].id, rows[2].id], model=model)
+    assert get_table_row_count(model) == 2
+
+    version = cache.get(table_rows_version_cache_key(table.id))
+    handler.delete_row_by_id(user, table, row.id, model=model)
+    assert get_table_row_count(model) == 1
+    assert cache.get(table_rows_version_cache_key(table.id)) > version
+
+    TrashHandler.restore_item(user, "row", row.id, parent_trash_item_id=table.id)
+    assert get_table_row_count(model) == 2
+    assert TableRowCount.objects.get(table=table).count == model.objects.count()
+
+
+@pytest.mark.django_db
+def test_count_rows(data_fixture, settings):
+    table = data_fixture.create_database_table()
+    text_field = data_fixture.create_text_field(table=table)
+    model = table.get_model()
+    model.objects.create(**{f"field_{text_field.id}": "a"})
+    model.objects.create(**{f"field_{text_field.id}": "b"})
+    model.objects.create(**{f"field_{text_field.id}": "b"})
+
+    queryset = model.objects.filter(**{f"field_{text_field.id}": "b"})
+    assert count_rows(model.objects.all(), filtered=False) == RowCount(
+        3, ROW_COUNT_MODE_EXACT
+    )
+    assert count_rows(queryset) == RowCount(2, ROW_COUNT_MODE_EXACT)
+    # The table doesn't have enough rows to approximate the count.
+    assert count_rows(queryset, approximate=True) == RowCount(2, ROW_COUNT_MODE_EXACT)
+
+    settings.APPROXIMATE_ROW_COUNT_THRESHOLD = 2
+    row_count = count_rows(queryset, approximate=True)
+    assert row_count.mode == ROW_COUNT_MODE_APPROXIMATE
+    assert row_count.count == estimate_row_count(queryset)
+    assert isinstance(row_count.count, int)
+    # Unfiltered rows are never approximated because the count is stored.
+    assert count_rows(model.objects.all(), filtered=False, approximate=True) == (
+        RowCount(3, ROW_COUNT_MODE_EXACT)
+    )
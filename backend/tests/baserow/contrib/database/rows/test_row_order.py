@@ -0,0 +1,161 @@
+import pytest
+
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.db import connection
+
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.rows.order import (
+    allocate_orders_at_end,
+    allocate_orders_before_row,
+    get_row_order_sequence_name,
+    renormalize_row_orders,
+)
+
+
+def get_row_order_sequence_value(model):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT last_value FROM "
+            f"{connection.ops.quote_name(get_row_order_sequence_name(model))}"
+        )
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_allocate_orders_at_end(data_fixture):
+    table = data_fixture.create_database_table()
+    model = table.get_model()
+    model.objects.create(order=Decimal("1.5"))
+    model.objects.create(order=Decimal("3.25"), trashed=True)
+
+    assert allocate_orders_at_end(model) == Decimal("5")
+    assert get_row_order_sequence_value(model) == 5
+
+    # The highest order of the table is only looked up once.
+    model.objects.create(order=Decimal("100"))
+    assert allocate_orders_at_end(model, amount=3) == Decimal("8")
+    assert allocate_orders_at_end(model) == Decimal("9")
+    assert get_row_order_sequence_value(model) == 9
+
+
+@pytest.mark.django_db
+def test_allocate_orders_before_row(data_fixture):
+    table = data_fixture.create_database_table()
+    model = table.get_model()
+    row_1 = model.objects.create(order=Decimal("1"))
+    row_2 = model.objects.create(order=Decimal("2"))
+
+    assert allocate_orders_before_row(row_2, model) == (
+        Decimal("1.50000000000000000000"),
+        Decimal("0.50000000000000000000"),
+    )
+    assert allocate_orders_before_row(row_2, model, amount=3) == (
+        Decimal("1.75000000000000000000"),
+        Decimal("0.25000000000000000000"),
+    )
+    assert allocate_orders_before_row(row_1, model) == (
+        Decimal("0.50000000000000000000"),
+        Decimal("0.50000000000000000000"),
+    )
+
+    row_1.refresh_from_db()
+    row_2.refresh_from_db()
+    assert row_1.order == Decimal("1")
+    assert row_2.order == Decimal("2")
+
+
+@pytest.mark.django_db
+@patch("baserow.contrib.database.rows.order.schedule_row_order_renormalization")
+def test_allocate_orders_before_row_when_the_gap_is_exhausted(
+    mock_schedule, data_fixture
+):
+    table = data_fixture.create_database_table()
+    model = table.get_model()
+    row_1 = model.objects.create(order=Decimal("1.99999999999999999999"))
+    row_2 = model.objects.create(order=Decimal("2"))
+
+    row_3 = model.objects.create(order=Decimal("1.99999999999999999999"))
+    row_4 = model.objects.create(order=Decimal("1"))
+
+    # The rows between 1 and 2 are spaced evenly again, leaving room for the new
+    # row right before the row with order 2.
+    assert allocate_orders_before_row(row_2, model) == (
+        Decimal("1.75000000000000000000"),
+        Decimal("0.25000000000000000000"),
+    )
+    mock_schedule.assert_called_once_with(table.id)
+
+    row_1.refresh_from_db()
+    row_2.refresh_from_db()
+    row_3.refresh_from_db()
+    row_4.refresh_from_db()
+    assert row_1.order == Decimal("1.25000000000000000000")
+    assert row_2.order == Decimal("2.00000000000000000000")
+    assert row_3.order == Decimal("1.50000000000000000000")
+    assert row_4.order == Decimal("1.00000000000000000000")
+
+    # The before row itself is moved when it's in the same interval.
+    mock_schedule.reset_mock()
+    row_5 = model.objects.create(order=Decimal("1.50000000000000000001"))
+    assert allocate_orders_before_row(row_5, model, amount=2) == (
+        Decimal("1.66666666666666666664"),
+        Decimal("0.16666666666666666666"),
+    )
+    mock_schedule.assert_called_once_with(table.id)
+    assert row_5.order == Decimal("1.83333333333333333330")
+    row_5.refresh_from_db()
+    assert row_5.order == Decimal("1.83333333333333333330")
+
+
+@pytest.mark.django_db
+def test_creating_rows_at_the_same_position_renormalizes_the_orders(
+    data_fixture, django_capture_on_commit_callbacks
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    handler = RowHandler()
+    first_row = handler.create_row(user, table)
+    last_row = handler.create_row(user, table)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        before_row = last_row
+        for _ in range(70):
+            before_row = handler.create_row(user, table, before_row=before_row)
+
+    model = table.get_model()
+    assert list(model.objects.values_list("order", flat=True)) == [
+        Decimal(order) for order in range(1, 73)
+    ]
+    ids = list(model.objects.values_list("id", flat=True))
+    assert ids[0] == first_row.id
+    assert ids[1] == before_row.id
+    assert ids[-1] == last_row.id
+    assert get_row_order_sequence_value(model) == 72
+    assert handler.create_row(user, table).order == Decimal("73")
+
+
+@pytest.mark.django_db
+def test_renormalize_row_orders(data_fixture):
+    table = data_fixture.create_database_table()
+    model = table.get_model()
+    row_1 = model.objects.create(order=Decimal("0.5"))
+    row_2 = model.objects.create(order=Decimal("0.75"), trashed=True)
+    row_3 = model.objects.create(order=Decimal("0.75"))
+    row_4 = model.objects.create(order=Decimal("4"))
+
+    assert renormalize_row_orders(table.id) == 3
+
+    assert list(
+        model.objects_and_trash.order_by("order").values_list("id", "order")
+    ) == [(row_1.id, 1), (row_2.id, 2), (row_3.id, 3), (row_4.id, 4)]
+    assert allocate_orders_at_end(model) == Decimal("5")
+    assert renormalize_row_orders(table.id) == 0
+    assert renormalize_row_orders(99999) == 0
+
+    # The order sequence is reset to the amount of rows, even if higher orders have
+    # been handed out before.
+    allocate_orders_at_end(model, amount=10)
+    assert renormalize_row_orders(table.id) == 0
+    assert allocate_orders_at_end(model) == Decimal("5")
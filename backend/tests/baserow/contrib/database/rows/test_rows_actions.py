@@ -21,6 +21,7 @@ from baserow.contrib.database.rows.actions import (
     MoveRowActionType,
     UpdateRowActionType,
     UpdateRowsActionType,
+    UpsertRowsActionType,
 )
 from baserow.contrib.database.rows.handler import RowHandler
 
@@ -1147,3 +1148,54 @@ def test_can_undo_redo_update_rows_interesting_field_types(data_fixture):
         )
     ) == [multi_select_option_2.id]
     assert getattr(row_table_1, f"field_{formula_field.id}") == "New value"
+
+
+@pytest.mark.django_db
+def test_can_undo_redo_upsert_rows(data_fixture):
+    session_id = "session-id"
+    user = data_fixture.create_user(session_id=session_id)
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_text_field(table=table, name="Key")
+    name_field = data_fixture.create_text_field(table=table, name="Name")
+
+    row_handler = RowHandler()
+    row = row_handler.create_row(
+        user, table, {key_field.id: "a", name_field.id: "Original value"}
+    )
+    model = table.get_model()
+
+    created_rows, updated_rows = action_type_registry.get_by_type(
+        UpsertRowsActionType
+    ).do(
+        user,
+        table,
+        [
+            {f"field_{key_field.id}": "a", f"field_{name_field.id}": "New value"},
+            {f"field_{key_field.id}": "b", f"field_{name_field.id}": "Created"},
+        ],
+        key_field.id,
+    )
+    assert [r.id for r in updated_rows] == [row.id]
+    assert len(created_rows) == 1
+
+    action_undone = ActionHandler.undo(
+        user, [TableActionScopeType.value(table_id=table.id)], session_id
+    )
+
+    assert action_undone is not None
+    assert action_undone.type == UpsertRowsActionType.type
+    assert action_undone.error is None
+    assert list(model.objects.values_list(f"field_{name_field.id}", flat=True)) == [
+        "Original value"
+    ]
+
+    action_redone = ActionHandler.redo(
+        user, [TableActionScopeType.value(table_id=table.id)], session_id
+    )
+
+    assert action_redone is not None
+    assert action_redone.type == UpsertRowsActionType.type
+    assert action_redone.error is None
+    assert list(
+        model.objects.order_by("id").values_list(f"field_{name_field.id}", flat=True)
+    ) == ["New value", "Created"]
@@ -8,7 +8,17 @@ import pytest
 from django.core.exceptions import ValidationError
 from django.db import models
 
-from baserow.contrib.database.rows.exceptions import RowDoesNotExist
+from baserow.contrib.database.api.rows.serializers import get_row_serializer_class
+from baserow.contrib.database.fields.exceptions import (
+    FieldDoesNotExist,
+    IncompatibleFieldTypeForUpsert,
+)
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.rows.exceptions import (
+    RowDoesNotExist,
+    UpsertMatchValuesMatchMultipleRows,
+    UpsertMatchValuesNotUnique,
+)
 from baserow.contrib.database.rows.handler import RowHandler
 from baserow.core.exceptions import UserNotInGroup
 from baserow.core.trash.handler import TrashHandler
@@ -171,7 +181,7 @@ def test_create_row(send_mock, data_fixture):
     row_2.refresh_from_db()
     assert row_1.order == Decimal("1.00000000000000000000")
     assert row_2.order == Decimal("2.00000000000000000000")
-    assert row_3.order == Decimal("1.99999999999999999999")
+    assert row_3.order == Decimal("1.50000000000000000000")
     assert send_mock.call_args[1]["before"].id == row_2.id
 
     row_4 = handler.create_row(user=user, table=table, before_row=row_2)
@@ -180,8 +190,8 @@ def test_create_row(send_mock, data_fixture):
     row_3.refresh_from_db()
     assert row_1.order == Decimal("1.00000000000000000000")
     assert row_2.order == Decimal("2.00000000000000000000")
-    assert row_3.order == Decimal("1.99999999999999999998")
-    assert row_4.order == Decimal("1.99999999999999999999")
+    assert row_3.order == Decimal("1.50000000000000000000")
+    assert row_4.order == Decimal("1.75000000000000000000")
 
     row_5 = handler.create_row(user=user, table=table, before_row=row_3)
     row_1.refresh_from_db()
@@ -190,9 +200,9 @@ def test_create_row(send_mock, data_fixture):
     row_4.refresh_from_db()
     assert row_1.order == Decimal("1.00000000000000000000")
     assert row_2.order == Decimal("2.00000000000000000000")
-    assert row_3.order == Decimal("1.99999999999999999998")
-    assert row_4.order == Decimal("1.99999999999999999999")
-    assert row_5.order == Decimal("1.99999999999999999997")
+    assert row_3.order == Decimal("1.50000000000000000000")
+    assert row_4.order == Decimal("1.75000000000000000000")
+    assert row_5.order == Decimal("1.25000000000000000000")
 
     row_6 = handler.create_row(user=user, table=table, before_row=row_2)
     row_1.refresh_from_db()
@@ -202,10 +212,10 @@ def test_create_row(send_mock, data_fixture):
     row_5.refresh_from_db()
     assert row_1.order == Decimal("1.00000000000000000000")
     assert row_2.order == Decimal("2.00000000000000000000")
-    assert row_3.order == Decimal("1.99999999999999999997")
-    assert row_4.order == Decimal("1.99999999999999999998")
-    assert row_5.order == Decimal("1.99999999999999999996")
-    assert row_6.order == Decimal("1.99999999999999999999")
+    assert row_3.order == Decimal("1.50000000000000000000")
+    assert row_4.order == Decimal("1.75000000000000000000")
+    assert row_5.order == Decimal("1.25000000000000000000")
+    assert row_6.order == Decimal("1.87500000000000000000")
 
     row_7 = handler.create_row(user, table=table, before_row=row_1)
     row_1.refresh_from_db()
@@ -216,11 +226,11 @@ def test_create_row(send_mock, data_fixture):
     row_6.refresh_from_db()
     assert row_1.order == Decimal("1.00000000000000000000")
     assert row_2.order == Decimal("2.00000000000000000000")
-    assert row_3.order == Decimal("1.99999999999999999997")
-    assert row_4.order == Decimal("1.99999999999999999998")
-    assert row_5.order == Decimal("1.99999999999999999996")
-    assert row_6.order == Decimal("1.99999999999999999999")
-    assert row_7.order == Decimal("0.99999999999999999999")
+    assert row_3.order == Decimal("1.50000000000000000000")
+    assert row_4.order == Decimal("1.75000000000000000000")
+    assert row_5.order == Decimal("1.25000000000000000000")
+    assert row_6.order == Decimal("1.87500000000000000000")
+    assert row_7.order == Decimal("0.50000000000000000000")
 
     with pytest.raises(ValidationError):
         handler.create_row(user=user, table=table, values={price_field.id: -10.22})
@@ -286,6 +296,71 @@ def test_get_row(data_fixture):
     assert getattr(row_tmp, f"field_{price_field.id}") == Decimal("59999.99")
 
 
+@pytest.mark.django_db
+def test_update_rows_only_recalculates_formulas_which_can_have_changed(
+    data_fixture,
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="text")
+    other_field = data_fixture.create_text_field(table=table, name="other")
+    handler = FieldHandler()
+    text_formula = handler.create_field(
+        user, table, "formula", name="text formula", formula="field('text')"
+    )
+    other_formula = handler.create_field(
+        user, table, "formula", name="other formula", formula="field('other')"
+    )
+    constant_formula = handler.create_field(
+        user, table, "formula", name="constant formula", formula="'constant'"
+    )
+    model = table.get_model()
+    row = RowHandler().create_row(
+        user, table, {f"field_{other_field.id}": "x"}, model=model
+    )
+
+    # The cells are changed without recalculating the formulas, so it can be
+    # detected which formulas are recalculated by the update.
+    model.objects.update(
+        **{
+            f"field_{other_field.id}": "changed",
+            f"field_{constant_formula.id}": "stale",
+        }
+    )
+    RowHandler().update_rows(
+        user, table, [{"id": row.id, f"field_{text_field.id}": "a"}], model=model
+    )
+
+    row.refresh_from_db()
+    assert getattr(row, f"field_{text_formula.id}") == "a"
+    assert getattr(row, f"field_{other_formula.id}") == "x"
+    assert getattr(row, f"field_{constant_formula.id}") == "constant"
+
+
+@pytest.mark.django_db
+@patch("baserow.contrib.database.rows.signals.rows_updated.send")
+@patch("baserow.contrib.database.rows.signals.before_rows_update.send")
+@patch("baserow.contrib.database.rows.signals.before_rows_update.has_listeners")
+def test_update_rows_only_sends_before_rows_update_to_listeners(
+    has_listeners_mock, send_mock, rows_updated_mock, data_fixture
+):
+    has_listeners_mock.return_value = False
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    model = table.get_model()
+    row = RowHandler().create_row(user, table, {}, model=model)
+
+    RowHandler().update_rows(
+        user, table, [{"id": row.id, f"field_{text_field.id}": "a"}], model=model
+    )
+
+    send_mock.assert_not_called()
+    assert rows_updated_mock.call_args[1]["before_return"] == []
+    row.refresh_from_db()
+    assert getattr(row, f"field_{text_field.id}") == "a"
+
+
 @pytest.mark.django_db
 @patch("baserow.contrib.database.rows.signals.row_updated.send")
 def test_update_row(send_mock, data_fixture):
@@ -365,6 +440,65 @@ def test_create_rows_created_on_and_last_modified(data_fixture):
         assert row.updated_on == datetime(2020, 1, 1, 12, 0, tzinfo=UTC)
 
 
+@pytest.mark.django_db
+def test_create_rows_returns_rows_without_selecting_them_again(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    related_table = data_fixture.create_database_table(
+        user=user, database=table.database
+    )
+    text_field = data_fixture.create_text_field(table=table, name="text", primary=True)
+    number_field = data_fixture.create_number_field(
+        table=table, name="number", number_decimal_places=2
+    )
+    related_primary_field = data_fixture.create_text_field(
+        table=related_table, name="name", primary=True
+    )
+    field_handler = FieldHandler()
+    link_row_field = field_handler.create_field(
+        user, table, "link_row", name="link", link_row_table=related_table
+    )
+    field_handler.create_field(
+        user,
+        table,
+        "lookup",
+        name="lookup",
+        through_field_id=link_row_field.id,
+        target_field_id=related_primary_field.id,
+    )
+    field_handler.create_field(
+        user, table, "formula", name="formula", formula="concat(field('text'), '!')"
+    )
+    multiple_select_field = data_fixture.create_multiple_select_field(table=table)
+    option = data_fixture.create_select_option(field=multiple_select_field)
+    related_row = related_table.get_model().objects.create(
+        **{f"field_{related_primary_field.id}": "related"}
+    )
+    model = table.get_model()
+
+    rows = RowHandler().create_rows(
+        user,
+        table,
+        [
+            {
+                f"field_{text_field.id}": "a",
+                f"field_{number_field.id}": "1.5",
+                f"field_{link_row_field.id}": [related_row.id],
+                f"field_{multiple_select_field.id}": [option.id],
+            },
+            {},
+        ],
+        model=model,
+    )
+
+    serializer_class = get_row_serializer_class(model, is_response=True)
+    selected_rows = model.objects.all().enhance_by_fields()
+    assert (
+        serializer_class(rows, many=True).data
+        == serializer_class(selected_rows, many=True).data
+    )
+
+
 @pytest.mark.django_db
 def test_update_rows_created_on_and_last_modified(data_fixture):
     user = data_fixture.create_user()
@@ -386,6 +520,184 @@ def test_update_rows_created_on_and_last_modified(data_fixture):
         assert row.updated_on == datetime(2020, 1, 2, 12, 0, tzinfo=UTC)
 
 
+@pytest.mark.django_db
+def test_update_rows_only_writes_the_provided_values(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="text")
+    number_field = data_fixture.create_number_field(table=table, name="number")
+    last_modified_field = data_fixture.create_last_modified_field(
+        table=table, date_include_time=True
+    )
+    formula_field = FieldHandler().create_field(
+        user, table, "formula", name="formula", formula="concat(field('text'), '!')"
+    )
+    model = table.get_model()
+    handler = RowHandler()
+
+    with freeze_time("2020-01-01 12:00"):
+        row_1, row_2 = handler.create_rows(
+            user,
+            table,
+            [
+                {f"field_{text_field.id}": "a", f"field_{number_field.id}": 1},
+                {f"field_{text_field.id}": "b", f"field_{number_field.id}": 2},
+            ],
+        )
+
+    with freeze_time("2020-01-02 12:00"):
+        rows = handler.update_rows(
+            user,
+            table,
+            [
+                {"id": row_1.id, f"field_{text_field.id}": "c"},
+                {"id": row_2.id, f"field_{number_field.id}": 3},
+            ],
+            model=model,
+        )
+
+    assert [
+        (
+            getattr(row, f"field_{text_field.id}"),
+            getattr(row, f"field_{number_field.id}"),
+            getattr(row, f"field_{formula_field.id}"),
+            getattr(row, f"field_{last_modified_field.id}"),
+        )
+        for row in rows
+    ] == [
+        ("c", 1, "c!", datetime(2020, 1, 2, 12, 0, tzinfo=UTC)),
+        ("b", 3, "b!", datetime(2020, 1, 2, 12, 0, tzinfo=UTC)),
+    ]
+
+
+@pytest.mark.django_db
+def test_upsert_rows(data_fixture):
+    user = data_fixture.create_user()
+    user_2 = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    key_field = data_fixture.create_number_field(
+        table=table, name="key", number_decimal_places=1
+    )
+    name_field = data_fixture.create_text_field(table=table, name="name")
+    boolean_field = data_fixture.create_boolean_field(table=table, name="boolean")
+    model = table.get_model()
+    handler = RowHandler()
+
+    row_1, row_2 = handler.create_rows(
+        user,
+        table,
+        [
+            {f"field_{key_field.id}": 1, f"field_{name_field.id}": "a"},
+            {f"field_{key_field.id}": 2, f"field_{name_field.id}": "b"},
+        ],
+    )
+
+    with pytest.raises(UserNotInGroup):
+        handler.upsert_rows(user_2, table, [], key_field.id)
+
+    with pytest.raises(FieldDoesNotExist):
+        handler.upsert_rows(user, table, [], 99999)
+
+    with pytest.raises(IncompatibleFieldTypeForUpsert):
+        handler.upsert_rows(user, table, [], boolean_field.id)
+
+    with pytest.raises(UpsertMatchValuesNotUnique) as exc_info:
+        handler.upsert_rows(
+            user,
+            table,
+            [{f"field_{key_field.id}": "3"}, {f"field_{key_field.id}": "3.0"}],
+            key_field.id,
+        )
+    assert exc_info.value.values == ["3.0"]
+
+    (
+        created_rows,
+        updated_rows,
+        original_rows_values,
+        new_rows_values,
+    ) = handler.upsert_rows(
+        user,
+        table,
+        [
+            {f"field_{key_field.id}": "2.0", f"field_{name_field.id}": "c"},
+            {f"field_{key_field.id}": 3, f"field_{name_field.id}": "d"},
+            {f"field_{name_field.id}": "e"},
+        ],
+        key_field.id,
+        model=model,
+    )
+
+    assert [row.id for row in updated_rows] == [row_2.id]
+    assert original_rows_values == [
+        {
+            "id": row_2.id,
+            f"field_{key_field.id}": Decimal("2.0"),
+            f"field_{name_field.id}": "b",
+        }
+    ]
+    assert new_rows_values == [
+        {
+            "id": row_2.id,
+            f"field_{key_field.id}": "2.0",
+            f"field_{name_field.id}": "c",
+        }
+    ]
+    assert [getattr(row, f"field_{name_field.id}") for row in created_rows] == [
+        "d",
+        "e",
+    ]
+    assert list(
+        model.objects.order_by("id").values_list(
+            f"field_{key_field.id}", f"field_{name_field.id}"
+        )
+    ) == [
+        (Decimal("1.0"), "a"),
+        (Decimal("2.0"), "c"),
+        (Decimal("3.0"), "d"),
+        (None, "e"),
+    ]
+
+    model.objects.create(**{f"field_{key_field.id}": 1})
+    with pytest.raises(UpsertMatchValuesMatchMultipleRows) as exc_info:
+        handler.upsert_rows(user, table, [{f"field_{key_field.id}": 1}], key_field.id)
+    assert exc_info.value.values == ["1.0"]
+
+
+@pytest.mark.django_db
+def test_update_rows_recalculates_formulas_of_implicitly_changed_fields(
+    data_fixture,
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="text")
+    data_fixture.create_last_modified_field(
+        table=table, name="last modified", date_include_time=True
+    )
+    formula_field = FieldHandler().create_field(
+        user, table, "formula", name="formula", formula="field('last modified')"
+    )
+    model = table.get_model()
+    handler = RowHandler()
+
+    with freeze_time("2020-01-01 12:00"):
+        row = handler.create_row(
+            user, table, {f"field_{text_field.id}": "a"}, model=model
+        )
+
+    with freeze_time("2020-01-02 12:00"):
+        handler.update_rows(
+            user,
+            table,
+            [{"id": row.id, f"field_{text_field.id}": "b"}],
+            model=model,
+        )
+
+    row.refresh_from_db()
+    assert getattr(row, f"field_{formula_field.id}") == datetime(
+        2020, 1, 2, 12, 0, tzinfo=UTC
+    )
+
+
 @pytest.mark.django_db
 @patch("baserow.contrib.database.rows.signals.row_updated.send")
 @patch("baserow.contrib.database.rows.signals.before_row_update.send")
@@ -430,7 +742,7 @@ def test_move_row(before_send_mock, send_mock, data_fixture):
     row_1.refresh_from_db()
     row_2.refresh_from_db()
     row_3.refresh_from_db()
-    assert row_1.order == Decimal("2.99999999999999999999")
+    assert row_1.order == Decimal("2.50000000000000000000")
     assert row_2.order == Decimal("2.00000000000000000000")
     assert row_3.order == Decimal("3.00000000000000000000")
 
@@ -4,7 +4,21 @@ import pytest
 from baserow.contrib.database.table.cache import (
     invalidate_table_in_model_cache,
     get_latest_cached_model_field_attrs,
+    generated_models_local_cache,
+    GeneratedModelLRUCache,
+    generated_models_cache,
+    get_latest_cached_models_field_attrs,
+    fetch_latest_cached_model_field_attrs_with_related,
+    table_model_cache_entry_key,
+    get_latest_model_version,
+    clear_generated_model_cache,
+    record_table_model_usage,
+    get_most_recently_used_table_ids,
+    _table_model_usage_recorded_at,
 )
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.table.handler import TableHandler
+from baserow.test_utils.helpers import setup_interesting_test_table
 
 
 @pytest.mark.django_db
@@ -97,3 +111,237 @@ def test_deleting_tables_group_removes_generated_model_cache_entry(data_fixture)
     table.database.group.delete()
 
     assert get_latest_cached_model_field_attrs(table.id) is None
+
+
+@pytest.mark.django_db
+def test_get_model_is_served_from_local_cache(data_fixture):
+    table = data_fixture.create_database_table()
+    data_fixture.create_text_field(table=table)
+    generated_models_local_cache.clear()
+
+    model = table.get_model()
+    assert table.get_model() is model
+    assert generated_models_local_cache.stats()["hits"] == 1
+
+    data_fixture.create_text_field(table=table)
+
+    new_model = table.get_model()
+    assert new_model is not model
+    assert len(new_model._field_objects) == 2
+
+
+@pytest.mark.django_db
+def test_local_cached_model_not_used_when_related_table_changed(data_fixture):
+    table_a, table_b, link_field = data_fixture.create_two_linked_tables()
+    generated_models_local_cache.clear()
+
+    model_a = table_a.get_model()
+    assert table_a.get_model() is model_a
+
+    field = data_fixture.create_text_field(table=table_b)
+
+    new_model_a = table_a.get_model()
+    assert new_model_a is not model_a
+    related_model = new_model_a._meta.get_field(link_field.db_column).remote_field.model
+    assert field.id in related_model._field_objects
+
+
+@pytest.mark.django_db
+def test_filtered_model_not_cached_if_full_model_not_cached(data_fixture):
+    field = data_fixture.create_text_field()
+    generated_models_local_cache.clear()
+
+    model = field.table.get_model(field_ids=[field.id])
+    assert field.table.get_model(field_ids=[field.id]) is not model
+    assert generated_models_local_cache.stats()["size"] == 0
+    assert get_latest_cached_model_field_attrs(field.table_id) is None
+
+
+@pytest.mark.django_db
+def test_filtered_model_generated_from_cache_includes_dependencies(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table, name="text")
+    other_field = data_fixture.create_text_field(table=table, name="other")
+    formula_field = FieldHandler().create_field(
+        user, table, "formula", name="formula", formula="field('text')"
+    )
+    table.get_model()
+    generated_models_local_cache.clear()
+
+    model = table.get_model(field_ids=[formula_field.id])
+
+    assert set(model._field_objects.keys()) == {formula_field.id, text_field.id}
+    assert other_field.id not in model._field_objects
+    assert table.get_model(field_ids=[formula_field.id]) is model
+    assert table.get_model(field_ids=[other_field.id]) is not model
+    assert table.get_model() is not model
+
+
+def test_generated_model_lru_cache_evicts_least_recently_used():
+    cache = GeneratedModelLRUCache(max_size=2)
+    cache.set((1, 1), "a")
+    cache.set((2, 1), "b")
+    assert cache.get((1, 1)) == "a"
+    cache.set((3, 1), "c")
+
+    assert cache.get((2, 1)) is None
+    assert cache.get((1, 1)) == "a"
+    assert cache.get((3, 1), is_valid=lambda value: False) is None
+    assert cache.stats() == {"size": 1, "max_size": 2, "hits": 2, "misses": 2}
+
+    cache.set((1, 2), "d")
+    cache.delete_table(1)
+    assert len(cache) == 0
+
+
+@pytest.mark.django_db
+def test_get_latest_cached_models_field_attrs(data_fixture):
+    table_a = data_fixture.create_database_table()
+    table_b = data_fixture.create_database_table()
+    table_a.get_model()
+
+    latest = get_latest_cached_models_field_attrs([table_a.id, table_b.id])
+
+    version_a, field_attrs_a = latest[table_a.id]
+    version_b, field_attrs_b = latest[table_b.id]
+    assert isinstance(version_a, int)
+    assert "fields" in field_attrs_a
+    assert isinstance(version_b, int)
+    assert field_attrs_b is None
+
+
+@pytest.mark.django_db
+def test_fetch_latest_cached_model_field_attrs_with_related(data_fixture):
+    unrelated_table = data_fixture.create_database_table()
+    table_a, table_b, link_field = data_fixture.create_two_linked_tables()
+    table_c = data_fixture.create_database_table(database=table_b.database)
+    data_fixture.create_link_row_field(table=table_b, link_row_table=table_c)
+    for table in [unrelated_table, table_a, table_b, table_c]:
+        table.get_model()
+
+    fetched = fetch_latest_cached_model_field_attrs_with_related(table_a.id)
+
+    assert set(fetched.keys()) == {table_a.id, table_b.id, table_c.id}
+    assert all(field_attrs is not None for _, field_attrs in fetched.values())
+
+
+@pytest.mark.django_db
+def test_generating_linked_model_fetches_related_field_attrs_in_batches(
+    data_fixture,
+):
+    table_a, table_b, link_field = data_fixture.create_two_linked_tables()
+    table_a.get_model()
+    table_b.get_model()
+    generated_models_local_cache.clear()
+
+    with patch.object(
+        generated_models_cache, "get_many", wraps=generated_models_cache.get_many
+    ) as patched_get_many:
+        model = table_a.get_model()
+
+    # One call for the local model cache versions and two calls per level of
+    # related tables for the versions and entries.
+    assert patched_get_many.call_count == 5
+    assert link_field.db_column in [f.name for f in model._meta.get_fields()]
+
+
+@pytest.mark.django_db
+def test_model_generated_from_compact_field_attrs_matches_uncached(data_fixture):
+    table, user, row, _ = setup_interesting_test_table(data_fixture)
+    uncached_model = table.get_model(use_cache=False)
+    table.get_model()
+    generated_models_local_cache.clear()
+
+    cache_key = table_model_cache_entry_key(
+        table.id, get_latest_model_version(table.id)
+    )
+    assert isinstance(generated_models_cache.get(cache_key), str)
+
+    cached_model = table.get_model()
+
+    for field_id, field_object in uncached_model._field_objects.items():
+        cached_field_object = cached_model._field_objects[field_id]
+        assert cached_field_object["type"] == field_object["type"]
+        assert cached_field_object["name"] == field_object["name"]
+        assert cached_field_object["field"].specific_class == (
+            field_object["field"].specific_class
+        )
+        cached_model_field = cached_model._meta.get_field(field_object["name"])
+        uncached_model_field = uncached_model._meta.get_field(field_object["name"])
+        assert cached_model_field.__class__ is uncached_model_field.__class__
+    assert cached_model._primary_field_id == uncached_model._primary_field_id
+    assert str(cached_model.objects.get(id=row.id)) == str(
+        uncached_model.objects.get(id=row.id)
+    )
+
+
+@pytest.mark.django_db
+def test_get_model_records_most_recently_used_tables(data_fixture):
+    clear_generated_model_cache()
+    table_a = data_fixture.create_database_table()
+    table_b = data_fixture.create_database_table()
+
+    with patch("baserow.contrib.database.table.cache.time") as mock_time:
+        mock_time.time.return_value = 1000
+        table_a.get_model()
+        mock_time.time.return_value = 1001
+        table_b.get_model()
+        assert get_most_recently_used_table_ids(10) == [table_b.id, table_a.id]
+
+        # The usage of the same table is only recorded once per interval.
+        mock_time.time.return_value = 1002
+        table_a.get_model()
+        assert get_most_recently_used_table_ids(10) == [table_b.id, table_a.id]
+
+        mock_time.time.return_value = 2000
+        record_table_model_usage(table_a.id)
+        assert get_most_recently_used_table_ids(10) == [table_a.id, table_b.id]
+        assert get_most_recently_used_table_ids(1) == [table_a.id]
+        # The recordings older than the interval are forgotten by the process.
+        assert list(_table_model_usage_recorded_at.keys()) == [table_a.id]
+
+
+@pytest.mark.django_db
+def test_warm_model_cache(data_fixture):
+    table_a, table_b, link_field = data_fixture.create_two_linked_tables()
+    table_c = data_fixture.create_database_table()
+    data_fixture.create_text_field(table=table_c)
+    clear_generated_model_cache()
+
+    handler = TableHandler()
+    table_ids = handler.get_tables_to_warm_in_model_cache()
+    assert set(table_ids) >= {table_a.id, table_b.id, table_c.id}
+
+    timings = handler.warm_model_cache(
+        [table_a.id, table_b.id, table_c.id], batch_size=2
+    )
+    assert set(timings.keys()) == {table_a.id, table_b.id, table_c.id}
+    for table in [table_a, table_b, table_c]:
+        assert get_latest_cached_model_field_attrs(table.id) is not None
+
+    # Tables which have already been cached are skipped unless forced.
+    assert handler.warm_model_cache([table_a.id]) == {}
+    version = get_latest_model_version(table_a.id)
+    assert set(handler.warm_model_cache([table_a.id], force=True).keys()) == {
+        table_a.id
+    }
+    assert get_latest_model_version(table_a.id) > version
+
+    # The model is generated from the warmed cache.
+    generated_models_local_cache.clear()
+    assert table_a.get_model()._table_model_version == get_latest_model_version(
+        table_a.id
+    )
+
+
+@pytest.mark.django_db
+def test_get_tables_to_warm_in_model_cache_skips_deleted_tables(data_fixture):
+    clear_generated_model_cache()
+    table_a = data_fixture.create_database_table()
+    table_b = data_fixture.create_database_table()
+    record_table_model_usage(table_a.id)
+    record_table_model_usage(table_b.id)
+    table_b.delete()
+
+    assert TableHandler().get_tables_to_warm_in_model_cache(10) == [table_a.id]
@@ -720,3 +720,20 @@ def test_table_model_fields_requiring_refresh_after_update(data_fixture):
     )
     assert len(fields_from_normal_formula_model) == 1
     assert fields_from_normal_formula_model[0] == f"field_{formula_field.id}"
+
+
+@pytest.mark.django_db
+def test_get_table_model_fetches_specific_fields_per_type(
+    data_fixture, django_assert_num_queries
+):
+    table = data_fixture.create_database_table()
+    for i in range(0, 20):
+        data_fixture.create_text_field(table=table, name=f"text_{i}")
+        data_fixture.create_number_field(table=table, name=f"number_{i}")
+        data_fixture.create_boolean_field(table=table, name=f"boolean_{i}")
+
+    # One query to fetch the fields and one for each of the three field types.
+    with django_assert_num_queries(4):
+        model = table.get_model(use_cache=False)
+
+    assert len(model._field_objects) == 60
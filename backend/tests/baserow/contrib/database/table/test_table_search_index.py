@@ -0,0 +1,136 @@
+import pytest
+from django.db import connection
+
+from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.table.handler import TableHandler
+from baserow.contrib.database.table.search_index import (
+    get_search_index_table_name,
+    rebuild_search_index,
+)
+from baserow.core.trash.handler import TrashHandler
+
+
+def search_ids(table, search, **kwargs):
+    model = table.get_model()
+    queryset = model.objects.all().search_all_fields(search, **kwargs)
+    return sorted(queryset.values_list("id", flat=True))
+
+
+@pytest.mark.django_db
+def test_search_index(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    name_field = data_fixture.create_text_field(table=table, primary=True)
+    row_handler = RowHandler()
+    row_1 = row_handler.create_row(user, table, {name_field.db_column: "Apple pie"})
+    row_2, row_3 = row_handler.create_rows(
+        user,
+        table,
+        [{name_field.db_column: "Banana"}, {name_field.db_column: "Pineapple"}],
+    )
+
+    TableHandler().update_table(user, table, table.name, search_index_enabled=True)
+    table.refresh_from_db()
+    assert table.search_index_enabled is True
+    assert table.search_index_ready is False
+    assert get_search_index_table_name(table.id) in (
+        connection.introspection.table_names()
+    )
+
+    # Until the index has been built the rows are searched without it.
+    assert search_ids(table, "apple") == [row_1.id, row_3.id]
+
+    assert rebuild_search_index(table.id) == 3
+    table.refresh_from_db()
+    assert table.search_index_ready is True
+
+    # The index only matches the words starting with the search query.
+    assert search_ids(table, "apple") == [row_1.id]
+    assert search_ids(table, "ban") == [row_2.id]
+    assert search_ids(table, "apple pi") == [row_1.id]
+    assert search_ids(table, str(row_3.id)) == [row_3.id]
+    # The rows are searched without the index if it can't be used.
+    assert search_ids(table, "-") == []
+    field_ids = [name_field.id]
+    assert search_ids(table, "apple", only_search_by_field_ids=field_ids) == [
+        row_1.id,
+        row_3.id,
+    ]
+
+    row_handler.update_row(user, table, row_2, {name_field.db_column: "Cherry"})
+    row_handler.update_rows(
+        user, table, [{"id": row_3.id, name_field.db_column: "Cherry tart"}]
+    )
+    row_4 = row_handler.create_row(user, table, {name_field.db_column: "Cherry"})
+    assert search_ids(table, "ban") == []
+    assert search_ids(table, "cherry") == [row_2.id, row_3.id, row_4.id]
+
+    row_handler.delete_row_by_id(user, table, row_4.id)
+    assert search_ids(table, "cherry") == [row_2.id, row_3.id]
+
+    # The values of all the rows can change, so the index is rebuilt.
+    FieldHandler().create_field(user, table, "text", name="Notes")
+    table.refresh_from_db()
+    assert table.search_index_ready is False
+
+    TableHandler().update_table(user, table, table.name, search_index_enabled=False)
+    table.refresh_from_db()
+    assert table.search_index_enabled is False
+    assert get_search_index_table_name(table.id) not in (
+        connection.introspection.table_names()
+    )
+    assert rebuild_search_index(table.id) == 0
+
+
+@pytest.mark.django_db
+def test_search_index_of_dependant_rows_is_updated(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    linked_table = data_fixture.create_database_table(
+        user=user, database=table.database
+    )
+    data_fixture.create_text_field(table=table, primary=True)
+    name_field = data_fixture.create_text_field(table=linked_table, primary=True)
+    field_handler = FieldHandler()
+    link_field = field_handler.create_field(
+        user, table, "link_row", name="Link", link_row_table=linked_table
+    )
+    field_handler.create_field(
+        user,
+        table,
+        "lookup",
+        name="Lookup",
+        through_field_id=link_field.id,
+        target_field_id=name_field.id,
+    )
+
+    row_handler = RowHandler()
+    linked_row = row_handler.create_row(
+        user, linked_table, {name_field.db_column: "Apple"}
+    )
+    row = row_handler.create_row(user, table, {link_field.db_column: [linked_row.id]})
+
+    TableHandler().update_table(user, table, table.name, search_index_enabled=True)
+    rebuild_search_index(table.id)
+    table.refresh_from_db()
+    assert search_ids(table, "apple") == [row.id]
+
+    row_handler.update_row(
+        user, linked_table, linked_row, {name_field.db_column: "Banana"}
+    )
+    assert search_ids(table, "apple") == []
+    assert search_ids(table, "banana") == [row.id]
+
+
+@pytest.mark.django_db
+def test_search_index_is_dropped_with_table(data_fixture):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    TableHandler().update_table(user, table, table.name, search_index_enabled=True)
+
+    TrashHandler.permanently_delete(table)
+
+    assert get_search_index_table_name(table.id) not in (
+        connection.introspection.table_names()
+    )
@@ -3,6 +3,8 @@ import random
 from decimal import Decimal
 
 from baserow.contrib.database.fields.handler import FieldHandler
+from baserow.contrib.database.rows.handler import RowHandler
+from baserow.contrib.database.views.aggregation_deltas import AggregationDeltaTracker
 from baserow.contrib.database.views.registries import view_aggregation_type_registry
 from baserow.contrib.database.views.exceptions import FieldAggregationNotSupported
 from baserow.contrib.database.views.handler import ViewHandler
@@ -431,3 +433,209 @@ def test_aggregation_is_updated_when_view_is_trashed(data_fixture):
     TrashHandler().restore_item(user, "view", grid_view_one.id)
     aggregations_restored_view = view_handler.get_view_field_aggregations(grid_view_one)
     assert field.db_column not in aggregations_restored_view
+
+
+def test_decomposable_aggregation_types_apply_state_deltas():
+    empty_count = view_aggregation_type_registry.get("empty_count")
+    state = empty_count.apply_state_delta({"count": 3}, {"count": 1}, {"count": None})
+    assert empty_count.get_value_from_state(state) == 2
+
+    sum_type = view_aggregation_type_registry.get("sum")
+    state = sum_type.apply_state_delta(
+        {"sum": Decimal(10), "count": 2},
+        {"sum": Decimal(4), "count": 1},
+        {"sum": None, "count": 0},
+    )
+    assert state == {"sum": Decimal(6), "count": 1}
+    assert sum_type.get_value_from_state(state) == Decimal(6)
+    assert sum_type.get_value_from_state({"sum": 0, "count": 0}) is None
+
+    average = view_aggregation_type_registry.get("average")
+    state = average.apply_state_delta(
+        {"sum": Decimal(10), "count": 4},
+        {"sum": None, "count": None},
+        {"sum": Decimal(5), "count": 1},
+    )
+    assert average.get_value_from_state(state) == Decimal(3)
+    assert average.get_value_from_state({"sum": None, "count": 0}) is None
+
+    min_type = view_aggregation_type_registry.get("min")
+    assert min_type.apply_state_delta({"value": 2}, {"value": 5}, {"value": 1}) == {
+        "value": 1
+    }
+    assert min_type.apply_state_delta(
+        {"value": None}, {"value": None}, {"value": 3}
+    ) == {"value": 3}
+    # The row having the minimum value changed, so it can't be derived.
+    assert min_type.apply_state_delta({"value": 2}, {"value": 2}, {"value": 3}) is None
+
+    max_type = view_aggregation_type_registry.get("max")
+    assert max_type.apply_state_delta({"value": 5}, {"value": 2}, {"value": 3}) == {
+        "value": 5
+    }
+    assert max_type.apply_state_delta({"value": 5}, {"value": 5}, {"value": 6}) is None
+
+
+@pytest.mark.django_db
+def test_view_field_aggregations_are_updated_with_deltas(
+    data_fixture, django_capture_on_commit_callbacks
+):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    number_field = data_fixture.create_number_field(table=table)
+    text_field = data_fixture.create_text_field(table=table)
+    min_field = data_fixture.create_number_field(table=table)
+    grid_view = data_fixture.create_grid_view(table=table)
+    data_fixture.create_view_filter(
+        view=grid_view, field=number_field, type="higher_than", value="0"
+    )
+    for field, aggregation_raw_type in [
+        (number_field, "sum"),
+        (text_field, "empty_count"),
+        (min_field, "min"),
+    ]:
+        data_fixture.create_grid_view_field_option(
+            grid_view=grid_view,
+            field=field,
+            aggregation_type="whatever",
+            aggregation_raw_type=aggregation_raw_type,
+        )
+
+    row_handler = RowHandler()
+    view_handler = ViewHandler()
+    names = [number_field.db_column, text_field.db_column, min_field.db_column]
+
+    def get_valid_cached_values():
+        return {
+            name: cached_value["value"]
+            for name, (cached_value, version) in view_handler.get_cached_aggregations(
+                grid_view, names
+            ).items()
+            if cached_value is not None and cached_value["version"] == version
+        }
+
+    row_1 = row_handler.create_row(
+        user,
+        table,
+        {
+            f"field_{number_field.id}": 10,
+            f"field_{text_field.id}": "a",
+            f"field_{min_field.id}": 5,
+        },
+    )
+    row_2 = row_handler.create_row(
+        user,
+        table,
+        {
+            f"field_{number_field.id}": 20,
+            f"field_{text_field.id}": "",
+            f"field_{min_field.id}": 3,
+        },
+    )
+    assert view_handler.get_view_field_aggregations(grid_view) == {
+        number_field.db_column: Decimal(30),
+        text_field.db_column: 1,
+        min_field.db_column: Decimal(3),
+    }
+
+    with django_capture_on_commit_callbacks(execute=True):
+        row_handler.update_row_by_id(
+            user, table, row_1.id, {f"field_{number_field.id}": 15}
+        )
+        # The cached values are invalid until the change is committed.
+        assert get_valid_cached_values() == {}
+
+    assert get_valid_cached_values() == {
+        number_field.db_column: Decimal(35),
+        text_field.db_column: 1,
+        min_field.db_column: Decimal(3),
+    }
+
+    with django_capture_on_commit_callbacks(execute=True):
+        row_3 = row_handler.create_row(
+            user,
+            table,
+            {
+                f"field_{number_field.id}": 1,
+                f"field_{text_field.id}": None,
+                f"field_{min_field.id}": 1,
+            },
+        )
+
+    assert get_valid_cached_values() == {
+        number_field.db_column: Decimal(36),
+        text_field.db_column: 2,
+        min_field.db_column: Decimal(1),
+    }
+
+    # The row doesn't match the filter of the view anymore.
+    with django_capture_on_commit_callbacks(execute=True):
+        row_handler.update_row_by_id(
+            user, table, row_2.id, {f"field_{number_field.id}": -5}
+        )
+
+    assert get_valid_cached_values() == {
+        number_field.db_column: Decimal(16),
+        text_field.db_column: 1,
+        min_field.db_column: Decimal(1),
+    }
+
+    # The deleted row has the minimum value, so the minimum must be computed again.
+    with django_capture_on_commit_callbacks(execute=True):
+        row_handler.delete_row_by_id(user, table, row_3.id)
+
+    assert get_valid_cached_values() == {
+        number_field.db_column: Decimal(15),
+        text_field.db_column: 0,
+    }
+    assert view_handler.get_view_field_aggregations(grid_view) == {
+        number_field.db_column: Decimal(15),
+        text_field.db_column: 0,
+        min_field.db_column: Decimal(5),
+    }
+
+    with django_capture_on_commit_callbacks(execute=True):
+        TrashHandler.restore_item(user, "row", row_3.id, parent_trash_item_id=table.id)
+
+    assert get_valid_cached_values() == {
+        number_field.db_column: Decimal(16),
+        text_field.db_column: 1,
+        min_field.db_column: Decimal(1),
+    }
+
+
+@pytest.mark.django_db
+def test_aggregation_delta_tracker_only_queries_cached_aggregations(
+    data_fixture, django_assert_num_queries
+):
+    table = data_fixture.create_database_table()
+    number_field = data_fixture.create_number_field(table=table)
+    grid_view = data_fixture.create_grid_view(table=table)
+    grid_view_2 = data_fixture.create_grid_view(table=table)
+    for view in [grid_view, grid_view_2]:
+        data_fixture.create_grid_view_field_option(
+            grid_view=view,
+            field=number_field,
+            aggregation_type="whatever",
+            aggregation_raw_type="sum",
+        )
+    model = table.get_model()
+    row = model.objects.create(**{f"field_{number_field.id}": 1})
+    view_handler = ViewHandler()
+
+    # Nothing is cached, so only the aggregations of the views are fetched.
+    tracker = AggregationDeltaTracker(table, model, [row.id])
+    with django_assert_num_queries(1):
+        tracker.before_change()
+        tracker.after_change()
+    assert tracker.tracked == []
+
+    view_handler.get_view_field_aggregations(grid_view)
+    view_handler.clear_aggregation_cache(grid_view, number_field.db_column)
+
+    # The states of the rows that have just been created aren't queried before
+    # the change, and only the view having a cached value is tracked.
+    tracker = AggregationDeltaTracker(table, model, [row.id])
+    with django_assert_num_queries(1):
+        tracker.before_change(created=True)
+    assert [view.id for view, _, _, _ in tracker.tracked] == [grid_view.id]
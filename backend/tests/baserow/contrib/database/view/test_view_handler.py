@@ -1910,3 +1910,114 @@ def test_cant_update_sort_when_view_trashed(data_fixture):
 
     with pytest.raises(ViewSortDoesNotExist):
         ViewHandler().update_sort(user, view_sort, field)
+
+
+@pytest.mark.django_db
+def test_get_view_row_count(data_fixture, django_assert_num_queries):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    grid_view = data_fixture.create_grid_view(table=table)
+    model = table.get_model()
+    handler = ViewHandler()
+    row_handler = RowHandler()
+    row_handler.create_rows(
+        user,
+        table,
+        [{f"field_{text_field.id}": "a"}, {f"field_{text_field.id}": "b"}, {}],
+        model=model,
+    )
+
+    # Without filters the stored count of the table is used.
+    assert handler.get_view_row_count(grid_view, model=model) == (3, "exact")
+
+    view_filter = handler.create_filter(user, grid_view, text_field, "equal", "a")
+    assert handler.get_view_row_count(grid_view, model=model) == (1, "exact")
+    queryset = handler.get_queryset(grid_view, model=model)
+    # Only checks whether the view has filters.
+    with django_assert_num_queries(1):
+        assert handler.get_view_row_count(grid_view, queryset) == (1, "cached")
+
+    # Searching never uses the cache.
+    assert handler.get_view_row_count(grid_view, model=model, search="b") == (
+        0,
+        "exact",
+    )
+
+    row_handler.create_row(user, table, {f"field_{text_field.id}": "a"}, model)
+    assert handler.get_view_row_count(grid_view, model=model) == (2, "exact")
+    assert handler.get_view_row_count(grid_view, model=model) == (2, "cached")
+
+    handler.update_filter(user, view_filter, value="b")
+    assert handler.get_view_row_count(grid_view, model=model) == (1, "exact")
+
+    handler.update_view(user, grid_view, filters_disabled=True)
+    assert handler.get_view_row_count(grid_view, model=model) == (4, "exact")
+
+    handler.update_view(user, grid_view, filters_disabled=False)
+    assert handler.get_view_row_count(grid_view, model=model) == (1, "exact")
+
+    handler.delete_filter(user, view_filter)
+    assert handler.get_view_row_count(grid_view, model=model) == (4, "exact")
+
+
+@pytest.mark.django_db
+def test_get_cached_view_rows(data_fixture, settings, django_assert_num_queries):
+    user = data_fixture.create_user()
+    table = data_fixture.create_database_table(user=user)
+    text_field = data_fixture.create_text_field(table=table)
+    grid_view = data_fixture.create_grid_view(table=table)
+    model = table.get_model()
+    handler = ViewHandler()
+    row_handler = RowHandler()
+    row_1, row_2, row_3 = row_handler.create_rows(
+        user,
+        table,
+        [
+            {f"field_{text_field.id}": "b"},
+            {f"field_{text_field.id}": "c"},
+            {f"field_{text_field.id}": "a"},
+        ],
+        model=model,
+    )
+
+    view_sort = handler.create_sort(user, grid_view, text_field, "DESC")
+    queryset = handler.get_queryset(grid_view, model=model)
+    # The cache is disabled by default.
+    assert handler.get_cached_view_rows(grid_view, queryset) is None
+
+    settings.VIEW_ROW_IDS_CACHE_MAX_ROWS = 10
+    cached_rows = handler.get_cached_view_rows(grid_view, queryset)
+    assert list(cached_rows.row_ids) == [row_2.id, row_1.id, row_3.id]
+    assert cached_rows.row_count == (3, "exact")
+    assert [row.id for row in cached_rows[1:3]] == [row_1.id, row_3.id]
+
+    # Only checks whether the view is sorted and gets the cached ids.
+    with django_assert_num_queries(1):
+        cached_rows = handler.get_cached_view_rows(grid_view, queryset)
+    assert cached_rows.row_count == (3, "cached")
+
+    handler.update_sort(user, view_sort, order="ASC")
+    queryset = handler.get_queryset(grid_view, model=model)
+    cached_rows = handler.get_cached_view_rows(grid_view, queryset)
+    assert list(cached_rows.row_ids) == [row_3.id, row_1.id, row_2.id]
+
+    view_filter = handler.create_filter(user, grid_view, text_field, "not_equal", "a")
+    queryset = handler.get_queryset(grid_view, model=model)
+    cached_rows = handler.get_cached_view_rows(grid_view, queryset)
+    assert list(cached_rows.row_ids) == [row_1.id, row_2.id]
+
+    row_handler.update_row(user, table, row_2, {f"field_{text_field.id}": "a"}, model)
+    cached_rows = handler.get_cached_view_rows(grid_view, queryset)
+    assert cached_rows.row_count == (1, "exact")
+    assert list(cached_rows.row_ids) == [row_1.id]
+
+    settings.VIEW_ROW_IDS_CACHE_MAX_ROWS = 1
+    handler.delete_filter(user, view_filter)
+    queryset = handler.get_queryset(grid_view, model=model)
+    # The view has too many rows to be cached.
+    assert handler.get_cached_view_rows(grid_view, queryset) is None
+
+    handler.delete_sort(user, view_sort)
+    queryset = handler.get_queryset(grid_view, model=model)
+    assert handler.get_cached_view_rows(grid_view, queryset) is None
@@ -3,7 +3,13 @@ import pytest
 from django.db import connection
 from django.test.utils import override_settings
 
-from baserow.core.db import LockedAtomicTransaction
+from baserow.contrib.database.fields.models import (
+    BooleanField,
+    Field,
+    NumberField,
+    TextField,
+)
+from baserow.core.db import LockedAtomicTransaction, get_specific_instances
 from baserow.core.models import Settings
 
 
@@ -24,3 +30,41 @@ def test_locked_atomic_transaction(api_client, data_fixture):
 
     with LockedAtomicTransaction(Settings):
         assert is_locked(Settings)
+
+
+@pytest.mark.django_db
+def test_get_specific_instances(data_fixture, django_assert_num_queries):
+    table = data_fixture.create_database_table()
+    text_field = data_fixture.create_text_field(table=table, order=1)
+    number_field = data_fixture.create_number_field(table=table, order=2)
+    boolean_field = data_fixture.create_boolean_field(table=table, order=3)
+    trashed_text_field = data_fixture.create_text_field(
+        table=table, order=4, trashed=True
+    )
+
+    fields = list(Field.objects_and_trash.filter(table=table).order_by("order"))
+    # Make sure the content types are cached.
+    [field.specific_class for field in fields]
+
+    # One query per field type instead of one query per field.
+    with django_assert_num_queries(3):
+        specific_fields = get_specific_instances(fields)
+
+    assert [type(field) for field in specific_fields] == [
+        TextField,
+        NumberField,
+        BooleanField,
+        TextField,
+    ]
+    assert [field.id for field in specific_fields] == [
+        text_field.id,
+        number_field.id,
+        boolean_field.id,
+        trashed_text_field.id,
+    ]
+
+    # The resolved specific instances are cached on the provided instances.
+    with django_assert_num_queries(0):
+        assert [field.specific for field in fields] == specific_fields
+        assert get_specific_instances(fields) == specific_fields
+        assert get_specific_instances(specific_fields) == specific_fields
@@ -1,3 +1,7 @@
+import gc
+import weakref
+from unittest.mock import patch
+
 import pytest
 
 from django.core.exceptions import ImproperlyConfigured
@@ -147,6 +151,50 @@ def test_registry_get_by_model_returns_the_most_specific_value():
     assert registry.get_by_model(SubClassOfBaseFakeModel()) == subtype_of_base_app
 
 
+def test_registry_get_by_model_index_is_updated_when_registry_changes():
+    base_app = BaseFakeModelApplication()
+    subtype_of_base_app = SubClassOfBaseFakeModelApplication()
+    registry = TemporaryRegistry()
+    registry.register(base_app)
+
+    # Only the registered model classes themselves match when a class is provided.
+    with pytest.raises(InstanceTypeDoesNotExist):
+        registry.get_by_model(SubClassOfBaseFakeModel)
+    assert registry.get_by_model(SubClassOfBaseFakeModel()) == base_app
+    assert registry.get_by_model(SubClassOfBaseFakeModel()) == base_app
+
+    registry.register(subtype_of_base_app)
+    assert registry.get_by_model(SubClassOfBaseFakeModel()) == subtype_of_base_app
+
+    registry.unregister(subtype_of_base_app)
+    assert registry.get_by_model(SubClassOfBaseFakeModel()) == base_app
+
+    with patch.dict(registry.registry, {"temporary_2": subtype_of_base_app}):
+        assert registry.get_by_model(SubClassOfBaseFakeModel) == subtype_of_base_app
+    assert registry.get_by_model(SubClassOfBaseFakeModel()) == base_app
+
+    registry.registry = {}
+    with pytest.raises(InstanceTypeDoesNotExist):
+        registry.get_by_model(BaseFakeModel())
+
+
+def test_registry_get_by_model_does_not_retain_resolved_classes():
+    base_app = BaseFakeModelApplication()
+    registry = TemporaryRegistry()
+    registry.register(base_app)
+
+    # Like the generated table models, which are subclasses of a registered model
+    # class created on the fly.
+    dynamic_model = type("DynamicFakeModel", (BaseFakeModel,), {})
+    assert registry.get_by_model(dynamic_model()) == base_app
+    assert registry.get_by_model(dynamic_model()) == base_app
+
+    dynamic_model_ref = weakref.ref(dynamic_model)
+    del dynamic_model
+    gc.collect()
+    assert dynamic_model_ref() is None
+
+
 def test_api_exceptions_api_mixins():
     class FakeInstance(MapAPIExceptionsInstanceMixin, Instance):
         type = "fake_instance"
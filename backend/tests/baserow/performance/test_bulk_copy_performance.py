@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from baserow.contrib.database.db.bulk_copy import copy_rows
+from baserow.contrib.database.management.commands.fill_table_rows import fill_table_rows
+from baserow.test_utils.helpers import setup_interesting_test_table
+
+
+@pytest.mark.django_db
+@pytest.mark.slow
+# You must add --runslow -s to pytest to run this test, you can do this in intellij by
+# editing the run config for this test and adding --runslow -s to additional args.
+def test_copying_rows_compared_to_bulk_create(data_fixture):
+    table, user, row, _ = setup_interesting_test_table(data_fixture)
+    count = 10000
+    fill_table_rows(count, table)
+
+    model = table.get_model()
+    rows = list(model.objects.all())
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+
+    def copy_of_rows():
+        copies = []
+        for original in rows:
+            copied_row = model()
+            for field in fields:
+                setattr(copied_row, field.attname, getattr(original, field.attname))
+            copies.append(copied_row)
+        return copies
+
+    copies = copy_of_rows()
+    start = time.perf_counter()
+    model.objects.bulk_create(copies, batch_size=512)
+    bulk_create_time = time.perf_counter() - start
+
+    copies = copy_of_rows()
+    start = time.perf_counter()
+    copy_rows(model, copies)
+    copy_time = time.perf_counter() - start
+
+    print(f"--------- Inserting {len(rows)} rows -------")
+    print(f"bulk_create: {bulk_create_time:.3f}s")
+    print(f"copy_rows: {copy_time:.3f}s")
+    assert model.objects.count() == len(rows) * 3
@@ -1,3 +1,4 @@
+import time
 from decimal import Decimal
 
 import pytest
@@ -364,3 +365,57 @@ def test_fanout(data_fixture, api_client, django_assert_num_queries):
             )
             print(profiler.output_text(unicode=True, color=True))
     print(results)
+
+
+FORMULA_CORPUS = [
+    "'test'",
+    "1+1",
+    "field('number')+1",
+    "field('number') * 2 - field('other number') / 4",
+    "concat(field('first name'), ' ', field('last name'))",
+    "upper(left(field('name'), 1))",
+    "if(field('done'), 'Finished', 'In progress')",
+    "if(field('amount') > 1000, 'large', if(field('amount') > 100, 'medium', 'small'))",
+    "date_diff('dd', field('start'), field('end'))",
+    "datetime_format(field('date'), 'YYYY-MM-DD')",
+    "totext(field('price')) + ' EUR'",
+    "sum(lookup('orders', 'amount'))",
+    "count(field('orders'))",
+    "join(lookup('tags', 'name'), ', ')",
+    "avg(lookup('reviews', 'rating'))",
+    "and(field('active'), not(isblank(field('email'))))",
+    "replace(lower(trim(field('title'))), ' ', '-')",
+    "or(contains(field('description'), 'urgent'), field('priority') = 'high')",
+    "row_id() + 1000",
+    "concat('https://example.com/items/', totext(row_id()))",
+]
+
+
+@pytest.mark.slow
+# You must add --runslow -s to pytest to run this test, you can do this in intellij by
+# editing the run config for this test and adding --runslow -s to additional args.
+def test_raw_formula_to_untyped_expression_performance():
+    from baserow.contrib.database.formula import FormulaHandler
+    from baserow.contrib.database.formula.parser.ast_mapper import (
+        raw_formula_to_untyped_expression,
+    )
+
+    repeats = 50
+
+    start = time.perf_counter()
+    for i in range(repeats):
+        for formula in FORMULA_CORPUS:
+            raw_formula_to_untyped_expression(formula)
+    uncached_time = (time.perf_counter() - start) / repeats / len(FORMULA_CORPUS)
+
+    start = time.perf_counter()
+    for i in range(repeats):
+        for formula in FORMULA_CORPUS:
+            FormulaHandler.raw_formula_to_untyped_expression(formula)
+    cached_time = (time.perf_counter() - start) / repeats / len(FORMULA_CORPUS)
+
+    print(
+        f"Parsing {len(FORMULA_CORPUS)} formulas: uncached "
+        f"{uncached_time * 1000:.3f}ms, cached {cached_time * 1000:.3f}ms per formula"
+    )
+    assert cached_time < uncached_time
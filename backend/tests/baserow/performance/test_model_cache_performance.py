@@ -0,0 +1,51 @@
+import pickle
+import time
+
+import pytest
+
+from baserow.contrib.database.table.cache import (
+    compact_field_attrs,
+    load_compact_field_attrs,
+)
+from baserow.test_utils.helpers import setup_interesting_test_table
+
+
+@pytest.mark.django_db
+@pytest.mark.slow
+# You must add --runslow -s to pytest to run this test, you can do this in intellij by
+# editing the run config for this test and adding --runslow -s to additional args.
+def test_compact_field_attrs_size_and_deserialize_time(data_fixture):
+    table, user, row, _ = setup_interesting_test_table(data_fixture)
+    for i in range(500):
+        data_fixture.create_text_field(table=table, name=f"extra text {i}")
+    for i in range(100):
+        data_fixture.create_number_field(table=table, name=f"extra number {i}")
+
+    field_attrs = table._fetch_and_generate_field_attrs(
+        True, False, None, None, [], False
+    )
+    pickled = pickle.dumps(field_attrs)
+    compact = pickle.dumps(compact_field_attrs(field_attrs))
+
+    repeats = 20
+
+    start = time.perf_counter()
+    for i in range(repeats):
+        pickle.loads(pickled)
+    pickle_time = (time.perf_counter() - start) / repeats
+
+    start = time.perf_counter()
+    for i in range(repeats):
+        table._generate_field_attrs_from_compact(
+            load_compact_field_attrs(pickle.loads(compact))
+        )
+    compact_time = (time.perf_counter() - start) / repeats
+
+    print(
+        f"{len(field_attrs['_field_objects'])} fields\n"
+        f"pickled field_attrs: {len(pickled)} bytes, {pickle_time * 1000:.2f}ms to "
+        f"deserialize\n"
+        f"compact field_attrs: {len(compact)} bytes, {compact_time * 1000:.2f}ms to "
+        f"deserialize and rehydrate"
+    )
+    assert len(compact) < len(pickled)
@@ -0,0 +1,50 @@
+import time
+
+import pytest
+
+from baserow.contrib.database.fields.registries import field_type_registry
+from baserow.contrib.database.views.registries import view_type_registry
+from baserow.contrib.database.webhooks.registries import webhook_event_type_registry
+from baserow.core.registries import application_type_registry
+from baserow.core.trash.registries import trash_item_type_registry
+
+
+@pytest.mark.slow
+# You must add --runslow -s to pytest to run this test, you can do this in intellij by
+# editing the run config for this test and adding --runslow -s to additional args.
+def test_registry_get_by_model_performance():
+    repeats = 10000
+
+    for registry in [
+        field_type_registry,
+        view_type_registry,
+        application_type_registry,
+        trash_item_type_registry,
+        webhook_event_type_registry,
+    ]:
+        model_classes = [
+            value.model_class
+            for value in registry.get_all()
+            if isinstance(getattr(value, "model_class", None), type)
+        ]
+        if not model_classes:
+            continue
+
+        start = time.perf_counter()
+        for i in range(repeats):
+            for model_class in model_classes:
+                registry._find_most_specific_by_model(True, model_class)
+        scan_time = (time.perf_counter() - start) / repeats / len(model_classes)
+
+        start = time.perf_counter()
+        for i in range(repeats):
+            for model_class in model_classes:
+                registry.get_by_model(model_class)
+        index_time = (time.perf_counter() - start) / repeats / len(model_classes)
+
+        print(
+            f"{registry.name}: {len(registry.registry)} types, "
+            f"linear scan {scan_time * 1e6:.2f}us, "
+            f"indexed lookup {index_time * 1e6:.2f}us per get_by_model"
+        )
+        assert index_time < scan_time